@@ -57,10 +57,12 @@ except Exception as e:
 
 # Create FastAPI app
 environment = os.getenv("ENVIRONMENT", "production").lower()
+from backend.core.serialization import FastJSONResponse  # orjson-rendered responses (stdlib fallback)
 app = FastAPI(
     title="AI Social Media Content Agent",
     description="Complete autonomous social media management platform with security hardening",
     version="2.0.0",
+    default_response_class=FastJSONResponse,
     docs_url="/docs" if environment != "production" else None,  # Disable docs in production
     redoc_url="/redoc" if environment != "production" else None  # Disable redoc in production
 )
@@ -71,9 +73,13 @@ try:
     from backend.core.security_middleware import setup_security_middleware
     from backend.core.audit_logger import AuditTrackingMiddleware, AuditLogger
     
-    # Initialize audit logger and add audit tracking middleware
-    audit_logger = AuditLogger()
+    from backend.core.config import get_settings
+    
+    # Initialize audit logger and add audit tracking middleware; rows are
+    # persisted by a background batch writer, drained on shutdown
+    audit_logger = AuditLogger(get_settings().audit_database_url or None)
     app.add_middleware(AuditTrackingMiddleware, audit_logger=audit_logger)
+    app.add_event_handler("shutdown", audit_logger.close)
     
     # Setup all security middleware
     setup_security_middleware(app, environment=environment)
@@ -151,22 +157,29 @@ except Exception as e:
 loaded_routers = []
 failed_routers = []
 
-# Load routers from centralized registry
+# Load routers from centralized registry: imported on first request under
+# their path prefix or by the background warm-up (LAZY_ROUTERS=false: at import)
 try:
-    from backend.api._registry import ROUTERS
-    logger.info("Loading {} routers from registry".format(len(ROUTERS)))
+    from backend.api._registry import ROUTER_MANIFEST, load_router
+    from backend.core.config import get_settings
+    from backend.core.lazy_routers import LazyRouterLoader, LazyRouterMiddleware
     
-    for router in ROUTERS:
-        try:
-            router_name = getattr(router, 'prefix', 'unknown').replace('/api/', '') or 'root'
-            app.include_router(router)
-            loaded_routers.append(router_name)
-            logger.info("✅ {} router loaded successfully".format(router_name))
-        except Exception as e:
-            router_name = getattr(router, 'prefix', 'unknown')
-            failed_routers.append((router_name, str(e)))
-            logger.error("❌ {} router error: {} - {}".format(router_name, type(e).__name__, e))
-            continue
+    router_settings = get_settings()
+    router_loader = LazyRouterLoader(
+        app,
+        ROUTER_MANIFEST,
+        load_router,
+        loaded=loaded_routers,
+        failed=failed_routers,
+        warm_up_delay=router_settings.router_warmup_delay_s
+    )
+    if router_settings.lazy_routers:
+        app.add_middleware(LazyRouterMiddleware, loader=router_loader)
+        app.add_event_handler("startup", router_loader.start_warm_up)
+        logger.info("Registered {} routers for lazy loading".format(len(ROUTER_MANIFEST)))
+    else:
+        logger.info("Loading {} routers from registry".format(len(ROUTER_MANIFEST)))
+        router_loader.load_all()
             
 except ImportError as e:
     logger.error("Failed to import router registry: {}".format(e))
@@ -192,6 +205,22 @@ try:
 except Exception as e:
     logger.error("❌ Failed to setup static file serving: {}".format(e))
 
+# Shared outbound HTTP transports (pooled keep-alive connections to platform APIs)
+try:
+    from backend.services.http_transport import startup_http_transports, shutdown_http_transports
+    app.add_event_handler("startup", startup_http_transports)
+    app.add_event_handler("shutdown", shutdown_http_transports)
+    logger.info("✅ Shared HTTP transport lifecycle hooks registered")
+except Exception as e:
+    logger.error("❌ Failed to register shared HTTP transport hooks: {}".format(e))
+
+# Async database pool (hot read paths), created on first use
+try:
+    from backend.db.async_database import dispose_async_engine
+    app.add_event_handler("shutdown", dispose_async_engine)
+except Exception as e:
+    logger.error("❌ Failed to register async database shutdown hook: {}".format(e))
+
 # Root endpoints
 @app.get("/")
 async def root():
@@ -344,35 +373,22 @@ async def not_found_handler(request: Request, exc: HTTPException):
 logger.info("=" * 50)
 logger.info("Loaded {} routers successfully".format(len(loaded_routers)))
 logger.info("Failed to load {} routers".format(len(failed_routers)))
+if "router_loader" in globals() and not router_loader.all_loaded:
+    logger.info("Deferred {} routers to first use / background warm-up".format(len(router_loader.pending())))
 logger.info("Total routes: {}".format(len(app.routes)))
 logger.info("=" * 50)
 
-# Database schema safety net (migrations should be run separately)
-try:
-    from backend.db.ensure_columns import ensure_user_columns, ensure_notifications_table, ensure_content_logs_table, ensure_social_inbox_tables
-    logger.info("Running database schema safety net...")
-    
-    # Only run safety net for critical tables
-    ensure_user_columns()
-    ensure_notifications_table() 
-    ensure_content_logs_table()
-    ensure_social_inbox_tables()
-    
-    logger.info("✅ Database schema safety net completed")
-    
-except Exception as e:
-    logger.warning(f"⚠️ Schema safety net warnings: {e}")
-    logger.info("App will continue - database tables may need manual creation")
-
-# AI Suggestions Performance Fix - Auto-migration on startup
+# Database schema safety net (migrations should be run separately): runs after
+# startup instead of at import, per SCHEMA_CHECKS_ON_STARTUP
 try:
-    from backend.db.auto_migrate import init_database_schema
-    logger.info("🚀 Initializing AI suggestions performance fix...")
-    init_database_schema()
-    logger.info("✅ AI suggestions performance optimization completed")
+    from backend.core.config import get_settings
+    from backend.db.schema_checks import start_schema_checks
+    app.add_event_handler(
+        "startup",
+        lambda: start_schema_checks(get_settings().schema_checks_on_startup)
+    )
 except Exception as e:
-    logger.warning(f"⚠️ AI suggestions auto-migration warnings: {e}")
-    logger.info("AI suggestions may be slower until database schema is updated manually")
+    logger.warning(f"⚠️ Could not register schema safety net: {e}")
 
 # Export the app
 __all__ = ["app"]
\ No newline at end of file
@@ -18,6 +18,7 @@ import time
 
 from openai import OpenAI
 from backend.core.config import get_settings
+from backend.core.lazy import LazyProxy
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -32,6 +33,7 @@ except ImportError:
     from backend.core.vector_store_mock import VectorStoreMock as VectorStore
 
 from backend.agents.tools import web_scraper, openai_tool
+from backend.agents.research_engine import ResearchExecutionEngine
 
 @dataclass
 class ResearchTopic:
@@ -125,6 +127,9 @@ class DeepResearchAgent:
         # Create directories
         for path in [self.knowledge_base_path, self.research_cache_path, self.intelligence_reports_path]:
             path.mkdir(parents=True, exist_ok=True)
+        
+        # Provider rate limits, search cache and run checkpoints
+        self.engine = ResearchExecutionEngine(self.research_cache_path)
             
         logger.info("Deep Research Agent initialized with GPT-5 and GPT-5 mini")
     
@@ -209,24 +214,33 @@ class DeepResearchAgent:
         start_time = datetime.utcnow()
         research_period = (start_time - timedelta(days=7), start_time)
         
-        all_findings = []
+        # Topics already finished by a crashed run for this industry/day are reused
+        checkpoint = self.engine.checkpoint(industry, start_time)
+        completed_topics = checkpoint.completed_topics()
         
-        # Research each topic
-        for topic in topics:
-            try:
-                logger.info(f"Researching topic: {topic.name}")
-                findings = await self._research_topic(topic)
-                all_findings.extend(findings)
-                
-                # Update last researched timestamp
-                topic.last_researched = start_time
-                
-                # Brief pause to respect rate limits
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Failed to research topic {topic.name}: {e}")
+        async def research_one(topic: ResearchTopic) -> List[ResearchFinding]:
+            if topic.name in completed_topics:
+                logger.info(f"Reusing checkpointed findings for topic: {topic.name}")
+                findings = [self._finding_from_dict(item) for item in completed_topics[topic.name]]
+            else:
+                async with self.engine.topic_limiter.slot():
+                    logger.info(f"Researching topic: {topic.name}")
+                    findings = await self._research_topic(topic)
+                checkpoint.record_topic(topic.name, findings)
+            
+            # Update last researched timestamp
+            topic.last_researched = start_time
+            return findings
+        
+        # Research all topics concurrently; provider limiters bound the actual load
+        results = await asyncio.gather(*[research_one(topic) for topic in topics], return_exceptions=True)
+        
+        all_findings = []
+        for topic, result in zip(topics, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to research topic {topic.name}: {result}")
                 continue
+            all_findings.extend(result)
         
         # Analyze and synthesize findings
         intelligence_report = await self._synthesize_intelligence(
@@ -240,7 +254,12 @@ class DeepResearchAgent:
         # Generate actionable insights
         await self._generate_content_opportunities(intelligence_report)
         
-        logger.info(f"Weekly research completed. Found {len(all_findings)} insights.")
+        # Everything is persisted, so the next run should start fresh
+        checkpoint.clear()
+        
+        cache = self.engine.search_cache
+        logger.info(f"Weekly research completed. Found {len(all_findings)} insights "
+                    f"(search cache hits: {cache.hits}, misses: {cache.misses}).")
         return intelligence_report
     
     async def _research_topic(self, topic: ResearchTopic) -> List[ResearchFinding]:
@@ -294,6 +313,10 @@ class DeepResearchAgent:
             return [f"{topic.name} {kw}" for kw in topic.keywords[:10]]
     
     async def _search_web(self, query: str) -> List[Dict[str, Any]]:
+        """Search the web, sharing results for identical queries within the same day"""
+        return await self.engine.search_cache.get_or_fetch(query, self._search_web_uncached)
+    
+    async def _search_web_uncached(self, query: str) -> List[Dict[str, Any]]:
         """Search the web using multiple sources"""
         results = []
         
@@ -329,7 +352,9 @@ class DeepResearchAgent:
         }
         
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=10)
+            response = await self.engine.call(
+                "search", requests.post, url, headers=headers, json=payload, timeout=10
+            )
             response.raise_for_status()
             data = response.json()
             
@@ -377,7 +402,7 @@ class DeepResearchAgent:
         """Process and analyze a search result"""
         try:
             # Scrape content
-            scraped_data = web_scraper.scrape_url(result["url"])
+            scraped_data = await self.engine.call("scrape", web_scraper.scrape_url, result["url"])
             
             if scraped_data["status"] != "success":
                 return None
@@ -683,7 +708,9 @@ class DeepResearchAgent:
         try:
             if use_web_search:
                 # Use Responses API with web search
-                response = self.client.responses.create(
+                response = await self.engine.call(
+                    "openai",
+                    self.client.responses.create,
                     model=self.routine_research_model,
                     input=f"You are an expert research analyst. Use web search to provide current, thorough research on: {prompt}",
                     tools=[
@@ -695,7 +722,9 @@ class DeepResearchAgent:
                 return response.output_text if hasattr(response, 'output_text') else str(response)
             else:
                 # Fallback to Chat Completions without web search
-                response = self.client.chat.completions.create(
+                response = await self.engine.call(
+                    "openai",
+                    self.client.chat.completions.create,
                     model=self.routine_research_model,
                     messages=[
                         {"role": "system", "content": "You are an expert research analyst and industry intelligence specialist. Provide thorough, accurate, and actionable insights based on your knowledge."},
@@ -714,7 +743,9 @@ class DeepResearchAgent:
         """Call GPT-5 full model with enhanced reasoning and web search for deep research"""
         try:
             # Use Responses API with web search for deep research
-            response = self.client.responses.create(
+            response = await self.engine.call(
+                "openai",
+                self.client.responses.create,
                 model=self.deep_research_model,
                 input=f"Conduct deep industry analysis with comprehensive web research on: {prompt}. Provide well-cited insights with strategic implications.",
                 tools=[
@@ -737,7 +768,9 @@ class DeepResearchAgent:
         """Fallback method for research calls without built-in web search"""
         try:
             # Use the old method as fallback
-            response = self.client.chat.completions.create(
+            response = await self.engine.call(
+                "openai",
+                self.client.chat.completions.create,
                 model="gpt-5-mini",  # Fallback to GPT-5 mini model
                 messages=[
                     {"role": "system", "content": "You are an expert research analyst and industry intelligence specialist. Provide thorough, accurate, and actionable insights."},
@@ -826,21 +859,26 @@ class DeepResearchAgent:
         # Multi-source research
         search_queries = await self._generate_search_queries(topic)
         
-        for query in search_queries[:config["sources"]]:
+        async def research_query(query: str) -> List[ResearchFinding]:
             try:
-                # Web search and scraping
+                # Web search (cached/deduplicated) and concurrent scraping
                 search_results = await self._search_web(query)
-                
-                for result in search_results[:5]:  # Top 5 results per query
-                    finding = await self._process_search_result(result, topic)
-                    if finding and finding.relevance_score >= self.min_relevance_threshold:
-                        findings.append(finding)
-                        
-                await asyncio.sleep(0.5)  # Rate limiting
-                
+                processed = await asyncio.gather(*[
+                    self._process_search_result(result, topic)
+                    for result in search_results[:5]  # Top 5 results per query
+                ])
+                return [
+                    finding for finding in processed
+                    if finding and finding.relevance_score >= self.min_relevance_threshold
+                ]
             except Exception as e:
                 logger.warning(f"Search query failed: {query} - {e}")
-                continue
+                return []
+        
+        # Provider limiters replace the old fixed per-query sleep
+        unique_queries = list(dict.fromkeys(search_queries[:config["sources"]]))
+        for query_findings in await asyncio.gather(*[research_query(q) for q in unique_queries]):
+            findings.extend(query_findings)
         
         # Analyze and rank findings
         findings = await self._analyze_and_rank_findings(findings, topic)
@@ -904,6 +942,17 @@ class DeepResearchAgent:
             "implications": ["Strategic implications"]
         }]
     
+    def _finding_from_dict(self, data: Dict[str, Any]) -> ResearchFinding:
+        """Rebuild a ResearchFinding from its checkpointed form"""
+        data = dict(data)
+        for field_name in ("publish_date", "discovered_at"):
+            if isinstance(data.get(field_name), str):
+                try:
+                    data[field_name] = datetime.fromisoformat(data[field_name])
+                except ValueError:
+                    data[field_name] = datetime.utcnow()
+        return ResearchFinding(**data)
+    
     def _create_research_finding(self, data: Dict[str, Any], topic: ResearchTopic) -> Optional[ResearchFinding]:
         """Create ResearchFinding from parsed data"""
         try:
@@ -1024,5 +1073,5 @@ class DeepResearchAgent:
             logger.error(f"Failed to get recent intelligence: {e}")
             return None
 
-# Global instance
-deep_research_agent = DeepResearchAgent()
\ No newline at end of file
+# Global instance (built on first use)
+deep_research_agent = LazyProxy(DeepResearchAgent)
\ No newline at end of file
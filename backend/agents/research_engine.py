@@ -0,0 +1,192 @@
+"""
+Research Execution Engine
+
+Concurrency, caching and checkpointing support for the Deep Research Agent:
+- Per-provider rate limits (OpenAI, web search, scraping)
+- Search results cached by (query, day) and deduplicated while in flight
+- Durable per-run checkpoints so a crashed weekly run resumes where it stopped
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from backend.core.config import get_settings
+from backend.services.rate_limit import AsyncRateLimiter
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _atomic_write_json(path: Path, data: Any):
+    """Write JSON to a temp file and rename it over the target"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, default=str)
+    os.replace(tmp_path, path)
+
+
+class SearchResultCache:
+    """
+    Day-scoped search result cache with in-flight deduplication
+
+    Identical queries issued by different topics in the same run share one
+    provider call; completed results are persisted per (query, day) so later
+    runs on the same day skip the provider entirely.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._memory: Dict[str, List[Dict[str, Any]]] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def _key(self, query: str, day: str) -> str:
+        digest = hashlib.sha1(self.normalize_query(query).encode()).hexdigest()
+        return f"{day}_{digest}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        if key in self._memory:
+            return self._memory[key]
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                results = json.load(f)
+            self._memory[key] = results
+            return results
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable search cache entry {path.name}: {e}")
+            return None
+
+    async def get_or_fetch(
+        self,
+        query: str,
+        fetch: Callable[[str], Awaitable[List[Dict[str, Any]]]],
+        day: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return cached results for the query, fetching once if absent"""
+        day = day or datetime.utcnow().strftime('%Y%m%d')
+        key = self._key(query, day)
+
+        cached = self._load(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.hits += 1
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The leading fetch was cancelled, not this caller; fetch for ourselves
+                return await self.get_or_fetch(query, fetch, day)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            results = await fetch(query)
+            # Empty results usually mean a provider error; don't pin them for the day
+            if results:
+                self._memory[key] = results
+                _atomic_write_json(self._path(key), results)
+            future.set_result(results)
+            return results
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters receive the exception; mark it retrieved so it is not logged twice
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+            if not future.done():
+                # Leader cancelled: release waiters instead of leaving them waiting forever
+                future.cancel()
+
+
+class ResearchRunCheckpoint:
+    """
+    Durable record of topics already researched in a weekly run
+
+    Findings are written per topic as soon as the topic finishes, so if the
+    process dies the next run for the same industry and day reuses them.
+    """
+
+    def __init__(self, runs_dir: Path, industry: str, run_date: datetime):
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        safe_industry = "".join(c if c.isalnum() or c in "-_" else "_" for c in industry)
+        self.path = runs_dir / f"{safe_industry}_{run_date.strftime('%Y%m%d')}.json"
+        self._topics: Dict[str, List[Dict[str, Any]]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self._topics = json.load(f).get("topics", {})
+                logger.info(f"Resuming research run from {self.path.name} ({len(self._topics)} topics done)")
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable research checkpoint {self.path.name}: {e}")
+
+    def completed_topics(self) -> Dict[str, List[Dict[str, Any]]]:
+        return dict(self._topics)
+
+    def record_topic(self, topic_name: str, findings: List[Any]):
+        """Persist one topic's findings (dataclass instances or dicts)"""
+        self._topics[topic_name] = [
+            asdict(finding) if not isinstance(finding, dict) else finding
+            for finding in findings
+        ]
+        _atomic_write_json(self.path, {
+            "updated_at": datetime.utcnow().isoformat(),
+            "topics": self._topics
+        })
+
+    def clear(self):
+        """Remove the checkpoint once the run has been fully stored"""
+        self._topics = {}
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ResearchExecutionEngine:
+    """Shared limits and caches used by one Deep Research Agent"""
+
+    def __init__(self, cache_root: Path):
+        self.limiters = {
+            "openai": AsyncRateLimiter(settings.research_openai_concurrency, settings.research_openai_rpm),
+            "search": AsyncRateLimiter(settings.research_search_concurrency, settings.research_search_rpm),
+            "scrape": AsyncRateLimiter(settings.research_scrape_concurrency, 0),
+        }
+        self.topic_limiter = AsyncRateLimiter(settings.research_max_concurrent_topics, 0)
+        self.search_cache = SearchResultCache(cache_root / "search")
+        self.runs_path = cache_root / "runs"
+
+    def limiter(self, provider: str) -> AsyncRateLimiter:
+        return self.limiters[provider]
+
+    async def call(self, provider: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking provider call in a worker thread under that provider's limit"""
+        async with self.limiters[provider].slot():
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    def checkpoint(self, industry: str, run_date: datetime) -> ResearchRunCheckpoint:
+        return ResearchRunCheckpoint(self.runs_path, industry, run_date)
@@ -6,6 +6,7 @@ import json
 import logging
 from typing import Dict, List, Any
 from backend.core.config import get_settings
+from backend.core.lazy import LazyProxy
 from backend.core.openai_utils import get_openai_completion_params
 
 settings = get_settings()
@@ -546,8 +547,8 @@ class FAISSMemoryTool:
                 })
             return results
 
-# Initialize tools
-web_scraper = WebScrapingTool()
-twitter_tool = TwitterTool()
-openai_tool = OpenAITool()
-memory_tool = FAISSMemoryTool()
\ No newline at end of file
+# Initialize tools (clients and the FAISS index are built on first use)
+web_scraper = LazyProxy(WebScrapingTool)
+twitter_tool = LazyProxy(TwitterTool)
+openai_tool = LazyProxy(OpenAITool)
+memory_tool = LazyProxy(FAISSMemoryTool)
\ No newline at end of file
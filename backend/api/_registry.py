@@ -1,69 +1,67 @@
 """
 Centralized router registry for all API endpoints
+
+Routers are listed in a manifest instead of being imported here, so the app can
+register them lazily (see ``backend.core.lazy_routers``): each router module is
+imported on the first request under one of its path prefixes, or by the
+background warm-up after startup. Manifest order is registration order, and so
+route-matching priority, exactly as when every router was included eagerly.
 """
-from . import (
-    auth_open,  # New open SaaS authentication
-    auth_fastapi_users,
-    admin,
-    two_factor,
-    user_credentials,
-    user_settings,  # User preferences and configuration
-    ai_suggestions,  # AI contextual suggestions
-    content,
-    goals,
-    memory,
-    workflow_v2,
-    monitoring,
-    diagnostics,
-    content_history,
-    notifications,
-    vector_search,
-    vector_search_production,
-    similarity,
-    deep_research,
-    integration_services,
-    feature_flags,
-    autonomous,
-    performance_monitoring,
-    social_platforms,
-    social_inbox,  # Phase 3A social inbox for managing interactions
-    organizations,
-    system_logs,  # System logging and error tracking
-    database_health,  # Database schema health checks
-    partner_oauth,  # Partner OAuth for multi-tenant connections
-    assistant_chat,  # OpenAI Assistant chat for landing page
-)
+import importlib
+from typing import NamedTuple, Tuple
+
+
+class RouterSpec(NamedTuple):
+    """A router module and the path prefixes that need it loaded"""
+    module: str
+    paths: Tuple[str, ...]
+
 
 # All routers to be registered with the FastAPI app
-ROUTERS = [
-    auth_fastapi_users.router,  # FastAPI Users authentication (primary)
-    auth_open.router,  # Open SaaS authentication (no registration keys)
-    two_factor.router,  # Two-Factor Authentication endpoints
-    admin.router,  # Admin authentication and management system
-    user_credentials.router,  # User social media credentials management
-    user_settings.router,  # User preferences and configuration
-    ai_suggestions.router,  # AI contextual suggestions
-    content.router,
-    goals.router,
-    memory.router,
-    workflow_v2.router,
-    monitoring.router,
-    diagnostics.router,
-    content_history.router,
-    notifications.router,
-    vector_search_production.router,  # Production pgvector search (primary)
-    vector_search.router,  # Legacy vector search (will be phased out)
-    similarity.router,
-    deep_research.router,
-    integration_services.router,
-    feature_flags.router,
-    autonomous.router,
-    # performance_monitoring.router,  # Middleware only - no router
-    social_platforms.router,  # Social media platform connections and posting
-    social_inbox.router,  # Phase 3A social inbox for managing interactions
-    organizations.router,  # Multi-tenant organization management
-    system_logs.router,  # System logging and error tracking endpoints
-    database_health.router,  # Database schema health monitoring
-    partner_oauth.router,  # Partner OAuth for multi-tenant connections
-    assistant_chat.router,  # OpenAI Assistant chat for landing page
-]
\ No newline at end of file
+ROUTER_MANIFEST = [
+    RouterSpec("auth_fastapi_users", ("/api/auth-legacy",)),  # FastAPI Users authentication (primary)
+    RouterSpec("auth_open", ("/api/auth",)),  # Open SaaS authentication (no registration keys)
+    RouterSpec("two_factor", ("/api/2fa",)),  # Two-Factor Authentication endpoints
+    RouterSpec("admin", ("/api/admin",)),  # Admin authentication and management system
+    RouterSpec("user_credentials", ("/api/credentials",)),  # User social media credentials management
+    RouterSpec("user_settings", ("/api/user-settings",)),  # User preferences and configuration
+    RouterSpec("ai_suggestions", ("/api/ai",)),  # AI contextual suggestions
+    RouterSpec("content", ("/api/content",)),
+    RouterSpec("goals", ("/api/goals",)),
+    RouterSpec("memory", ("/api/memory",)),
+    RouterSpec("workflow_v2", ("/api/workflow",)),
+    RouterSpec("monitoring", ("/api/monitoring",)),
+    RouterSpec("diagnostics", ("/api/diagnostics",)),
+    RouterSpec("content_history", ("/api/content",)),
+    RouterSpec("notifications", ("/api/notifications",)),
+    RouterSpec("vector_search_production", ("/api/vector-search",)),  # Production pgvector search (primary)
+    RouterSpec("vector_search", ("/api/vector",)),  # Legacy vector search (will be phased out)
+    RouterSpec("similarity", ("/api/similarity",)),
+    RouterSpec("deep_research", ("/api/v1/deep-research",)),
+    RouterSpec("integration_services", ("/api/integrations",)),
+    RouterSpec("feature_flags", ("/api/feature-flags",)),
+    RouterSpec("autonomous", ("/api/autonomous",)),
+    # performance_monitoring: middleware only - no router
+    RouterSpec("social_platforms", ("/api/social",)),  # Social media platform connections and posting
+    RouterSpec("social_inbox", ("/api/inbox",)),  # Phase 3A social inbox for managing interactions
+    RouterSpec("organizations", ("/api/organizations",)),  # Multi-tenant organization management
+    RouterSpec("system_logs", ("/api/system",)),  # System logging and error tracking endpoints
+    RouterSpec("database_health", ("/api/database",)),  # Database schema health monitoring
+    RouterSpec("partner_oauth", ("/api/oauth",)),  # Partner OAuth for multi-tenant connections
+    RouterSpec("assistant_chat", ("/api/chat",)),  # OpenAI Assistant chat for landing page
+]
+
+
+def load_router(spec: RouterSpec):
+    """Import a manifest entry's module and return its router"""
+    # ORM models first: auth_fastapi_users declares its own (extend_existing)
+    # "users" table, which must come after backend.db.models defines it
+    importlib.import_module("backend.db.models")
+    return importlib.import_module(f"{__package__}.{spec.module}").router
+
+
+def __getattr__(name):
+    # Eager list kept for callers that include every router up front
+    if name == "ROUTERS":
+        return [load_router(spec) for spec in ROUTER_MANIFEST]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,9 +10,10 @@ from datetime import datetime, date, timezone, timedelta
 import uuid
 import json
 
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
 from backend.db.models import ContentLog, ContentItem, User, SocialConnection, ContentDraft
 from backend.auth.dependencies import get_current_active_user
+from backend.core.response_cache import response_cache
 from backend.services.cache_decorators import cached, cache_invalidate
 from backend.agents.tools import openai_tool
 from backend.services.image_generation_service import image_generation_service
@@ -601,9 +602,10 @@ async def get_upcoming_content(
     )
 
 @router.get("/analytics/summary", response_model=ContentAnalytics)
+@response_cache.cached("content.analytics_summary", scope=lambda kwargs: kwargs["current_user"].id)
 async def get_content_analytics(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     days: int = Query(30, ge=1, le=365)
 ):
     """Get content analytics summary"""
@@ -3,14 +3,18 @@ Content History API Endpoints
 Provides comprehensive content history retrieval and analytics functionality
 """
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func, text
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import and_, or_, desc, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
 import logging
 
-from backend.db.database import get_db
+from backend.core.response_cache import response_cache
+from backend.core.serialization import FastJSONResponse, RowEncoder
+from backend.db.async_database import get_async_db
+from backend.db.database import get_db, get_read_db
 from backend.db.models import ContentItem, ContentPerformanceSnapshot, ContentCategory, User
 from backend.services.performance_tracking import performance_tracker
 from backend.services.content_categorization import content_categorizer
@@ -67,6 +71,10 @@ class ContentHistoryItem(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
 
+
+# ContentItem rows encoded in the shape of ContentHistoryItem, without a model per row
+history_item_encoder = RowEncoder(ContentHistoryItem)
+
 class ContentHistoryResponse(BaseModel):
     """Paginated content history response"""
     items: List[ContentHistoryItem]
@@ -113,14 +121,14 @@ async def get_content_history(
     search_text: Optional[str] = Query(None, description="Search in content text"),
     sort_by: str = Query("created_at", description="Sort field"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get paginated content history with filtering and search capabilities
     """
     try:
         # Build base query
-        query = db.query(ContentItem).filter(ContentItem.user_id == user_id)
+        query = select(ContentItem).filter(ContentItem.user_id == user_id)
         
         # Apply filters
         if platforms:
@@ -180,54 +188,29 @@ async def get_content_history(
                 query = query.order_by(ContentItem.created_at)
         
         # Get total count
-        total_count = query.count()
+        total_count = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
         
-        # Apply pagination
+        # Apply pagination, loading only the columns the response needs
         offset = (page - 1) * page_size
-        items = query.offset(offset).limit(page_size).all()
-        
-        # Convert to response models
-        content_items = []
-        for item in items:
-            content_items.append(ContentHistoryItem(
-                id=item.id,
-                content=item.content,
-                platform=item.platform,
-                content_type=item.content_type,
-                status=item.status,
-                published_at=item.published_at,
-                scheduled_for=item.scheduled_for,
-                likes_count=item.likes_count or 0,
-                shares_count=item.shares_count or 0,
-                comments_count=item.comments_count or 0,
-                reach_count=item.reach_count or 0,
-                engagement_rate=item.engagement_rate or 0.0,
-                performance_tier=item.performance_tier or "unknown",
-                viral_score=item.viral_score or 0.0,
-                topic_category=item.topic_category,
-                sentiment=item.sentiment,
-                tone=item.tone,
-                hashtags=item.hashtags or [],
-                keywords=item.keywords or [],
-                ai_generated=item.ai_generated or False,
-                created_at=item.created_at,
-                updated_at=item.updated_at
-            ))
+        items = (await db.scalars(query.options(
+            load_only(*[getattr(ContentItem, name) for name in history_item_encoder.fields])
+        ).offset(offset).limit(page_size))).all()
         
         # Calculate pagination info
         total_pages = (total_count + page_size - 1) // page_size
         has_next = page < total_pages
         has_previous = page > 1
         
-        return ContentHistoryResponse(
-            items=content_items,
-            total_count=total_count,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages,
-            has_next=has_next,
-            has_previous=has_previous
-        )
+        # Rows are encoded straight to JSON (same shape as ContentHistoryResponse)
+        return FastJSONResponse({
+            "items": history_item_encoder.encode_rows(items),
+            "total_count": total_count,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "has_next": has_next,
+            "has_previous": has_previous
+        })
         
     except Exception as e:
         logger.error(f"Error retrieving content history: {e}")
@@ -309,10 +292,11 @@ async def get_content_analytics(
         raise HTTPException(status_code=500, detail=f"Failed to get analytics: {str(e)}")
 
 @router.get("/analytics/summary", response_model=ContentAnalytics)
+@response_cache.cached("content_history.analytics_summary", scope="user_id")
 async def get_content_analytics_summary(
     user_id: int = Query(..., description="User ID"),
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get comprehensive content analytics summary for a user
@@ -469,7 +453,7 @@ async def search_similar_content(
     limit: int = Query(10, ge=1, le=50, description="Maximum results to return"),
     threshold: float = Query(0.7, ge=0.0, le=1.0, description="Similarity threshold"),
     platforms: Optional[str] = Query(None, description="Comma-separated platforms to search"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Find similar content using semantic search
@@ -536,7 +520,7 @@ async def export_content_history(
     date_from: Optional[datetime] = Query(None, description="Start date filter"),
     date_to: Optional[datetime] = Query(None, description="End date filter"),
     platforms: Optional[str] = Query(None, description="Comma-separated platforms"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Export content history in various formats
@@ -712,10 +696,11 @@ async def delete_content_item(
 # Additional utility endpoints
 
 @router.get("/statistics/performance")
+@response_cache.cached("content_history.performance_statistics", scope="user_id")
 async def get_performance_statistics(
     user_id: int = Query(..., description="User ID"),
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get detailed performance statistics and trends
@@ -7,7 +7,7 @@ for improved user experience and perceived performance.
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 import json
 import asyncio
 
@@ -25,6 +25,14 @@ class StreamingImageRequest(BaseModel):
     content_context: Optional[str] = Field(None, max_length=2000)
     industry_context: Optional[str] = Field(None, max_length=1000)
 
+class StreamingBatchRequest(BaseModel):
+    content_text: str = Field(..., min_length=1, max_length=5000)
+    platforms: List[str] = Field(..., min_length=1, max_length=5)
+    image_count: int = Field(1, ge=1, le=5)
+    quality_preset: str = Field("standard", pattern="^(draft|standard|premium|story|banner)$")
+    industry_context: Optional[str] = Field(None, max_length=1000)
+    share_master_image: bool = True
+
 @router.post("/stream")
 async def stream_image_generation(
     request: StreamingImageRequest,
@@ -75,6 +83,57 @@ async def stream_image_generation(
         }
     )
 
+@router.post("/stream-batch")
+async def stream_batch_image_generation(
+    request: StreamingBatchRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Generate images for several platforms concurrently, streaming each one as it completes.
+    
+    Returns Server-Sent Events (SSE) stream with one event per finished image.
+    """
+    valid_platforms = {"twitter", "linkedin", "instagram", "facebook", "tiktok"}
+    invalid_platforms = set(request.platforms) - valid_platforms
+    if invalid_platforms:
+        raise HTTPException(status_code=400, detail=f"Invalid platforms: {sorted(invalid_platforms)}")
+    
+    async def generate_stream():
+        """Generator function for streaming batch results"""
+        total = len(request.platforms) * request.image_count
+        try:
+            yield f"data: {json.dumps({'status': 'started', 'platforms': request.platforms, 'total': total})}\n\n"
+            
+            async for event in image_generation_service.stream_content_images(
+                content_text=request.content_text,
+                platforms=request.platforms,
+                image_count=request.image_count,
+                industry_context=request.industry_context,
+                quality_preset=request.quality_preset,
+                share_master_image=request.share_master_image
+            ):
+                yield f"data: {json.dumps(event)}\n\n"
+                
+        except Exception as e:
+            error_event = {
+                "status": "error",
+                "error": str(e)
+            }
+            yield f"data: {json.dumps(error_event)}\n\n"
+        
+        # Send completion event
+        yield f"data: {json.dumps({'status': 'stream_ended'})}\n\n"
+    
+    return StreamingResponse(
+        generate_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering
+        }
+    )
+
 @router.get("/stream-status")
 async def get_streaming_status(
     current_user: User = Depends(get_current_active_user)
@@ -91,6 +150,7 @@ async def get_streaming_status(
             "Real-time partial image streaming",
             "Platform-specific optimization",
             "Multiple quality presets",
-            "Content context awareness"
+            "Content context awareness",
+            "Concurrent multi-platform batch streaming"
         ]
     }
\ No newline at end of file
@@ -19,6 +19,7 @@ from backend.db.database_optimized import health_check as db_health, db_optimize
 from backend.services.redis_cache import redis_cache
 from backend.services.quota_management import quota_manager
 from backend.services.metrics_collection import metrics_collector
+from backend.services.schedule_dispatcher import get_schedule_dispatcher
 from backend.integrations.performance_optimizer import PerformanceOptimizer
 from backend.auth.dependencies import get_current_active_user
 from backend.db.models import User
@@ -335,7 +336,8 @@ async def get_system_metrics(current_user: User = Depends(get_current_active_use
             "database": db_optimizer.get_stats(),
             "cache": await redis_cache.get_cache_stats(),
             "quota": await quota_manager.get_quota_stats(),
-            "integrations": await system_monitor.get_integration_status()
+            "integrations": await system_monitor.get_integration_status(),
+            "scheduling": get_schedule_dispatcher().get_stats()
         }
         
         # Add to metrics history
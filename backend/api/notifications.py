@@ -3,18 +3,20 @@ Notifications API Endpoints with Real-time WebSocket Support
 Provides notification management, retrieval, and real-time delivery functionality
 """
 from fastapi import APIRouter, HTTPException, Depends, Query, WebSocket, WebSocketDisconnect
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, func, select
 from typing import List, Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 from datetime import datetime
 import logging
 import json
 
+from backend.db.async_database import get_async_db
 from backend.db.database import get_db
 from backend.core.datetime_utils import utc_now_iso
 from backend.db.models import Notification, User
-from backend.auth.dependencies import get_current_active_user
+from backend.auth.dependencies import get_current_active_user, get_current_active_user_async
 from backend.services.notification_service import (
     notification_service, 
     websocket_manager, 
@@ -39,7 +41,8 @@ class NotificationResponse(BaseModel):
     is_dismissed: bool
     action_url: Optional[str]
     action_label: Optional[str]
-    metadata: dict
+    # Stored as ``notification_metadata``: ``metadata`` is the declarative MetaData on ORM rows
+    metadata: dict = Field(default_factory=dict, validation_alias=AliasChoices("notification_metadata", "metadata"))
     created_at: datetime
     read_at: Optional[datetime] = None
     
@@ -214,8 +217,8 @@ async def broadcast_system_notification(
 
 @router.get("/", response_model=List[NotificationResponse])
 async def get_user_notifications(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db),
     unread_only: bool = Query(False, description="Show only unread notifications"),
     notification_type: Optional[str] = Query(None, description="Filter by notification type"),
     priority: Optional[str] = Query(None, description="Filter by priority (high, medium, low)"),
@@ -225,7 +228,7 @@ async def get_user_notifications(
     """Get user's notifications with optional filtering"""
     
     try:
-        query = db.query(Notification).filter(Notification.user_id == current_user.id)
+        query = select(Notification).filter(Notification.user_id == current_user.id)
         
         # Apply filters
         if unread_only:
@@ -241,7 +244,7 @@ async def get_user_notifications(
         query = query.order_by(desc(Notification.created_at))
         
         # Apply pagination
-        notifications = query.offset(offset).limit(limit).all()
+        notifications = (await db.scalars(query.offset(offset).limit(limit))).all()
         
         logger.info(f"Retrieved {len(notifications)} notifications for user {current_user.id}")
         return notifications
@@ -252,38 +255,30 @@ async def get_user_notifications(
 
 @router.get("/summary", response_model=NotificationSummary)
 async def get_notifications_summary(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get summary of user's notifications"""
     
     try:
-        # Get all notifications count
-        total_count = db.query(Notification).filter(
-            Notification.user_id == current_user.id
-        ).count()
-        
-        # Get unread count
-        unread_count = db.query(Notification).filter(
-            and_(
-                Notification.user_id == current_user.id,
-                Notification.is_read.is_(False)
-            )
-        ).count()
-        
-        # Get high priority unread count
-        high_priority_count = db.query(Notification).filter(
-            and_(
-                Notification.user_id == current_user.id,
-                Notification.is_read.is_(False),
-                Notification.priority == "high"
-            )
-        ).count()
+        # Get total, unread and high priority unread counts in one pass
+        total_count, unread_count, high_priority_count = (await db.execute(
+            select(
+                func.count(),
+                func.count().filter(Notification.is_read.is_(False)),
+                func.count().filter(
+                    and_(
+                        Notification.is_read.is_(False),
+                        Notification.priority == "high"
+                    )
+                )
+            ).where(Notification.user_id == current_user.id)
+        )).one()
         
         # Get recent notifications (last 5)
-        recent_notifications = db.query(Notification).filter(
+        recent_notifications = (await db.scalars(select(Notification).filter(
             Notification.user_id == current_user.id
-        ).order_by(desc(Notification.created_at)).limit(5).all()
+        ).order_by(desc(Notification.created_at)).limit(5))).all()
         
         return NotificationSummary(
             total_notifications=total_count,
@@ -822,22 +822,15 @@ async def connect_meta_account(
             try:
                 webhook_service = get_meta_webhook_service()
                 
-                # Subscribe Facebook Page to webhooks
-                page_webhook_success = await webhook_service.subscribe_page_webhooks(
-                    request.page_id, 
-                    page_access_token
+                # Subscribe Facebook Page (and Instagram if present) in one batch request
+                subscription = await webhook_service.subscribe_connection_webhooks(
+                    request.page_id,
+                    page_access_token,
+                    instagram_id
                 )
                 
-                # Subscribe Instagram if present
-                instagram_webhook_success = True  # Default to success if no Instagram
-                if instagram_id:
-                    instagram_webhook_success = await webhook_service.subscribe_instagram_webhooks(
-                        instagram_id,
-                        page_access_token
-                    )
-                
                 # Overall webhook subscription success
-                webhook_subscription_success = page_webhook_success and instagram_webhook_success
+                webhook_subscription_success = subscription["page"] and subscription["instagram"]
                 
                 # Update connection webhook status
                 if webhook_subscription_success:
@@ -10,15 +10,19 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field, ConfigDict
 
+from backend.core.serialization import FastJSONResponse, RowEncoder
+from backend.db.async_database import get_async_db
 from backend.db.database import get_db
 from backend.db.models import (
     SocialInteraction, InteractionResponse, ResponseTemplate, 
     CompanyKnowledge, User, SocialPlatformConnection
 )
-from backend.auth.dependencies import get_current_active_user
+from backend.auth.dependencies import get_current_active_user, get_current_active_user_async
 from backend.services.social_webhook_service import get_webhook_service
 from backend.services.personality_response_engine import get_personality_engine
 from backend.services.websocket_manager import websocket_service
@@ -45,6 +49,10 @@ class InteractionResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+
+# SocialInteraction rows encoded in the shape of InteractionResponse, without a model per row
+interaction_encoder = RowEncoder(InteractionResponse)
+
 class InteractionListResponse(BaseModel):
     interactions: List[InteractionResponse]
     total_count: int
@@ -92,13 +100,13 @@ async def get_interactions(
     intent: Optional[str] = Query(None, pattern="^(question|complaint|praise|lead|spam|general)$"),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get filtered list of social media interactions"""
     try:
         # Build query with filters
-        query = db.query(SocialInteraction).filter(
+        query = select(SocialInteraction).filter(
             SocialInteraction.user_id == current_user.id
         )
         
@@ -112,32 +120,33 @@ async def get_interactions(
             query = query.filter(SocialInteraction.intent == intent)
         
         # Get total count before pagination
-        total_count = query.count()
+        total_count = await db.scalar(select(func.count()).select_from(query.subquery()))
         
         # Get paginated results
-        interactions = query.order_by(
+        interactions = (await db.scalars(query.order_by(
             SocialInteraction.priority_score.desc(),
             SocialInteraction.received_at.desc()
-        ).offset(offset).limit(limit).all()
-        
-        # Get summary counts
-        unread_count = db.query(SocialInteraction).filter(
-            SocialInteraction.user_id == current_user.id,
-            SocialInteraction.status == 'unread'
-        ).count()
-        
-        high_priority_count = db.query(SocialInteraction).filter(
-            SocialInteraction.user_id == current_user.id,
-            SocialInteraction.priority_score >= 70,
-            SocialInteraction.status.in_(['unread', 'read'])
-        ).count()
-        
-        return InteractionListResponse(
-            interactions=interactions,
-            total_count=total_count,
-            unread_count=unread_count,
-            high_priority_count=high_priority_count
-        )
+        ).offset(offset).limit(limit))).all()
+        
+        # Get summary counts in one pass
+        summary = (await db.execute(
+            select(
+                func.count().filter(SocialInteraction.status == 'unread'),
+                func.count().filter(
+                    SocialInteraction.priority_score >= 70,
+                    SocialInteraction.status.in_(['unread', 'read'])
+                )
+            ).where(SocialInteraction.user_id == current_user.id)
+        )).one()
+        unread_count, high_priority_count = summary
+        
+        # Rows are encoded straight to JSON (same shape as InteractionListResponse)
+        return FastJSONResponse({
+            "interactions": interaction_encoder.encode_rows(interactions),
+            "total_count": total_count,
+            "unread_count": unread_count,
+            "high_priority_count": high_priority_count
+        })
         
     except Exception as e:
         logger.error(f"Failed to get interactions: {e}")
@@ -4,12 +4,16 @@ Authentication dependencies for FastAPI routes
 from typing import Optional, Dict, Any
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from backend.db.async_database import get_async_db
 from backend.db.database import get_db
 from backend.db.models import User
 from backend.auth.auth0 import auth0_verifier
 from backend.auth.jwt_handler import JWTHandler
+from backend.auth.principal_cache import Principal, principal_cache
 
 # Security scheme
 security = HTTPBearer()
@@ -41,11 +45,8 @@ async def verify_local_token(token: str = Depends(get_token)) -> Dict[str, Any]:
     """Verify locally issued JWT token"""
     return jwt_handler.verify_token(token)
 
-async def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(get_token)
-) -> AuthUser:
-    """Get current authenticated user (supports both Auth0 and local JWT)"""
+def _decode_token(token: str) -> AuthUser:
+    """Authenticated user for a local JWT or, when configured, an Auth0 token"""
     
     # Try local JWT first (primary authentication method)
     try:
@@ -65,9 +66,6 @@ async def get_current_user(
                 email = payload.get("email")
                 username = payload.get("nickname") or payload.get("preferred_username") or email
                 
-                # Ensure user exists in local database
-                await sync_auth0_user(db, user_id, email, username)
-                
                 return AuthUser(user_id=user_id, email=email, username=username, auth_method="auth0")
             else:
                 # Auth0 not configured, skip fallback
@@ -84,8 +82,31 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-async def sync_auth0_user(db: Session, auth0_id: str, email: str, username: str) -> User:
-    """Sync Auth0 user with local database"""
+def _needs_local_user(current_user: AuthUser) -> bool:
+    """Auth0 users must exist in the local database (a cached principal means they do)"""
+    return current_user.auth_method == "auth0" and principal_cache.get(current_user.email) is None
+
+async def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(get_token)
+) -> AuthUser:
+    """Get current authenticated user (supports both Auth0 and local JWT)"""
+    current_user = _decode_token(token)
+    if _needs_local_user(current_user):
+        await sync_auth0_user(db, current_user.user_id, current_user.email, current_user.username)
+    return current_user
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(get_token)
+) -> AuthUser:
+    """``get_current_user`` for handlers on the async database session"""
+    current_user = _decode_token(token)
+    if _needs_local_user(current_user):
+        await db.run_sync(_ensure_local_user, current_user.email, current_user.username)
+    return current_user
+
+def _ensure_local_user(db: Session, email: str, username: str) -> User:
     # Check if user exists
     user = db.query(User).filter_by(email=email).first()
     
@@ -104,13 +125,11 @@ async def sync_auth0_user(db: Session, auth0_id: str, email: str, username: str)
     
     return user
 
-async def get_current_active_user(
-    current_user: AuthUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current active user from database"""
-    user = db.query(User).filter_by(email=current_user.email).first()
-    
+async def sync_auth0_user(db: Session, auth0_id: str, email: str, username: str) -> User:
+    """Sync Auth0 user with local database"""
+    return _ensure_local_user(db, email, username)
+
+def _check_active(user: Optional[User]) -> User:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -123,8 +142,34 @@ async def get_current_active_user(
             detail="User account is inactive"
         )
     
+    if isinstance(user, User):
+        principal_cache.set(Principal.from_user(user))
     return user
 
+async def get_current_active_user(
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current active user, from the principal cache when possible"""
+    principal = principal_cache.get(current_user.email)
+    if principal is not None:
+        return principal.attach(db)
+    
+    return _check_active(db.query(User).filter_by(email=current_user.email).first())
+
+async def get_current_active_user_async(
+    current_user: AuthUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """``get_current_active_user`` for handlers on the async database session"""
+    principal = principal_cache.get(current_user.email)
+    if principal is not None:
+        # Attaching issues no SQL, so the sync facade can be used directly
+        return principal.attach(db.sync_session)
+    
+    result = await db.execute(select(User).filter_by(email=current_user.email))
+    return _check_active(result.scalars().first())
+
 async def get_admin_user(
     current_user: User = Depends(get_current_active_user)
 ) -> User:
@@ -0,0 +1,256 @@
+"""
+Short-TTL cache of authenticated principals for get_current_active_user
+
+Every authenticated request used to load its ``User`` row by email. The cache
+keeps the non-secret user fields as an immutable ``Principal`` in two tiers:
+- an in-process LRU (``local_ttl`` seconds, checked first)
+- Redis (``redis_ttl`` seconds, shared by workers)
+
+On a hit the principal is attached to the request's session as a detached
+``User`` without a SELECT. Columns the principal does not carry (password hash,
+2FA secrets, timestamps) stay expired and load on first access, and changes
+made by endpoints are flushed as usual.
+
+Only active users are cached. Committed updates or deletes of a ``User``
+invalidate its entries (ORM events below); other processes drop their local
+copy within ``local_ttl``.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from backend.db.models import User
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "principal_cache_invalidate"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Non-secret fields of an active user, enough to rebuild a detached ``User``"""
+    id: int
+    email: str
+    username: str
+    full_name: Optional[str]
+    tier: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    is_verified: bool
+    auth_provider: Optional[str]
+    default_organization_id: Optional[str]
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(**{field.name: getattr(user, field.name) for field in fields(cls)})
+
+    def attach(self, db: Session) -> User:
+        """``User`` for this principal, persistent in ``db``, without querying"""
+        existing = db.identity_map.get(identity_key(User, self.id))
+        if existing is not None:
+            return existing
+
+        user = User(**asdict(self))
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
+
+class PrincipalCache:
+    """Two-tier (local LRU + Redis) principal cache keyed by the token's email claim"""
+
+    def __init__(
+        self,
+        redis_client=None,
+        redis_url: Optional[str] = None,
+        max_size: int = 10000,
+        local_ttl: float = 5.0,
+        redis_ttl: int = 60,
+        retry_interval: float = 30.0,
+        key_prefix: str = "auth:principal:"
+    ):
+        self.max_size = max_size
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.retry_interval = retry_interval
+        self.key_prefix = key_prefix
+        self.redis_url = redis_url
+
+        self._redis = redis_client
+        self._redis_retry_at = 0.0
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0, "redis_errors": 0}
+
+    @classmethod
+    def from_settings(cls) -> "PrincipalCache":
+        from backend.core.config import get_settings
+
+        settings = get_settings()
+        return cls(
+            redis_url=settings.redis_url if settings.auth_principal_redis_ttl_s > 0 else None,
+            max_size=settings.auth_principal_cache_size,
+            local_ttl=settings.auth_principal_local_ttl_s,
+            redis_ttl=settings.auth_principal_redis_ttl_s
+        )
+
+    def get(self, email: str) -> Optional[Principal]:
+        """Cached principal for ``email``, or None"""
+        if not email:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(email)
+            if entry is not None:
+                principal, expires_at = entry
+                if expires_at > now:
+                    self._local.move_to_end(email)
+                    self._stats["local_hits"] += 1
+                    return principal
+                del self._local[email]
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = client.get(self.key_prefix + email)
+            except Exception as e:
+                self._redis_failed(e)
+                raw = None
+            if raw:
+                principal = Principal(**json.loads(raw))
+                self._store_local(principal)
+                with self._lock:
+                    self._stats["redis_hits"] += 1
+                return principal
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, principal: Principal) -> None:
+        """Cache ``principal`` in both tiers (inactive users are never cached)"""
+        if not principal.is_active:
+            return
+
+        self._store_local(principal)
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.set(self.key_prefix + principal.email, json.dumps(asdict(principal)), ex=self.redis_ttl)
+            except Exception as e:
+                self._redis_failed(e)
+
+    def invalidate(self, *emails: str) -> None:
+        """Drop cached principals for ``emails`` from both tiers"""
+        emails = [email for email in emails if email]
+        if not emails:
+            return
+
+        with self._lock:
+            for email in emails:
+                self._local.pop(email, None)
+            self._stats["invalidations"] += len(emails)
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.delete(*[self.key_prefix + email for email in emails])
+            except Exception as e:
+                self._redis_failed(e)
+
+    def clear(self) -> None:
+        """Drop every local entry (Redis entries expire on their own)"""
+        with self._lock:
+            self._local.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["local_size"] = len(self._local)
+        stats["redis_enabled"] = self._redis is not None or bool(self.redis_url)
+        return stats
+
+    def _store_local(self, principal: Principal) -> None:
+        if self.local_ttl <= 0:
+            return
+        with self._lock:
+            self._local[principal.email] = (principal, time.monotonic() + self.local_ttl)
+            self._local.move_to_end(principal.email)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+    def _redis_client(self):
+        if self._redis is not None:
+            return self._redis if time.monotonic() >= self._redis_retry_at else None
+        if not self.redis_url or not REDIS_AVAILABLE or time.monotonic() < self._redis_retry_at:
+            return None
+
+        try:
+            self._redis = redis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5
+            )
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        # Serve from the local tier and database until the retry interval passes
+        logger.warning(f"Principal cache Redis tier unavailable for {self.retry_interval}s: {error}")
+        with self._lock:
+            self._stats["redis_errors"] += 1
+        self._redis_retry_at = time.monotonic() + self.retry_interval
+
+
+principal_cache = PrincipalCache.from_settings()
+
+
+def _queue_invalidation(session: Session, *emails: str) -> None:
+    session.info.setdefault(_PENDING_KEY, set()).update(email for email in emails if email)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User) -> None:
+    session = Session.object_session(target)
+    if session is None:
+        return
+    history = inspect(target).attrs.email.history
+    _queue_invalidation(session, target.email, *(history.deleted or ()))
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target: User) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        _queue_invalidation(session, target.email)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    # After commit, so a concurrent miss cannot re-cache the pre-update row
+    emails = session.info.pop(_PENDING_KEY, None)
+    if emails:
+        principal_cache.invalidate(*emails)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -16,6 +16,8 @@ import structlog
 from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from backend.core.audit_sink import AuditSink
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -125,24 +127,33 @@ class AuditLogger:
     
     Features:
     - Structured logging with JSON output
-    - Database persistence for audit trails
+    - Database persistence for audit trails (batched off the caller's thread by AuditSink)
     - GDPR/CCPA compliance tracking
     - Security event monitoring
     - Performance metrics
     - Automated compliance reporting
     """
     
-    def __init__(self, db_url: str = None):
+    def __init__(self, db_url: str = None, sink: Optional[AuditSink] = None):
         self.logger = structlog.get_logger("audit")
+        self.sink = sink
         
         if db_url:
             self.engine = create_engine(db_url)
             Base.metadata.create_all(bind=self.engine)
             Session = sessionmaker(bind=self.engine)
+            # Reporting queries only; writes go through the sink
             self.db_session = Session()
+            if self.sink is None:
+                self.sink = AuditSink.from_settings(self.engine, AuditLog.__table__)
         else:
             self.db_session = None
     
+    def close(self, timeout: float = 10.0) -> None:
+        """Drain queued audit rows to the database (call on shutdown)."""
+        if self.sink:
+            self.sink.close(timeout)
+    
     def log_event(
         self,
         event_type: Union[AuditEventType, str],
@@ -201,27 +212,21 @@ class AuditLogger:
         # Log to structured logger
         self.logger.info("audit_event", **audit_entry)
         
-        # Persist to database if available
-        if self.db_session:
-            try:
-                db_audit = AuditLog(
-                    timestamp=datetime.utcnow(),
-                    event_type=event_type,
-                    user_id=user_id,
-                    session_id=session_id,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    resource=resource,
-                    action=action,
-                    outcome=outcome,
-                    details=details,
-                    compliance_flags=audit_entry["compliance_flags"]
-                )
-                self.db_session.add(db_audit)
-                self.db_session.commit()
-            except Exception as e:
-                self.logger.error("Failed to persist audit log", error=str(e))
-                self.db_session.rollback()
+        # Queue for the background batch writer if persistence is configured
+        if self.sink:
+            self.sink.submit({
+                "timestamp": datetime.utcnow(),
+                "event_type": event_type,
+                "user_id": user_id,
+                "session_id": session_id,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "resource": resource,
+                "action": action,
+                "outcome": outcome,
+                "details": details,
+                "compliance_flags": audit_entry["compliance_flags"]
+            })
     
     def _requires_retention(self, event_type: str) -> bool:
         """Determine if event requires long-term retention."""
@@ -471,7 +476,11 @@ class ComplianceReporter:
 
 
 class AuditTrackingMiddleware:
-    """FastAPI middleware for automatic audit logging of requests."""
+    """
+    FastAPI middleware for automatic audit logging of requests.
+    
+    log_event only queues the row, so request latency excludes audit persistence.
+    """
     
     def __init__(self, app, audit_logger: AuditLogger):
         self.app = app
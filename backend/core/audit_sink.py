@@ -0,0 +1,302 @@
+"""
+Asynchronous, batched persistence for audit log entries.
+
+``AuditLogger.log_event`` hands rows to an ``AuditSink`` instead of writing
+them itself: rows go onto a bounded in-memory queue and a background writer
+thread flushes them with one multi-row INSERT per batch, when ``batch_size``
+rows are waiting or ``flush_interval`` seconds have passed. Callers (request
+handlers included) never wait on the database.
+
+When the queue is full the overflow policy applies:
+- ``spill``: append the row to a local JSONL file
+- ``sample``: spill one in ``sample_every`` routine rows and drop the rest;
+  retention-required and security-relevant rows are always spilled
+
+Batches the database rejects are spilled too. ``replay_spill`` loads a spill
+file back once the database is healthy, and ``close`` drains the queue on
+shutdown.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("spill", "sample")
+
+_STOP = object()
+
+
+class AuditSink:
+    """Bounded queue of audit rows drained by a background batch writer."""
+
+    def __init__(
+        self,
+        engine,
+        table,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow_policy: str = "spill",
+        sample_every: int = 10,
+        spill_path: str = "logs/audit_spill.jsonl"
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit overflow policy '{overflow_policy}'; expected one of {OVERFLOW_POLICIES}")
+
+        self.engine = engine
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.sample_every = max(1, sample_every)
+        self.spill_path = Path(spill_path)
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._closed = False
+        self._overflowed = 0
+
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "spilled": 0,
+            "dropped": 0,
+            "write_errors": 0,
+        }
+
+    @classmethod
+    def from_settings(cls, engine, table) -> "AuditSink":
+        """Sink configured from the ``audit_*`` settings."""
+        from backend.core.config import get_settings
+
+        settings = get_settings()
+        return cls(
+            engine,
+            table,
+            max_queue=settings.audit_queue_size,
+            batch_size=settings.audit_batch_size,
+            flush_interval=settings.audit_flush_interval_s,
+            overflow_policy=settings.audit_overflow_policy,
+            sample_every=settings.audit_overflow_sample_every,
+            spill_path=settings.audit_spill_path
+        )
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """
+        Queue a row for writing without blocking.
+
+        Returns:
+            True if queued, False if the overflow policy handled it
+        """
+        if self._closed:
+            self._overflow(row)
+            return False
+
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._overflow(row)
+            return False
+
+        with self._lock:
+            self._stats["enqueued"] += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every row queued so far has been written or spilled."""
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.unfinished_tasks == 0
+
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self._queue.unfinished_tasks == 0
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop accepting rows, write out the queue and stop the writer."""
+        self._closed = True
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("Audit sink queue still full at shutdown; unwritten rows left in memory")
+            return
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.error(f"Audit sink writer did not drain within {timeout}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus current queue depth."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        stats["overflow_policy"] = self.overflow_policy
+        return stats
+
+    def replay_spill(self, path: Optional[str] = None) -> int:
+        """
+        Write rows from a spill file to the database and remove the file.
+
+        If a write fails, the rows not yet written go back to the spill file
+        for the next replay and the error is raised.
+
+        Returns:
+            Number of rows written
+        """
+        spill_path = Path(path) if path else self.spill_path
+        if not spill_path.exists():
+            return 0
+
+        replaying = spill_path.with_suffix(spill_path.suffix + ".replaying")
+        with self._spill_lock:
+            spill_path.rename(replaying)
+
+        with replaying.open("r", encoding="utf-8") as handle:
+            lines = [line.rstrip("\n") + "\n" for line in handle if line.strip()]
+
+        written = 0
+        try:
+            rows = [_load_spilled_row(line) for line in lines]
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                self._insert(batch)
+                written += len(batch)
+        except Exception as e:
+            logger.error(f"Audit spill replay stopped after {written} of {len(lines)} rows: {e}")
+            with self._spill_lock:
+                with spill_path.open("a", encoding="utf-8") as handle:
+                    handle.writelines(lines[written:])
+            replaying.unlink()
+            raise
+
+        replaying.unlink()
+        logger.info(f"Replayed {len(rows)} spilled audit rows from {spill_path}")
+        return len(rows)
+
+    def _ensure_writer(self) -> None:
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            if self._pid is not None and self._pid != pid:
+                # Forked child: the parent's queue contents and writer thread are not ours
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name="audit-sink-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if item is _STOP:
+                    stopping = True
+                    self._queue.task_done()
+                else:
+                    batch.append(item)
+            except queue.Empty:
+                pass
+
+            if batch and (stopping or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch)
+                for _ in batch:
+                    self._queue.task_done()
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+        # Rows submitted while closing
+        remaining = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                remaining.append(item)
+            self._queue.task_done()
+        if remaining:
+            self._write(remaining)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self._insert(batch)
+            with self._lock:
+                self._stats["written"] += len(batch)
+                self._stats["batches"] += 1
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} audit rows, spilling to {self.spill_path}: {e}")
+            with self._lock:
+                self._stats["write_errors"] += 1
+            self._spill(batch)
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        # executemany; SQLAlchemy 2.0 sends it as multi-row INSERT ... VALUES batches
+        with self.engine.begin() as connection:
+            connection.execute(self.table.insert(), rows)
+
+    def _overflow(self, row: Dict[str, Any]) -> None:
+        if self.overflow_policy == "sample" and not _always_keep(row):
+            with self._lock:
+                self._overflowed += 1
+                keep = self._overflowed % self.sample_every == 1 or self.sample_every == 1
+                if not keep:
+                    self._stats["dropped"] += 1
+            if not keep:
+                return
+        self._spill([row])
+
+    def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            with self._spill_lock:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with self.spill_path.open("a", encoding="utf-8") as handle:
+                    for row in rows:
+                        handle.write(json.dumps(row, default=_json_default) + "\n")
+            with self._lock:
+                self._stats["spilled"] += len(rows)
+        except OSError as e:
+            logger.error(f"Failed to spill {len(rows)} audit rows to {self.spill_path}: {e}")
+            with self._lock:
+                self._stats["dropped"] += len(rows)
+
+
+def _always_keep(row: Dict[str, Any]) -> bool:
+    flags = row.get("compliance_flags") or {}
+    return bool(flags.get("retention_required") or flags.get("security_relevant"))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _load_spilled_row(line: str) -> Dict[str, Any]:
+    row = json.loads(line)
+    if row.get("timestamp"):
+        row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+    return row
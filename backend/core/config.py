@@ -142,6 +142,7 @@ class Settings(BaseSettings):
     redis_url: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
     celery_broker_url: str = ""  # Will default to redis_url if empty
     celery_result_backend: str = ""  # Will default to redis_url if empty
+    celery_worker_profile: str = Field(default="all", env="CELERY_WORKER_PROFILE")  # realtime | io | cpu | all
     
     # Open SaaS Configuration
     enable_registration: bool = Field(default=True, env="ENABLE_REGISTRATION")
@@ -223,11 +224,102 @@ class Settings(BaseSettings):
     x_publish_max_rps: int = Field(default=1, env="X_PUBLISH_MAX_RPS")
     cb_fail_threshold: int = Field(default=5, env="CB_FAIL_THRESHOLD")
     cb_cooldown_s: int = Field(default=120, env="CB_COOLDOWN_S")
+    publish_admission_lease_size: int = Field(default=0, env="PUBLISH_ADMISSION_LEASE_SIZE")  # 0 = no worker token leases
+    publish_admission_lease_ttl_s: float = Field(default=5.0, env="PUBLISH_ADMISSION_LEASE_TTL_S")
     
     # File Upload Configuration
     upload_dir: str = Field(default="uploads", env="UPLOAD_DIR")
     max_file_size: int = Field(default=10 * 1024 * 1024, env="MAX_FILE_SIZE")  # 10MB default
     allowed_image_types: str = Field(default="jpg,jpeg,png,gif,webp", env="ALLOWED_IMAGE_TYPES")
+
+    # Image Generation Batching (shared across all requests in a process)
+    image_gen_max_concurrency: int = Field(default=3, env="IMAGE_GEN_MAX_CONCURRENCY")
+    image_gen_requests_per_minute: int = Field(default=30, env="IMAGE_GEN_REQUESTS_PER_MINUTE")
+
+    # Deep Research Execution
+    research_max_concurrent_topics: int = Field(default=4, env="RESEARCH_MAX_CONCURRENT_TOPICS")
+    research_openai_concurrency: int = Field(default=4, env="RESEARCH_OPENAI_CONCURRENCY")
+    research_openai_rpm: int = Field(default=60, env="RESEARCH_OPENAI_RPM")
+    research_search_concurrency: int = Field(default=5, env="RESEARCH_SEARCH_CONCURRENCY")
+    research_search_rpm: int = Field(default=120, env="RESEARCH_SEARCH_RPM")
+    research_scrape_concurrency: int = Field(default=8, env="RESEARCH_SCRAPE_CONCURRENCY")
+
+    # Shared outbound HTTP transports (per platform host)
+    http_pool_max_connections: int = Field(default=20, env="HTTP_POOL_MAX_CONNECTIONS")
+    http_pool_max_keepalive: int = Field(default=10, env="HTTP_POOL_MAX_KEEPALIVE")
+    http_pool_keepalive_expiry: float = Field(default=30.0, env="HTTP_POOL_KEEPALIVE_EXPIRY")
+    http_pool_http2: bool = Field(default=True, env="HTTP_POOL_HTTP2")
+
+    # Meta Graph API batching (up to 50 sub-requests per POST /?batch=)
+    meta_graph_batch_size: int = Field(default=50, env="META_GRAPH_BATCH_SIZE")
+    meta_graph_batch_flush_interval: float = Field(default=0.05, env="META_GRAPH_BATCH_FLUSH_INTERVAL")
+    meta_graph_batch_max_retries: int = Field(default=2, env="META_GRAPH_BATCH_MAX_RETRIES")
+
+    # Scheduled post dispatch (Redis due index + Celery ETA hand-off)
+    schedule_dispatch_interval_s: float = Field(default=30.0, env="SCHEDULE_DISPATCH_INTERVAL_S")
+    schedule_dispatch_lookahead_s: float = Field(default=90.0, env="SCHEDULE_DISPATCH_LOOKAHEAD_S")
+    schedule_dispatch_batch_size: int = Field(default=500, env="SCHEDULE_DISPATCH_BATCH_SIZE")
+    schedule_dispatch_claim_ttl_s: int = Field(default=7 * 24 * 3600, env="SCHEDULE_DISPATCH_CLAIM_TTL_S")
+    schedule_dispatch_lag_samples: int = Field(default=1000, env="SCHEDULE_DISPATCH_LAG_SAMPLES")
+
+    # Publisher media pipeline (streamed downloads, chunked uploads, media id cache)
+    media_pipeline_max_concurrency: int = Field(default=4, env="MEDIA_PIPELINE_MAX_CONCURRENCY")
+    media_upload_chunk_size: int = Field(default=1024 * 1024, env="MEDIA_UPLOAD_CHUNK_SIZE")
+    media_spool_max_bytes: int = Field(default=1024 * 1024, env="MEDIA_SPOOL_MAX_BYTES")
+    media_max_bytes: int = Field(default=512 * 1024 * 1024, env="MEDIA_MAX_BYTES")
+    media_processing_timeout_s: float = Field(default=300.0, env="MEDIA_PROCESSING_TIMEOUT_S")  # platform-side video/GIF processing
+
+    # Campaign fan-out (bulk publish paced by each (org, platform) token bucket)
+    campaign_bucket_headroom: float = Field(default=0.9, env="CAMPAIGN_BUCKET_HEADROOM")  # share of the refill rate a campaign plans to use
+
+    # Audit log persistence (bounded queue drained by a background batch writer)
+    audit_database_url: str = Field(default="", env="AUDIT_DATABASE_URL")  # empty: audit events go to the structured log only
+    audit_queue_size: int = Field(default=10000, env="AUDIT_QUEUE_SIZE")
+    audit_batch_size: int = Field(default=500, env="AUDIT_BATCH_SIZE")
+    audit_flush_interval_s: float = Field(default=1.0, env="AUDIT_FLUSH_INTERVAL_S")
+    audit_overflow_policy: str = Field(default="spill", env="AUDIT_OVERFLOW_POLICY")  # spill | sample
+    audit_overflow_sample_every: int = Field(default=10, env="AUDIT_OVERFLOW_SAMPLE_EVERY")
+    audit_spill_path: str = Field(default="logs/audit_spill.jsonl", env="AUDIT_SPILL_PATH")
+
+    # API cold start (lazy router imports, schema checks off the serving path)
+    lazy_routers: bool = Field(default=True, env="LAZY_ROUTERS")  # false: import every router at startup
+    router_warmup_delay_s: float = Field(default=0.0, env="ROUTER_WARMUP_DELAY_S")
+    schema_checks_on_startup: str = Field(default="background", env="SCHEMA_CHECKS_ON_STARTUP")  # background | blocking | off
+
+    # Authenticated principal cache (get_current_active_user)
+    auth_principal_cache_size: int = Field(default=10000, env="AUTH_PRINCIPAL_CACHE_SIZE")
+    auth_principal_local_ttl_s: float = Field(default=5.0, env="AUTH_PRINCIPAL_LOCAL_TTL_S")  # 0 disables the in-process tier
+    auth_principal_redis_ttl_s: int = Field(default=60, env="AUTH_PRINCIPAL_REDIS_TTL_S")  # 0 disables the Redis tier
+
+    # Vector index snapshots shared between worker processes (backend/core/shared_index.py)
+    shared_index_mmap: bool = Field(default=True, env="SHARED_INDEX_MMAP")  # false: private in-memory copies
+    shared_index_check_interval_s: float = Field(default=1.0, env="SHARED_INDEX_CHECK_INTERVAL_S")
+    shared_index_keep_versions: int = Field(default=3, env="SHARED_INDEX_KEEP_VERSIONS")
+    shared_index_preload: bool = Field(default=False, env="SHARED_INDEX_PRELOAD")  # load in the Celery parent before fork
+
+    # Dashboard response cache with ETags (backend/core/response_cache.py)
+    response_cache_enabled: bool = Field(default=True, env="RESPONSE_CACHE_ENABLED")
+    response_cache_size: int = Field(default=2000, env="RESPONSE_CACHE_SIZE")
+    response_cache_local_ttl_s: float = Field(default=5.0, env="RESPONSE_CACHE_LOCAL_TTL_S")  # staleness bound across processes
+    response_cache_redis_ttl_s: int = Field(default=300, env="RESPONSE_CACHE_REDIS_TTL_S")  # 0: local tier only
+
+    # Async database engine for hot read paths (backend/db/async_database.py)
+    async_db_pool_size: int = Field(default=20, env="ASYNC_DB_POOL_SIZE")
+    async_db_max_overflow: int = Field(default=30, env="ASYNC_DB_MAX_OVERFLOW")
+    async_db_pool_timeout_s: float = Field(default=30.0, env="ASYNC_DB_POOL_TIMEOUT_S")
+
+    # Read replicas for analytics, exports and search (backend/db/routing.py)
+    database_replica_urls: str = Field(default="", env="DATABASE_REPLICA_URLS")  # comma-separated; empty: primary only
+    replica_max_lag_s: float = Field(default=5.0, env="REPLICA_MAX_LAG_S")  # lagging replicas fall back to primary
+    replica_check_interval_s: float = Field(default=2.0, env="REPLICA_CHECK_INTERVAL_S")
+
+    # AI Content Categorization Batching
+    categorization_max_concurrency: int = Field(default=4, env="CATEGORIZATION_MAX_CONCURRENCY")
+    categorization_requests_per_minute: int = Field(default=120, env="CATEGORIZATION_REQUESTS_PER_MINUTE")
+    categorization_pack_size: int = Field(default=8, env="CATEGORIZATION_PACK_SIZE")
+    categorization_pack_max_chars: int = Field(default=500, env="CATEGORIZATION_PACK_MAX_CHARS")
+    categorization_cache_size: int = Field(default=10000, env="CATEGORIZATION_CACHE_SIZE")
+    categorization_cache_ttl: int = Field(default=86400, env="CATEGORIZATION_CACHE_TTL")
     
     # OpenTelemetry
     otel_service_name: str = "ai-social-agent-api"
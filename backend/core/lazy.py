@@ -0,0 +1,54 @@
+"""
+Lazy construction of heavy module-level singletons
+
+Several modules expose a ready-made instance (``vector_search``,
+``openai_tool`` ...) whose constructor creates API clients or loads data from
+disk. Importing such a module used to pay that cost at import time, in every
+process, whether or not the instance was ever used. ``LazyProxy`` keeps the
+module attribute and its call sites unchanged and builds the instance on first
+attribute access.
+"""
+import threading
+from typing import Any, Callable, Optional
+
+
+class LazyProxy:
+    """Proxy that builds its target with ``factory()`` on first use (thread-safe, once)"""
+
+    __slots__ = ("_factory", "_name", "_instance", "_lock")
+
+    def __init__(self, factory: Callable[[], Any], name: Optional[str] = None):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_name", name or getattr(factory, "__name__", repr(factory)))
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get(self) -> Any:
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            with object.__getattribute__(self, "_lock"):
+                instance = object.__getattribute__(self, "_instance")
+                if instance is None:
+                    instance = object.__getattribute__(self, "_factory")()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    @property
+    def is_initialized(self) -> bool:
+        return object.__getattribute__(self, "_instance") is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._get(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._get(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._get()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "initialized" if self.is_initialized else "not initialized"
+        return f"<LazyProxy {object.__getattribute__(self, '_name')} ({state})>"
@@ -0,0 +1,187 @@
+"""
+Lazy router registration for the FastAPI app
+
+Importing every router module at startup pulls in most of the backend (ORM
+models, platform clients, agent tooling) before the first request can be
+served, and every worker process pays for it. ``LazyRouterLoader`` registers
+routers from a manifest instead:
+- ``LazyRouterMiddleware`` imports the routers whose path prefixes match an
+  incoming request before it is routed (the OpenAPI/docs paths load them all)
+- ``warm_up`` imports the rest in the background after startup
+
+Imports run in a worker thread so the event loop keeps serving. Loaded routes
+are spliced into the app's route list at the manifest's position, so matching
+priority is the same as with eager registration, and endpoints registered
+after the loader (fallbacks) still come after them.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LazyRouterLoader:
+    """Imports and includes manifest routers on demand, preserving manifest order"""
+
+    def __init__(
+        self,
+        app,
+        manifest: Sequence[Any],
+        import_router: Callable[[Any], Any],
+        loaded: Optional[List[str]] = None,
+        failed: Optional[List[Tuple[str, str]]] = None,
+        warm_up_delay: float = 0.0
+    ):
+        """
+        Args:
+            app: FastAPI app; routers are inserted at its current end of routes
+            manifest: Entries with ``module`` and ``paths`` (``RouterSpec``)
+            import_router: Returns the router for a manifest entry
+            loaded: List to append loaded router names to (for health output)
+            failed: List to append (name, error) for routers that failed
+            warm_up_delay: Seconds after startup before background loading
+        """
+        self.app = app
+        self.manifest = list(manifest)
+        self.import_router = import_router
+        self.loaded = loaded if loaded is not None else []
+        self.failed = failed if failed is not None else []
+        self.warm_up_delay = warm_up_delay
+
+        self._anchor = len(app.router.routes)
+        self._routes: Dict[int, list] = {}
+        self._done: set = set()
+        self._import_seconds: Dict[str, float] = {}
+        self._include_lock = threading.Lock()
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self.load_all_paths = {path for path in (app.openapi_url, app.docs_url, app.redoc_url) if path}
+
+    @property
+    def all_loaded(self) -> bool:
+        return len(self._done) == len(self.manifest)
+
+    def pending(self) -> List[int]:
+        return [index for index in range(len(self.manifest)) if index not in self._done]
+
+    def indexes_for_path(self, path: str) -> List[int]:
+        """Pending manifest entries that serve ``path``"""
+        if path in self.load_all_paths:
+            return self.pending()
+        return [
+            index for index in self.pending()
+            if any(path == prefix or path.startswith(prefix + "/") for prefix in self.manifest[index].paths)
+        ]
+
+    def load(self, index: int) -> None:
+        """Import and include one entry synchronously"""
+        if index not in self._done:
+            self._include(index, self._import(index))
+
+    def load_all(self) -> None:
+        """Eager registration: include every pending entry now"""
+        for index in self.pending():
+            self.load(index)
+
+    async def load_async(self, index: int) -> None:
+        """Import one entry in a worker thread and include it on the event loop"""
+        lock = self._locks.setdefault(index, asyncio.Lock())
+        async with lock:
+            if index in self._done:
+                return
+            result = await asyncio.to_thread(self._import, index)
+            self._include(index, result)
+
+    async def ensure_loaded(self, path: str) -> None:
+        """Load the routers that serve ``path`` before it is routed"""
+        if self.all_loaded:
+            return
+        for index in self.indexes_for_path(path):
+            await self.load_async(index)
+
+    async def warm_up(self) -> None:
+        """Load every remaining router, one at a time, in the background"""
+        if self.warm_up_delay:
+            await asyncio.sleep(self.warm_up_delay)
+        start = time.perf_counter()
+        pending = self.pending()
+        for index in pending:
+            await self.load_async(index)
+        logger.info(
+            f"Router warm-up loaded {len(pending)} routers in {time.perf_counter() - start:.2f}s "
+            f"({len(self.failed)} failed, {len(self.app.routes)} routes)"
+        )
+
+    def start_warm_up(self) -> None:
+        """Startup handler: schedule ``warm_up`` without delaying startup"""
+        if self._warm_up_task is None and not self.all_loaded:
+            self._warm_up_task = asyncio.get_running_loop().create_task(self.warm_up())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Loaded/pending counts and per-router import times (slowest first)"""
+        return {
+            "loaded": len(self.loaded),
+            "failed": len(self.failed),
+            "pending": [self.manifest[index].module for index in self.pending()],
+            "import_seconds": dict(sorted(self._import_seconds.items(), key=lambda item: -item[1])),
+        }
+
+    def _import(self, index: int):
+        spec = self.manifest[index]
+        start = time.perf_counter()
+        try:
+            return self.import_router(spec)
+        except Exception as e:
+            return e
+        finally:
+            self._import_seconds[spec.module] = round(time.perf_counter() - start, 4)
+
+    def _include(self, index: int, router) -> None:
+        spec = self.manifest[index]
+        with self._include_lock:
+            if index in self._done:
+                return
+            self._done.add(index)
+
+            if isinstance(router, Exception):
+                self.failed.append((spec.module, str(router)))
+                logger.error("❌ {} router error: {} - {}".format(spec.module, type(router).__name__, router))
+                return
+
+            routes = self.app.router.routes
+            before = len(routes)
+            try:
+                self.app.include_router(router)
+            except Exception as e:
+                del routes[before:]
+                self.failed.append((getattr(router, "prefix", spec.module), str(e)))
+                logger.error("❌ {} router error: {} - {}".format(spec.module, type(e).__name__, e))
+                return
+
+            added = routes[before:]
+            del routes[before:]
+            position = self._anchor + sum(len(self._routes[i]) for i in self._routes if i < index)
+            routes[position:position] = added
+            self._routes[index] = added
+            self.app.openapi_schema = None
+
+        router_name = getattr(router, "prefix", "unknown").replace("/api/", "") or "root"
+        self.loaded.append(router_name)
+        logger.info("✅ {} router loaded ({:.0f} ms import)".format(router_name, self._import_seconds[spec.module] * 1000))
+
+
+class LazyRouterMiddleware:
+    """Pure ASGI middleware that loads a request's routers before routing it"""
+
+    def __init__(self, app, loader: LazyRouterLoader):
+        self.app = app
+        self.loader = loader
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and not self.loader.all_loaded:
+            await self.loader.ensure_loaded(scope.get("path", ""))
+        await self.app(scope, receive, send)
+
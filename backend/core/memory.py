@@ -12,7 +12,8 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 from openai import OpenAI
 from backend.core.config import get_settings
-import json
+from backend.core.serialization import dump_file, load_file
+from backend.core.shared_index import IndexSnapshots, read_faiss_index
 import uuid
 
 logger = logging.getLogger(__name__)
@@ -34,25 +35,48 @@ class FAISSMemorySystem:
             
         self.dimension = dimension
         self.index_path = index_path
-        self.index_file = os.path.join(index_path, "faiss.index")
-        self.metadata_file = os.path.join(index_path, "metadata.json")
         
         # Initialize OpenAI client
         self.openai_client = OpenAI(api_key=settings.openai_api_key)
         
-        # Create directories
-        os.makedirs(index_path, exist_ok=True)
+        # Versioned snapshots, shared (memory-mapped) between processes
+        self._snapshots = IndexSnapshots(index_path)
         
         # Initialize or load FAISS index
+        self._load_snapshot()
+    
+    def _load_snapshot(self):
+        """Load the current snapshot (the index is mapped read-only where FAISS supports it)"""
+        self._version = self._snapshots.current_version()
+        self.index_file = self._snapshots.path("faiss.index", self._version)
+        self.metadata_file = self._snapshots.path("metadata.json", self._version)
+        self._index_mapped = False
         self._index = self._load_or_create_index()
         self._metadata = self._load_metadata()
+    
+    def _refresh(self, force: bool = False):
+        """Reload if another process published a newer snapshot"""
+        if force:
+            changed = self._snapshots.current_version() != self._version
+        else:
+            changed = self._snapshots.has_changed(self._version)
+        if changed:
+            self._load_snapshot()
+    
+    def _writable_index(self):
+        """Private copy of a memory-mapped index, taken before the first mutation"""
+        if self._index_mapped:
+            self._index = faiss.clone_index(self._index)
+            self._index_mapped = False
+        return self._index
         
     def _load_or_create_index(self):
         """Load existing FAISS index or create new one"""
         if os.path.exists(self.index_file):
             try:
                 if FAISS_AVAILABLE:
-                    return faiss.read_index(self.index_file)
+                    index, self._index_mapped = read_faiss_index(faiss, self.index_file)
+                    return index
             except Exception as e:
                 logger.warning(f"Error loading index: {e}. Creating new index.")
         
@@ -65,21 +89,26 @@ class FAISSMemorySystem:
         """Load metadata mapping index IDs to content information"""
         if os.path.exists(self.metadata_file):
             try:
-                with open(self.metadata_file, 'r') as f:
-                    return json.load(f)
+                return load_file(self.metadata_file)
             except Exception as e:
                 logger.warning(f"Error loading metadata: {e}. Starting with empty metadata.")
         return {}
     
+    def _publish(self):
+        """Save index and metadata as a new snapshot, then load it back shared"""
+        with self._snapshots.publish() as directory:
+            if FAISS_AVAILABLE and hasattr(self, '_index') and self._index:
+                faiss.write_index(self._index, os.path.join(directory, "faiss.index"))
+            dump_file(os.path.join(directory, "metadata.json"), self._metadata, default=str)
+        self._load_snapshot()
+    
     def _save_index(self):
-        """Save FAISS index to disk"""
-        if FAISS_AVAILABLE and hasattr(self, '_index') and self._index:
-            faiss.write_index(self._index, self.index_file)
+        """Save FAISS index to disk (publishes a full snapshot)"""
+        self._publish()
     
     def _save_metadata(self):
-        """Save metadata to disk"""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self._metadata, f, indent=2, default=str)
+        """Save metadata to disk (publishes a full snapshot)"""
+        self._publish()
     
     def embed_text(self, text: str) -> np.ndarray:
         """Create embedding for text using OpenAI"""
@@ -106,8 +135,11 @@ class FAISSMemorySystem:
         embedding = self.embed_text(content)
         
         if embedding.any():
+            # Build on the latest published snapshot
+            self._refresh(force=True)
+            
             # Add to FAISS index
-            self._index.add(embedding.reshape(1, -1))
+            self._writable_index().add(embedding.reshape(1, -1))
             
             # Store metadata with index ID
             index_id = self._index.ntotal - 1
@@ -120,8 +152,7 @@ class FAISSMemorySystem:
             }
             
             # Save to disk
-            self._save_index()
-            self._save_metadata()
+            self._publish()
             
             return content_id
         
@@ -131,7 +162,8 @@ class FAISSMemorySystem:
         """Search for similar content"""
         if not FAISS_AVAILABLE:
             return self._simple_search.search_similar(query, top_k, threshold)
-            
+        
+        self._refresh()
         if self._index.ntotal == 0:
             return []
         
@@ -162,7 +194,8 @@ class FAISSMemorySystem:
         """Retrieve content by type"""
         if not FAISS_AVAILABLE:
             return self._simple_search.get_content_by_type(content_type, limit)
-            
+        
+        self._refresh()
         results = []
         for idx, meta in self.metadata.items():
             if meta.get('metadata', {}).get('type') == content_type:
@@ -181,7 +214,8 @@ class FAISSMemorySystem:
         """Retrieve high-performing content for learning"""
         if not FAISS_AVAILABLE:
             return self._simple_search.get_high_performing_content(min_engagement, limit)
-            
+        
+        self._refresh()
         results = []
         for idx, meta in self.metadata.items():
             engagement = meta.get('metadata', {}).get('engagement_rate', 0)
@@ -202,7 +236,8 @@ class FAISSMemorySystem:
         """Find content suitable for repurposing"""
         if not FAISS_AVAILABLE:
             return self._simple_search.get_content_for_repurposing(days_old, min_engagement)
-            
+        
+        self._refresh()
         from datetime import timedelta
         cutoff_date = datetime.utcnow() - timedelta(days=days_old)
         
@@ -229,7 +264,8 @@ class FAISSMemorySystem:
         """Analyze patterns in stored content"""
         if not FAISS_AVAILABLE:
             return self._simple_search.analyze_content_patterns()
-            
+        
+        self._refresh()
         if not self.metadata:
             return {'error': 'No content available for analysis'}
         
@@ -280,6 +316,8 @@ class FAISSMemorySystem:
         from datetime import timedelta
         cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
         
+        if FAISS_AVAILABLE:
+            self._refresh(force=True)
         indices_to_remove = []
         for idx, meta in list(self.metadata.items()):
             created_at = datetime.fromisoformat(meta.get('created_at', ''))
@@ -290,7 +328,7 @@ class FAISSMemorySystem:
         # Note: FAISS doesn't support efficient deletion, so we'd need to rebuild index
         # For now, just remove from metadata
         if indices_to_remove:
-            self._save_metadata()
+            self._publish()
             logger.info(f"Cleaned up {len(indices_to_remove)} old content items from metadata")
         
         return len(indices_to_remove)
@@ -307,6 +345,7 @@ class FAISSMemorySystem:
         """Set index object (compatibility)"""
         if FAISS_AVAILABLE:
             self._index = value
+            self._index_mapped = False
     
     @property
     def metadata(self):
@@ -0,0 +1,374 @@
+"""
+Response cache with strong ETags for read-heavy dashboard endpoints
+
+Analytics summaries used to be recomputed on every dashboard poll. Endpoints
+decorated with ``response_cache.cached(route, scope=...)`` now keep their
+serialized body, gzip-compressed, keyed by route, owning user and the request
+path plus its sorted query string:
+- in an in-process LRU (``local_ttl`` seconds, checked first)
+- in Redis, one hash per user (``redis_ttl`` seconds, shared by workers)
+
+Responses carry a strong ``ETag`` (hash of the uncompressed body) and
+``Cache-Control: private, no-cache``, so clients revalidate on every poll and a
+matching ``If-None-Match`` gets an empty 304. The stored gzip body is sent
+as-is to clients that accept gzip.
+
+Invalidation is driven by writes: committed inserts, updates and deletes of
+``ContentItem``, ``ContentLog`` and ``ContentPerformanceSnapshot`` drop every
+entry of the owning user (one Redis ``DEL``). The session hooks are registered
+by ``backend.db.database``, so API workers and Celery tasks both invalidate;
+other processes drop their local copy within ``local_ttl``.
+"""
+import functools
+import gzip
+import hashlib
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Union
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+from starlette.responses import Response
+
+from backend.core.serialization import dumps
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "response_cache_invalidate"
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """A serialized response body, stored gzip-compressed, with its strong ETag"""
+    etag: str
+    gzip_body: bytes
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedBody":
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        return cls(etag=etag, gzip_body=gzip.compress(body, compresslevel=6, mtime=0))
+
+    def to_bytes(self) -> bytes:
+        return self.etag.encode() + b"\n" + self.gzip_body
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedBody":
+        etag, _, gzip_body = raw.partition(b"\n")
+        return cls(etag=etag.decode(), gzip_body=gzip_body)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for coding in (accept_encoding or "").lower().split(","):
+        name, _, params = coding.partition(";")
+        if name.strip() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class ResponseCache:
+    """Two-tier (local LRU + Redis) cache of serialized endpoint responses, invalidated per user"""
+
+    def __init__(
+        self,
+        redis_client=None,
+        redis_url: Optional[str] = None,
+        max_size: int = 2000,
+        local_ttl: float = 5.0,
+        redis_ttl: int = 300,
+        retry_interval: float = 30.0,
+        key_prefix: str = "resp:",
+        enabled: bool = True
+    ):
+        self.max_size = max_size
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.retry_interval = retry_interval
+        self.key_prefix = key_prefix
+        self.redis_url = redis_url
+        self.enabled = enabled
+
+        self._redis = redis_client
+        self._redis_retry_at = 0.0
+        # (scope, field) -> (CachedBody, expires_at, scope generation when stored)
+        self._local: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "local_hits": 0, "redis_hits": 0, "misses": 0, "not_modified": 0,
+            "invalidations": 0, "redis_errors": 0
+        }
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache":
+        from backend.core.config import get_settings
+
+        settings = get_settings()
+        return cls(
+            redis_url=settings.redis_url if settings.response_cache_redis_ttl_s > 0 else None,
+            max_size=settings.response_cache_size,
+            local_ttl=settings.response_cache_local_ttl_s,
+            redis_ttl=settings.response_cache_redis_ttl_s,
+            enabled=settings.response_cache_enabled
+        )
+
+    @staticmethod
+    def scope_for(user_id: Any) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def request_key(route: str, request: Request) -> str:
+        """Route plus path and sorted query parameters, so parameter order does not matter"""
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{route}:{request.url.path}?{query}"
+
+    def get(self, scope: str, field: str) -> Optional[CachedBody]:
+        """Cached body for ``field`` in ``scope``, or None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get((scope, field))
+            if entry is not None:
+                body, expires_at, generation = entry
+                if expires_at > now and generation == self._generations.get(scope, 0):
+                    self._local.move_to_end((scope, field))
+                    self._stats["local_hits"] += 1
+                    return body
+                del self._local[(scope, field)]
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = client.hget(self.key_prefix + scope, field)
+            except Exception as e:
+                self._redis_failed(e)
+                raw = None
+            if raw:
+                body = CachedBody.from_bytes(raw)
+                self._store_local(scope, field, body, self.generation(scope))
+                with self._lock:
+                    self._stats["redis_hits"] += 1
+                return body
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def generation(self, scope: str) -> int:
+        """Local invalidation counter for ``scope``; pass it to ``set`` to drop results computed before a write"""
+        with self._lock:
+            return self._generations.get(scope, 0)
+
+    def set(self, scope: str, field: str, body: bytes, generation: Optional[int] = None) -> CachedBody:
+        """
+        Cache ``body`` for ``field`` in ``scope`` and return it as a ``CachedBody``
+
+        Nothing is stored if ``scope`` was invalidated since ``generation`` was read.
+        """
+        entry = CachedBody.from_body(body)
+        if generation is not None and generation != self.generation(scope):
+            return entry
+
+        self._store_local(scope, field, entry, generation if generation is not None else self.generation(scope))
+        client = self._redis_client()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.hset(self.key_prefix + scope, field, entry.to_bytes())
+                pipe.expire(self.key_prefix + scope, self.redis_ttl)
+                pipe.execute()
+            except Exception as e:
+                self._redis_failed(e)
+        return entry
+
+    def invalidate(self, *scopes: str) -> None:
+        """Drop every cached response of ``scopes`` from both tiers"""
+        scopes = [scope for scope in scopes if scope]
+        if not scopes:
+            return
+
+        with self._lock:
+            for scope in scopes:
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+            self._stats["invalidations"] += len(scopes)
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.delete(*[self.key_prefix + scope for scope in scopes])
+            except Exception as e:
+                self._redis_failed(e)
+
+    def clear(self) -> None:
+        """Drop every local entry (Redis entries expire on their own)"""
+        with self._lock:
+            self._local.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["local_size"] = len(self._local)
+        stats["enabled"] = self.enabled
+        stats["redis_enabled"] = self._redis is not None or bool(self.redis_url)
+        return stats
+
+    def respond(self, request: Request, entry: CachedBody) -> Response:
+        """200 with the cached body, or an empty 304 if the client already has it"""
+        headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            with self._lock:
+                self._stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        if _accepts_gzip(request.headers.get("accept-encoding")):
+            headers["Content-Encoding"] = "gzip"
+            return Response(entry.gzip_body, media_type="application/json", headers=headers)
+        return Response(gzip.decompress(entry.gzip_body), media_type="application/json", headers=headers)
+
+    def cached(self, route: str, scope: Union[str, Callable[[Dict[str, Any]], Any]]):
+        """
+        Serve an endpoint's responses from the cache
+
+        Args:
+            route: stable name for the endpoint (part of the key)
+            scope: name of the endpoint parameter holding the owning user id, or
+                a callable taking the endpoint's keyword arguments and returning it
+
+        The endpoint gets a ``request`` parameter if it does not declare one.
+        Results that are already ``Response`` objects are passed through uncached.
+        """
+        def decorator(endpoint):
+            signature = inspect.signature(endpoint)
+            inject_request = "request" not in signature.parameters
+            parameters = list(signature.parameters.values())
+            if inject_request:
+                parameters.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                request = kwargs.pop("request") if inject_request else kwargs["request"]
+                if not self.enabled:
+                    return await endpoint(*args, **kwargs)
+
+                user_id = scope(kwargs) if callable(scope) else kwargs[scope]
+                scope_key = self.scope_for(user_id)
+                field = self.request_key(route, request)
+
+                entry = self.get(scope_key, field)
+                if entry is None:
+                    generation = self.generation(scope_key)
+                    result = await endpoint(*args, **kwargs)
+                    if isinstance(result, Response):
+                        return result
+                    entry = self.set(scope_key, field, dumps(jsonable_encoder(result)), generation)
+                return self.respond(request, entry)
+
+            wrapper.__signature__ = signature.replace(parameters=parameters)
+            return wrapper
+
+        return decorator
+
+    def _store_local(self, scope: str, field: str, entry: CachedBody, generation: int) -> None:
+        if self.local_ttl <= 0:
+            return
+        with self._lock:
+            self._local[(scope, field)] = (entry, time.monotonic() + self.local_ttl, generation)
+            self._local.move_to_end((scope, field))
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+    def _redis_client(self):
+        if self._redis is not None:
+            return self._redis if time.monotonic() >= self._redis_retry_at else None
+        if not self.redis_url or not REDIS_AVAILABLE or time.monotonic() < self._redis_retry_at:
+            return None
+
+        try:
+            self._redis = redis.from_url(self.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        # Serve from the local tier and recompute until the retry interval passes
+        logger.warning(f"Response cache Redis tier unavailable for {self.retry_interval}s: {error}")
+        with self._lock:
+            self._stats["redis_errors"] += 1
+        self._redis_retry_at = time.monotonic() + self.retry_interval
+
+
+response_cache = ResponseCache.from_settings()
+
+
+def _owner_ids(session: Session, obj) -> set:
+    """Users whose cached dashboards ``obj`` feeds"""
+    from backend.db.models import ContentItem, ContentLog, ContentPerformanceSnapshot
+
+    if isinstance(obj, (ContentItem, ContentLog)):
+        return {obj.user_id}
+    if isinstance(obj, ContentPerformanceSnapshot):
+        item = session.identity_map.get(identity_key(ContentItem, obj.content_item_id))
+        if item is not None:
+            return {item.user_id}
+        # No autoflush from here: we are inside a flush
+        owner = session.connection().execute(
+            select(ContentItem.user_id).where(ContentItem.id == obj.content_item_id)
+        ).scalar()
+        return {owner}
+    return set()
+
+
+def _collect_owners(session: Session, flush_context) -> None:
+    owners = set()
+    for obj in session.new:
+        owners |= _owner_ids(session, obj)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            owners |= _owner_ids(session, obj)
+    for obj in session.deleted:
+        owners |= _owner_ids(session, obj)
+    owners.discard(None)
+    if owners:
+        session.info.setdefault(_PENDING_KEY, set()).update(owners)
+
+
+def _invalidate_committed(session: Session) -> None:
+    # After commit, so a concurrent miss cannot re-cache the pre-write aggregates
+    owners = session.info.pop(_PENDING_KEY, None)
+    if owners:
+        response_cache.invalidate(*[response_cache.scope_for(owner) for owner in owners])
+
+
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_invalidation_hooks() -> None:
+    """Invalidate cached responses on committed content and metrics writes (idempotent)"""
+    for name, hook in (
+        ("after_flush", _collect_owners),
+        ("after_commit", _invalidate_committed),
+        ("after_rollback", _discard_pending),
+    ):
+        if not event.contains(Session, name, hook):
+            event.listen(Session, name, hook)
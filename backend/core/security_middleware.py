@@ -2,13 +2,17 @@
 Security Middleware for Production
 Implements security headers, CORS, rate limiting, and request validation
 """
+import asyncio
 import time
 import logging
-from typing import Dict, List, Optional, Any
+import uuid
+from typing import Dict, List, Optional, Any, Tuple
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
 import hashlib
 import json
+import re
+from urllib.parse import parse_qsl
 
 from fastapi import Request, Response, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -63,31 +67,113 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
                 content={"error": "Internal server error", "message": "Security middleware encountered an error"}
             )
 
+
+# Burst (sliding 10 seconds), minute and hour checks plus recording in one round trip.
+# KEYS: burst sorted set, minute counter, hour counter
+# ARGV: now, burst limit, minute limit, hour limit, requests already admitted locally, member prefix
+# Returns {limited (0 = no, 1 = burst, 2 = minute, 3 = hour), burst count, minute count, hour count}
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local prefix = ARGV[6]
+local recorded = 0
+
+local function record(n)
+    for i = 1, n do
+        recorded = recorded + 1
+        redis.call('ZADD', KEYS[1], now, prefix .. ':' .. recorded)
+    end
+    redis.call('EXPIRE', KEYS[1], 15)
+    redis.call('INCRBY', KEYS[2], n)
+    redis.call('EXPIRE', KEYS[2], 70)
+    redis.call('INCRBY', KEYS[3], n)
+    redis.call('EXPIRE', KEYS[3], 3700)
+end
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - 10)
+local pending = tonumber(ARGV[5])
+if pending > 0 then
+    record(pending)
+end
+
+local burst = redis.call('ZCARD', KEYS[1])
+local minute = tonumber(redis.call('GET', KEYS[2]) or '0')
+local hour = tonumber(redis.call('GET', KEYS[3]) or '0')
+if burst >= tonumber(ARGV[2]) then
+    return {1, burst, minute, hour}
+end
+if minute >= tonumber(ARGV[3]) then
+    return {2, burst, minute, hour}
+end
+if hour >= tonumber(ARGV[4]) then
+    return {3, burst, minute, hour}
+end
+
+record(1)
+return {0, burst + 1, minute + 1, hour + 1}
+"""
+
+SCRIPT_LIMIT_TYPES = {1: "burst", 2: "minute", 3: "hour"}
+
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Redis-backed rate limiting middleware for production scalability"""
+    """
+    Redis-backed rate limiting middleware for production scalability
+    
+    Each request costs one EVALSHA (SLIDING_WINDOW_SCRIPT). Redis health is
+    checked by a background probe rather than per request; while Redis is
+    failing the in-memory limiter is used until the probe sees it recover.
+    
+    With ``local_precheck``, a client well under its limits gets a small local
+    allowance (its remaining headroom divided by ``precheck_share``, the number
+    of API processes expected to share it) valid for ``precheck_ttl`` seconds.
+    Requests inside it skip Redis, and are recorded with the client's next
+    scripted check.
+    """
     
     def __init__(self, app, 
                  requests_per_minute: int = 60, 
                  requests_per_hour: int = 1000,
-                 burst_limit: int = 10):
+                 burst_limit: int = 10,
+                 health_check_interval: float = 5.0,
+                 local_precheck: bool = False,
+                 precheck_share: int = 4,
+                 precheck_ttl: float = 1.0):
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
         self.burst_limit = burst_limit
+        self.health_check_interval = health_check_interval
+        self.local_precheck = local_precheck
+        self.precheck_share = max(1, precheck_share)
+        self.precheck_ttl = precheck_ttl
         
         # Always initialize in-memory storage as fallback
         self.minute_counts: Dict[str, deque] = defaultdict(deque)
         self.hour_counts: Dict[str, deque] = defaultdict(deque)
         self.burst_counts: Dict[str, List[float]] = defaultdict(list)
         
+        # Local allowances per client (local_precheck)
+        self._grants: Dict[str, Dict[str, float]] = {}
+        
+        # Redis circuit: closed while healthy, opened by a failed call, closed again by the probe
+        self._redis_healthy = True
+        self._probe_task: Optional[asyncio.Task] = None
+        self._probe_loop = None
+        self._stats = {"redis_checks": 0, "local_admits": 0, "memory_checks": 0, "redis_errors": 0}
+        
         # Try to use Redis for distributed rate limiting
         self.use_redis = False
         self.redis_client = None
+        self._rate_script = None
         
         try:
             import redis.asyncio as redis
             redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-            self.redis_client = redis.Redis.from_url(redis_url, decode_responses=True)
+            self.redis_client = redis.Redis.from_url(
+                redis_url, decode_responses=True, socket_timeout=1.0, socket_connect_timeout=1.0
+            )
+            # Registered script: EVALSHA, falling back to EVAL only on NOSCRIPT
+            self._rate_script = self.redis_client.register_script(SLIDING_WINDOW_SCRIPT)
             self.use_redis = True
             logger.info("Rate limiting using async Redis for distributed storage with memory fallback")
         except Exception as e:
@@ -104,6 +190,55 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         except Exception as e:
             logger.warning(f"Redis connection test failed: {e}")
             return False
+    
+    def _ensure_health_probe(self) -> None:
+        """Start the background Redis probe on the running loop (once per loop)"""
+        if not self.use_redis:
+            return
+        loop = asyncio.get_running_loop()
+        if self._probe_task is not None and self._probe_loop is loop and not self._probe_task.done():
+            return
+        self._probe_loop = loop
+        self._probe_task = loop.create_task(self._health_probe())
+    
+    async def _health_probe(self) -> None:
+        """Refresh Redis health off the request path"""
+        while True:
+            healthy = await self._test_redis_connection()
+            if healthy != self._redis_healthy:
+                logger.info(f"Rate limiting Redis {'recovered' if healthy else 'unavailable'}; "
+                            f"using {'Redis' if healthy else 'in-memory'} limits")
+            self._redis_healthy = healthy
+            await asyncio.sleep(self.health_check_interval)
+    
+    async def stop_health_probe(self) -> None:
+        """Cancel the background Redis probe (run at application shutdown)"""
+        task, self._probe_task = self._probe_task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        if self._probe_loop is asyncio.get_running_loop():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            await super().__call__(scope, receive, send)
+            return
+        
+        async def shutdown_receive():
+            message = await receive()
+            if message["type"] == "lifespan.shutdown":
+                await self.stop_health_probe()
+            return message
+        
+        await self.app(scope, shutdown_receive, send)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Check counters and Redis circuit state"""
+        return {**self._stats, "redis_healthy": self._redis_healthy, "local_grants": len(self._grants)}
         
     def _get_limit_for_type(self, limit_type: str) -> int:
         """Get the limit value for a given limit type"""
@@ -116,6 +251,26 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         else:
             return 0
     
+    def _limit_info(self, limit_type: str) -> Dict[str, Any]:
+        """Rate limit response details for an exceeded limit"""
+        if limit_type == "burst":
+            return {
+                "limit_type": "burst",
+                "retry_after": 10,
+                "message": f"Burst limit exceeded: max {self.burst_limit} requests per 10 seconds"
+            }
+        if limit_type == "minute":
+            return {
+                "limit_type": "minute",
+                "retry_after": 60,
+                "message": f"Rate limit exceeded: max {self.requests_per_minute} requests per minute"
+            }
+        return {
+            "limit_type": "hour",
+            "retry_after": 3600,
+            "message": f"Rate limit exceeded: max {self.requests_per_hour} requests per hour"
+        }
+    
     def get_client_ip(self, request: Request) -> str:
         """Get client IP address, handling proxies"""
         # Check for forwarded headers (from load balancers/proxies)
@@ -131,13 +286,26 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # Fallback to direct connection
         return request.client.host if request.client else "unknown"
     
-    async def _redis_rate_check(self, client_ip: str) -> Optional[Dict[str, Any]]:
-        """Redis-based rate limiting check using async operations"""
-        if not self.use_redis or not await self._test_redis_connection():
-            return self._memory_rate_check(client_ip)
+    async def _redis_rate_check(self, client_ip: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, int]]:
+        """
+        Rate limit check against Redis in one scripted round trip
+        
+        Returns:
+            Tuple of (limit info if rate limited, usage counts {"minute": n, "hour": n})
+        """
+        if not self.use_redis or not self._redis_healthy:
+            return self._memory_rate_check(client_ip), self._memory_usage(client_ip)
+        
+        now = time.time()
+        if self.local_precheck:
+            usage = self._local_admit(client_ip, now)
+            if usage is not None:
+                return None, usage
+        
+        grant = self._grants.pop(client_ip, None)
+        pending = int(grant["pending"]) if grant else 0
         
         try:
-            now = time.time()
             current_minute = int(now // 60)
             current_hour = int(now // 3600)
             
@@ -146,59 +314,59 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             minute_key = f"rate_limit:{client_ip}:minute:{current_minute}"
             hour_key = f"rate_limit:{client_ip}:hour:{current_hour}"
             
-            # Check burst limit (sliding window of 10 seconds)
-            burst_count = await self.redis_client.zcard(burst_key)
-            if burst_count >= self.burst_limit:
-                return {
-                    "limit_type": "burst", 
-                    "retry_after": 10,
-                    "message": f"Burst limit exceeded: max {self.burst_limit} requests per 10 seconds"
-                }
-            
-            # Check minute limit
-            minute_count = await self.redis_client.get(minute_key) or 0
-            if int(minute_count) >= self.requests_per_minute:
-                return {
-                    "limit_type": "minute",
-                    "retry_after": 60,
-                    "message": f"Rate limit exceeded: max {self.requests_per_minute} requests per minute"
-                }
-            
-            # Check hour limit
-            hour_count = await self.redis_client.get(hour_key) or 0
-            if int(hour_count) >= self.requests_per_hour:
-                return {
-                    "limit_type": "hour",
-                    "retry_after": 3600,
-                    "message": f"Rate limit exceeded: max {self.requests_per_hour} requests per hour"
-                }
-            
-            # Record this request in Redis using async pipeline
-            pipe = self.redis_client.pipeline()
-            
-            # Burst counter (sliding window)
-            pipe.zadd(burst_key, {str(now): now})
-            pipe.zremrangebyscore(burst_key, 0, now - 10)  # Remove entries older than 10 seconds
-            pipe.expire(burst_key, 15)  # Expire key after 15 seconds
-            
-            # Minute counter
-            pipe.incr(minute_key)
-            pipe.expire(minute_key, 70)  # Expire after 70 seconds
-            
-            # Hour counter  
-            pipe.incr(hour_key)
-            pipe.expire(hour_key, 3700)  # Expire after ~1 hour
+            limited, burst, minute, hour = await self._rate_script(
+                keys=[burst_key, minute_key, hour_key],
+                args=[now, self.burst_limit, self.requests_per_minute, self.requests_per_hour,
+                      pending, uuid.uuid4().hex]
+            )
+            self._stats["redis_checks"] += 1
             
-            await pipe.execute()
+            if limited:
+                return self._limit_info(SCRIPT_LIMIT_TYPES[int(limited)]), {"minute": int(minute), "hour": int(hour)}
             
-            return None  # Not rate limited
+            if self.local_precheck:
+                self._issue_grant(client_ip, now, int(burst), int(minute), int(hour))
+            return None, {"minute": int(minute), "hour": int(hour)}
             
         except Exception as e:
             logger.warning(f"Redis rate limiting failed, falling back to memory: {e}")
-            return self._memory_rate_check(client_ip)
+            self._stats["redis_errors"] += 1
+            self._redis_healthy = False
+            return self._memory_rate_check(client_ip), self._memory_usage(client_ip)
+    
+    def _local_admit(self, client_ip: str, now: float) -> Optional[Dict[str, int]]:
+        """Admit from the client's local allowance, if it has one left"""
+        grant = self._grants.get(client_ip)
+        if not grant or grant["remaining"] <= 0 or now >= grant["expires_at"]:
+            return None
+        grant["remaining"] -= 1
+        grant["pending"] += 1
+        self._stats["local_admits"] += 1
+        return {"minute": int(grant["minute"] + grant["pending"]), "hour": int(grant["hour"] + grant["pending"])}
+    
+    def _issue_grant(self, client_ip: str, now: float, burst: int, minute: int, hour: int) -> None:
+        """Give an obviously under-limit client a short local allowance"""
+        headroom = min(self.burst_limit - burst, self.requests_per_minute - minute, self.requests_per_hour - hour)
+        size = headroom // self.precheck_share
+        if size < 1:
+            return
+        
+        if len(self._grants) >= 10000:
+            self._grants = {ip: g for ip, g in self._grants.items() if g["expires_at"] > now and g["pending"]}
+        
+        # Never outlive the minute window the counts came from
+        expires_at = min(now + self.precheck_ttl, (int(now // 60) + 1) * 60)
+        self._grants[client_ip] = {
+            "remaining": size, "pending": 0, "expires_at": expires_at, "minute": minute, "hour": hour
+        }
+    
+    def _memory_usage(self, client_ip: str) -> Dict[str, int]:
+        """Usage counts from the in-memory limiter"""
+        return {"minute": len(self.minute_counts[client_ip]), "hour": len(self.hour_counts[client_ip])}
     
     def _memory_rate_check(self, client_ip: str) -> Optional[Dict[str, Any]]:
         """Memory-based rate limiting fallback"""
+        self._stats["memory_checks"] += 1
         now = time.time()
         current_minute = int(now // 60)
         current_hour = int(now // 3600)
@@ -257,9 +425,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 return await call_next(request)
             
             client_ip = self.get_client_ip(request)
+            self._ensure_health_probe()
             
             # Check rate limits (uses async Redis if available, falls back to memory)
-            limit_info = await self._redis_rate_check(client_ip)
+            limit_info, usage = await self._redis_rate_check(client_ip)
             if limit_info:
                 logger.warning(f"Rate limit exceeded for {client_ip}: {limit_info['message']}")
                 
@@ -282,8 +451,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
             
             # Add current rate limit status to response
-            minute_remaining = max(0, self.requests_per_minute - len(self.minute_counts[client_ip]))
-            hour_remaining = max(0, self.requests_per_hour - len(self.hour_counts[client_ip]))
+            minute_remaining = max(0, self.requests_per_minute - usage["minute"])
+            hour_remaining = max(0, self.requests_per_hour - usage["hour"])
             
             response.headers["X-RateLimit-Limit-Minute"] = str(self.requests_per_minute)
             response.headers["X-RateLimit-Remaining-Minute"] = str(minute_remaining)
@@ -303,11 +472,23 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     content={"error": "Internal server error", "message": "Rate limiting middleware encountered an error"}
                 )
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
-    """Validate incoming requests for security threats"""
+class RequestValidationMiddleware:
+    """
+    Validate incoming requests for security threats
+    
+    Pure ASGI middleware. All patterns are compiled into one case-insensitive
+    regex, so the URL, query parameters and headers are scanned in a single
+    pass before the app runs. The body is scanned chunk by chunk as the app
+    reads it (first ``max_body_scan`` bytes only), never buffered or replayed,
+    so large uploads stream through untouched.
+    """
+    
+    exempt_paths = {"/health", "/ready", "/metrics"}
+    skipped_headers = {b"authorization", b"cookie", b"user-agent"}  # Sensitive or noisy
+    max_body_scan = 10240  # 10KB limit for security scanning
     
     def __init__(self, app):
-        super().__init__(app)
+        self.app = app
         
         # Common SQL injection patterns
         self.sql_patterns = [
@@ -327,131 +508,147 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
             "../", "..\\", "....//", "....\\\\", "/etc/passwd", 
             "/etc/shadow", "c:\\windows\\system32", ".htaccess"
         ]
+        
+        self._pattern_messages = {}
+        for label, patterns in (
+            ("Potential SQL injection attempt", self.sql_patterns),
+            ("Potential XSS attempt", self.xss_patterns),
+            ("Potential path traversal attempt", self.path_traversal_patterns),
+        ):
+            for pattern in patterns:
+                self._pattern_messages.setdefault(pattern, f"{label}: {pattern}")
+        
+        # Longest first so overlapping patterns report the most specific one
+        alternation = "|".join(re.escape(p) for p in sorted(self._pattern_messages, key=len, reverse=True))
+        self._text_regex = re.compile(alternation, re.IGNORECASE)
+        self._bytes_regex = re.compile(alternation.encode("ascii"), re.IGNORECASE)
+        # Bytes kept from the previous body chunk so a pattern split across chunks still matches
+        self._overlap = max(len(p) for p in self._pattern_messages) - 1
     
     def check_suspicious_content(self, content: str) -> Optional[str]:
         """Check content for suspicious patterns"""
-        content_lower = content.lower()
-        
-        # Check SQL injection
-        for pattern in self.sql_patterns:
-            if pattern in content_lower:
-                return f"Potential SQL injection attempt: {pattern}"
+        match = self._text_regex.search(content)
+        return self._pattern_messages[match.group(0).lower()] if match else None
+    
+    def _check_body_chunk(self, chunk: bytes) -> Optional[str]:
+        match = self._bytes_regex.search(chunk)
+        return self._pattern_messages[match.group(0).decode("ascii").lower()] if match else None
+    
+    def _request_head(self, scope) -> str:
+        """URL, decoded query parameters and inspected headers, newline-separated for one scan"""
+        headers = scope.get("headers") or []
+        host = next((value for name, value in headers if name == b"host"), b"").decode("latin-1")
+        query_string = scope.get("query_string", b"").decode("latin-1")
         
-        # Check XSS
-        for pattern in self.xss_patterns:
-            if pattern in content_lower:
-                return f"Potential XSS attempt: {pattern}"
+        parts = [f"{scope.get('scheme', 'http')}://{host}{scope.get('path', '')}?{query_string}"]
+        parts.extend(f"{key}={value}" for key, value in parse_qsl(query_string, keep_blank_values=True))
+        parts.extend(
+            f"{name.decode('latin-1')}: {value.decode('latin-1')}"
+            for name, value in headers if name.lower() not in self.skipped_headers
+        )
+        return "\n".join(parts)
+    
+    @staticmethod
+    def _client_host(scope) -> str:
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+    
+    @staticmethod
+    async def _reject(send) -> None:
+        response = JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"error": "Invalid request", "message": "Request contains suspicious content"}
+        )
+        await response({"type": "http"}, None, send)
+    
+    async def _call_app(self, scope, receive, send) -> None:
+        """Run the app, turning an exception before the response starts into a 500"""
+        response_started = False
         
-        # Check path traversal
-        for pattern in self.path_traversal_patterns:
-            if pattern in content_lower:
-                return f"Potential path traversal attempt: {pattern}"
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
         
-        return None
+        try:
+            await self.app(scope, receive, tracking_send)
+        except Exception as e:
+            if response_started:
+                raise
+            logger.error(f"Request processing failed: {scope.get('method')} {scope.get('path')}: {e}")
+            response = JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"error": "Internal server error", "message": "Request validation middleware encountered an error"}
+            )
+            await response({"type": "http"}, None, send)
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope.get("path") in self.exempt_paths or scope.get("method") == "OPTIONS":
+            await self._call_app(scope, receive, send)
+            return
+        
         try:
-            # Skip validation for health checks and CORS preflight requests
-            if request.url.path in ["/health", "/ready", "/metrics"] or request.method == "OPTIONS":
-                return await call_next(request)
-            
-            # Check URL path
-            try:
-                suspicious = self.check_suspicious_content(str(request.url))
-                if suspicious:
-                    logger.warning(f"Suspicious request from {request.client.host if request.client else 'unknown'}: {suspicious}")
-                    return JSONResponse(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        content={"error": "Invalid request", "message": "Request contains suspicious content"}
-                    )
-            except Exception as e:
-                logger.error(f"Error checking URL path: {e}")
-            
-            # Check query parameters
-            try:
-                for key, value in request.query_params.items():
-                    suspicious = self.check_suspicious_content(f"{key}={value}")
-                    if suspicious:
-                        logger.warning(f"Suspicious query parameter from {request.client.host if request.client else 'unknown'}: {suspicious}")
-                        return JSONResponse(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            content={"error": "Invalid request", "message": "Request contains suspicious content"}
-                        )
-            except Exception as e:
-                logger.error(f"Error checking query parameters: {e}")
-            
-            # Check headers for suspicious content
-            try:
-                for header_name, header_value in request.headers.items():
-                    if header_name.lower() not in ["authorization", "cookie", "user-agent"]:  # Skip sensitive headers
-                        suspicious = self.check_suspicious_content(f"{header_name}: {header_value}")
-                        if suspicious:
-                            logger.warning(f"Suspicious header from {request.client.host if request.client else 'unknown'}: {suspicious}")
-                            return JSONResponse(
-                                status_code=status.HTTP_400_BAD_REQUEST,
-                                content={"error": "Invalid request", "message": "Request contains suspicious content"}
-                            )
-            except Exception as e:
-                logger.error(f"Error checking headers: {e}")
-            
-            # For POST/PUT requests, check body (limited to prevent DoS)
-            if request.method in ["POST", "PUT", "PATCH"]:
-                try:
-                    # Only check first 10KB to prevent DoS
-                    body = await request.body()
-                    if len(body) > 10240:  # 10KB limit for security scanning
-                        body = body[:10240]
-                    
-                    if body:
-                        try:
-                            body_str = body.decode('utf-8', errors='ignore')
-                            suspicious = self.check_suspicious_content(body_str)
-                            if suspicious:
-                                logger.warning(f"Suspicious request body from {request.client.host if request.client else 'unknown'}: {suspicious}")
-                                return JSONResponse(
-                                    status_code=status.HTTP_400_BAD_REQUEST,
-                                    content={"error": "Invalid request", "message": "Request contains suspicious content"}
-                                )
-                        except Exception as decode_e:
-                            logger.debug(f"Could not decode request body for validation: {decode_e}")
-                            # If we can't decode, skip body validation
-                            pass
-                except Exception as e:
-                    logger.error(f"Error checking request body: {e}")
-            
-            # Process request normally
-            response = await call_next(request)
-            
-            # Check if response is None (indicates endpoint didn't return anything)
-            if response is None:
-                logger.error(f"No response returned from endpoint: {request.method} {request.url.path}")
-                return JSONResponse(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    content={"error": "Internal server error", "message": "No response returned."}
-                )
-            return response
-            
+            suspicious = self.check_suspicious_content(self._request_head(scope))
         except Exception as e:
-            logger.error(f"Request validation middleware error: {e}")
             # Fail open - allow request to continue if validation fails
+            logger.error(f"Error checking request URL and headers: {e}")
+            suspicious = None
+        if suspicious:
+            logger.warning(f"Suspicious request from {self._client_host(scope)}: {suspicious}")
+            await self._reject(send)
+            return
+        
+        if scope.get("method") not in ("POST", "PUT", "PATCH"):
+            await self._call_app(scope, receive, send)
+            return
+        
+        scanned = 0
+        tail = b""
+        rejected = False
+        response_started = False
+        
+        async def inspecting_receive():
+            nonlocal scanned, tail, rejected
+            message = await receive()
+            if rejected or message["type"] != "http.request" or scanned >= self.max_body_scan:
+                return message
+            
+            chunk = message.get("body", b"")[:self.max_body_scan - scanned]
+            scanned += len(chunk)
             try:
-                response = await call_next(request)
-                
-                # Check fallback response too
-                if response is None:
-                    logger.error(f"No response returned from fallback endpoint: {request.method} {request.url.path}")
-                    return JSONResponse(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        content={"error": "Internal server error", "message": "No response returned."}
-                    )
-                return response
-                
-            except Exception as inner_e:
-                logger.error(f"Fallback request processing failed: {inner_e}")
-                return JSONResponse(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    content={"error": "Internal server error", "message": "Request validation middleware encountered an error"}
-                )
+                suspicious = self._check_body_chunk(tail + chunk)
+            except Exception as e:
+                logger.error(f"Error checking request body: {e}")
+                suspicious = None
+            tail = (tail + chunk)[-self._overlap:]
+            
+            if not suspicious:
+                return message
+            
+            logger.warning(f"Suspicious request body from {self._client_host(scope)}: {suspicious}")
+            rejected = True
+            if not response_started:
+                await self._reject(send)
+            # The app sees the client go away and stops reading
+            return {"type": "http.disconnect"}
+        
+        async def guarded_send(message):
+            nonlocal response_started
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self._call_app(scope, inspecting_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
 
 def get_cors_middleware_config(environment: str = "production"):
     """Get CORS middleware configuration based on environment"""
@@ -572,7 +769,10 @@ def setup_security_middleware(app, environment: str = "production"):
                 RateLimitMiddleware,
                 requests_per_minute=requests_per_minute,
                 requests_per_hour=requests_per_hour,
-                burst_limit=burst_limit
+                burst_limit=burst_limit,
+                health_check_interval=float(os.getenv("RATE_LIMIT_HEALTH_INTERVAL", "5")),
+                local_precheck=os.getenv("RATE_LIMIT_LOCAL_PRECHECK", "false").lower() == "true",
+                precheck_share=int(os.getenv("RATE_LIMIT_PRECHECK_SHARE", "4"))
             )
             logger.info(f"✅ Rate limiting middleware added: {requests_per_minute}/min, {requests_per_hour}/hr, burst={burst_limit}")
         except Exception as e:
@@ -0,0 +1,159 @@
+"""
+Fast JSON encoding for API responses, websocket frames and on-disk metadata
+
+Uses orjson when it is installed and falls back to the stdlib ``json`` module
+otherwise, so callers never need to care which one is active:
+- ``dumps`` / ``dumps_str`` / ``loads``: replacements for ``json.dumps`` / ``json.loads``
+- ``dump_file`` / ``load_file``: metadata files (compact unless ``indent=True``)
+- ``FastJSONResponse``: the app's default response class
+- ``RowEncoder``: ORM rows straight to the dicts a flat Pydantic response
+  model would produce, for list endpoints that return ``FastJSONResponse``
+  directly instead of building one model instance per row
+
+Output matches Pydantic's JSON mode for the common types: UTC datetimes end in
+``Z``, ``Decimal`` becomes a number, models are dumped with ``model_dump``.
+"""
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+from uuid import UUID
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _isoformat(value) -> str:
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _encode_default(obj: Any) -> Any:
+    """Types neither encoder handles natively (plus the stdlib gaps orjson covers)"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        # Same rule as FastAPI's jsonable_encoder
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return _isoformat(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, "tolist"):
+        # numpy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _with_fallback(default: Optional[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    if default is None:
+        return _encode_default
+
+    def encode(obj):
+        try:
+            return _encode_default(obj)
+        except TypeError:
+            return default(obj)
+
+    return encode
+
+
+def dumps(obj: Any, *, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Encode ``obj`` as UTF-8 JSON bytes
+
+    Args:
+        indent: pretty-print with two spaces
+        default: called for objects no encoder understands (e.g. ``str``)
+    """
+    encode = _with_fallback(default)
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=encode, option=_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which the stdlib encodes fine
+            pass
+    return json.dumps(
+        obj, default=encode, ensure_ascii=False,
+        indent=2 if indent else None, separators=None if indent else (",", ":")
+    ).encode("utf-8")
+
+
+def dumps_str(obj: Any, *, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """``dumps`` as ``str`` (websocket text frames, Redis string values)"""
+    return dumps(obj, indent=indent, default=default).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from ``bytes`` or ``str``"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_file(path: str, obj: Any, *, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> None:
+    """Write ``obj`` to ``path`` as JSON"""
+    with open(path, "wb") as f:
+        f.write(dumps(obj, indent=indent, default=default))
+
+
+def load_file(path: str) -> Any:
+    """Read a JSON file"""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``dumps`` (orjson when available)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RowEncoder:
+    """
+    Encode ORM rows as the dicts a flat Pydantic response model would produce
+
+    Fields are read by attribute name. Fields with a default in the model get
+    that default when the row value is falsy (the ``row.likes_count or 0``
+    idiom of the hand-written converters); no validation is performed.
+    """
+
+    def __init__(self, model: Type[BaseModel], exclude: Iterable[str] = ()):
+        self.model = model
+        excluded = set(exclude)
+        self.fields = tuple(name for name in model.model_fields if name not in excluded)
+        self._plan = []
+        for name in self.fields:
+            field = model.model_fields[name]
+            fallback = None if field.is_required() else field.get_default(call_default_factory=True)
+            self._plan.append((name, fallback))
+
+    def encode_row(self, row: Any) -> Dict[str, Any]:
+        item = {}
+        for name, fallback in self._plan:
+            value = getattr(row, name)
+            if fallback is not None and not value:
+                value = fallback
+            item[name] = value
+        return item
+
+    def encode_rows(self, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+        return [self.encode_row(row) for row in rows]
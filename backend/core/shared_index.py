@@ -0,0 +1,223 @@
+"""
+Read-only index state shared between worker processes
+
+Every API worker and Celery process used to load its own copy of the vector
+indexes (FAISS index, vector arrays, metadata JSON), so N workers held N copies
+of the same data. Index files are now:
+- written as immutable, versioned snapshots: ``<index_path>/versions/<id>/``,
+  with a ``CURRENT`` file naming the live version. Writers build the next
+  snapshot in a temporary directory and publish it with two ``os.replace``
+  calls, so readers never see a half-written index
+- loaded memory-mapped (``np.load(mmap_mode="r")`` and FAISS ``IO_FLAG_MMAP``
+  where the installed FAISS supports it for the index type), so every process
+  maps the same page-cache pages instead of holding a private copy
+- reloaded by readers when ``CURRENT`` changes (checked at most every
+  ``SHARED_INDEX_CHECK_INTERVAL_S``)
+
+Directories without ``CURRENT`` (written before snapshots existed) are read from
+the index root as before until the first publish supersedes them.
+
+Python objects (metadata dicts) cannot be mapped. For prefork servers they can
+be built once in the parent with ``preload_shared_indexes()``, which also
+freezes the GC so children do not dirty the shared pages: Celery calls it from
+``worker_init`` when ``SHARED_INDEX_PRELOAD`` is on, and a gunicorn
+``--preload`` config can call it from ``on_starting``.
+"""
+import gc
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from backend.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+
+
+class IndexSnapshots:
+    """Versioned, atomically published snapshot directories under one index path"""
+
+    def __init__(self, root: str, keep_versions: Optional[int] = None, check_interval_s: Optional[float] = None):
+        settings = get_settings()
+        self.root = root
+        self.keep_versions = max(1, keep_versions if keep_versions is not None else settings.shared_index_keep_versions)
+        self.check_interval_s = (
+            check_interval_s if check_interval_s is not None else settings.shared_index_check_interval_s
+        )
+        self._current_file = os.path.join(root, CURRENT_FILE)
+        self._versions_dir = os.path.join(root, VERSIONS_DIR)
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.last_published: Optional[str] = None
+        os.makedirs(root, exist_ok=True)
+
+    def current_version(self) -> Optional[str]:
+        """The published version id, or None for a legacy (unversioned) directory"""
+        try:
+            with open(self._current_file, "r", encoding="utf-8") as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        if version and os.path.isdir(os.path.join(self._versions_dir, version)):
+            return version
+        logger.error(f"Index snapshot pointer {self._current_file} names a missing version '{version}'")
+        return None
+
+    def directory(self, version: Optional[str]) -> str:
+        """Directory holding the files of ``version`` (the index root for legacy data)"""
+        if version is None:
+            return self.root
+        return os.path.join(self._versions_dir, version)
+
+    def path(self, name: str, version: Optional[str]) -> str:
+        return os.path.join(self.directory(version), name)
+
+    def has_changed(self, loaded_version: Optional[str]) -> bool:
+        """True if a newer version was published since ``loaded_version`` (throttled)"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval_s:
+            return False
+        self._last_check = now
+        return self.current_version() != loaded_version
+
+    @contextmanager
+    def publish(self) -> Iterator[str]:
+        """
+        Write the next snapshot into the yielded directory, then make it current
+
+        The directory is discarded if the block raises. Concurrent writers do not
+        merge: the last one to publish wins, as with the previous in-place saves.
+        """
+        os.makedirs(self._versions_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self._versions_dir)
+        try:
+            yield staging
+            with self._lock:
+                version = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+                os.replace(staging, os.path.join(self._versions_dir, version))
+                pointer = f"{self._current_file}.{uuid.uuid4().hex[:8]}.tmp"
+                with open(pointer, "w", encoding="utf-8") as f:
+                    f.write(version)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(pointer, self._current_file)
+                self._last_check = 0.0
+                self.last_published = version
+            logger.info(f"Published index snapshot {version} in {self.root}")
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self._prune(keep=version)
+
+    def _prune(self, keep: str) -> None:
+        """Remove old versions; processes still mapping them keep their open pages"""
+        try:
+            versions = sorted(
+                name for name in os.listdir(self._versions_dir)
+                if not name.startswith(".") and name != keep
+            )
+        except OSError:
+            return
+        for name in versions[:max(0, len(versions) - (self.keep_versions - 1))]:
+            shutil.rmtree(os.path.join(self._versions_dir, name), ignore_errors=True)
+
+    def get_stats(self, loaded_version: Optional[str]) -> Dict[str, Any]:
+        return {
+            "snapshot_version": loaded_version,
+            "published_version": self.current_version(),
+            "mmap_enabled": get_settings().shared_index_mmap,
+        }
+
+
+def load_array(path: str) -> np.ndarray:
+    """Load a ``.npy`` array, memory-mapped read-only when SHARED_INDEX_MMAP is on"""
+    if get_settings().shared_index_mmap:
+        try:
+            return np.load(path, mmap_mode="r")
+        except ValueError as e:
+            # Object arrays cannot be mapped
+            logger.warning(f"Cannot memory-map {path} ({e}), loading a private copy")
+    return np.load(path)
+
+
+def save_array(path: str, array: np.ndarray) -> None:
+    """Write ``array`` to ``path`` exactly (``np.save`` would append ``.npy``)"""
+    with open(path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array))
+
+
+def read_faiss_index(faiss_module, path: str):
+    """
+    Read a FAISS index, memory-mapped read-only when the index type supports it
+
+    Returns ``(index, mapped)``; a mapped index must be cloned before ``add``/``train``.
+    """
+    flags = getattr(faiss_module, "IO_FLAG_MMAP", 0)
+    if get_settings().shared_index_mmap and flags:
+        try:
+            return faiss_module.read_index(path, flags | getattr(faiss_module, "IO_FLAG_READ_ONLY", 0)), True
+        except Exception as e:
+            logger.info(f"FAISS cannot memory-map {path} ({e}), loading a private copy")
+    return faiss_module.read_index(path), False
+
+
+def _preload_targets():
+    """(name, loader) pairs for the process-wide index singletons"""
+    def vector_store():
+        from backend.core.vector_store import get_vector_store
+        get_vector_store()
+
+    def memory_system():
+        from backend.core.memory import memory_system
+        memory_system.metadata
+
+    def vector_search():
+        from backend.core.simple_vector_search import vector_search
+        vector_search.metadata
+
+    return [("vector_store", vector_store), ("memory_system", memory_system), ("vector_search", vector_search)]
+
+
+def preload_shared_indexes(freeze: bool = True) -> List[str]:
+    """
+    Build the index singletons in a prefork parent so children share them copy-on-write
+
+    Args:
+        freeze: move everything allocated so far to the permanent GC generation,
+            so collections in the children do not touch (and copy) those pages
+
+    Returns:
+        Names of the singletons that loaded
+    """
+    loaded = []
+    for name, loader in _preload_targets():
+        try:
+            loader()
+            loaded.append(name)
+        except Exception as e:
+            logger.warning(f"Could not preload {name} before fork: {e}")
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    logger.info(f"Preloaded shared index state before fork: {', '.join(loaded) or 'nothing'}")
+    return loaded
+
+
+def register_celery_index_hooks():
+    """Preload the index singletons in the Celery parent before the pool forks (SHARED_INDEX_PRELOAD)"""
+    from celery.signals import worker_init
+
+    @worker_init.connect(weak=False)
+    def _preload_indexes(**kwargs):
+        if get_settings().shared_index_preload:
+            preload_shared_indexes()
@@ -2,7 +2,6 @@
 Simple vector search implementation using NumPy (fallback for FAISS)
 """
 import numpy as np
-import json
 import os
 import uuid
 import logging
@@ -10,6 +9,9 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 from openai import OpenAI
 from backend.core.config import get_settings
+from backend.core.lazy import LazyProxy
+from backend.core.serialization import dump_file, load_file
+from backend.core.shared_index import IndexSnapshots, load_array, save_array
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -20,24 +22,38 @@ class SimpleVectorSearch:
     def __init__(self, dimension: int = 1536, index_path: str = "data/memory"):
         self.dimension = dimension
         self.index_path = index_path
-        self.vectors_file = os.path.join(index_path, "vectors.npy")
-        self.metadata_file = os.path.join(index_path, "metadata.json")
         
         # Initialize OpenAI client
         self.openai_client = OpenAI(api_key=settings.openai_api_key)
         
-        # Create directories
-        os.makedirs(index_path, exist_ok=True)
+        # Versioned snapshots, shared (memory-mapped) between processes
+        self._snapshots = IndexSnapshots(index_path)
         
         # Load or initialize data
+        self._load_snapshot()
+    
+    def _load_snapshot(self):
+        """Load the current snapshot (vectors are mapped read-only, not copied)"""
+        self._version = self._snapshots.current_version()
+        self.vectors_file = self._snapshots.path("vectors.npy", self._version)
+        self.metadata_file = self._snapshots.path("metadata.json", self._version)
         self.vectors = self._load_vectors()
         self.metadata = self._load_metadata()
     
+    def _refresh(self, force: bool = False):
+        """Reload if another process published a newer snapshot"""
+        if force:
+            changed = self._snapshots.current_version() != self._version
+        else:
+            changed = self._snapshots.has_changed(self._version)
+        if changed:
+            self._load_snapshot()
+    
     def _load_vectors(self) -> np.ndarray:
         """Load vectors from disk or create empty array"""
         if os.path.exists(self.vectors_file):
             try:
-                return np.load(self.vectors_file)
+                return load_array(self.vectors_file)
             except Exception as e:
                 logger.error(f"Error loading vectors: {e}")
         return np.empty((0, self.dimension), dtype=np.float32)
@@ -46,20 +62,17 @@ class SimpleVectorSearch:
         """Load metadata from disk or create empty dict"""
         if os.path.exists(self.metadata_file):
             try:
-                with open(self.metadata_file, 'r') as f:
-                    return json.load(f)
+                return load_file(self.metadata_file)
             except Exception as e:
                 logger.error(f"Error loading metadata: {e}")
         return {}
     
-    def _save_vectors(self):
-        """Save vectors to disk"""
-        np.save(self.vectors_file, self.vectors)
-    
-    def _save_metadata(self):
-        """Save metadata to disk"""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.metadata, f, indent=2, default=str)
+    def _publish(self):
+        """Save vectors and metadata as a new snapshot, then map it back in"""
+        with self._snapshots.publish() as directory:
+            save_array(os.path.join(directory, "vectors.npy"), self.vectors)
+            dump_file(os.path.join(directory, "metadata.json"), self.metadata, default=str)
+        self._load_snapshot()
     
     def embed_text(self, text: str) -> np.ndarray:
         """Create embedding for text using OpenAI"""
@@ -87,6 +100,9 @@ class SimpleVectorSearch:
         embedding = self.embed_text(content)
         
         if embedding.any():
+            # Build on the latest published snapshot
+            self._refresh(force=True)
+            
             # Add to vectors array
             if self.vectors.shape[0] == 0:
                 self.vectors = embedding.reshape(1, -1)
@@ -104,8 +120,7 @@ class SimpleVectorSearch:
             }
             
             # Save to disk
-            self._save_vectors()
-            self._save_metadata()
+            self._publish()
             
             return content_id
         
@@ -113,6 +128,7 @@ class SimpleVectorSearch:
     
     def search_similar(self, query: str, top_k: int = 5, threshold: float = 0.7) -> List[Dict]:
         """Search for similar content using cosine similarity"""
+        self._refresh()
         if len(self.vectors) == 0:
             return []
         
@@ -145,6 +161,7 @@ class SimpleVectorSearch:
     
     def get_content_by_type(self, content_type: str, limit: int = 10) -> List[Dict]:
         """Retrieve content by type"""
+        self._refresh()
         results = []
         for idx, meta in self.metadata.items():
             if meta.get('metadata', {}).get('type') == content_type:
@@ -161,6 +178,7 @@ class SimpleVectorSearch:
     
     def get_high_performing_content(self, min_engagement: float = 5.0, limit: int = 10) -> List[Dict]:
         """Retrieve high-performing content for learning"""
+        self._refresh()
         results = []
         for idx, meta in self.metadata.items():
             engagement = meta.get('metadata', {}).get('engagement_rate', 0)
@@ -179,6 +197,7 @@ class SimpleVectorSearch:
     
     def get_content_for_repurposing(self, days_old: int = 30, min_engagement: float = 3.0) -> List[Dict]:
         """Find content suitable for repurposing"""
+        self._refresh()
         from datetime import timedelta
         cutoff_date = datetime.utcnow() - timedelta(days=days_old)
         
@@ -203,6 +222,7 @@ class SimpleVectorSearch:
     
     def analyze_content_patterns(self) -> Dict[str, Any]:
         """Analyze patterns in stored content"""
+        self._refresh()
         if not self.metadata:
             return {'error': 'No content available for analysis'}
         
@@ -253,5 +273,5 @@ class SimpleVectorSearch:
         """Get total number of vectors (compatibility with FAISS API)"""
         return len(self.vectors)
 
-# Global instance
-vector_search = SimpleVectorSearch()
\ No newline at end of file
+# Global instance (built on first use: creates the OpenAI client and loads vectors from disk)
+vector_search = LazyProxy(SimpleVectorSearch)
\ No newline at end of file
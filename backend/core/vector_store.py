@@ -4,13 +4,14 @@ Provides high-performance vector indexing and similarity search for content embe
 """
 
 import os
-import json
 import uuid
 import pickle
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 from backend.core.config import get_utc_now
+from backend.core.serialization import dump_file, dumps, load_file
+from backend.core.shared_index import IndexSnapshots, read_faiss_index
 import logging
 
 try:
@@ -32,6 +33,8 @@ class VectorStore:
     Features:
     - FAISS IndexFlatIP for efficient cosine similarity search
     - Persistent storage with automatic loading/saving
+    - Versioned snapshots shared between worker processes (memory-mapped
+      index where FAISS supports it, atomic publish, reload on change)
     - Batch operations for optimal performance
     - Memory-efficient operations with configurable limits
     """
@@ -57,23 +60,65 @@ class VectorStore:
         self.index_type = index_type
         self.max_vectors_in_memory = max_vectors_in_memory
         
-        # File paths
-        self.index_file = os.path.join(index_path, "faiss.index")
-        self.metadata_file = os.path.join(index_path, "metadata.json")
-        self.id_mapping_file = os.path.join(index_path, "id_mapping.json")
-        self.vectors_file = os.path.join(index_path, "vectors.npz")  # Store vectors for rebuild
-        
-        # Create directory if it doesn't exist
-        os.makedirs(index_path, exist_ok=True)
+        # Versioned snapshots of the index files (creates the directory)
+        self._snapshots = IndexSnapshots(index_path)
         
         # Initialize components
+        self._load_snapshot()
+        
+        logger.info(f"VectorStore initialized with {self.total_vectors} vectors")
+    
+    def _load_snapshot(self):
+        """Load the current snapshot; vectors for rebuilds are read on first use."""
+        self._version = self._snapshots.current_version()
+        
+        # File paths
+        self.index_file = self._snapshots.path("faiss.index", self._version)
+        self.metadata_file = self._snapshots.path("metadata.json", self._version)
+        self.id_mapping_file = self._snapshots.path("id_mapping.json", self._version)
+        self.vectors_file = self._snapshots.path("vectors.npz", self._version)  # Store vectors for rebuild
+        
+        self._index_mapped = False
         self._index = self._create_or_load_index()
         self._metadata = self._load_metadata()
         self._id_mapping = self._load_id_mapping()
-        self._vectors = self._load_vectors()  # Store vectors for deletion/rebuild
+        self._stored_vectors = None  # Loaded by the first deletion/rebuild
         self._next_internal_id = max([int(k) for k in self._id_mapping.keys()] + [-1]) + 1
+        self._dirty = False
+    
+    def _refresh(self, force: bool = False):
+        """
+        Reload if another process published a newer snapshot.
         
-        logger.info(f"VectorStore initialized with {self.total_vectors} vectors")
+        Unpublished local changes are never discarded; ``force`` skips the
+        check throttle (used before mutations).
+        """
+        if self._dirty:
+            return
+        if force:
+            changed = self._snapshots.current_version() != self._version
+        else:
+            changed = self._snapshots.has_changed(self._version)
+        if changed:
+            self._load_snapshot()
+    
+    def _writable_index(self):
+        """Private copy of a memory-mapped index, taken before the first mutation."""
+        if self._index_mapped:
+            self._index = faiss.clone_index(self._index)
+            self._index_mapped = False
+        return self._index
+    
+    @property
+    def _vectors(self) -> Dict[str, np.ndarray]:
+        """Stored vectors for deletion/rebuild (only needed by writers)."""
+        if self._stored_vectors is None:
+            self._stored_vectors = self._load_vectors()
+        return self._stored_vectors
+    
+    @_vectors.setter
+    def _vectors(self, value: Dict[str, np.ndarray]):
+        self._stored_vectors = value
     
     def _create_or_load_index(self):
         """Create new FAISS index or load existing one."""
@@ -84,7 +129,7 @@ class VectorStore:
         # Try to load existing index
         if os.path.exists(self.index_file):
             try:
-                index = faiss.read_index(self.index_file)
+                index, self._index_mapped = read_faiss_index(faiss, self.index_file)
                 logger.info(f"Loaded existing FAISS index with {index.ntotal} vectors")
                 return index
             except Exception as e:
@@ -113,8 +158,7 @@ class VectorStore:
         """Load metadata mapping internal IDs to content information."""
         if os.path.exists(self.metadata_file):
             try:
-                with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return load_file(self.metadata_file)
             except Exception as e:
                 logger.error(f"Failed to load metadata: {e}")
         return {}
@@ -123,40 +167,28 @@ class VectorStore:
         """Load mapping from internal IDs to content IDs."""
         if os.path.exists(self.id_mapping_file):
             try:
-                with open(self.id_mapping_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return load_file(self.id_mapping_file)
             except Exception as e:
                 logger.error(f"Failed to load ID mapping: {e}")
         return {}
     
-    def _save_index(self):
-        """Save FAISS index to disk."""
+    def _save_index(self, directory: str):
+        """Save FAISS index into a snapshot directory."""
         if not FAISS_AVAILABLE or not self._index:
             return
             
-        try:
-            faiss.write_index(self._index, self.index_file)
-            logger.info("FAISS index saved successfully")
-        except Exception as e:
-            logger.error(f"Failed to save index: {e}")
+        faiss.write_index(self._index, os.path.join(directory, "faiss.index"))
+        logger.info("FAISS index saved successfully")
     
-    def _save_metadata(self):
-        """Save metadata to disk."""
-        try:
-            with open(self.metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(self._metadata, f, indent=2, default=str, ensure_ascii=False)
-            logger.info("Metadata saved successfully")
-        except Exception as e:
-            logger.error(f"Failed to save metadata: {e}")
+    def _save_metadata(self, directory: str):
+        """Save metadata into a snapshot directory."""
+        dump_file(os.path.join(directory, "metadata.json"), self._metadata, default=str)
+        logger.info("Metadata saved successfully")
     
-    def _save_id_mapping(self):
-        """Save ID mapping to disk."""
-        try:
-            with open(self.id_mapping_file, 'w', encoding='utf-8') as f:
-                json.dump(self._id_mapping, f, indent=2)
-            logger.info("ID mapping saved successfully")
-        except Exception as e:
-            logger.error(f"Failed to save ID mapping: {e}")
+    def _save_id_mapping(self, directory: str):
+        """Save ID mapping into a snapshot directory."""
+        dump_file(os.path.join(directory, "id_mapping.json"), self._id_mapping)
+        logger.info("ID mapping saved successfully")
     
     def _load_vectors(self) -> Dict[str, np.ndarray]:
         """Load stored vectors from disk."""
@@ -173,27 +205,19 @@ class VectorStore:
                 logger.error(f"Failed to load vectors: {e}")
         return {}
     
-    def _save_vectors(self):
-        """Save vectors to disk for rebuild capability."""
-        try:
-            # Only save vectors for which we have valid metadata
-            valid_vectors = {
-                internal_id: vector 
-                for internal_id, vector in self._vectors.items() 
-                if internal_id in self._metadata
-            }
-            
-            if valid_vectors:
-                np.savez_compressed(self.vectors_file, **valid_vectors)
-                logger.info(f"Saved {len(valid_vectors)} vectors to disk")
-            else:
-                # Remove file if no valid vectors
-                if os.path.exists(self.vectors_file):
-                    os.remove(self.vectors_file)
-                    logger.info("Removed empty vectors file")
-                    
-        except Exception as e:
-            logger.error(f"Failed to save vectors: {e}")
+    def _save_vectors(self, directory: str):
+        """Save vectors into a snapshot directory for rebuild capability."""
+        # Only save vectors for which we have valid metadata
+        valid_vectors = {
+            internal_id: vector 
+            for internal_id, vector in self._vectors.items() 
+            if internal_id in self._metadata
+        }
+        
+        # No file at all if there are no valid vectors
+        if valid_vectors:
+            np.savez_compressed(os.path.join(directory, "vectors.npz"), **valid_vectors)
+            logger.info(f"Saved {len(valid_vectors)} vectors to disk")
     
     def add_vector(
         self, 
@@ -228,8 +252,12 @@ class VectorStore:
             logger.warning(f"Vector norm {norm} != 1.0, normalizing")
             vector = vector / norm
         
+        # Build on the latest published snapshot
+        self._refresh(force=True)
+        
         # Add to index
-        self._index.add(vector.astype(np.float32))
+        self._writable_index().add(vector.astype(np.float32))
+        self._dirty = True
         
         # Store metadata, mapping, and vector for rebuild capability
         internal_id = str(self._next_internal_id)
@@ -288,8 +316,12 @@ class VectorStore:
             logger.warning(f"Normalizing {np.sum(mask)} vectors")
             vectors[mask] = vectors[mask] / norms[mask].reshape(-1, 1)
         
+        # Build on the latest published snapshot
+        self._refresh(force=True)
+        
         # Add to index
-        self._index.add(vectors.astype(np.float32))
+        self._writable_index().add(vectors.astype(np.float32))
+        self._dirty = True
         
         # Store metadata, mappings, and vectors
         for i, (content_id, metadata) in enumerate(zip(content_ids, metadata_list)):
@@ -328,6 +360,7 @@ class VectorStore:
         Returns:
             List of search results with content_id, score, and metadata
         """
+        self._refresh()
         if not FAISS_AVAILABLE or self.total_vectors == 0:
             return []
         
@@ -391,6 +424,8 @@ class VectorStore:
         Returns:
             True if vector was found and removed, False otherwise
         """
+        self._refresh(force=True)
+        
         # Find the internal ID for this content
         internal_id = None
         for iid, cid in self._id_mapping.items():
@@ -406,6 +441,7 @@ class VectorStore:
         self._metadata.pop(internal_id, None)
         self._id_mapping.pop(internal_id, None)
         self._vectors.pop(internal_id, None)
+        self._dirty = True
         
         logger.info(f"Removed vector data for content_id: {content_id}")
         
@@ -415,9 +451,7 @@ class VectorStore:
             logger.info(f"Index rebuilt after removing content_id: {content_id}")
         else:
             # Just save metadata/mapping changes for now
-            self._save_metadata()
-            self._save_id_mapping()
-            self._save_vectors()
+            self._save_all()
             logger.info(f"Vector marked for deletion: {content_id} (rebuild required)")
         
         return True
@@ -474,6 +508,8 @@ class VectorStore:
             'memory_usage_mb': self._estimate_memory_usage(),
             'faiss_available': FAISS_AVAILABLE,
             'is_trained': self.is_trained,
+            'index_memory_mapped': self._index_mapped,
+            **self._snapshots.get_stats(self._version),
             'inconsistencies': inconsistencies,
             'needs_rebuild': len(inconsistencies) > 0
         }
@@ -485,7 +521,7 @@ class VectorStore:
         
         # Rough estimate: vectors + metadata
         vector_size = self.total_vectors * self.dimension * 4  # float32
-        metadata_size = len(json.dumps(self._metadata).encode('utf-8'))
+        metadata_size = len(dumps(self._metadata, default=str))
         return (vector_size + metadata_size) / (1024 * 1024)
     
     def rebuild_index(self):
@@ -522,8 +558,10 @@ class VectorStore:
                 self._index = faiss.IndexIVFFlat(quantizer, self.dimension, 100)
             else:
                 self._index = faiss.IndexFlatIP(self.dimension)
+            self._index_mapped = False
+            self._dirty = True
                 
-            self._save_index()
+            self._save_all()
             logger.info("Empty index created and saved")
             return
         
@@ -557,6 +595,8 @@ class VectorStore:
         
         # Replace the old index
         self._index = new_index
+        self._index_mapped = False
+        self._dirty = True
         
         # Clean up ID mapping - rebuild it sequentially for consistency
         new_id_mapping = {}
@@ -588,11 +628,22 @@ class VectorStore:
         logger.info(f"Memory usage: {self._estimate_memory_usage():.2f} MB")
     
     def _save_all(self):
-        """Save all components to disk."""
-        self._save_index()
-        self._save_metadata()
-        self._save_id_mapping()
-        self._save_vectors()
+        """Publish all components to disk as one new snapshot, then load it back shared."""
+        try:
+            with self._snapshots.publish() as directory:
+                self._save_index(directory)
+                self._save_metadata(directory)
+                self._save_id_mapping(directory)
+                self._save_vectors(directory)
+        except Exception as e:
+            logger.error(f"Failed to save index snapshot: {e}")
+            return
+        
+        vectors = self._stored_vectors
+        self._load_snapshot()
+        if self._version == self._snapshots.last_published:
+            # Our own snapshot: keep the rebuild vectors instead of re-reading them
+            self._stored_vectors = vectors
     
     @property
     def total_vectors(self) -> int:
@@ -615,8 +666,9 @@ class VectorStore:
         
         if hasattr(self._index, 'train') and not self.is_trained:
             logger.info(f"Training index with {training_vectors.shape[0]} vectors")
-            self._index.train(training_vectors.astype(np.float32))
-            self._save_index()
+            self._writable_index().train(training_vectors.astype(np.float32))
+            self._dirty = True
+            self._save_all()
     
     async def similarity_search(
         self, 
@@ -720,9 +772,10 @@ class VectorStore:
             raise
     
     def __del__(self):
-        """Ensure data is saved when object is destroyed."""
+        """Ensure unpublished changes are saved when object is destroyed."""
         try:
-            self._save_all()
+            if self._dirty:
+                self._save_all()
         except:
             pass  # Ignore errors during cleanup
 
@@ -0,0 +1,127 @@
+"""
+Async database engine and session dependency
+
+``get_db`` hands out a synchronous ``Session``, so every query issued from an
+``async def`` handler blocks the event loop and requests queue behind each
+other instead of behind the connection pool. Hot read paths use
+``get_async_db`` instead: an ``AsyncSession`` on an asyncpg engine (aiosqlite
+in tests) that awaits the database and lets the loop serve other requests.
+
+The engine is built on first use from the same ``DATABASE_URL`` as the sync
+engine, so importing this module never requires asyncpg, and is registered
+with ``connection_pool_manager`` under the ``"async"`` pool name. Models,
+``Base`` and the ORM event hooks (principal and response cache invalidation)
+are shared with the sync path.
+"""
+import logging
+from typing import AsyncGenerator, Dict, Optional, Tuple, Any
+
+from fastapi import HTTPException
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def to_async_url(database_url: str) -> Tuple[URL, Dict[str, Any]]:
+    """
+    Async driver URL and ``connect_args`` for a sync database URL
+
+    ``sslmode`` (libpq) is not understood by asyncpg and becomes its ``ssl`` argument.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+
+    connect_args: Dict[str, Any] = {}
+    if backend == "postgresql":
+        sslmode = url.query.get("sslmode")
+        if sslmode:
+            connect_args["ssl"] = sslmode
+            url = url.difference_update_query(["sslmode"])
+        connect_args["server_settings"] = {"application_name": "ai_social_media_agent_async"}
+
+    return url.set(drivername=_ASYNC_DRIVERS[backend]), connect_args
+
+
+def create_async_db_engine(database_url: str, pool_name: str = "async", **engine_kwargs) -> AsyncEngine:
+    """Create an async engine for ``database_url`` and track it in ``connection_pool_manager``"""
+    from backend.services.connection_pool_manager import connection_pool_manager
+
+    settings = get_settings()
+    url, connect_args = to_async_url(database_url)
+    config: Dict[str, Any] = {"connect_args": connect_args, "pool_pre_ping": True}
+    if url.get_backend_name() == "postgresql":
+        config.update({
+            "pool_size": settings.async_db_pool_size,
+            "max_overflow": settings.async_db_max_overflow,
+            "pool_timeout": settings.async_db_pool_timeout_s,
+            "pool_recycle": 3600,
+        })
+    config.update(engine_kwargs)
+
+    engine = create_async_engine(url, **config)
+    connection_pool_manager.register_async_pool(engine, pool_name)
+    return engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """The application's async engine, created on first use"""
+    global _engine
+    if _engine is None:
+        _engine = create_async_db_engine(get_settings().get_database_url())
+    return _engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(
+            get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False  # Attributes stay readable after commit (no implicit IO)
+        )
+    return _sessionmaker
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Database dependency that provides an ``AsyncSession``
+
+    Same contract as ``get_db``: commit after the handler, rollback on errors.
+    Lazy loading is not available on async sessions; load what the response
+    needs in the query.
+    """
+    async with get_async_sessionmaker()() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+
+            # Filter out expected authentication 401s from database error logs
+            if isinstance(e, HTTPException) and e.status_code == 401:
+                raise
+
+            logger.error(f"Async database session error: {str(e)}")
+            raise
+
+
+async def dispose_async_engine() -> None:
+    """Close the async pool (application shutdown)"""
+    global _engine, _sessionmaker
+    if _engine is None:
+        return
+
+    from backend.services.connection_pool_manager import connection_pool_manager
+
+    await connection_pool_manager.close_async_pool("async")
+    _engine, _sessionmaker = None, None
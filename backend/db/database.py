@@ -3,8 +3,10 @@ from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from sqlalchemy.pool import QueuePool
 from typing import Generator
 import logging
-from fastapi import HTTPException
+from fastapi import Depends, HTTPException
 from backend.core.config import get_settings
+from backend.core.response_cache import register_invalidation_hooks
+from backend.db.routing import ReplicaRouter, RoutingSession
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -33,6 +35,9 @@ engine = create_engine(
     }
     )
 
+# Committed content/metrics writes invalidate cached dashboard responses, in API and worker processes alike
+register_invalidation_hooks()
+
 # Add connection pool event listeners for monitoring
 @event.listens_for(engine, "connect")
 def receive_connect(dbapi_connection, connection_record):
@@ -49,7 +54,18 @@ def receive_checkin(dbapi_connection, connection_record):
     """Log connection checkin to pool"""
     logger.debug("Connection checked in to pool")
 
+# Read replicas: reads of read-only sessions and marked queries, primary after any write
+replica_urls = [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()]
+replica_router = ReplicaRouter.from_urls(
+    engine,
+    replica_urls,
+    max_lag_s=settings.replica_max_lag_s,
+    check_interval_s=settings.replica_check_interval_s
+) if replica_urls else None
+
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    router=replica_router,
     autocommit=False, 
     autoflush=False, 
     bind=engine,
@@ -86,6 +102,29 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def get_read_db(db: Session = Depends(get_db)) -> Generator[Session, None, None]:
+    """
+    Database dependency for read-heavy handlers (analytics, exports, search)
+    
+    Plain SELECTs go to a replica when one is configured and within the lag
+    limit. Once the request writes through this session or the ``get_db``
+    session, its reads go to the primary. Without replicas this is the
+    request's ``get_db`` session.
+    """
+    if replica_router is None:
+        yield db
+        return
+    
+    read_db = SessionLocal(read_only=True, linked=db)
+    try:
+        yield read_db
+        read_db.commit()
+    except Exception:
+        read_db.rollback()
+        raise
+    finally:
+        read_db.close()
+
 def get_db_connection_info():
     """Get current database connection pool information"""
     try:
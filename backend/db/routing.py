@@ -0,0 +1,204 @@
+"""
+Read-replica routing for ORM sessions
+
+Analytics aggregations, exports and search used to share the primary's pool
+with publishing and webhook writes. ``RoutingSession`` picks an engine per
+statement:
+- writes (flushes, INSERT/UPDATE/DELETE, ``SELECT ... FOR UPDATE``, anything
+  that is not a plain SELECT) go to the primary and make the session sticky
+- once a session (or the request session it is linked to) has written, all
+  its reads go to the primary too (read-your-writes for the request)
+- SELECTs go to a replica in read-only sessions (``get_read_db``) or when
+  marked with ``.execution_options(use_replica=True)``; ``use_replica=False``
+  keeps a read on the primary even in a read-only session
+- everything else goes to the primary
+
+``ReplicaRouter`` hands out replicas round-robin and skips those lagging
+more than ``max_lag_s`` (measured at most every ``check_interval_s``) or
+failing their lag probe; with none available the read falls back to the
+primary. Replicas are configured with ``DATABASE_REPLICA_URLS``; without it
+sessions never leave the primary.
+"""
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import Select
+
+logger = logging.getLogger(__name__)
+
+REPLICA_OPTION = "use_replica"
+_WROTE_KEY = "routing_wrote"
+
+# Seconds behind the primary; 0 when every received WAL record is replayed
+# (an idle primary leaves the last replay timestamp arbitrarily old)
+_POSTGRES_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def measure_replication_lag(engine: Engine) -> float:
+    """Replication lag of ``engine`` in seconds (0 for databases without replication)"""
+    if engine.dialect.name != "postgresql":
+        return 0.0
+    with engine.connect() as conn:
+        return float(conn.execute(_POSTGRES_LAG_SQL).scalar() or 0.0)
+
+
+@dataclass
+class ReplicaState:
+    """Last known health of one replica"""
+    name: str
+    engine: Engine
+    healthy: bool = True
+    lag_s: Optional[float] = None
+    error: Optional[str] = None
+    reads: int = 0
+
+
+class ReplicaRouter:
+    """Chooses a replica for routed reads, skipping lagging or failing ones"""
+
+    def __init__(
+        self,
+        replicas: Dict[str, Engine],
+        max_lag_s: float = 5.0,
+        check_interval_s: float = 2.0,
+        lag_probe: Callable[[Engine], float] = measure_replication_lag
+    ):
+        self.max_lag_s = max_lag_s
+        self.check_interval_s = check_interval_s
+        self.lag_probe = lag_probe
+        self.replicas = [ReplicaState(name, engine) for name, engine in replicas.items()]
+        self.fallbacks = 0
+
+        self._cycle = itertools.cycle(self.replicas)
+        self._checked_at: Optional[float] = None
+        self._check_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_urls(
+        cls,
+        primary: Engine,
+        replica_urls: List[str],
+        max_lag_s: float = 5.0,
+        check_interval_s: float = 2.0
+    ) -> "ReplicaRouter":
+        """Build replica engines and register every engine with the pool monitoring"""
+        from backend.db.database_optimized import create_optimized_engine
+        from backend.services.connection_pool_manager import connection_pool_manager
+
+        replicas = {f"replica-{i}": create_optimized_engine(url) for i, url in enumerate(replica_urls, 1)}
+        connection_pool_manager.register_pool(primary, "primary")
+        for name, engine in replicas.items():
+            connection_pool_manager.register_pool(engine, name)
+
+        logger.info(f"Read replica routing enabled: {', '.join(replicas)} (max lag {max_lag_s}s)")
+        return cls(replicas, max_lag_s=max_lag_s, check_interval_s=check_interval_s)
+
+    def reader(self) -> Optional[Engine]:
+        """Engine for a routed read, or None to use the primary"""
+        self.refresh()
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = next(self._cycle)
+                if replica.healthy:
+                    replica.reads += 1
+                    return replica.engine
+            self.fallbacks += 1
+        return None
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-measure replica lag if ``check_interval_s`` has passed (one thread at a time)"""
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.check_interval_s:
+            return
+        if not self._check_lock.acquire(blocking=force):
+            # Another thread is measuring; use the last known state
+            return
+
+        try:
+            for replica in self.replicas:
+                try:
+                    replica.lag_s = self.lag_probe(replica.engine)
+                    replica.error = None
+                    replica.healthy = replica.lag_s <= self.max_lag_s
+                    if not replica.healthy:
+                        logger.warning(f"Replica '{replica.name}' is {replica.lag_s:.1f}s behind; reading from primary")
+                except Exception as e:
+                    replica.healthy, replica.lag_s, replica.error = False, None, str(e)
+                    logger.warning(f"Replica '{replica.name}' unavailable; reading from primary: {e}")
+            self._checked_at = time.monotonic()
+        finally:
+            self._check_lock.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_lag_s": self.max_lag_s,
+            "fallbacks": self.fallbacks,
+            "replicas": {
+                replica.name: {
+                    "healthy": replica.healthy,
+                    "lag_s": replica.lag_s,
+                    "error": replica.error,
+                    "reads": replica.reads,
+                }
+                for replica in self.replicas
+            },
+        }
+
+
+class RoutingSession(Session):
+    """
+    Session that sends eligible reads to replicas
+
+    Args:
+        router: replicas to read from (None: always the primary)
+        read_only: route every plain SELECT to a replica
+        linked: request session whose writes also make this session sticky
+    """
+
+    def __init__(
+        self,
+        *args,
+        router: Optional[ReplicaRouter] = None,
+        read_only: bool = False,
+        linked: Optional[Session] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self.read_only = read_only
+        self.linked = linked
+
+    @property
+    def wrote(self) -> bool:
+        """Whether this session or its linked session has written"""
+        return bool(self.info.get(_WROTE_KEY) or (self.linked is not None and self.linked.info.get(_WROTE_KEY)))
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        use_replica = kw.pop(REPLICA_OPTION, None)
+        if self.router is None:
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        if self._flushing or not isinstance(clause, Select) or clause._for_update_arg is not None:
+            self.info[_WROTE_KEY] = True
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        if use_replica is None:
+            use_replica = clause._execution_options.get(REPLICA_OPTION)
+        if use_replica is False or self.wrote or not (use_replica or self.read_only):
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        replica = self.router.reader()
+        return replica if replica is not None else super().get_bind(mapper, clause=clause, **kw)
@@ -0,0 +1,72 @@
+"""
+Database schema safety net, kept out of the request-serving path
+
+The ``ensure_*`` checks and the AI suggestions auto-migration used to run while
+``app.py`` was being imported, so every worker waited on them before serving.
+They now run:
+- as a release step: ``python -m backend.db.schema_checks`` (start_production.sh)
+- or from the app's startup hook, per ``SCHEMA_CHECKS_ON_STARTUP``:
+  ``background`` (default, daemon thread), ``blocking`` or ``off``
+
+Migrations should still be run separately; these checks are idempotent.
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CHECK_MODES = ("background", "blocking", "off")
+
+
+def run_schema_checks() -> None:
+    """Run every schema safety-net check, logging (not raising) failures"""
+    # Database schema safety net (migrations should be run separately)
+    try:
+        from backend.db.ensure_columns import ensure_user_columns, ensure_notifications_table, ensure_content_logs_table, ensure_social_inbox_tables
+        logger.info("Running database schema safety net...")
+
+        # Only run safety net for critical tables
+        ensure_user_columns()
+        ensure_notifications_table()
+        ensure_content_logs_table()
+        ensure_social_inbox_tables()
+
+        logger.info("✅ Database schema safety net completed")
+
+    except Exception as e:
+        logger.warning(f"⚠️ Schema safety net warnings: {e}")
+        logger.info("App will continue - database tables may need manual creation")
+
+    # AI Suggestions Performance Fix - Auto-migration
+    try:
+        from backend.db.auto_migrate import init_database_schema
+        logger.info("🚀 Initializing AI suggestions performance fix...")
+        init_database_schema()
+        logger.info("✅ AI suggestions performance optimization completed")
+    except Exception as e:
+        logger.warning(f"⚠️ AI suggestions auto-migration warnings: {e}")
+        logger.info("AI suggestions may be slower until database schema is updated manually")
+
+
+def start_schema_checks(mode: str = "background") -> None:
+    """
+    Run the schema checks according to ``mode``
+
+    Args:
+        mode: ``background`` (daemon thread), ``blocking`` (now) or ``off``
+    """
+    if mode not in SCHEMA_CHECK_MODES:
+        logger.warning(f"Unknown schema check mode '{mode}', expected one of {SCHEMA_CHECK_MODES}; running in background")
+        mode = "background"
+
+    if mode == "off":
+        logger.info("Schema checks on startup disabled (run `python -m backend.db.schema_checks` as a release step)")
+    elif mode == "blocking":
+        run_schema_checks()
+    else:
+        threading.Thread(target=run_schema_checks, name="schema-checks", daemon=True).start()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_schema_checks()
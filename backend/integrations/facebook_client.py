@@ -15,6 +15,8 @@ from dataclasses import dataclass
 from enum import Enum
 
 from backend.core.config import get_settings
+from backend.services.http_transport import shared_transport
+from backend.services.meta_graph_batch import GraphBatchExecutor
 from backend.auth.social_oauth import oauth_manager
 
 settings = get_settings()
@@ -215,7 +217,7 @@ class FacebookAPIClient:
             "User-Agent": "AI-Social-Media-Agent/1.0"
         }
         
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with httpx.AsyncClient(timeout=120.0, transport=shared_transport("meta")) as client:
             try:
                 if method.upper() == "GET":
                     response = await client.get(url, headers=headers, params=params)
@@ -697,6 +699,57 @@ class FacebookAPIClient:
         """
         endpoint = self.endpoints["post_insights"].format(post_id=post_id)
         
+        try:
+            response = await self._make_request(
+                "GET", endpoint, access_token, params=self._post_insights_params(metrics)
+            )
+            return self._parse_post_insights(post_id, response)
+            
+        except Exception as e:
+            logger.warning(f"Failed to get Facebook insights: {e}")
+            return self._empty_post_insights(post_id)
+    
+    async def get_posts_insights(
+        self,
+        access_token: str,
+        post_ids: List[str],
+        metrics: Optional[List[str]] = None
+    ) -> Dict[str, FacebookInsights]:
+        """
+        Get insights for many Facebook posts using Graph batch requests
+        
+        Up to 50 posts share one HTTP request; a post whose insights fail gets
+        empty insights, as with get_post_insights.
+        
+        Args:
+            access_token: Facebook access token
+            post_ids: Facebook post IDs
+            metrics: Specific metrics to retrieve
+            
+        Returns:
+            Insights keyed by post ID
+        """
+        params = self._post_insights_params(metrics)
+        
+        async with GraphBatchExecutor(access_token=access_token, graph_version=self.api_version) as batch:
+            futures = {
+                post_id: batch.submit("GET", self.endpoints["post_insights"].format(post_id=post_id), params=params)
+                for post_id in dict.fromkeys(post_ids)
+            }
+        
+        insights = {}
+        for post_id, future in futures.items():
+            try:
+                insights[post_id] = self._parse_post_insights(post_id, future.result())
+            except Exception as e:
+                logger.warning(f"Failed to get Facebook insights for {post_id}: {e}")
+                insights[post_id] = self._empty_post_insights(post_id)
+        
+        logger.info(f"Fetched insights for {len(insights)} Facebook posts in {batch.stats['batch_requests']} batch requests")
+        return insights
+    
+    def _post_insights_params(self, metrics: Optional[List[str]] = None) -> Dict[str, str]:
+        """Query parameters for post insights"""
         # Default metrics
         if not metrics:
             metrics = [
@@ -709,69 +762,67 @@ class FacebookAPIClient:
                 "post_negative_feedback"
             ]
         
-        params = {
+        return {
             "metric": ",".join(metrics),
             "period": "lifetime"
         }
-        
-        try:
-            response = await self._make_request("GET", endpoint, access_token, params=params)
-            
-            # Parse insights data
-            insights_data = {}
-            for insight in response.get("data", []):
-                metric_name = insight.get("name")
-                values = insight.get("values", [])
-                if values:
-                    value = values[0].get("value")
-                    if isinstance(value, dict):
-                        # For metrics like reactions_by_type
-                        insights_data[metric_name] = sum(value.values()) if value else 0
-                    else:
-                        insights_data[metric_name] = value or 0
-            
-            # Calculate total engagement
-            reactions = insights_data.get("post_reactions_by_type_total", 0)
-            comments = 0  # Will need separate API call for comments
-            shares = 0    # Will need separate API call for shares
-            engagement = reactions + comments + shares
-            
-            return FacebookInsights(
-                post_id=post_id,
-                impressions=insights_data.get("post_impressions", 0),
-                reach=insights_data.get("post_reach", 0),
-                engagement=engagement,
-                reactions=reactions,
-                comments=comments,
-                shares=shares,
-                clicks=insights_data.get("post_clicks", 0),
-                video_views=insights_data.get("post_video_views"),
-                story_completions=insights_data.get("post_story_completions"),
-                post_consumptions=insights_data.get("post_consumptions", 0),
-                post_engaged_users=insights_data.get("post_engaged_users", 0),
-                negative_feedback=insights_data.get("post_negative_feedback", 0),
-                fetched_at=datetime.utcnow()
-            )
-            
-        except Exception as e:
-            logger.warning(f"Failed to get Facebook insights: {e}")
-            # Return empty insights
-            return FacebookInsights(
-                post_id=post_id,
-                impressions=0,
-                reach=0,
-                engagement=0,
-                reactions=0,
-                comments=0,
-                shares=0,
-                clicks=0,
-                video_views=None,
-                story_completions=None,
-                post_consumptions=0,
-                post_engaged_users=0,
-                negative_feedback=0,
-                fetched_at=datetime.utcnow()
-            )
+    
+    def _parse_post_insights(self, post_id: str, response: Dict[str, Any]) -> FacebookInsights:
+        """Build FacebookInsights from a post insights response"""
+        # Parse insights data
+        insights_data = {}
+        for insight in response.get("data", []):
+            metric_name = insight.get("name")
+            values = insight.get("values", [])
+            if values:
+                value = values[0].get("value")
+                if isinstance(value, dict):
+                    # For metrics like reactions_by_type
+                    insights_data[metric_name] = sum(value.values()) if value else 0
+                else:
+                    insights_data[metric_name] = value or 0
+        
+        # Calculate total engagement
+        reactions = insights_data.get("post_reactions_by_type_total", 0)
+        comments = 0  # Will need separate API call for comments
+        shares = 0    # Will need separate API call for shares
+        engagement = reactions + comments + shares
+        
+        return FacebookInsights(
+            post_id=post_id,
+            impressions=insights_data.get("post_impressions", 0),
+            reach=insights_data.get("post_reach", 0),
+            engagement=engagement,
+            reactions=reactions,
+            comments=comments,
+            shares=shares,
+            clicks=insights_data.get("post_clicks", 0),
+            video_views=insights_data.get("post_video_views"),
+            story_completions=insights_data.get("post_story_completions"),
+            post_consumptions=insights_data.get("post_consumptions", 0),
+            post_engaged_users=insights_data.get("post_engaged_users", 0),
+            negative_feedback=insights_data.get("post_negative_feedback", 0),
+            fetched_at=datetime.utcnow()
+        )
+    
+    def _empty_post_insights(self, post_id: str) -> FacebookInsights:
+        """Empty insights returned when the API call fails"""
+        return FacebookInsights(
+            post_id=post_id,
+            impressions=0,
+            reach=0,
+            engagement=0,
+            reactions=0,
+            comments=0,
+            shares=0,
+            clicks=0,
+            video_views=None,
+            story_completions=None,
+            post_consumptions=0,
+            post_engaged_users=0,
+            negative_feedback=0,
+            fetched_at=datetime.utcnow()
+        )
     
     async def get_page_posts(
         self,
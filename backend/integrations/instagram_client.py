@@ -2,6 +2,7 @@
 Instagram API Client with OAuth 2.0 Support
 Handles authentication, posting, and metrics collection for Instagram platform
 """
+import asyncio
 import os
 import logging
 from typing import Dict, Any, Optional, List, Tuple
@@ -11,12 +12,13 @@ import time
 from dataclasses import dataclass
 from enum import Enum
 
+import httpx
 import requests
-from requests.auth import HTTPBasicAuth
 from requests_oauthlib import OAuth2Session
 
 from backend.core.token_encryption import get_token_manager
 from backend.core.audit_logger import log_content_event, AuditEventType
+from backend.services.http_transport import run_blocking, shared_transport
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +44,7 @@ class InstagramPost:
     created_at: datetime
     engagement_metrics: Dict[str, int]
 
-class InstagramClient:
+class AsyncInstagramClient:
     """
     Instagram API client with OAuth 2.0 authentication and comprehensive features
     
@@ -55,12 +57,16 @@ class InstagramClient:
     
     Note: Uses Instagram Basic Display API for personal accounts.
     For business accounts, use Instagram Graph API which requires Facebook Business approval.
+    
+    All network calls are coroutines on the shared pooled "meta" transport, so
+    they never block the event loop. Use InstagramClient from synchronous code.
     """
     
     # Instagram Graph API endpoints (Meta/Facebook)
     BASE_URL = "https://graph.instagram.com"
     FACEBOOK_OAUTH_URL = "https://www.facebook.com/v18.0/dialog/oauth"
     FACEBOOK_TOKEN_URL = "https://graph.facebook.com/v18.0/oauth/access_token"
+    GRAPH_URL = "https://graph.facebook.com/v18.0"
     
     # Instagram API limits
     MAX_CAPTION_LENGTH = 2200
@@ -82,7 +88,6 @@ class InstagramClient:
             logger.warning("Instagram OAuth credentials not provided. Set INSTAGRAM_CLIENT_ID and INSTAGRAM_CLIENT_SECRET environment variables.")
         
         self.token_manager = get_token_manager()
-        self.session = requests.Session()
         
         # Rate limiting tracking
         self.rate_limits = {}
@@ -90,6 +95,11 @@ class InstagramClient:
         
         logger.info("Instagram client initialized")
     
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request on the shared Meta transport"""
+        async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
+            return await client.request(method, url, **kwargs)
+    
     def get_oauth_authorization_url(self, redirect_uri: str, state: Optional[str] = None) -> Tuple[str, str]:
         """
         Get OAuth 2.0 authorization URL for user consent
@@ -121,7 +131,7 @@ class InstagramClient:
             logger.error(f"Failed to generate Instagram OAuth authorization URL: {e}")
             raise InstagramAPIError(f"OAuth authorization URL generation failed: {e}")
     
-    def exchange_code_for_tokens(self, authorization_code: str, redirect_uri: str) -> Dict[str, Any]:
+    async def exchange_code_for_tokens(self, authorization_code: str, redirect_uri: str) -> Dict[str, Any]:
         """
         Exchange authorization code for access and refresh tokens
         
@@ -141,7 +151,8 @@ class InstagramClient:
                 "client_secret": self.client_secret
             }
             
-            response = requests.post(
+            response = await self._request(
+                "POST",
                 self.FACEBOOK_TOKEN_URL,
                 data=token_data,
                 headers={"Content-Type": "application/x-www-form-urlencoded"}
@@ -155,7 +166,7 @@ class InstagramClient:
             
             # Exchange short-lived token for long-lived token
             if "access_token" in token_response:
-                long_lived_token = self._get_long_lived_token(token_response["access_token"])
+                long_lived_token = await self._get_long_lived_token(token_response["access_token"])
                 if long_lived_token:
                     token_response.update(long_lived_token)
             
@@ -166,7 +177,7 @@ class InstagramClient:
             logger.error(f"Instagram token exchange failed: {e}")
             raise InstagramAPIError(f"Token exchange failed: {e}")
     
-    def _get_long_lived_token(self, short_lived_token: str) -> Optional[Dict[str, Any]]:
+    async def _get_long_lived_token(self, short_lived_token: str) -> Optional[Dict[str, Any]]:
         """
         Exchange short-lived access token for long-lived token (60 days)
         
@@ -177,8 +188,9 @@ class InstagramClient:
             Long-lived token data or None if exchange fails
         """
         try:
-            response = requests.get(
-                "https://graph.facebook.com/v18.0/oauth/access_token",
+            response = await self._request(
+                "GET",
+                self.FACEBOOK_TOKEN_URL,
                 params={
                     "grant_type": "fb_exchange_token",
                     "client_id": self.client_id,
@@ -200,15 +212,6 @@ class InstagramClient:
             logger.error(f"Failed to get long-lived Instagram token: {e}")
             return None
     
-    def _get_authenticated_session(self, access_token: str) -> requests.Session:
-        """Get authenticated requests session"""
-        session = requests.Session()
-        session.headers.update({
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        })
-        return session
-    
     def _check_rate_limit(self, endpoint: str) -> bool:
         """
         Check if we're within rate limits for an endpoint
@@ -231,7 +234,7 @@ class InstagramClient:
         remaining = rate_limit_info.get("remaining", 1)
         return remaining > 0
     
-    def _update_rate_limit(self, endpoint: str, response: requests.Response):
+    def _update_rate_limit(self, endpoint: str, response: httpx.Response):
         """Update rate limit tracking from API response headers"""
         headers = response.headers
         
@@ -242,7 +245,7 @@ class InstagramClient:
             "reset_time": int(time.time()) + 3600  # Assume 1 hour reset
         }
     
-    def get_user_info(self, access_token: str) -> Dict[str, Any]:
+    async def get_user_info(self, access_token: str) -> Dict[str, Any]:
         """
         Get authenticated user information
         
@@ -253,12 +256,14 @@ class InstagramClient:
             Dictionary containing user information
         """
         try:
-            # First get user's pages to find Instagram account
-            pages_response = requests.get(
-                "https://graph.facebook.com/v18.0/me/accounts",
+            # Expand each page's linked Instagram account in the pages call itself
+            # instead of one lookup per page
+            pages_response = await self._request(
+                "GET",
+                f"{self.GRAPH_URL}/me/accounts",
                 params={
                     "access_token": access_token,
-                    "fields": "id,name,access_token"
+                    "fields": "id,name,access_token,instagram_business_account"
                 }
             )
             
@@ -273,28 +278,18 @@ class InstagramClient:
             page_access_token = None
             
             for page in pages_data.get("data", []):
-                # Get Instagram account connected to this page
-                ig_response = requests.get(
-                    f"https://graph.facebook.com/v18.0/{page['id']}",
-                    params={
-                        "access_token": page["access_token"],
-                        "fields": "instagram_business_account"
-                    }
-                )
-                
-                if ig_response.status_code == 200:
-                    ig_data = ig_response.json()
-                    if "instagram_business_account" in ig_data:
-                        instagram_account_id = ig_data["instagram_business_account"]["id"]
-                        page_access_token = page["access_token"]
-                        break
+                if "instagram_business_account" in page:
+                    instagram_account_id = page["instagram_business_account"]["id"]
+                    page_access_token = page["access_token"]
+                    break
             
             if not instagram_account_id:
                 raise InstagramAPIError("No Instagram Business Account found")
             
             # Get Instagram account details
-            response = requests.get(
-                f"https://graph.facebook.com/v18.0/{instagram_account_id}",
+            response = await self._request(
+                "GET",
+                f"{self.GRAPH_URL}/{instagram_account_id}",
                 params={
                     "access_token": page_access_token,
                     "fields": "id,username,name,profile_picture_url,followers_count,follows_count,media_count"
@@ -327,7 +322,7 @@ class InstagramClient:
             logger.error(f"Failed to get Instagram user info: {e}")
             raise InstagramAPIError(f"Failed to get user info: {e}")
     
-    def create_media_container(self, access_token: str, image_url: str, caption: str, instagram_account_id: str) -> str:
+    async def create_media_container(self, access_token: str, image_url: str, caption: str, instagram_account_id: str) -> str:
         """
         Create a media container for posting
         
@@ -346,8 +341,9 @@ class InstagramClient:
                 raise InstagramAPIError(f"Caption too long: {len(caption)} > {self.MAX_CAPTION_LENGTH}")
             
             # Create media container
-            response = requests.post(
-                f"https://graph.facebook.com/v18.0/{instagram_account_id}/media",
+            response = await self._request(
+                "POST",
+                f"{self.GRAPH_URL}/{instagram_account_id}/media",
                 params={
                     "access_token": access_token,
                     "image_url": image_url,
@@ -369,7 +365,7 @@ class InstagramClient:
             logger.error(f"Failed to create Instagram media container: {e}")
             raise InstagramAPIError(f"Failed to create media container: {e}")
     
-    def publish_media(self, access_token: str, container_id: str, instagram_account_id: str, user_id: int) -> Dict[str, Any]:
+    async def publish_media(self, access_token: str, container_id: str, instagram_account_id: str, user_id: int) -> Dict[str, Any]:
         """
         Publish a media container to Instagram
         
@@ -388,8 +384,9 @@ class InstagramClient:
                 raise InstagramAPIError("Rate limit exceeded for media publish endpoint")
             
             # Publish media
-            response = requests.post(
-                f"https://graph.facebook.com/v18.0/{instagram_account_id}/media_publish",
+            response = await self._request(
+                "POST",
+                f"{self.GRAPH_URL}/{instagram_account_id}/media_publish",
                 params={
                     "access_token": access_token,
                     "creation_id": container_id
@@ -442,7 +439,7 @@ class InstagramClient:
             
             raise InstagramAPIError(f"Failed to publish media: {e}")
     
-    def post_image(self, access_token: str, image_url: str, caption: str, user_id: int) -> Dict[str, Any]:
+    async def post_image(self, access_token: str, image_url: str, caption: str, user_id: int) -> Dict[str, Any]:
         """
         Post an image to Instagram (combines container creation and publishing)
         
@@ -457,12 +454,12 @@ class InstagramClient:
         """
         try:
             # Get user info to get Instagram account ID and page token
-            user_info = self.get_user_info(access_token)
+            user_info = await self.get_user_info(access_token)
             instagram_account_id = user_info["id"]
             page_access_token = user_info["page_access_token"]
             
             # Create media container
-            container_id = self.create_media_container(
+            container_id = await self.create_media_container(
                 page_access_token, 
                 image_url, 
                 caption, 
@@ -470,11 +467,10 @@ class InstagramClient:
             )
             
             # Wait for media processing (Instagram requirement)
-            import time
-            time.sleep(2)  # Wait for Instagram processing
+            await asyncio.sleep(2)
             
             # Publish media
-            publish_result = self.publish_media(
+            publish_result = await self.publish_media(
                 page_access_token,
                 container_id,
                 instagram_account_id,
@@ -493,7 +489,7 @@ class InstagramClient:
             logger.error(f"Failed to post Instagram image: {e}")
             raise InstagramAPIError(f"Failed to post image: {e}")
     
-    def get_post_metrics(self, access_token: str, post_id: str) -> Dict[str, Any]:
+    async def get_post_metrics(self, access_token: str, post_id: str) -> Dict[str, Any]:
         """
         Get engagement metrics for a specific Instagram post
         
@@ -510,8 +506,9 @@ class InstagramClient:
                 raise InstagramAPIError("Rate limit exceeded for insights endpoint")
             
             # Get post insights
-            response = requests.get(
-                f"https://graph.facebook.com/v18.0/{post_id}/insights",
+            response = await self._request(
+                "GET",
+                f"{self.GRAPH_URL}/{post_id}/insights",
                 params={
                     "access_token": access_token,
                     "metric": "impressions,reach,likes,comments,saves,shares"
@@ -587,7 +584,7 @@ class InstagramClient:
                 "error": str(e)
             }
     
-    def validate_connection(self, access_token: str) -> Dict[str, Any]:
+    async def validate_connection(self, access_token: str) -> Dict[str, Any]:
         """
         Validate Instagram connection by making a test API call
         
@@ -599,7 +596,7 @@ class InstagramClient:
         """
         try:
             # Test connection by getting user info
-            user_info = self.get_user_info(access_token)
+            user_info = await self.get_user_info(access_token)
             
             return {
                 "is_valid": True,
@@ -697,6 +694,64 @@ class InstagramClient:
         return text.strip()
 
 
+class InstagramClient:
+    """
+    Blocking wrapper around AsyncInstagramClient for Celery tasks and scripts
+    
+    Each network call runs the async client to completion; do not use from async code.
+    """
+    
+    BASE_URL = AsyncInstagramClient.BASE_URL
+    GRAPH_URL = AsyncInstagramClient.GRAPH_URL
+    MAX_CAPTION_LENGTH = AsyncInstagramClient.MAX_CAPTION_LENGTH
+    SUPPORTED_IMAGE_FORMATS = AsyncInstagramClient.SUPPORTED_IMAGE_FORMATS
+    SUPPORTED_VIDEO_FORMATS = AsyncInstagramClient.SUPPORTED_VIDEO_FORMATS
+    
+    def __init__(self, client_id: Optional[str] = None, client_secret: Optional[str] = None,
+                 async_client: Optional[AsyncInstagramClient] = None):
+        self.async_client = async_client or AsyncInstagramClient(client_id, client_secret)
+    
+    @property
+    def rate_limits(self) -> Dict[str, Dict[str, int]]:
+        return self.async_client.rate_limits
+    
+    def get_oauth_authorization_url(self, redirect_uri: str, state: Optional[str] = None) -> Tuple[str, str]:
+        return self.async_client.get_oauth_authorization_url(redirect_uri, state)
+    
+    def exchange_code_for_tokens(self, authorization_code: str, redirect_uri: str) -> Dict[str, Any]:
+        return run_blocking(self.async_client.exchange_code_for_tokens(authorization_code, redirect_uri))
+    
+    def get_user_info(self, access_token: str) -> Dict[str, Any]:
+        return run_blocking(self.async_client.get_user_info(access_token))
+    
+    def create_media_container(self, access_token: str, image_url: str, caption: str, instagram_account_id: str) -> str:
+        return run_blocking(self.async_client.create_media_container(access_token, image_url, caption, instagram_account_id))
+    
+    def publish_media(self, access_token: str, container_id: str, instagram_account_id: str, user_id: int) -> Dict[str, Any]:
+        return run_blocking(self.async_client.publish_media(access_token, container_id, instagram_account_id, user_id))
+    
+    def post_image(self, access_token: str, image_url: str, caption: str, user_id: int) -> Dict[str, Any]:
+        return run_blocking(self.async_client.post_image(access_token, image_url, caption, user_id))
+    
+    def get_post_metrics(self, access_token: str, post_id: str) -> Dict[str, Any]:
+        return run_blocking(self.async_client.get_post_metrics(access_token, post_id))
+    
+    def validate_connection(self, access_token: str) -> Dict[str, Any]:
+        return run_blocking(self.async_client.validate_connection(access_token))
+    
+    def validate_post_content(self, caption: str, image_url: str) -> Tuple[bool, str]:
+        return self.async_client.validate_post_content(caption, image_url)
+    
+    def extract_hashtags(self, text: str) -> List[str]:
+        return self.async_client.extract_hashtags(text)
+    
+    def extract_mentions(self, text: str) -> List[str]:
+        return self.async_client.extract_mentions(text)
+    
+    def optimize_for_instagram(self, text: str) -> str:
+        return self.async_client.optimize_for_instagram(text)
+
+
 # Helper functions for common operations
 
 def create_instagram_client() -> InstagramClient:
@@ -722,5 +777,6 @@ def validate_image_url(url: str) -> bool:
     except Exception:
         return False
 
-# Global Instagram client instance
-instagram_client = InstagramClient()
\ No newline at end of file
+# Global Instagram client instances (async for the API/services, blocking for Celery)
+async_instagram_client = AsyncInstagramClient()
+instagram_client = InstagramClient(async_client=async_instagram_client)
\ No newline at end of file
@@ -5,12 +5,13 @@ This client uses the unified Meta Graph API v22.0 to handle both Facebook and In
 through a single integration point, replacing separate Facebook/Instagram clients.
 """
 import logging
-import aiohttp
+import httpx
 import asyncio
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
 from backend.core.config import get_settings
+from backend.services.http_transport import shared_transport
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -48,13 +49,12 @@ class MetaGraphAPIClient:
         params['access_token'] = self.access_token
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
                 if method.upper() == 'GET':
-                    async with session.get(url, params=params) as response:
-                        result = await response.json()
+                    response = await client.get(url, params=params)
                 else:
-                    async with session.request(method, url, params=params, data=data) as response:
-                        result = await response.json()
+                    response = await client.request(method, url, params=params, data=data)
+                result = response.json()
                 
                 # Check for API errors
                 if 'error' in result:
@@ -12,6 +12,8 @@ from dataclasses import dataclass, asdict
 from functools import wraps
 import logging
 
+from backend.services.http_transport import ConnectionPool
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -196,69 +198,6 @@ class PerformanceCache:
         self.set(platform, operation, data, **kwargs)
         logger.info(f"Cache warmed: {platform}_{operation}")
 
-class ConnectionPool:
-    """
-    HTTP connection pool manager for social media APIs
-    Provides connection reuse and rate limiting coordination
-    """
-    
-    def __init__(self, max_connections: int = 100, max_keepalive: int = 20):
-        """
-        Initialize connection pool
-        
-        Args:
-            max_connections: Maximum total connections
-            max_keepalive: Maximum keepalive connections per host
-        """
-        self.max_connections = max_connections
-        self.max_keepalive = max_keepalive
-        self.pools: Dict[str, Any] = {}
-        self.connection_stats = {
-            "total_connections": 0,
-            "active_connections": 0,
-            "connection_reuse": 0,
-            "connection_timeouts": 0
-        }
-        
-        logger.info(f"Connection pool initialized: max_connections={max_connections}")
-    
-    async def get_client(self, platform: str, timeout: int = 30):
-        """Get optimized HTTP client for platform"""
-        import httpx
-        
-        if platform not in self.pools:
-            limits = httpx.Limits(
-                max_connections=self.max_connections,
-                max_keepalive_connections=self.max_keepalive
-            )
-            
-            timeout_config = httpx.Timeout(timeout)
-            
-            self.pools[platform] = httpx.AsyncClient(
-                limits=limits,
-                timeout=timeout_config,
-                http2=True  # Enable HTTP/2 for better performance
-            )
-            
-            logger.info(f"Created new connection pool for {platform}")
-        
-        return self.pools[platform]
-    
-    async def close_all(self):
-        """Close all connection pools"""
-        for platform, client in self.pools.items():
-            await client.aclose()
-            logger.info(f"Closed connection pool for {platform}")
-        
-        self.pools.clear()
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """Get connection pool statistics"""
-        return {
-            **self.connection_stats,
-            "active_pools": len(self.pools)
-        }
-
 class RateLimiter:
     """
     Advanced rate limiter with platform-specific limits and burst handling
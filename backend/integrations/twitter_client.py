@@ -10,12 +10,12 @@ import json
 import hashlib
 import time
 
-import requests
-from requests.auth import HTTPBasicAuth
+import httpx
 from requests_oauthlib import OAuth2Session
 
 from backend.core.token_encryption import get_token_manager
 from backend.core.audit_logger import log_content_event, AuditEventType
+from backend.services.http_transport import run_blocking, shared_transport
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +23,7 @@ class TwitterAPIError(Exception):
     """Custom exception for Twitter API errors"""
     pass
 
-class TwitterClient:
+class AsyncTwitterClient:
     """
     Twitter/X API client with OAuth 2.0 authentication and comprehensive features
     
@@ -33,6 +33,9 @@ class TwitterClient:
     - Engagement metrics collection
     - Rate limit handling
     - Error recovery and retry logic
+    
+    All network calls are coroutines on the shared pooled "x" transport, so
+    they never block the event loop. Use TwitterClient from synchronous code.
     """
     
     # Twitter API v2 endpoints
@@ -59,7 +62,6 @@ class TwitterClient:
             logger.warning("Twitter OAuth credentials not provided. Set TWITTER_CLIENT_ID and TWITTER_CLIENT_SECRET environment variables.")
         
         self.token_manager = get_token_manager()
-        self.session = requests.Session()
         
         # Rate limiting tracking
         self.rate_limits = {}
@@ -67,6 +69,11 @@ class TwitterClient:
         
         logger.info("Twitter client initialized")
     
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request on the shared X transport"""
+        async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("x")) as client:
+            return await client.request(method, url, **kwargs)
+    
     def get_oauth_authorization_url(self, redirect_uri: str, state: Optional[str] = None) -> Tuple[str, str]:
         """
         Get OAuth 2.0 authorization URL for user consent
@@ -99,7 +106,7 @@ class TwitterClient:
             logger.error(f"Failed to generate OAuth authorization URL: {e}")
             raise TwitterAPIError(f"OAuth authorization URL generation failed: {e}")
     
-    def exchange_code_for_tokens(self, authorization_code: str, redirect_uri: str, code_verifier: str) -> Dict[str, Any]:
+    async def exchange_code_for_tokens(self, authorization_code: str, redirect_uri: str, code_verifier: str) -> Dict[str, Any]:
         """
         Exchange authorization code for access and refresh tokens
         
@@ -121,10 +128,11 @@ class TwitterClient:
                 "code_verifier": code_verifier
             }
             
-            response = requests.post(
+            response = await self._request(
+                "POST",
                 f"{self.OAUTH_URL}/token",
                 data=token_data,
-                auth=HTTPBasicAuth(self.client_id, self.client_secret),
+                auth=(self.client_id, self.client_secret),
                 headers={"Content-Type": "application/x-www-form-urlencoded"}
             )
             
@@ -145,7 +153,7 @@ class TwitterClient:
             logger.error(f"Token exchange failed: {e}")
             raise TwitterAPIError(f"Token exchange failed: {e}")
     
-    def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
+    async def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
         """
         Refresh access token using refresh token
         
@@ -162,10 +170,11 @@ class TwitterClient:
                 "client_id": self.client_id
             }
             
-            response = requests.post(
+            response = await self._request(
+                "POST",
                 f"{self.OAUTH_URL}/token",
                 data=token_data,
-                auth=HTTPBasicAuth(self.client_id, self.client_secret),
+                auth=(self.client_id, self.client_secret),
                 headers={"Content-Type": "application/x-www-form-urlencoded"}
             )
             
@@ -186,14 +195,12 @@ class TwitterClient:
             logger.error(f"Token refresh failed: {e}")
             raise TwitterAPIError(f"Token refresh failed: {e}")
     
-    def _get_authenticated_session(self, access_token: str) -> requests.Session:
-        """Get authenticated requests session"""
-        session = requests.Session()
-        session.headers.update({
+    def _auth_headers(self, access_token: str) -> Dict[str, str]:
+        """Get bearer auth headers"""
+        return {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json"
-        })
-        return session
+        }
     
     def _check_rate_limit(self, endpoint: str) -> bool:
         """
@@ -217,7 +224,7 @@ class TwitterClient:
         remaining = rate_limit_info.get("remaining", 1)
         return remaining > 0
     
-    def _update_rate_limit(self, endpoint: str, response: requests.Response):
+    def _update_rate_limit(self, endpoint: str, response: httpx.Response):
         """Update rate limit tracking from API response headers"""
         headers = response.headers
         
@@ -227,7 +234,7 @@ class TwitterClient:
             "reset_time": int(headers.get("x-rate-limit-reset", 0))
         }
     
-    def get_user_info(self, access_token: str) -> Dict[str, Any]:
+    async def get_user_info(self, access_token: str) -> Dict[str, Any]:
         """
         Get authenticated user information
         
@@ -254,14 +261,14 @@ class TwitterClient:
             }
             
         try:
-            session = self._get_authenticated_session(access_token)
-            
             # Check rate limits
             if not self._check_rate_limit("users/me"):
                 raise TwitterAPIError("Rate limit exceeded for user info endpoint")
             
-            response = session.get(
+            response = await self._request(
+                "GET",
                 f"{self.BASE_URL}/users/me",
+                headers=self._auth_headers(access_token),
                 params={
                     "user.fields": "id,name,username,profile_image_url,public_metrics,verified,description,location"
                 }
@@ -281,7 +288,7 @@ class TwitterClient:
             logger.error(f"Failed to get user info: {e}")
             raise TwitterAPIError(f"Failed to get user info: {e}")
     
-    def post_tweet(self, access_token: str, content: str, user_id: int, media_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+    async def post_tweet(self, access_token: str, content: str, user_id: int, media_ids: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Post a tweet to Twitter
         
@@ -299,8 +306,6 @@ class TwitterClient:
             if len(content) > self.MAX_TWEET_LENGTH:
                 raise TwitterAPIError(f"Tweet content too long: {len(content)} > {self.MAX_TWEET_LENGTH}")
             
-            session = self._get_authenticated_session(access_token)
-            
             # Check rate limits
             if not self._check_rate_limit("tweets"):
                 raise TwitterAPIError("Rate limit exceeded for tweets endpoint")
@@ -314,8 +319,10 @@ class TwitterClient:
                 tweet_payload["media"] = {"media_ids": media_ids}
             
             # Post tweet
-            response = session.post(
+            response = await self._request(
+                "POST",
                 f"{self.BASE_URL}/tweets",
+                headers=self._auth_headers(access_token),
                 json=tweet_payload
             )
             
@@ -362,7 +369,7 @@ class TwitterClient:
             
             raise TwitterAPIError(f"Failed to post tweet: {e}")
     
-    def get_tweet_metrics(self, access_token: str, tweet_id: str) -> Dict[str, Any]:
+    async def get_tweet_metrics(self, access_token: str, tweet_id: str) -> Dict[str, Any]:
         """
         Get engagement metrics for a specific tweet
         
@@ -374,14 +381,14 @@ class TwitterClient:
             Dictionary containing tweet metrics
         """
         try:
-            session = self._get_authenticated_session(access_token)
-            
             # Check rate limits
             if not self._check_rate_limit("tweets/metrics"):
                 raise TwitterAPIError("Rate limit exceeded for tweet metrics endpoint")
             
-            response = session.get(
+            response = await self._request(
+                "GET",
                 f"{self.BASE_URL}/tweets/{tweet_id}",
+                headers=self._auth_headers(access_token),
                 params={
                     "tweet.fields": "public_metrics,created_at,author_id,context_annotations,entities",
                     "expansions": "author_id"
@@ -424,7 +431,7 @@ class TwitterClient:
             logger.error(f"Failed to get tweet metrics: {e}")
             raise TwitterAPIError(f"Failed to get tweet metrics: {e}")
     
-    def validate_connection(self, access_token: str) -> Dict[str, Any]:
+    async def validate_connection(self, access_token: str) -> Dict[str, Any]:
         """
         Validate Twitter connection by making a test API call
         
@@ -436,7 +443,7 @@ class TwitterClient:
         """
         try:
             # Test connection by getting user info
-            user_info = self.get_user_info(access_token)
+            user_info = await self.get_user_info(access_token)
             
             return {
                 "is_valid": True,
@@ -457,6 +464,49 @@ class TwitterClient:
             }
 
 
+class TwitterClient:
+    """
+    Blocking wrapper around AsyncTwitterClient for Celery tasks and scripts
+    
+    Each call runs the async client to completion; do not use from async code.
+    """
+    
+    BASE_URL = AsyncTwitterClient.BASE_URL
+    OAUTH_URL = AsyncTwitterClient.OAUTH_URL
+    MAX_TWEET_LENGTH = AsyncTwitterClient.MAX_TWEET_LENGTH
+    MAX_THREAD_TWEETS = AsyncTwitterClient.MAX_THREAD_TWEETS
+    MAX_IMAGES_PER_TWEET = AsyncTwitterClient.MAX_IMAGES_PER_TWEET
+    
+    def __init__(self, client_id: Optional[str] = None, client_secret: Optional[str] = None,
+                 async_client: Optional[AsyncTwitterClient] = None):
+        self.async_client = async_client or AsyncTwitterClient(client_id, client_secret)
+    
+    @property
+    def rate_limits(self) -> Dict[str, Dict[str, int]]:
+        return self.async_client.rate_limits
+    
+    def get_oauth_authorization_url(self, redirect_uri: str, state: Optional[str] = None) -> Tuple[str, str]:
+        return self.async_client.get_oauth_authorization_url(redirect_uri, state)
+    
+    def exchange_code_for_tokens(self, authorization_code: str, redirect_uri: str, code_verifier: str) -> Dict[str, Any]:
+        return run_blocking(self.async_client.exchange_code_for_tokens(authorization_code, redirect_uri, code_verifier))
+    
+    def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
+        return run_blocking(self.async_client.refresh_access_token(refresh_token))
+    
+    def get_user_info(self, access_token: str) -> Dict[str, Any]:
+        return run_blocking(self.async_client.get_user_info(access_token))
+    
+    def post_tweet(self, access_token: str, content: str, user_id: int, media_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        return run_blocking(self.async_client.post_tweet(access_token, content, user_id, media_ids))
+    
+    def get_tweet_metrics(self, access_token: str, tweet_id: str) -> Dict[str, Any]:
+        return run_blocking(self.async_client.get_tweet_metrics(access_token, tweet_id))
+    
+    def validate_connection(self, access_token: str) -> Dict[str, Any]:
+        return run_blocking(self.async_client.validate_connection(access_token))
+
+
 # Helper functions for common operations
 
 def create_twitter_client() -> TwitterClient:
@@ -518,5 +568,6 @@ def split_content_for_thread(content: str, max_length: int = 270) -> List[str]:
     
     return chunks
 
-# Global Twitter client instance
-twitter_client = TwitterClient()
\ No newline at end of file
+# Global Twitter client instances (async for the API/services, blocking for Celery)
+async_twitter_client = AsyncTwitterClient()
+twitter_client = TwitterClient(async_client=async_twitter_client)
\ No newline at end of file
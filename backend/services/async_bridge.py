@@ -0,0 +1,198 @@
+"""
+Async execution bridge for synchronous callers
+
+Celery task bodies and blocking client wrappers hand coroutines to one
+long-lived event loop per process, running in a background thread, instead of
+``asyncio.run`` creating and tearing down a loop per call. Anything bound to
+the loop (pooled HTTP transports, async clients) survives from one task to the
+next; the loop is recreated in forked children and drained on worker exit.
+"""
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from typing import Any, Coroutine, Dict, Optional
+
+from celery.exceptions import SoftTimeLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+# Start time and soft limit of the Celery task running on this thread
+_task_context = threading.local()
+
+
+def _remaining_soft_time_limit() -> Optional[float]:
+    """Seconds left before the current task's soft time limit, if there is one"""
+    soft_limit = getattr(_task_context, "soft_limit", None)
+    if not soft_limit:
+        return None
+    return max(0.0, soft_limit - (time.monotonic() - _task_context.started))
+
+
+class AsyncBridge:
+    """
+    Run coroutines from synchronous code on a persistent per-process event loop
+
+    ``run`` blocks the calling thread until the coroutine finishes, so worker
+    threads submit concurrently and share one loop. Celery's threads pool does
+    not enforce soft time limits, so ``run`` enforces the remaining soft limit
+    of the current task itself: the coroutine is cancelled on the loop and
+    ``SoftTimeLimitExceeded`` is raised as it would be under prefork. A soft
+    limit signal raised while waiting (prefork) cancels the coroutine too.
+
+    Coroutines must not block the loop with long synchronous work; that stalls
+    every other task using the bridge.
+    """
+
+    def __init__(self, name: str = "async-bridge"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.stats = {
+            "calls": 0,
+            "cancelled": 0,
+            "timeouts": 0,
+            "loop_starts": 0,
+            "dispatch_ms_total": 0.0,
+            "dispatch_ms_max": 0.0
+        }
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The bridge loop, started (or restarted after a fork) on first use"""
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid() or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                thread = threading.Thread(target=self._run_loop, args=(loop, started), name=self.name, daemon=True)
+                thread.start()
+                started.wait()
+                self._loop, self._thread, self._pid = loop, thread, os.getpid()
+                self.stats["loop_starts"] += 1
+                logger.info(f"Started {self.name} event loop in process {self._pid}")
+            return self._loop
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, started: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    async def _timed(self, coro: Coroutine, submitted: float) -> Any:
+        # Submit-to-start latency is the bridge's per-call overhead
+        dispatch_ms = (time.perf_counter() - submitted) * 1000
+        self.stats["dispatch_ms_total"] += dispatch_ms
+        self.stats["dispatch_ms_max"] = max(self.stats["dispatch_ms_max"], dispatch_ms)
+        return await coro
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the bridge loop and return its result
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait (default: the current task's remaining soft time limit)
+
+        Raises:
+            SoftTimeLimitExceeded: timeout reached; the coroutine was cancelled
+            RuntimeError: called from a running event loop (await the coroutine instead)
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            coro.close()
+            raise RuntimeError("Blocking call made from a running event loop; await the coroutine instead")
+
+        if timeout is None:
+            timeout = _remaining_soft_time_limit()
+
+        loop = self.loop
+        self.stats["calls"] += 1
+        future = asyncio.run_coroutine_threadsafe(self._timed(coro, time.perf_counter()), loop)
+
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            if future.done():
+                # The coroutine itself raised TimeoutError
+                raise
+            future.cancel()
+            self.stats["timeouts"] += 1
+            raise SoftTimeLimitExceeded(f"Coroutine cancelled after {timeout:.1f}s")
+        except BaseException:
+            # Soft time limit signal or interrupt while waiting: stop the coroutine too
+            if not future.done():
+                future.cancel()
+                self.stats["cancelled"] += 1
+            raise
+
+    def reset(self):
+        """Forget the loop without stopping it (its thread does not exist in a forked child)"""
+        with self._lock:
+            self._loop = self._thread = self._pid = None
+
+    def stop(self, timeout: float = 5.0):
+        """Close pooled HTTP connections bound to the loop, then stop it"""
+        with self._lock:
+            loop, thread, pid = self._loop, self._thread, self._pid
+            self._loop = self._thread = self._pid = None
+        if loop is None or pid != os.getpid():
+            return
+
+        from backend.services.http_transport import http_transport_registry
+        try:
+            asyncio.run_coroutine_threadsafe(http_transport_registry.close_all(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Error closing pooled connections on {self.name} loop: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+        logger.info(f"Stopped {self.name} event loop: {self.get_stats()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Bridge call counts and average/max dispatch overhead"""
+        calls = self.stats["calls"]
+        return {
+            "calls": calls,
+            "cancelled": self.stats["cancelled"],
+            "timeouts": self.stats["timeouts"],
+            "loop_starts": self.stats["loop_starts"],
+            "loop_running": self._loop is not None and self._loop.is_running(),
+            "avg_dispatch_ms": round(self.stats["dispatch_ms_total"] / calls, 3) if calls else 0.0,
+            "max_dispatch_ms": round(self.stats["dispatch_ms_max"], 3)
+        }
+
+
+# Process-wide bridge used by Celery tasks and blocking client wrappers
+async_bridge = AsyncBridge()
+
+
+def register_celery_bridge_hooks():
+    """Track task soft time limits per thread and drain the bridge loop on worker exit"""
+    from celery.signals import task_prerun, task_postrun, worker_process_init, worker_process_shutdown, worker_shutdown
+
+    @task_prerun.connect(weak=False)
+    def _task_started(task=None, **kwargs):
+        timelimit = getattr(task.request, "timelimit", None) or (None, None)
+        _task_context.soft_limit = timelimit[1] or task.soft_time_limit or task.app.conf.task_soft_time_limit
+        _task_context.started = time.monotonic()
+
+    @task_postrun.connect(weak=False)
+    def _task_finished(**kwargs):
+        _task_context.soft_limit = None
+
+    @worker_process_init.connect(weak=False)
+    def _reset_bridge(**kwargs):
+        async_bridge.reset()
+
+    @worker_shutdown.connect(weak=False)
+    @worker_process_shutdown.connect(weak=False)
+    def _stop_bridge(**kwargs):
+        async_bridge.stop()
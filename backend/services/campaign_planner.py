@@ -0,0 +1,190 @@
+"""
+Campaign fan-out planner
+Groups bulk publish targets by (organization, platform) and spaces their
+dispatch times to match each token bucket, so a campaign drains at the rate
+the limiter admits instead of flooding the queue and retrying
+"""
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.core.config import get_settings
+from backend.services.rate_limit import TokenBucket, get_token_bucket
+
+logger = logging.getLogger(__name__)
+
+# connection ids -> {connection id: (organization id, platform)}
+ConnectionGroupLookup = Callable[[List[str]], Dict[str, Tuple[str, str]]]
+
+
+@dataclass
+class PlannedDispatch:
+    """One target and how long after the campaign start it should run"""
+    target: Dict[str, Any]
+    countdown_s: float
+
+
+@dataclass
+class CampaignPlan:
+    """Dispatch schedule for a campaign, in target order"""
+    dispatches: List[PlannedDispatch] = field(default_factory=list)
+    groups: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def duration_s(self) -> float:
+        """Seconds from the first to the last dispatch"""
+        return max((d.countdown_s for d in self.dispatches), default=0.0)
+
+
+class CampaignPlanner:
+    """
+    Spread campaign targets over time per (organization, platform)
+
+    Each group first spends the tokens its bucket holds right now, then one
+    target every ``window_s / refill_rate`` seconds, both scaled by
+    ``headroom`` so ad-hoc publishes for the same org still get admitted.
+    A platform's max requests per second caps the rate further. Groups are
+    independent, so a campaign takes as long as its largest group.
+
+    Targets with a ``connection_id`` are grouped by their connection's
+    organization and platform, the key the publish runner admits them by.
+    """
+
+    def __init__(
+        self,
+        token_bucket: TokenBucket,
+        platform_max_rps: Optional[Dict[str, float]] = None,
+        headroom: float = 0.9,
+        connection_groups: Optional[ConnectionGroupLookup] = None
+    ):
+        """
+        Args:
+            token_bucket: Bucket the publish tasks acquire from
+            platform_max_rps: Hard per-platform request rate (0/missing = bucket only)
+            headroom: Share of the bucket a campaign may plan to use (0-1]
+            connection_groups: Resolves connection ids to (organization, platform)
+        """
+        self.token_bucket = token_bucket
+        self.platform_max_rps = platform_max_rps or {}
+        self.headroom = min(1.0, max(0.01, headroom))
+        self.connection_groups = connection_groups
+
+    def plan(self, targets: List[Dict[str, Any]]) -> CampaignPlan:
+        """
+        Compute a countdown for every target
+
+        Args:
+            targets: Publish targets; the connection of a ``connection_id``, or
+                else ``organization_id`` (or ``user_id``) and ``platform``,
+                select the bucket
+
+        Returns:
+            CampaignPlan with dispatches in the order of targets
+        """
+        connections = self._resolve_connections(targets)
+        grouped: "OrderedDict[Tuple[str, str], List[int]]" = OrderedDict()
+        for index, target in enumerate(targets):
+            grouped.setdefault(self._group_key(target, connections), []).append(index)
+
+        countdowns: List[float] = [0.0] * len(targets)
+        plan = CampaignPlan()
+
+        for (org_id, platform), indexes in grouped.items():
+            burst, interval = self._pacing(org_id, platform)
+            for position, index in enumerate(indexes):
+                countdowns[index] = self._countdown(position, burst, interval, platform)
+
+            plan.groups[f"{org_id}:{platform}"] = {
+                "targets": len(indexes),
+                "burst": burst,
+                "interval_s": round(interval, 3),
+                "duration_s": round(countdowns[indexes[-1]], 3)
+            }
+
+        plan.dispatches = [PlannedDispatch(target, countdowns[i]) for i, target in enumerate(targets)]
+        logger.info(
+            f"Planned campaign of {len(targets)} targets across {len(grouped)} groups, "
+            f"~{plan.duration_s:.0f}s to dispatch"
+        )
+        return plan
+
+    def _resolve_connections(self, targets: List[Dict[str, Any]]) -> Dict[str, Tuple[str, str]]:
+        connection_ids = list({str(t["connection_id"]) for t in targets if t.get("connection_id")})
+        if not connection_ids or self.connection_groups is None:
+            return {}
+        try:
+            return self.connection_groups(connection_ids)
+        except Exception as e:
+            logger.warning(f"Could not resolve campaign connections, grouping by target fields: {e}")
+            return {}
+
+    def _group_key(self, target: Dict[str, Any], connections: Dict[str, Tuple[str, str]]) -> Tuple[str, str]:
+        if target.get("connection_id") and str(target["connection_id"]) in connections:
+            return connections[str(target["connection_id"])]
+        org_id = target.get("organization_id") or target.get("user_id") or "default"
+        return str(org_id), str(target.get("platform", "unknown")).lower()
+
+    def _pacing(self, org_id: str, platform: str) -> Tuple[int, float]:
+        """(tokens usable immediately, seconds between targets once they are spent)"""
+        bucket = self.token_bucket
+        burst = int(bucket.get_remaining(org_id, platform) * self.headroom)
+        interval = bucket.window_s / (bucket.refill_rate * self.headroom)
+        return burst, interval
+
+    def _countdown(self, position: int, burst: int, interval: float, platform: str) -> float:
+        token_ready = 0.0 if position < burst else (position - burst + 1) * interval
+        max_rps = self.platform_max_rps.get(platform) or 0
+        rps_ready = position / max_rps if max_rps > 0 else 0.0
+        return max(token_ready, rps_ready)
+
+
+def load_connection_groups(connection_ids: List[str]) -> Dict[str, Tuple[str, str]]:
+    """(organization id, platform) of each SocialConnection, as the publish runner reads them"""
+    from backend.db.database import SessionLocal
+    from backend.db.models import SocialConnection
+
+    by_uuid = {}
+    for connection_id in connection_ids:
+        try:
+            by_uuid[uuid.UUID(connection_id)] = connection_id
+        except ValueError:
+            continue
+    if not by_uuid:
+        return {}
+
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            SocialConnection.id, SocialConnection.organization_id, SocialConnection.platform
+        ).filter(SocialConnection.id.in_(list(by_uuid))).all()
+    finally:
+        db.close()
+    return {by_uuid[row.id]: (str(row.organization_id), row.platform) for row in rows}
+
+
+# Singleton instance
+_campaign_planner = None
+
+
+def get_campaign_planner() -> CampaignPlanner:
+    """Get campaign planner instance bound to the publish token bucket"""
+    global _campaign_planner
+
+    if _campaign_planner is None:
+        settings = get_settings()
+        _campaign_planner = CampaignPlanner(
+            token_bucket=get_token_bucket(),
+            platform_max_rps={
+                "meta": settings.meta_publish_max_rps,
+                "facebook": settings.meta_publish_max_rps,
+                "instagram": settings.meta_publish_max_rps,
+                "x": settings.x_publish_max_rps,
+                "twitter": settings.x_publish_max_rps
+            },
+            headroom=settings.campaign_bucket_headroom,
+            connection_groups=load_connection_groups
+        )
+
+    return _campaign_planner
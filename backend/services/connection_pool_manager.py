@@ -14,6 +14,7 @@ from collections import defaultdict, deque
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.pool import QueuePool, StaticPool
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import OperationalError, TimeoutError
 
@@ -51,6 +52,7 @@ class ConnectionPoolManager:
     
     def __init__(self):
         self.pools: Dict[str, Engine] = {}
+        self.async_pools: Dict[str, AsyncEngine] = {}
         self.pool_metrics: Dict[str, ConnectionPoolMetrics] = {}
         self.connection_times = defaultdict(lambda: deque(maxlen=100))
         self.pool_configs = {}
@@ -174,6 +176,71 @@ class ConnectionPoolManager:
         logger.info(f"Created optimized connection pool '{pool_name}': size={initial_size}, overflow={max_overflow}")
         return engine
     
+    def register_pool(self, engine: Engine, pool_name: str) -> Engine:
+        """
+        Track a pool created elsewhere (metrics, health checks, recommendations)
+        
+        Args:
+            engine: Engine created with ``create_engine``
+            pool_name: Name for the pool
+            
+        Returns:
+            The same engine
+        """
+        self.pools[pool_name] = engine
+        self._track_pool(engine, pool_name)
+        return engine
+    
+    def register_async_pool(self, engine: AsyncEngine, pool_name: str = "async") -> AsyncEngine:
+        """
+        Track an async engine's pool (metrics, health checks, recommendations)
+        
+        Args:
+            engine: Engine created with ``create_async_engine``
+            pool_name: Name for the pool
+            
+        Returns:
+            The same engine
+        """
+        self.async_pools[pool_name] = engine
+        # Pool events of an async engine are dispatched by its sync facade
+        self._track_pool(engine.sync_engine, pool_name, is_async=True)
+        return engine
+    
+    def _track_pool(self, engine: Engine, pool_name: str, is_async: bool = False):
+        pool = engine.pool
+        self.pool_configs[pool_name] = {"async": is_async, "poolclass": type(pool).__name__}
+        self.pool_metrics[pool_name] = ConnectionPoolMetrics(
+            pool_size=pool.size() if hasattr(pool, 'size') else 1,
+            checked_in=0,
+            checked_out=0,
+            overflow=0,
+            total_connections=0,
+            avg_connection_time=0.0,
+            peak_connections=0,
+            pool_exhaustion_count=0,
+            connection_errors=0,
+            slow_connections=0,
+            last_updated=get_utc_now()
+        )
+        self._add_pool_monitoring(engine, pool_name)
+        
+        logger.info(f"Registered {'async ' if is_async else ''}connection pool '{pool_name}' ({type(pool).__name__})")
+    
+    def _refresh_pool_status(self, engine: Engine, pool_name: str):
+        """Copy the pool's checked-in/out counts into its metrics"""
+        metrics = self.pool_metrics[pool_name]
+        if hasattr(engine.pool, 'checkedout'):
+            metrics.checked_out = engine.pool.checkedout()
+            metrics.checked_in = engine.pool.checkedin()
+            metrics.overflow = engine.pool.overflow()
+            
+            current_total = metrics.checked_out + metrics.checked_in
+            if current_total > metrics.peak_connections:
+                metrics.peak_connections = current_total
+        
+        metrics.last_updated = get_utc_now()
+    
     def _add_pool_monitoring(self, engine: Engine, pool_name: str):
         """Add pool monitoring event listeners"""
         
@@ -183,24 +250,19 @@ class ConnectionPoolManager:
             start_time = time.time()
             connection_record.info['connect_start'] = start_time
             
-            metrics = self.pool_metrics[pool_name]
-            metrics.total_connections += 1
-            
-            # Update pool status
-            if hasattr(engine.pool, 'checkedout'):
-                metrics.checked_out = engine.pool.checkedout()
-                metrics.checked_in = engine.pool.checkedin()
-                metrics.overflow = engine.pool.overflow()
-                
-                current_total = metrics.checked_out + metrics.checked_in
-                if current_total > metrics.peak_connections:
-                    metrics.peak_connections = current_total
-            
-            metrics.last_updated = get_utc_now()
+            self.pool_metrics[pool_name].total_connections += 1
+            self._refresh_pool_status(engine, pool_name)
         
         @event.listens_for(engine, "checkout")
         def track_checkout(dbapi_connection, connection_record, connection_proxy):
             """Track connection checkout"""
+            self._refresh_pool_status(engine, pool_name)
+            
+            # Every connection including overflow is now in use: the next checkout waits
+            max_overflow = getattr(engine.pool, '_max_overflow', -1)
+            if max_overflow >= 0 and self.pool_metrics[pool_name].checked_out >= engine.pool.size() + max_overflow:
+                self.pool_metrics[pool_name].pool_exhaustion_count += 1
+            
             if 'connect_start' in connection_record.info:
                 connection_time = (time.time() - connection_record.info['connect_start']) * 1000
                 self.connection_times[pool_name].append(connection_time)
@@ -299,10 +361,9 @@ class ConnectionPoolManager:
         Returns:
             Scaling action taken
         """
-        if pool_name not in self.pools:
+        if pool_name not in self.pools and pool_name not in self.async_pools:
             return {"error": f"Pool '{pool_name}' not found"}
         
-        engine = self.pools[pool_name]
         metrics = self.pool_metrics[pool_name]
         
         try:
@@ -355,34 +416,39 @@ class ConnectionPoolManager:
         """
         health_results = {}
         
-        for pool_name, engine in self.pools.items():
+        for pool_name, engine in [*self.pools.items(), *self.async_pools.items()]:
             try:
                 start_time = time.time()
                 
                 # Test connection
-                with engine.connect() as conn:
-                    result = conn.execute(text("SELECT 1")).fetchone()
+                if isinstance(engine, AsyncEngine):
+                    async with engine.connect() as conn:
+                        await conn.execute(text("SELECT 1"))
+                else:
+                    with engine.connect() as conn:
+                        result = conn.execute(text("SELECT 1")).fetchone()
                 
                 response_time = (time.time() - start_time) * 1000
                 
                 # Get pool status
+                pool = engine.pool
                 pool_status = {
                     "healthy": True,
                     "response_time_ms": response_time,
-                    "pool_size": engine.pool.size(),
-                    "checked_in": engine.pool.checkedin(),
-                    "checked_out": engine.pool.checkedout(),
-                    "overflow": engine.pool.overflow(),
-                    "status": engine.pool.status()
+                    "pool_size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                    "status": pool.status()
                 }
                 
                 # Check for potential issues
                 warnings = []
                 if response_time > 1000:
                     warnings.append("Slow response time")
-                if engine.pool.checkedout() / max(engine.pool.size(), 1) > 0.9:
+                if pool.checkedout() / max(pool.size(), 1) > 0.9:
                     warnings.append("High pool utilization")
-                if hasattr(engine.pool, 'invalidated') and engine.pool.invalidated():
+                if hasattr(pool, 'invalidated') and pool.invalidated():
                     warnings.append("Pool has invalidated connections")
                 
                 pool_status["warnings"] = warnings
@@ -405,7 +471,7 @@ class ConnectionPoolManager:
         return {
             "timestamp": get_utc_now().isoformat(),
             "pools": health_results,
-            "total_pools": len(self.pools)
+            "total_pools": len(self.pools) + len(self.async_pools)
         }
     
     def get_pool_metrics(self, pool_name: Optional[str] = None) -> Dict[str, Any]:
@@ -418,6 +484,11 @@ class ConnectionPoolManager:
         Returns:
             Pool metrics
         """
+        # Checked-in/out counts are read live; events only see the pool mid-transition
+        for name, engine in [*self.pools.items(), *self.async_pools.items()]:
+            if name in self.pool_metrics and (pool_name is None or name == pool_name):
+                self._refresh_pool_status(engine.sync_engine if isinstance(engine, AsyncEngine) else engine, name)
+        
         if pool_name:
             if pool_name in self.pool_metrics:
                 return self.pool_metrics[pool_name].to_dict()
@@ -479,7 +550,7 @@ class ConnectionPoolManager:
         """
         results = {}
         
-        for pool_name in self.pools.keys():
+        for pool_name in [*self.pools.keys(), *self.async_pools.keys()]:
             try:
                 # Perform health check
                 health = await self.health_check_pools()
@@ -505,7 +576,7 @@ class ConnectionPoolManager:
         }
     
     def close_all_pools(self):
-        """Close all connection pools gracefully"""
+        """Close all sync connection pools gracefully (async pools: ``close_async_pool``)"""
         for pool_name, engine in self.pools.items():
             try:
                 engine.dispose()
@@ -514,7 +585,24 @@ class ConnectionPoolManager:
                 logger.error(f"Error closing pool '{pool_name}': {e}")
         
         self.pools.clear()
-        self.pool_metrics.clear()
+        for pool_name in list(self.pool_metrics):
+            if pool_name not in self.async_pools:
+                del self.pool_metrics[pool_name]
+    
+    async def close_async_pool(self, pool_name: str = "async"):
+        """Dispose an async pool registered with ``register_async_pool``"""
+        engine = self.async_pools.pop(pool_name, None)
+        if engine is None:
+            return
+        
+        try:
+            await engine.dispose()
+            logger.info(f"Closed async connection pool '{pool_name}'")
+        except Exception as e:
+            logger.error(f"Error closing async pool '{pool_name}': {e}")
+        finally:
+            self.pool_metrics.pop(pool_name, None)
+            self.pool_configs.pop(pool_name, None)
 
 # Global connection pool manager
 connection_pool_manager = ConnectionPoolManager()
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+Short database transactions around per-connection platform calls
+
+Tasks that poll or refresh many social connections run in three phases:
+1. read the work set into plain ``ConnectionSnapshot`` objects in one short session
+2. call the platform APIs against the snapshots with no session checked out
+3. write the results, and their audit rows, in one short batched transaction
+   (``apply_connection_updates``)
+
+Writes are optimistic. ``social_connections`` has no version column, so the
+``updated_at`` a snapshot was read at (bumped by ``onupdate`` on every write)
+is the version token. A row changed since its snapshot is a conflict; the
+update's ``merge`` callback decides, against the fresh locked row, what (if
+anything) to write anyway.
+"""
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+
+from backend.db.models import SocialConnection, SocialAudit
+
+logger = logging.getLogger(__name__)
+
+# Fresh row, proposed values -> values to write anyway, or None to give up
+MergeFn = Callable[[SocialConnection, Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class ConnectionSnapshot:
+    """Detached copy of the connection fields platform calls need"""
+    id: Any
+    organization_id: Any
+    platform: str
+    platform_account_id: Optional[str]
+    platform_username: Optional[str]
+    access_tokens: Dict[str, Any]
+    platform_metadata: Dict[str, Any]
+    token_expires_at: Optional[datetime]
+    version: Optional[datetime]
+
+    @classmethod
+    def from_connection(cls, connection: SocialConnection) -> "ConnectionSnapshot":
+        return cls(
+            id=connection.id,
+            organization_id=connection.organization_id,
+            platform=connection.platform,
+            platform_account_id=connection.platform_account_id,
+            platform_username=connection.platform_username,
+            access_tokens=dict(getattr(connection, "access_tokens", None) or {}),
+            platform_metadata=dict(connection.platform_metadata or {}),
+            token_expires_at=connection.token_expires_at,
+            version=getattr(connection, "updated_at", None),
+        )
+
+
+@dataclass
+class ConnectionUpdate:
+    """Values to write to one connection, guarded by its snapshot version"""
+    snapshot: ConnectionSnapshot
+    values: Dict[str, Any]
+    merge: Optional[MergeFn] = None
+
+
+@dataclass
+class ConnectionAuditEntry:
+    """SocialAudit row to insert alongside the updates"""
+    snapshot: ConnectionSnapshot
+    action: str
+    status: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def to_model(self) -> SocialAudit:
+        return SocialAudit(
+            organization_id=self.snapshot.organization_id,
+            connection_id=self.snapshot.id,
+            action=self.action,
+            platform=self.snapshot.platform,
+            user_id=None,  # System operation
+            status=self.status,
+            audit_metadata=self.metadata
+        )
+
+
+def _default_session_factory():
+    from backend.db.database import SessionLocal
+    return SessionLocal
+
+
+@contextmanager
+def short_session(session_factory=None) -> Iterator[Session]:
+    """Session for one short unit of work; its connection goes back to the pool on exit"""
+    db = (session_factory or _default_session_factory())()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def load_snapshots(connections: Sequence[SocialConnection]) -> List[ConnectionSnapshot]:
+    """Snapshot loaded connections so the session can be closed before any I/O"""
+    return [ConnectionSnapshot.from_connection(connection) for connection in connections]
+
+
+def apply_connection_updates(
+    updates: Sequence[ConnectionUpdate],
+    audits: Sequence[ConnectionAuditEntry] = (),
+    session_factory=None
+) -> Dict[str, List[str]]:
+    """
+    Apply updates and insert audit rows in one transaction
+
+    Rows are locked in id order (``SELECT ... FOR UPDATE``) so concurrent
+    batches cannot deadlock, then each update is checked against its snapshot
+    version.
+
+    Returns:
+        Connection ids by outcome: ``applied``, ``merged`` (version changed,
+        merge wrote anyway) and ``conflicts`` (skipped, or the row is gone)
+    """
+    outcome = {"applied": [], "merged": [], "conflicts": []}
+    if not updates and not audits:
+        return outcome
+
+    with short_session(session_factory) as db:
+        rows = {}
+        if updates:
+            ids = [update.snapshot.id for update in updates]
+            rows = {
+                row.id: row
+                for row in db.query(SocialConnection)
+                .filter(SocialConnection.id.in_(ids))
+                .order_by(SocialConnection.id)
+                .with_for_update()
+                .populate_existing()
+                .all()
+            }
+
+        for update in updates:
+            connection_id = update.snapshot.id
+            row = rows.get(connection_id)
+            if row is None:
+                logger.warning(f"Connection {connection_id} disappeared before its update was applied")
+                outcome["conflicts"].append(str(connection_id))
+                continue
+
+            values = update.values
+            status = "applied"
+            if row.updated_at != update.snapshot.version:
+                values = update.merge(row, dict(values)) if update.merge else None
+                if values is None:
+                    logger.info(f"Connection {connection_id} changed since it was read; update skipped")
+                    outcome["conflicts"].append(str(connection_id))
+                    continue
+                status = "merged"
+
+            for name, value in values.items():
+                setattr(row, name, value)
+            if "platform_metadata" in values:
+                flag_modified(row, "platform_metadata")
+            outcome[status].append(str(connection_id))
+
+        db.add_all([audit.to_model() for audit in audits])
+        db.commit()
+
+    return outcome
@@ -16,8 +16,8 @@ from backend.db.database import get_db
 from backend.db.models import ContentItem, Goal, ContentTemplate
 from backend.services.research_automation import research_pipeline, ResearchQuery, ResearchSource
 from backend.services.metrics_collection import metrics_collector
-from backend.integrations.twitter_client import twitter_client
-from backend.integrations.instagram_client import instagram_client
+from backend.integrations.twitter_client import async_twitter_client as twitter_client
+from backend.integrations.instagram_client import async_instagram_client as instagram_client
 from backend.integrations.facebook_client import facebook_client
 from backend.core.vector_store import vector_store
 
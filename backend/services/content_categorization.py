@@ -3,23 +3,42 @@ AI-powered Content Categorization System
 Handles automatic categorization by topic, platform, engagement levels, and sentiment analysis
 """
 import asyncio
+import hashlib
 import logging
 import re
+import time
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
-from openai import OpenAI, AsyncOpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError
 import json
 
 from backend.core.config import get_settings
 from backend.db.models import ContentItem, ContentCategory
 from backend.services.embedding_service import embedding_service
+from backend.services.keyword_matcher import KeywordMatcher, KeywordScan
+from backend.services.rate_limit import AdaptiveRateLimiter, exponential_backoff_with_jitter
+from backend.integrations.performance_optimizer import PerformanceCache
 
 # Get logger (use application's logging configuration)
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Shared by every categorizer in the process so batch and single calls draw on one quota
+categorization_limiter = AdaptiveRateLimiter(
+    max_concurrency=settings.categorization_max_concurrency,
+    requests_per_minute=settings.categorization_requests_per_minute
+)
+
+CATEGORIZATION_MODEL = "gpt-4o-mini"
+CATEGORIZATION_SYSTEM_PROMPT = "You are an expert content analyst specializing in social media categorization. Always respond with valid JSON."
+MAX_RATE_LIMIT_RETRIES = 2
+
+_URL_PATTERN = re.compile(
+    r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+)
+
 @dataclass
 class CategoryResult:
     """Result of content categorization"""
@@ -46,6 +65,33 @@ class ContentCategorizer:
     - Platform-specific optimization suggestions
     - Engagement level prediction
     """
+
+    # Keyword lexicons for the fallback sentiment/tone heuristics
+    POSITIVE_WORDS = ["great", "amazing", "excellent", "love", "best", "awesome", "fantastic"]
+    NEGATIVE_WORDS = ["bad", "terrible", "awful", "hate", "worst", "disappointing"]
+    PROMOTIONAL_WORDS = ["buy", "sale", "offer", "discount"]
+    EDUCATIONAL_TONE_WORDS = ["tips"]
+
+    # Engagement prediction weights
+    CATEGORY_ENGAGEMENT_SCORES = {
+        "technology": {"twitter": 0.7, "linkedin": 0.8, "instagram": 0.5},
+        "marketing": {"twitter": 0.6, "linkedin": 0.7, "instagram": 0.8},
+        "business": {"twitter": 0.6, "linkedin": 0.9, "instagram": 0.4},
+        "educational": {"twitter": 0.7, "linkedin": 0.8, "instagram": 0.6},
+        "personal": {"twitter": 0.8, "linkedin": 0.6, "instagram": 0.9}
+    }
+    SENTIMENT_MULTIPLIERS = {
+        "positive": 1.2,
+        "neutral": 1.0,
+        "negative": 0.8
+    }
+    TONE_MULTIPLIERS = {
+        "humorous": 1.3,
+        "inspiring": 1.2,
+        "educational": 1.1,
+        "promotional": 0.9,
+        "controversial": 1.4  # High engagement but risky
+    }
     
     def __init__(self):
         """Initialize the content categorizer"""
@@ -116,44 +162,62 @@ class ContentCategorizer:
                 "tone_preferences": ["trendy", "energetic", "fun"]
             }
         }
+
+        # All fallback lexicons compiled into one matcher, scanned once per text
+        self.keyword_matcher = self._build_keyword_matcher()
+        
+        # AI results keyed by content hash; unchanged content is never re-sent to the model
+        self.result_cache = PerformanceCache(
+            max_size=settings.categorization_cache_size,
+            default_ttl=settings.categorization_cache_ttl
+        )
+        self.last_batch_stats: Dict[str, Any] = {}
         
         logger.info("ContentCategorizer initialized with base categories and platform rules")
     
-    def _extract_text_elements(self, content: str) -> Dict[str, List[str]]:
+    def _build_keyword_matcher(self) -> KeywordMatcher:
+        """Compile category and heuristic lexicons into a single matcher"""
+        lexicons = {
+            category: info["keywords"]
+            for category, info in self.base_categories.items()
+        }
+        lexicons.update({
+            "sentiment:positive": self.POSITIVE_WORDS,
+            "sentiment:negative": self.NEGATIVE_WORDS,
+            "tone:promotional": self.PROMOTIONAL_WORDS,
+            "tone:educational": self.EDUCATIONAL_TONE_WORDS,
+        })
+        return KeywordMatcher(lexicons)
+    
+    def _extract_text_elements(self, content: str, scan: Optional[KeywordScan] = None) -> Dict[str, List[str]]:
         """Extract hashtags, mentions, and links from content"""
-        # Extract hashtags
-        hashtags = re.findall(r'#\w+', content)
-        
-        # Extract mentions
-        mentions = re.findall(r'@\w+', content)
+        # Hashtags and mentions come from the keyword scan
+        if scan is None:
+            scan = self.keyword_matcher.scan(content)
         
         # Extract URLs
-        url_pattern = re.compile(
-            r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        )
-        links = url_pattern.findall(content)
+        links = _URL_PATTERN.findall(content)
         
         return {
-            "hashtags": hashtags,
-            "mentions": mentions,
+            "hashtags": scan.hashtags,
+            "mentions": scan.mentions,
             "links": links
         }
     
-    def _keyword_based_categorization(self, content: str) -> Tuple[str, float]:
+    def _keyword_based_categorization(
+        self,
+        content: str,
+        scan: Optional[KeywordScan] = None
+    ) -> Tuple[str, float]:
         """Fallback categorization based on keyword matching"""
-        content_lower = content.lower()
+        if scan is None:
+            scan = self.keyword_matcher.scan(content)
         
         category_scores = {}
-        for category, info in self.base_categories.items():
-            score = 0
-            for keyword in info["keywords"]:
-                # Count keyword occurrences (case-insensitive)
-                occurrences = content_lower.count(keyword.lower())
-                score += occurrences
-            
-            # Normalize by content length
-            if len(content) > 0:
-                category_scores[category] = score / (len(content) / 100)  # Per 100 characters
+        if len(content) > 0:
+            for category in self.base_categories:
+                # Normalize occurrence count by content length (per 100 characters)
+                category_scores[category] = scan.label_counts.get(category, 0) / (len(content) / 100)
         
         if category_scores:
             best_category = max(category_scores, key=category_scores.get)
@@ -162,8 +226,57 @@ class ContentCategorizer:
         
         return "general", 0.5
     
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    
+    def _get_cached_result(self, content: str, platform: str) -> Optional[CategoryResult]:
+        return self.result_cache.get(platform, "categorization", content_hash=self._content_hash(content))
+    
+    def _cache_result(self, content: str, platform: str, result: CategoryResult):
+        self.result_cache.set(platform, "categorization", result, content_hash=self._content_hash(content))
+    
+    async def _chat_completion(self, **request):
+        """Call the chat model under the shared limiter, backing off on rate limits"""
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            async with categorization_limiter.slot():
+                try:
+                    response = await self.async_client.chat.completions.create(**request)
+                except RateLimitError as e:
+                    retry_after = None
+                    try:
+                        retry_after = float(e.response.headers.get("retry-after"))
+                    except (AttributeError, TypeError, ValueError):
+                        pass
+                    categorization_limiter.penalize(retry_after)
+                    if attempt == MAX_RATE_LIMIT_RETRIES:
+                        raise
+                else:
+                    categorization_limiter.reward()
+                    return response
+            await asyncio.sleep(exponential_backoff_with_jitter(attempt))
+    
+    def _result_from_ai(self, content: str, ai_result: Dict[str, Any]) -> CategoryResult:
+        """Build a CategoryResult from one parsed model answer"""
+        text_elements = self._extract_text_elements(content)
+        return CategoryResult(
+            topic_category=ai_result.get("topic_category", "general"),
+            confidence=float(ai_result.get("confidence", 0.5)),
+            sentiment=ai_result.get("sentiment", "neutral"),
+            tone=ai_result.get("tone", "conversational"),
+            reading_level=ai_result.get("reading_level", "intermediate"),
+            keywords=ai_result.get("keywords", []),
+            hashtags=text_elements["hashtags"],
+            mentions=text_elements["mentions"],
+            links=text_elements["links"]
+        )
+    
     async def _ai_categorization(self, content: str, platform: str) -> CategoryResult:
         """Use OpenAI to categorize content with detailed analysis"""
+        cached = self._get_cached_result(content, platform)
+        if cached is not None:
+            return cached
+        
         try:
             # Create comprehensive categorization prompt
             prompt = f"""
@@ -191,10 +304,10 @@ class ContentCategorizer:
             5. Content purpose and intent
             """
             
-            response = await self.async_client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = await self._chat_completion(
+                model=CATEGORIZATION_MODEL,
                 messages=[
-                    {"role": "system", "content": "You are an expert content analyst specializing in social media categorization. Always respond with valid JSON."},
+                    {"role": "system", "content": CATEGORIZATION_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
@@ -204,21 +317,9 @@ class ContentCategorizer:
             # Parse AI response
             ai_result = json.loads(response.choices[0].message.content)
             
-            # Extract text elements
-            text_elements = self._extract_text_elements(content)
-            
-            # Create result object
-            return CategoryResult(
-                topic_category=ai_result.get("topic_category", "general"),
-                confidence=float(ai_result.get("confidence", 0.5)),
-                sentiment=ai_result.get("sentiment", "neutral"),
-                tone=ai_result.get("tone", "conversational"),
-                reading_level=ai_result.get("reading_level", "intermediate"),
-                keywords=ai_result.get("keywords", []),
-                hashtags=text_elements["hashtags"],
-                mentions=text_elements["mentions"],
-                links=text_elements["links"]
-            )
+            result = self._result_from_ai(content, ai_result)
+            self._cache_result(content, platform, result)
+            return result
             
         except Exception as e:
             logger.error(f"AI categorization failed: {e}")
@@ -227,16 +328,17 @@ class ContentCategorizer:
     
     async def _fallback_categorization(self, content: str, platform: str) -> CategoryResult:
         """Fallback categorization when AI fails"""
-        category, confidence = self._keyword_based_categorization(content)
-        text_elements = self._extract_text_elements(content)
-        
-        # Simple sentiment analysis based on keywords
-        positive_words = ["great", "amazing", "excellent", "love", "best", "awesome", "fantastic"]
-        negative_words = ["bad", "terrible", "awful", "hate", "worst", "disappointing"]
+        return self._keyword_categorize(content, platform)
+    
+    def _keyword_categorize(self, content: str, platform: str) -> CategoryResult:
+        """Keyword-only categorization from a single scan of the content"""
+        scan = self.keyword_matcher.scan(content)
+        category, confidence = self._keyword_based_categorization(content, scan)
+        text_elements = self._extract_text_elements(content, scan)
         
-        content_lower = content.lower()
-        positive_score = sum(1 for word in positive_words if word in content_lower)
-        negative_score = sum(1 for word in negative_words if word in content_lower)
+        # Simple sentiment analysis based on distinct keywords present
+        positive_score = scan.label_distinct.get("sentiment:positive", 0)
+        negative_score = scan.label_distinct.get("sentiment:negative", 0)
         
         if positive_score > negative_score:
             sentiment = "positive"
@@ -249,9 +351,9 @@ class ContentCategorizer:
         tone = "conversational"
         if platform == "linkedin":
             tone = "professional"
-        elif "?" in content or "tips" in content_lower:
+        elif "?" in content or "tone:educational" in scan.label_counts:
             tone = "educational"
-        elif any(word in content_lower for word in ["buy", "sale", "offer", "discount"]):
+        elif "tone:promotional" in scan.label_counts:
             tone = "promotional"
         
         return CategoryResult(
@@ -315,18 +417,7 @@ class ContentCategorizer:
             else:
                 result = await self._fallback_categorization(content, platform)
             
-            # Validate platform compatibility
-            platform_rules = self.platform_rules.get(platform, {})
-            if platform_rules:
-                # Check content length
-                max_length = platform_rules.get("max_length", 10000)
-                if len(content) > max_length:
-                    logger.warning(f"Content exceeds {platform} max length ({len(content)}/{max_length})")
-                
-                # Check hashtag limits
-                hashtag_limit = platform_rules.get("hashtag_limit", 10)
-                if len(result.hashtags) > hashtag_limit:
-                    logger.warning(f"Too many hashtags for {platform} ({len(result.hashtags)}/{hashtag_limit})")
+            self._check_platform_limits(content, platform, result)
             
             logger.info(f"Categorized content as '{result.topic_category}' with {result.confidence:.2f} confidence")
             return result
@@ -346,6 +437,111 @@ class ContentCategorizer:
                 links=[]
             )
     
+    def _check_platform_limits(self, content: str, platform: str, result: CategoryResult):
+        """Warn when content breaks the platform's length or hashtag limits"""
+        platform_rules = self.platform_rules.get(platform, {})
+        if platform_rules:
+            # Check content length
+            max_length = platform_rules.get("max_length", 10000)
+            if len(content) > max_length:
+                logger.warning(f"Content exceeds {platform} max length ({len(content)}/{max_length})")
+            
+            # Check hashtag limits
+            hashtag_limit = platform_rules.get("hashtag_limit", 10)
+            if len(result.hashtags) > hashtag_limit:
+                logger.warning(f"Too many hashtags for {platform} ({len(result.hashtags)}/{hashtag_limit})")
+    
+    def keyword_categorize_batch(self, content_list: List[Tuple[str, str]]) -> List[CategoryResult]:
+        """
+        Categorize many items with the precompiled keyword matcher (no AI calls)
+        
+        Args:
+            content_list: List of (content, platform) tuples
+            
+        Returns:
+            List of CategoryResult objects in input order
+        """
+        results = []
+        for i, (content, platform) in enumerate(content_list):
+            try:
+                result = self._keyword_categorize(content, platform)
+                self._check_platform_limits(content, platform, result)
+            except Exception as e:
+                logger.error(f"Error categorizing item {i}: {e}")
+                result = CategoryResult(
+                    topic_category="general",
+                    confidence=0.3,
+                    sentiment="neutral",
+                    tone="conversational",
+                    reading_level="intermediate",
+                    keywords=[],
+                    hashtags=[],
+                    mentions=[],
+                    links=[]
+                )
+            results.append(result)
+        return results
+    
+    async def _ai_categorize_pack(self, items: List[Tuple[str, str]]) -> List[CategoryResult]:
+        """
+        Categorize several short posts with one model request
+        
+        Items the model leaves out (or a failed request) fall back to keyword
+        categorization and are not cached.
+        """
+        posts = [
+            {"id": i, "platform": platform, "content": content}
+            for i, (content, platform) in enumerate(items)
+        ]
+        prompt = f"""
+            Analyze each of the following social media posts and categorize it.
+
+            Respond with a JSON object of the form {{"items": [...]}} containing one entry per post:
+            {{
+                "id": "the post id",
+                "topic_category": "one of: technology, marketing, business, industry_news, educational, personal, finance, health, or general",
+                "confidence": 0.0-1.0,
+                "sentiment": "positive, negative, or neutral",
+                "tone": "professional, casual, humorous, inspiring, educational, promotional, or conversational",
+                "reading_level": "beginner, intermediate, or advanced",
+                "keywords": ["3-5 most important keywords"]
+            }}
+
+            Posts:
+            {json.dumps(posts, ensure_ascii=False)}
+            """
+        
+        answers: Dict[int, Dict[str, Any]] = {}
+        try:
+            response = await self._chat_completion(
+                model=CATEGORIZATION_MODEL,
+                messages=[
+                    {"role": "system", "content": CATEGORIZATION_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=120 * len(items) + 100,
+                response_format={"type": "json_object"}
+            )
+            for answer in json.loads(response.choices[0].message.content).get("items", []):
+                try:
+                    answers[int(answer["id"])] = answer
+                except (KeyError, TypeError, ValueError):
+                    continue
+        except Exception as e:
+            logger.error(f"Packed AI categorization failed for {len(items)} items: {e}")
+        
+        results = []
+        for i, (content, platform) in enumerate(items):
+            if i in answers:
+                result = self._result_from_ai(content, answers[i])
+                self._cache_result(content, platform, result)
+            else:
+                result = self._keyword_categorize(content, platform)
+            self._check_platform_limits(content, platform, result)
+            results.append(result)
+        return results
+    
     async def categorize_batch(
         self, 
         content_list: List[Tuple[str, str]], 
@@ -354,6 +550,11 @@ class ContentCategorizer:
         """
         Categorize multiple content items efficiently
         
+        AI requests share the process-wide adaptive limiter. Short posts are
+        packed several per request, duplicates within the batch are sent once,
+        and cached results for unchanged content skip the model entirely.
+        Throughput is recorded in ``last_batch_stats``.
+        
         Args:
             content_list: List of (content, platform) tuples
             use_ai: Whether to use AI categorization
@@ -361,42 +562,18 @@ class ContentCategorizer:
         Returns:
             List of CategoryResult objects
         """
+        start_time = time.monotonic()
+        stats = {"items": len(content_list), "cached": 0, "ai_requests": 0, "packed_items": 0}
         try:
-            # Process in parallel for better performance
-            tasks = [
-                self.categorize_content(content, platform, use_ai)
-                for content, platform in content_list
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Handle any exceptions in results
-            processed_results = []
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error(f"Error categorizing item {i}: {result}")
-                    # Create fallback result
-                    processed_results.append(CategoryResult(
-                        topic_category="general",
-                        confidence=0.3,
-                        sentiment="neutral",
-                        tone="conversational",
-                        reading_level="intermediate",
-                        keywords=[],
-                        hashtags=[],
-                        mentions=[],
-                        links=[]
-                    ))
-                else:
-                    processed_results.append(result)
-            
-            logger.info(f"Batch categorized {len(processed_results)} content items")
-            return processed_results
-            
+            if not (use_ai and settings.openai_api_key):
+                # Keyword-only path is CPU bound; skip per-item coroutines
+                results = self.keyword_categorize_batch(content_list)
+            else:
+                results = await self._ai_categorize_batch(content_list, stats)
         except Exception as e:
             logger.error(f"Batch categorization failed: {e}")
             # Return fallback results for all items
-            return [
+            results = [
                 CategoryResult(
                     topic_category="general",
                     confidence=0.3,
@@ -410,6 +587,70 @@ class ContentCategorizer:
                 )
                 for _ in content_list
             ]
+        
+        elapsed = time.monotonic() - start_time
+        stats["seconds"] = round(elapsed, 3)
+        stats["items_per_second"] = round(len(content_list) / elapsed, 1) if elapsed > 0 else float(len(content_list))
+        self.last_batch_stats = stats
+        logger.info(
+            f"Batch categorized {len(results)} content items in {elapsed:.2f}s "
+            f"({stats['items_per_second']} items/sec, {stats['cached']} cached, {stats['ai_requests']} model requests)"
+        )
+        return results
+    
+    async def _ai_categorize_batch(
+        self,
+        content_list: List[Tuple[str, str]],
+        stats: Dict[str, Any]
+    ) -> List[CategoryResult]:
+        """Resolve cache hits, then pack short items and send long ones individually"""
+        results: List[Optional[CategoryResult]] = [None] * len(content_list)
+        
+        # Identical (content, platform) pairs are categorized once
+        pending: Dict[Tuple[str, str], List[int]] = {}
+        for i, item in enumerate(content_list):
+            if item in pending:
+                pending[item].append(i)
+                continue
+            cached = self._get_cached_result(*item)
+            if cached is not None:
+                results[i] = cached
+                stats["cached"] += 1
+            else:
+                pending[item] = [i]
+        
+        short_items = [item for item in pending if len(item[0]) <= settings.categorization_pack_max_chars]
+        long_items = [item for item in pending if len(item[0]) > settings.categorization_pack_max_chars]
+        pack_size = max(1, settings.categorization_pack_size)
+        packs = [short_items[i:i + pack_size] for i in range(0, len(short_items), pack_size)]
+        
+        async def run_pack(pack):
+            if len(pack) == 1:
+                return [await self.categorize_content(pack[0][0], pack[0][1], use_ai=True)]
+            stats["packed_items"] += len(pack)
+            return await self._ai_categorize_pack(pack)
+        
+        async def run_single(item):
+            return [await self.categorize_content(item[0], item[1], use_ai=True)]
+        
+        groups = packs + [[item] for item in long_items]
+        stats["ai_requests"] = len(groups)
+        # Concurrency is bounded by the limiter inside each model call
+        group_results = await asyncio.gather(
+            *[run_pack(pack) for pack in packs],
+            *[run_single(item) for item in long_items],
+            return_exceptions=True
+        )
+        
+        for group, outcome in zip(groups, group_results):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error categorizing {len(group)} item(s): {outcome}")
+                outcome = self.keyword_categorize_batch(group)
+            for item, result in zip(group, outcome):
+                for i in pending[item]:
+                    results[i] = result
+        
+        return results
     
     def predict_engagement_level(
         self, 
@@ -432,35 +673,15 @@ class ContentCategorizer:
             base_score = 0.5  # Default baseline
             
             # Category-based scoring
-            category_scores = {
-                "technology": {"twitter": 0.7, "linkedin": 0.8, "instagram": 0.5},
-                "marketing": {"twitter": 0.6, "linkedin": 0.7, "instagram": 0.8},
-                "business": {"twitter": 0.6, "linkedin": 0.9, "instagram": 0.4},
-                "educational": {"twitter": 0.7, "linkedin": 0.8, "instagram": 0.6},
-                "personal": {"twitter": 0.8, "linkedin": 0.6, "instagram": 0.9}
-            }
-            
-            category_score = category_scores.get(
+            category_score = self.CATEGORY_ENGAGEMENT_SCORES.get(
                 category_result.topic_category, {}
             ).get(platform, base_score)
             
             # Sentiment boost
-            sentiment_multiplier = {
-                "positive": 1.2,
-                "neutral": 1.0,
-                "negative": 0.8
-            }
-            sentiment_boost = sentiment_multiplier.get(category_result.sentiment, 1.0)
+            sentiment_boost = self.SENTIMENT_MULTIPLIERS.get(category_result.sentiment, 1.0)
             
             # Tone adjustment
-            tone_multiplier = {
-                "humorous": 1.3,
-                "inspiring": 1.2,
-                "educational": 1.1,
-                "promotional": 0.9,
-                "controversial": 1.4  # High engagement but risky
-            }
-            tone_boost = tone_multiplier.get(category_result.tone, 1.0)
+            tone_boost = self.TONE_MULTIPLIERS.get(category_result.tone, 1.0)
             
             # Hashtag optimization
             hashtag_boost = 1.0
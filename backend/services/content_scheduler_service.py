@@ -16,6 +16,7 @@ from backend.db.models import (
     SocialAudit, Organization
 )
 from backend.services.connection_publisher_service import get_connection_publisher_service
+from backend.services.schedule_dispatcher import get_schedule_dispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -255,6 +256,10 @@ class ContentSchedulerService:
                         }
                     )
                     
+                    # Index the due time; posts due within the lookahead go to Celery now
+                    if scheduled_time:
+                        get_schedule_dispatcher().register(schedule, db)
+                    
                 except Exception as e:
                     db.rollback()
                     error_msg = f"Error processing connection {connection.id}: {str(e)}"
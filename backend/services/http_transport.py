@@ -0,0 +1,259 @@
+"""
+Shared outbound HTTP transports
+
+One pooled, keep-alive (HTTP/2 when ``h2`` is installed) transport per platform,
+shared by every client and adapter in the process instead of a fresh TCP+TLS
+handshake per call. Call sites keep their short-lived ``httpx.AsyncClient``
+context managers and pass ``transport=shared_transport("<platform>")``; closing
+those clients leaves the pooled connections open.
+"""
+import asyncio
+import importlib.util
+import inspect
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from backend.core.config import get_settings
+
+# httpx negotiates HTTP/2 only when the h2 package can be imported
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """
+    Non-closing view of a pooled transport
+
+    Records per-host request and new-connection counts via the httpcore trace
+    extension; the difference is the number of requests served on a reused
+    connection.
+    """
+
+    def __init__(self, pool: "ConnectionPool", platform: str, transport: httpx.AsyncHTTPTransport):
+        self._pool = pool
+        self.platform = platform
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host_stats = self._pool.host_stats_for(request.url.host)
+        host_stats["requests"] += 1
+        self._pool.connection_stats["total_requests"] += 1
+
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            if event_name == "connection.connect_tcp.complete":
+                host_stats["connections_opened"] += 1
+                self._pool.connection_stats["total_connections"] += 1
+            if outer_trace is not None:
+                result = outer_trace(event_name, info)
+                if inspect.isawaitable(result):
+                    await result
+
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            return await self._transport.handle_async_request(request)
+        except httpx.TimeoutException:
+            self._pool.connection_stats["connection_timeouts"] += 1
+            raise
+
+    async def aclose(self):
+        # Owned by the ConnectionPool; per-call clients must not close it
+        pass
+
+
+class ConnectionPool:
+    """
+    HTTP connection pool manager for social media APIs
+    Provides connection reuse and rate limiting coordination
+
+    Connections cannot move between event loops, so pools are kept per running
+    loop and dropped with it. Celery tasks run on the persistent async bridge
+    loop, so their pools outlive individual tasks.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        platform_limits: Optional[Dict[str, int]] = None
+    ):
+        """
+        Initialize connection pool
+
+        Args:
+            max_connections: Maximum connections per platform host
+            max_keepalive: Maximum keepalive connections per platform host
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Negotiate HTTP/2 when the h2 package is available
+            platform_limits: Optional per-platform max_connections overrides
+        """
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.platform_limits = platform_limits or {}
+        self._loop_transports: Dict[asyncio.AbstractEventLoop, Dict[str, SharedTransport]] = {}
+        self._loop_clients: Dict[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]] = {}
+        self.host_stats: Dict[str, Dict[str, int]] = {}
+        self.connection_stats = {
+            "total_requests": 0,
+            "total_connections": 0,
+            "connection_timeouts": 0
+        }
+
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("h2 not installed; shared HTTP transports will use HTTP/1.1 keep-alive")
+        logger.info(f"Connection pool initialized: max_connections={max_connections}, http2={self.http2}")
+
+    def _drop_closed_loops(self):
+        # Pools of finished loops (e.g. after asyncio.run returns) can never be used again
+        for registry in (self._loop_transports, self._loop_clients):
+            for loop in [loop for loop in list(registry) if loop.is_closed()]:
+                registry.pop(loop, None)
+
+    @property
+    def transports(self) -> Dict[str, SharedTransport]:
+        """Shared transports of the running event loop"""
+        loop = asyncio.get_running_loop()
+        if loop not in self._loop_transports:
+            self._drop_closed_loops()
+            self._loop_transports[loop] = {}
+        return self._loop_transports[loop]
+
+    @property
+    def pools(self) -> Dict[str, httpx.AsyncClient]:
+        """Long-lived clients of the running event loop"""
+        loop = asyncio.get_running_loop()
+        if loop not in self._loop_clients:
+            self._drop_closed_loops()
+            self._loop_clients[loop] = {}
+        return self._loop_clients[loop]
+
+    def host_stats_for(self, host: str) -> Dict[str, int]:
+        if host not in self.host_stats:
+            self.host_stats[host] = {"requests": 0, "connections_opened": 0}
+        return self.host_stats[host]
+
+    def transport(self, platform: str) -> SharedTransport:
+        """Get the shared transport for a platform (call from inside the event loop)"""
+        transports = self.transports
+        if platform not in transports:
+            max_connections = self.platform_limits.get(platform, self.max_connections)
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(self.max_keepalive, max_connections),
+                keepalive_expiry=self.keepalive_expiry
+            )
+            transports[platform] = SharedTransport(
+                self,
+                platform,
+                httpx.AsyncHTTPTransport(limits=limits, http2=self.http2, retries=1)
+            )
+            logger.info(f"Created shared HTTP transport for {platform}")
+        return transports[platform]
+
+    async def get_client(self, platform: str, timeout: int = 30) -> httpx.AsyncClient:
+        """Get a long-lived HTTP client for platform on the shared transport"""
+        transport = self.transport(platform)
+        pools = self.pools
+        if platform not in pools:
+            pools[platform] = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(timeout)
+            )
+        return pools[platform]
+
+    async def close_all(self):
+        """Close all connection pools bound to the running loop"""
+        loop = asyncio.get_running_loop()
+        for platform, client in self._loop_clients.pop(loop, {}).items():
+            await client.aclose()
+        for platform, transport in self._loop_transports.pop(loop, {}).items():
+            await transport._transport.aclose()
+            logger.info(f"Closed connection pool for {platform}")
+
+    def reset(self):
+        """Forget pools without closing them (e.g. in a freshly forked worker)"""
+        self._loop_transports = {}
+        self._loop_clients = {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics"""
+        hosts = {}
+        for host, stats in self.host_stats.items():
+            reused = max(0, stats["requests"] - stats["connections_opened"])
+            hosts[host] = {
+                **stats,
+                "reused": reused,
+                "reuse_ratio": round(reused / stats["requests"], 3) if stats["requests"] else 0.0
+            }
+
+        return {
+            **self.connection_stats,
+            "connection_reuse": max(0, self.connection_stats["total_requests"] - self.connection_stats["total_connections"]),
+            "active_pools": sum(
+                len(transports) for loop, transports in list(self._loop_transports.items()) if not loop.is_closed()
+            ),
+            "http2": self.http2,
+            "hosts": hosts
+        }
+
+
+# Process-wide registry used by platform clients and publisher adapters
+http_transport_registry = ConnectionPool(
+    max_connections=settings.http_pool_max_connections,
+    max_keepalive=settings.http_pool_max_keepalive,
+    keepalive_expiry=settings.http_pool_keepalive_expiry,
+    http2=settings.http_pool_http2
+)
+
+
+def shared_transport(platform: str) -> SharedTransport:
+    """Shared transport for ``httpx.AsyncClient(transport=...)`` at call sites"""
+    return http_transport_registry.transport(platform)
+
+
+async def startup_http_transports():
+    """FastAPI startup hook: drop any pools inherited from a parent process"""
+    http_transport_registry.reset()
+
+
+async def shutdown_http_transports():
+    """FastAPI shutdown hook: drain pooled connections"""
+    await http_transport_registry.close_all()
+    logger.info(f"Shared HTTP transport stats at shutdown: {http_transport_registry.get_stats()}")
+
+
+def register_celery_transport_hooks():
+    """Reset pools in each new worker process and log reuse stats on exit"""
+    from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
+
+    @worker_init.connect(weak=False)
+    @worker_process_init.connect(weak=False)
+    def _reset_transports(**kwargs):
+        http_transport_registry.reset()
+
+    @worker_shutdown.connect(weak=False)
+    @worker_process_shutdown.connect(weak=False)
+    def _report_transports(**kwargs):
+        # Pools on the async bridge loop are drained when the bridge stops
+        logger.info(f"Shared HTTP transport stats at worker exit: {http_transport_registry.get_stats()}")
+
+
+def run_blocking(coro):
+    """
+    Run a coroutine to completion from synchronous code (Celery tasks, scripts)
+
+    Runs on the process-wide async bridge loop so pooled connections are reused
+    across calls; inside a running event loop the async client must be awaited
+    instead.
+    """
+    from backend.services.async_bridge import async_bridge
+    return async_bridge.run(coro)
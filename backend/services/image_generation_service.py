@@ -21,12 +21,22 @@ import uuid
 
 from openai import OpenAI, AsyncOpenAI
 from backend.core.config import get_settings
+from backend.core.lazy import LazyProxy
 from backend.services.image_processing_service import image_processing_service
 from backend.services.alt_text_service import alt_text_service
+from backend.services.rate_limit import AsyncRateLimiter
+from backend.services.http_transport import shared_transport
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+
+# Process-wide budget shared by single requests and batch fan-outs
+generation_limiter = AsyncRateLimiter(
+    max_concurrency=settings.image_gen_max_concurrency,
+    requests_per_minute=settings.image_gen_requests_per_minute
+)
+
 class ImageGenerationService:
     """
     Enhanced image generation service using OpenAI's Responses API with image_generation tool
@@ -381,57 +391,15 @@ class ImageGenerationService:
             if custom_options:
                 tool_options.update(custom_options)
             
-            # Use xAI for image generation
-            # xAI API only supports: model, prompt, n, response_format
-            # Does NOT support: size (defaults to 1024x768), quality, or other parameters
-            response = await self.async_client.images.generate(
-                model="grok-2-image",
-                prompt=enhanced_prompt,
-                n=1,
-                response_format="b64_json"  # Get base64 directly to avoid extra download step
-            )
-            
-            # Extract image data from xAI response
-            if not response.data or len(response.data) == 0:
-                raise Exception("No image data returned from xAI Grok image generation")
-            
-            # Get the generated image
-            image_data = response.data[0]
-            
-            # Check if we get a URL or base64 data
-            if hasattr(image_data, 'b64_json') and image_data.b64_json:
-                image_base64 = image_data.b64_json
-            elif hasattr(image_data, 'url') and image_data.url:
-                # Download image and convert to base64
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    img_response = await client.get(image_data.url)
-                    if img_response.status_code == 200:
-                        image_base64 = base64.b64encode(img_response.content).decode('utf-8')
-                    else:
-                        raise Exception(f"Failed to download generated image: {img_response.status_code}")
-            else:
-                raise Exception("No valid image data format returned from xAI")
+            image_base64 = await self._request_image_base64(enhanced_prompt)
             
             # Convert base64 to bytes for post-processing
             raw_image_bytes = base64.b64decode(image_base64)
             
-            # Apply post-processing if enabled
-            processed_image_bytes = raw_image_bytes
-            processing_metadata = {}
-            
-            if enable_post_processing:
-                try:
-                    processed_image_bytes, processing_metadata = image_processing_service.resize_for_platform(
-                        raw_image_bytes, platform, "default", quality_preset
-                    )
-                    logger.info(f"Post-processing completed for {platform} with preset {quality_preset}")
-                except Exception as e:
-                    logger.warning(f"Post-processing failed: {e}, using original image")
-                    processing_metadata = {"error": str(e), "fallback": True}
-            
-            # Validate image quality
-            quality_metrics = image_processing_service.validate_image_quality(processed_image_bytes)
+            # Decode once, render for the platform and score the in-memory result
+            processed_image_bytes, processing_metadata, quality_metrics = self._process_generated_image(
+                raw_image_bytes, platform, quality_preset, enable_post_processing
+            )
             
             # Retry if quality is too low (score < 50) and retries available
             retry_count = 0
@@ -445,109 +413,43 @@ class ImageGenerationService:
                 # Add quality improvement to prompt
                 retry_prompt = enhanced_prompt + ". Generate with higher resolution, better clarity, and professional quality."
                 
-                # Retry generation
-                response = await self.async_client.images.generate(
-                    model="grok-2-image",
-                    prompt=retry_prompt,
-                    n=1,
-                    response_format="b64_json"
-                )
-                
-                if response.data and len(response.data) > 0:
-                    retry_image_data = response.data[0]
-                    if hasattr(retry_image_data, 'b64_json') and retry_image_data.b64_json:
-                        image_base64 = retry_image_data.b64_json
-                        raw_image_bytes = base64.b64decode(image_base64)
-                        
-                        # Re-process and re-validate
-                        if enable_post_processing:
-                            try:
-                                processed_image_bytes, processing_metadata = image_processing_service.resize_for_platform(
-                                    raw_image_bytes, platform, "default", quality_preset
-                                )
-                            except Exception as e:
-                                logger.warning(f"Retry post-processing failed: {e}")
-                        
-                        quality_metrics = image_processing_service.validate_image_quality(processed_image_bytes)
-            
-            # Convert processed image back to base64
-            final_image_base64 = base64.b64encode(processed_image_bytes).decode('utf-8')
-            
-            # Generate alt-text if enabled
-            alt_text_data = {}
-            if generate_alt_text:
                 try:
-                    alt_text_data = await alt_text_service.generate_alt_text(
-                        processed_image_bytes,
-                        context=content_context or prompt,
-                        platform=platform
-                    )
-                    logger.info(f"Alt-text generated: {alt_text_data.get('status')}")
+                    image_base64 = await self._request_image_base64(retry_prompt)
                 except Exception as e:
-                    logger.warning(f"Alt-text generation failed: {e}")
-                    alt_text_data = {
-                        "alt_text": "Generated image",
-                        "status": "error",
-                        "error": str(e)
-                    }
+                    logger.warning(f"Retry generation failed: {e}")
+                    break
+                
+                raw_image_bytes = base64.b64decode(image_base64)
+                
+                # Re-process and re-validate
+                processed_image_bytes, processing_metadata, quality_metrics = self._process_generated_image(
+                    raw_image_bytes, platform, quality_preset, enable_post_processing
+                )
             
-            # Generate unique filename and ID
-            image_id = str(uuid.uuid4())
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            filename = f"{platform}_{timestamp}_{image_id[:8]}.png"
+            # Reuse the provider's base64 when the bytes were not re-encoded
+            if processed_image_bytes is raw_image_bytes:
+                final_image_base64 = image_base64
+            else:
+                final_image_base64 = base64.b64encode(processed_image_bytes).decode('ascii')
             
-            return {
-                "status": "success",
-                "image_id": image_id,
-                "response_id": image_id,
-                "image_base64": final_image_base64,
-                "image_data_url": f"data:image/png;base64,{final_image_base64}",
-                "filename": filename,
-                "prompt": {
-                    "original": prompt,
-                    "enhanced": enhanced_prompt,
-                    "revised": enhanced_prompt
-                },
-                "alt_text": alt_text_data.get("alt_text", ""),
-                "accessibility": {
-                    "alt_text": alt_text_data.get("alt_text", ""),
-                    "alt_text_status": alt_text_data.get("status", "not_generated"),
-                    "alt_text_length": alt_text_data.get("length", 0),
-                    "platform_optimized": alt_text_data.get("platform") == platform
-                },
-                "quality": {
-                    "score": quality_metrics.get("quality_score", 0),
-                    "issues": quality_metrics.get("issues", []),
-                    "recommendations": quality_metrics.get("recommendations", []),
-                    "retry_count": retry_count,
-                    "final_attempt": retry_count >= max_retries
-                },
-                "processing": {
-                    "post_processed": enable_post_processing,
-                    "processing_metadata": processing_metadata,
-                    "original_size": processing_metadata.get("original_size"),
-                    "final_size": processing_metadata.get("processed_size"),
-                    "compression_ratio": processing_metadata.get("compression_ratio", 1.0)
-                },
-                "metadata": {
-                    "platform": platform,
-                    "quality_preset": quality_preset,
-                    "tool_options": tool_options,
-                    "model": "grok-2-image",
-                    "generated_at": datetime.now().isoformat(),
-                    "actual_size": "1024x768",
-                    "requested_size": tool_options.get("size", "1024x1024"),
-                    "content_context": content_context,
-                    "industry_context": industry_context,
-                    "tone": tone,
-                    "enhancements_applied": {
-                        "post_processing": enable_post_processing,
-                        "alt_text_generation": generate_alt_text,
-                        "quality_validation": True,
-                        "retry_logic": max_retries > 0
-                    }
-                }
-            }
+            return await self._build_image_result(
+                prompt=prompt,
+                enhanced_prompt=enhanced_prompt,
+                platform=platform,
+                quality_preset=quality_preset,
+                tool_options=tool_options,
+                image_bytes=processed_image_bytes,
+                image_base64=final_image_base64,
+                processing_metadata=processing_metadata,
+                quality_metrics=quality_metrics,
+                retry_count=retry_count,
+                max_retries=max_retries,
+                content_context=content_context,
+                industry_context=industry_context,
+                tone=tone,
+                enable_post_processing=enable_post_processing,
+                generate_alt_text=generate_alt_text
+            )
             
         except Exception as e:
             logger.error(f"Image generation failed: {str(e)}")
@@ -558,6 +460,166 @@ class ImageGenerationService:
                 "platform": platform
             }
 
+    async def _request_image_base64(self, prompt: str) -> str:
+        """Run one image model call under the shared generation budget and return base64 data."""
+        # xAI API only supports: model, prompt, n, response_format
+        # Does NOT support: size (defaults to 1024x768), quality, or other parameters
+        async with generation_limiter.slot():
+            response = await self.async_client.images.generate(
+                model="grok-2-image",
+                prompt=prompt,
+                n=1,
+                response_format="b64_json"  # Get base64 directly to avoid extra download step
+            )
+        
+        # Extract image data from xAI response
+        if not response.data or len(response.data) == 0:
+            raise Exception("No image data returned from xAI Grok image generation")
+        
+        # Get the generated image
+        image_data = response.data[0]
+        
+        # Check if we get a URL or base64 data
+        if hasattr(image_data, 'b64_json') and image_data.b64_json:
+            return image_data.b64_json
+        if hasattr(image_data, 'url') and image_data.url:
+            # Download image and convert to base64
+            import httpx
+            async with httpx.AsyncClient(transport=shared_transport("xai")) as client:
+                img_response = await client.get(image_data.url)
+                if img_response.status_code == 200:
+                    return base64.b64encode(img_response.content).decode('ascii')
+                raise Exception(f"Failed to download generated image: {img_response.status_code}")
+        raise Exception("No valid image data format returned from xAI")
+
+    async def _build_image_result(self,
+                                  prompt: str,
+                                  enhanced_prompt: str,
+                                  platform: str,
+                                  quality_preset: str,
+                                  tool_options: Dict[str, Any],
+                                  image_bytes: bytes,
+                                  image_base64: str,
+                                  processing_metadata: Dict[str, Any],
+                                  quality_metrics: Dict[str, Any],
+                                  retry_count: int,
+                                  max_retries: int,
+                                  content_context: Optional[str],
+                                  industry_context: Optional[str],
+                                  tone: str,
+                                  enable_post_processing: bool,
+                                  generate_alt_text: bool) -> Dict[str, Any]:
+        """Generate alt-text for a final image and assemble the public result payload."""
+        # Generate alt-text if enabled
+        alt_text_data = {}
+        if generate_alt_text:
+            try:
+                alt_text_data = await alt_text_service.generate_alt_text(
+                    image_bytes,
+                    context=content_context or prompt,
+                    platform=platform
+                )
+                logger.info(f"Alt-text generated: {alt_text_data.get('status')}")
+            except Exception as e:
+                logger.warning(f"Alt-text generation failed: {e}")
+                alt_text_data = {
+                    "alt_text": "Generated image",
+                    "status": "error",
+                    "error": str(e)
+                }
+        
+        # Generate unique filename and ID
+        image_id = str(uuid.uuid4())
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        filename = f"{platform}_{timestamp}_{image_id[:8]}.png"
+        
+        return {
+            "status": "success",
+            "image_id": image_id,
+            "response_id": image_id,
+            "image_base64": image_base64,
+            "image_data_url": f"data:image/png;base64,{image_base64}",
+            "filename": filename,
+            "prompt": {
+                "original": prompt,
+                "enhanced": enhanced_prompt,
+                "revised": enhanced_prompt
+            },
+            "alt_text": alt_text_data.get("alt_text", ""),
+            "accessibility": {
+                "alt_text": alt_text_data.get("alt_text", ""),
+                "alt_text_status": alt_text_data.get("status", "not_generated"),
+                "alt_text_length": alt_text_data.get("length", 0),
+                "platform_optimized": alt_text_data.get("platform") == platform
+            },
+            "quality": {
+                "score": quality_metrics.get("quality_score", 0),
+                "issues": quality_metrics.get("issues", []),
+                "recommendations": quality_metrics.get("recommendations", []),
+                "retry_count": retry_count,
+                "final_attempt": retry_count >= max_retries
+            },
+            "processing": {
+                "post_processed": enable_post_processing,
+                "processing_metadata": processing_metadata,
+                "original_size": processing_metadata.get("original_size"),
+                "final_size": processing_metadata.get("processed_size"),
+                "compression_ratio": processing_metadata.get("compression_ratio", 1.0)
+            },
+            "metadata": {
+                "platform": platform,
+                "quality_preset": quality_preset,
+                "tool_options": tool_options,
+                "model": "grok-2-image",
+                "generated_at": datetime.now().isoformat(),
+                "actual_size": "1024x768",
+                "requested_size": tool_options.get("size", "1024x1024"),
+                "content_context": content_context,
+                "industry_context": industry_context,
+                "tone": tone,
+                "enhancements_applied": {
+                    "post_processing": enable_post_processing,
+                    "alt_text_generation": generate_alt_text,
+                    "quality_validation": True,
+                    "retry_logic": max_retries > 0
+                }
+            }
+        }
+
+    def _process_generated_image(self,
+                                 raw_image_bytes: bytes,
+                                 platform: str,
+                                 quality_preset: str,
+                                 enable_post_processing: bool) -> Tuple[bytes, Dict[str, Any], Dict[str, Any]]:
+        """
+        Post-process a generated image and score it without decoding the output again.
+        
+        Returns:
+            Tuple of (image_bytes, processing_metadata, quality_metrics)
+        """
+        if not enable_post_processing:
+            return raw_image_bytes, {}, image_processing_service.validate_image_quality(raw_image_bytes)
+        
+        try:
+            rendition = image_processing_service.process_renditions(
+                raw_image_bytes, [(platform, "default")], quality_preset
+            )[0]
+            logger.info(f"Post-processing completed for {platform} with preset {quality_preset}")
+        except Exception as e:
+            logger.warning(f"Post-processing failed: {e}, using original image")
+            return (
+                raw_image_bytes,
+                {"error": str(e), "fallback": True},
+                image_processing_service.validate_image_quality(raw_image_bytes)
+            )
+        
+        quality_metrics = rendition["quality_metrics"]
+        if quality_metrics is None:
+            # Processing fell back to the original bytes, so score those instead
+            quality_metrics = image_processing_service.validate_image_quality(rendition["image_bytes"])
+        
+        return rendition["image_bytes"], rendition["metadata"], quality_metrics
+
     async def edit_image(self,
                         edit_prompt: str,
                         previous_response_id: Optional[str] = None,
@@ -744,11 +806,14 @@ class ImageGenerationService:
                                     industry_context: Optional[str] = None,
                                     enable_post_processing: bool = True,
                                     generate_alt_text: bool = True,
-                                    quality_preset: str = "standard") -> Dict[str, List[Dict[str, Any]]]:
+                                    quality_preset: str = "standard",
+                                    share_master_image: bool = True) -> Dict[str, List[Dict[str, Any]]]:
         """
         Generate multiple images optimized for different platforms based on content.
         Includes Grok 4's enhancements: post-processing, alt-text, and quality validation.
         
+        Generations run concurrently under the shared ``generation_limiter`` budget.
+        
         Args:
             content_text: The social media content text
             platforms: List of target platforms
@@ -757,82 +822,288 @@ class ImageGenerationService:
             enable_post_processing: Apply platform-specific post-processing
             generate_alt_text: Generate accessibility alt-text
             quality_preset: Quality preset for all images
+            share_master_image: Generate each variation once and render it per platform
         
         Returns:
             Dict with platform keys and lists of enhanced generated images
         """
-        results = {}
+        results = {platform: [None] * image_count for platform in platforms}
+        
+        async for event in self.stream_content_images(
+            content_text=content_text,
+            platforms=platforms,
+            image_count=image_count,
+            industry_context=industry_context,
+            enable_post_processing=enable_post_processing,
+            generate_alt_text=generate_alt_text,
+            quality_preset=quality_preset,
+            share_master_image=share_master_image
+        ):
+            results[event["platform"]][event["batch_index"]] = event["image"]
+        
+        for platform in platforms:
+            # Log platform completion with quality summary
+            platform_images = results[platform]
+            successful_images = [img for img in platform_images if img.get("status") == "success"]
+            avg_quality = sum(img.get("quality", {}).get("score", 0) for img in successful_images) / max(len(successful_images), 1)
+            logger.info(f"Completed {platform}: {len(successful_images)}/{image_count} successful, avg quality: {avg_quality:.1f}")
+        
+        return results
+
+    async def stream_content_images(self,
+                                    content_text: str,
+                                    platforms: List[str],
+                                    image_count: int = 1,
+                                    industry_context: Optional[str] = None,
+                                    enable_post_processing: bool = True,
+                                    generate_alt_text: bool = True,
+                                    quality_preset: str = "standard",
+                                    share_master_image: bool = True) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Generate content images concurrently and yield each one as soon as it completes.
+        
+        With ``share_master_image`` each variation is generated once from a
+        platform-neutral prompt and rendered locally for every platform; otherwise
+        one generation runs per (platform, variation). Either way all model calls go
+        through the shared ``generation_limiter``.
         
+        Yields:
+            Dict with platform, batch_index, completed/total counters and the image result
+        """
         # Generate base prompt from content with quality enhancements
         base_prompt = f"Create a compelling visual representation for this social media content: {content_text[:200]}"
+        total = len(platforms) * image_count
         
-        for platform in platforms:
-            platform_images = []
-            logger.info(f"Generating {image_count} images for {platform} platform")
-            
-            for i in range(image_count):
-                # Add variation to each image with enhanced prompts
-                variation_prompt = base_prompt
-                if i > 0:
-                    variations = [
-                        "with a different artistic composition and visual angle",
-                        "from an alternative creative perspective with unique styling", 
-                        "with a complementary color palette and mood",
-                        "in a distinctive style with different visual emphasis",
-                        "with varied lighting and atmospheric elements"
-                    ]
-                    variation_prompt += f" {variations[i % len(variations)]}"
-                
-                # Add image number context for variety
-                if image_count > 1:
-                    variation_prompt += f". Variation {i + 1} of {image_count} for maximum visual diversity."
-                
-                try:
-                    result = await self.generate_image(
-                        prompt=variation_prompt,
-                        platform=platform,
-                        quality_preset=quality_preset,
-                        content_context=content_text,
-                        industry_context=industry_context,
-                        enable_post_processing=enable_post_processing,
-                        generate_alt_text=generate_alt_text,
-                        max_retries=1  # Reduced retries for batch generation
-                    )
+        async def run_shared(i: int) -> List[Tuple[str, int, Dict[str, Any]]]:
+            variation_prompt = self._build_variation_prompt(base_prompt, i, image_count)
+            renditions = await self._generate_master_renditions(
+                prompt=variation_prompt,
+                platforms=platforms,
+                quality_preset=quality_preset,
+                content_context=content_text,
+                industry_context=industry_context,
+                enable_post_processing=enable_post_processing,
+                generate_alt_text=generate_alt_text,
+                max_retries=1  # Reduced retries for batch generation
+            )
+            return [(platform, i, result) for platform, result in zip(platforms, renditions)]
+        
+        async def run_single(platform: str, i: int) -> List[Tuple[str, int, Dict[str, Any]]]:
+            variation_prompt = self._build_variation_prompt(base_prompt, i, image_count)
+            result = await self.generate_image(
+                prompt=variation_prompt,
+                platform=platform,
+                quality_preset=quality_preset,
+                content_context=content_text,
+                industry_context=industry_context,
+                enable_post_processing=enable_post_processing,
+                generate_alt_text=generate_alt_text,
+                max_retries=1  # Reduced retries for batch generation
+            )
+            return [(platform, i, result)]
+        
+        if share_master_image and len(platforms) > 1:
+            jobs = {asyncio.ensure_future(run_shared(i)): [(p, i) for p in platforms] for i in range(image_count)}
+        else:
+            jobs = {
+                asyncio.ensure_future(run_single(platform, i)): [(platform, i)]
+                for platform in platforms
+                for i in range(image_count)
+            }
+        
+        logger.info(f"Generating {image_count} images for {len(platforms)} platforms ({len(jobs)} generations)")
+        
+        completed = 0
+        pending = set(jobs)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for job in done:
+                    try:
+                        items = job.result()
+                    except Exception as e:
+                        logger.error(f"Batch image generation failed: {e}")
+                        items = [
+                            (platform, i, {
+                                "status": "error",
+                                "error": str(e),
+                                "platform": platform,
+                                "batch_index": i,
+                                "prompt": self._build_variation_prompt(base_prompt, i, image_count)
+                            })
+                            for platform, i in jobs[job]
+                        ]
                     
-                    # Add batch generation metadata
-                    if "metadata" in result:
-                        result["metadata"]["batch_info"] = {
+                    for platform, i, result in items:
+                        # Add batch generation metadata
+                        if "metadata" in result:
+                            result["metadata"]["batch_info"] = {
+                                "batch_index": i,
+                                "batch_total": image_count,
+                                "platform_batch": platform,
+                                "content_source": content_text[:100]
+                            }
+                        completed += 1
+                        logger.info(f"Generated image {i + 1}/{image_count} for {platform} (quality: {result.get('quality', {}).get('score', 'N/A')})")
+                        yield {
+                            "status": "image_completed",
+                            "platform": platform,
                             "batch_index": i,
-                            "batch_total": image_count,
-                            "platform_batch": platform,
-                            "content_source": content_text[:100]
+                            "completed": completed,
+                            "total": total,
+                            "image": result
                         }
-                    
-                    platform_images.append(result)
-                    logger.info(f"Generated image {i + 1}/{image_count} for {platform} (quality: {result.get('quality', {}).get('score', 'N/A')})")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to generate image {i + 1} for {platform}: {e}")
-                    # Add error placeholder
-                    platform_images.append({
-                        "status": "error",
-                        "error": str(e),
+        finally:
+            # Consumer disconnected or batch cancelled: stop outstanding generations
+            for job in pending:
+                job.cancel()
+
+    def _build_variation_prompt(self, base_prompt: str, index: int, image_count: int) -> str:
+        """Add variation wording so each image in a batch differs."""
+        variation_prompt = base_prompt
+        if index > 0:
+            variations = [
+                "with a different artistic composition and visual angle",
+                "from an alternative creative perspective with unique styling", 
+                "with a complementary color palette and mood",
+                "in a distinctive style with different visual emphasis",
+                "with varied lighting and atmospheric elements"
+            ]
+            variation_prompt += f" {variations[index % len(variations)]}"
+        
+        # Add image number context for variety
+        if image_count > 1:
+            variation_prompt += f". Variation {index + 1} of {image_count} for maximum visual diversity."
+        
+        return variation_prompt
+
+    async def _generate_master_renditions(self,
+                                          prompt: str,
+                                          platforms: List[str],
+                                          quality_preset: str = "standard",
+                                          content_context: Optional[str] = None,
+                                          industry_context: Optional[str] = None,
+                                          tone: str = "professional",
+                                          enable_post_processing: bool = True,
+                                          generate_alt_text: bool = True,
+                                          max_retries: int = 1) -> List[Dict[str, Any]]:
+        """
+        Generate one master image and derive a rendition for each platform locally.
+        
+        Returns:
+            One result per platform, in the order of ``platforms``, shaped like generate_image()
+        """
+        if not self.async_client:
+            return [
+                {
+                    "status": "error",
+                    "error": "Image generation service is unavailable. Please check xAI API key configuration.",
+                    "image_data": None,
+                    "metadata": {
                         "platform": platform,
-                        "batch_index": i,
-                        "prompt": variation_prompt
-                    })
-                
-                # Brief delay to avoid rate limits and allow processing
-                await asyncio.sleep(1.0)  # Increased delay for post-processing
+                        "quality_preset": quality_preset,
+                        "timestamp": datetime.now().isoformat()
+                    }
+                }
+                for platform in platforms
+            ]
+        
+        try:
+            # A platform-neutral prompt, since the master serves every platform
+            enhanced_prompt = self._enhance_prompt_with_quality_boosters(
+                prompt, "multi_platform", content_context, industry_context, tone
+            )
+            preset_config = self.quality_presets.get(quality_preset, self.quality_presets["standard"])
+            tool_options = {
+                "type": "image_generation",
+                "size": preset_config.get("size", "1024x1024"),
+                "quality": preset_config.get("quality", "standard")
+            }
             
-            results[platform] = platform_images
+            image_base64 = await self._request_image_base64(enhanced_prompt)
+            renditions = self._render_master(image_base64, platforms, quality_preset, enable_post_processing)
             
-            # Log platform completion with quality summary
-            successful_images = [img for img in platform_images if img.get("status") == "success"]
-            avg_quality = sum(img.get("quality", {}).get("score", 0) for img in successful_images) / max(len(successful_images), 1)
-            logger.info(f"Completed {platform}: {len(successful_images)}/{image_count} successful, avg quality: {avg_quality:.1f}")
+            retry_count = 0
+            while (min(r[3].get("quality_score", 100) for r in renditions) < 50 and
+                   retry_count < max_retries and
+                   not any("error" in r[3] for r in renditions)):
+                retry_count += 1
+                logger.info(f"Master image quality too low, retrying... ({retry_count}/{max_retries})")
+                retry_prompt = enhanced_prompt + ". Generate with higher resolution, better clarity, and professional quality."
+                try:
+                    image_base64 = await self._request_image_base64(retry_prompt)
+                except Exception as e:
+                    logger.warning(f"Retry generation failed: {e}")
+                    break
+                renditions = self._render_master(image_base64, platforms, quality_preset, enable_post_processing)
+            
+            return list(await asyncio.gather(*[
+                self._build_image_result(
+                    prompt=prompt,
+                    enhanced_prompt=enhanced_prompt,
+                    platform=platform,
+                    quality_preset=quality_preset,
+                    tool_options=tool_options,
+                    image_bytes=image_bytes,
+                    image_base64=rendition_base64,
+                    processing_metadata=processing_metadata,
+                    quality_metrics=quality_metrics,
+                    retry_count=retry_count,
+                    max_retries=max_retries,
+                    content_context=content_context,
+                    industry_context=industry_context,
+                    tone=tone,
+                    enable_post_processing=enable_post_processing,
+                    generate_alt_text=generate_alt_text
+                )
+                for platform, (image_bytes, rendition_base64, processing_metadata, quality_metrics)
+                in zip(platforms, renditions)
+            ]))
         
-        return results
+        except Exception as e:
+            logger.error(f"Master image generation failed: {str(e)}")
+            return [
+                {
+                    "status": "error",
+                    "error": str(e),
+                    "prompt": prompt,
+                    "platform": platform
+                }
+                for platform in platforms
+            ]
+
+    def _render_master(self,
+                       image_base64: str,
+                       platforms: List[str],
+                       quality_preset: str,
+                       enable_post_processing: bool) -> List[Tuple[bytes, str, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Render a master image for each platform from a single decode.
+        
+        Returns:
+            (image_bytes, image_base64, processing_metadata, quality_metrics) per platform
+        """
+        raw_image_bytes = base64.b64decode(image_base64)
+        
+        if not enable_post_processing:
+            quality_metrics = image_processing_service.validate_image_quality(raw_image_bytes)
+            return [(raw_image_bytes, image_base64, {}, quality_metrics) for _ in platforms]
+        
+        renditions = image_processing_service.process_renditions(
+            raw_image_bytes, [(platform, "default") for platform in platforms], quality_preset
+        )
+        rendered = []
+        for rendition in renditions:
+            image_bytes = rendition["image_bytes"]
+            quality_metrics = rendition["quality_metrics"]
+            if quality_metrics is None:
+                quality_metrics = image_processing_service.validate_image_quality(image_bytes)
+            if image_bytes is raw_image_bytes:
+                rendition_base64 = image_base64
+            else:
+                rendition_base64 = base64.b64encode(image_bytes).decode('ascii')
+            rendered.append((image_bytes, rendition_base64, rendition["metadata"], quality_metrics))
+        return rendered
 
     async def add_watermark_to_image(self, 
                                    image_base64: str, 
@@ -1023,5 +1294,5 @@ class ImageGenerationService:
             logger.error(f"Failed to save image to {filepath}: {str(e)}")
             return False
 
-# Global service instance
-image_generation_service = ImageGenerationService()
\ No newline at end of file
+# Global service instance (built on first use)
+image_generation_service = LazyProxy(ImageGenerationService)
\ No newline at end of file
@@ -119,66 +119,161 @@ class ImageProcessingService:
         Returns:
             Tuple of (processed_image_bytes, metadata)
         """
-        try:
-            # Load image from bytes
-            image = Image.open(io.BytesIO(image_data))
-            original_size = image.size
-            
-            # Convert to RGB if needed (handles RGBA, P modes)
-            if image.mode != 'RGB':
-                # Handle transparency by adding white background
-                if image.mode in ('RGBA', 'LA'):
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    if image.mode == 'RGBA':
-                        background.paste(image, mask=image.split()[-1])
-                    else:
-                        background.paste(image, mask=image.split()[-1])
-                    image = background
-                else:
-                    image = image.convert('RGB')
-            
-            # Get platform specifications
-            platform_spec = self.PLATFORM_SPECS.get(platform, self.PLATFORM_SPECS["instagram"])
-            target_size = platform_spec.get(format_type, platform_spec["default"])
-            
-            # Calculate optimal resize maintaining aspect ratio
-            processed_image = self._smart_resize(image, target_size)
-            
-            # Apply quality enhancements
-            processed_image = self._enhance_image_quality(processed_image, quality_preset)
-            
-            # Save to bytes with optimization
-            output_buffer = io.BytesIO()
-            quality_settings = self.QUALITY_SETTINGS[quality_preset]
-            
-            processed_image.save(
-                output_buffer,
-                format="JPEG",
-                quality=quality_settings["compression"],
-                optimize=True,
-                progressive=True
-            )
-            
-            processed_bytes = output_buffer.getvalue()
-            
-            metadata = {
-                "original_size": original_size,
-                "processed_size": processed_image.size,
-                "platform": platform,
-                "format_type": format_type,
-                "quality_preset": quality_preset,
-                "file_size_bytes": len(processed_bytes),
-                "compression_ratio": len(image_data) / len(processed_bytes) if len(processed_bytes) > 0 else 1.0
-            }
-            
-            logger.info(f"Image processed for {platform}: {original_size} → {processed_image.size}")
-            
-            return processed_bytes, metadata
+        renditions = self.process_renditions(
+            image_data, [(platform, format_type)], quality_preset, include_quality_metrics=False
+        )
+        rendition = renditions[0]
+        return rendition["image_bytes"], rendition["metadata"]
+
+    def process_renditions(
+        self,
+        image_data: bytes,
+        renditions: List[Tuple[str, str]],
+        quality_preset: str = "standard",
+        include_quality_metrics: bool = True
+    ) -> List[Dict[str, any]]:
+        """
+        Produce several platform renditions from a single decode of the source image
+        
+        The source is decoded once (using JPEG draft mode when every rendition is
+        smaller than the source), then each rendition is cropped, pre-reduced by an
+        integer factor and LANCZOS-resampled. All renditions are encoded through one
+        reusable output buffer, and quality metrics are computed from the in-memory
+        image rather than by re-decoding the encoded output.
+        
+        Args:
+            image_data: Raw image bytes
+            renditions: List of (platform, format_type) pairs to produce
+            quality_preset: Quality level for optimization
+            include_quality_metrics: Attach validate_image_quality-style metrics
             
+        Returns:
+            List of dicts with image_bytes, metadata and (optionally) quality_metrics,
+            in the same order as ``renditions``
+        """
+        targets = [self._get_target_size(platform, format_type) for platform, format_type in renditions]
+        
+        try:
+            image, original_size = self._decode_for_targets(image_data, targets)
         except Exception as e:
-            logger.error(f"Failed to process image for {platform}: {e}")
-            # Return original image as fallback
-            return image_data, {"error": str(e), "fallback": True}
+            logger.error(f"Failed to decode image for processing: {e}")
+            return [
+                {
+                    "image_bytes": image_data,
+                    "metadata": {"error": str(e), "fallback": True},
+                    "quality_metrics": None
+                }
+                for _ in renditions
+            ]
+        
+        quality_settings = self.QUALITY_SETTINGS.get(quality_preset, self.QUALITY_SETTINGS["standard"])
+        output_buffer = io.BytesIO()
+        results = []
+        
+        for (platform, format_type), target_size in zip(renditions, targets):
+            try:
+                # Calculate optimal resize maintaining aspect ratio
+                processed_image = self._smart_resize(image, target_size)
+                
+                # Apply quality enhancements
+                processed_image = self._enhance_image_quality(processed_image, quality_preset)
+                
+                # Reuse the encode buffer across renditions
+                output_buffer.seek(0)
+                output_buffer.truncate()
+                processed_image.save(
+                    output_buffer,
+                    format="JPEG",
+                    quality=quality_settings["compression"],
+                    optimize=True,
+                    progressive=True
+                )
+                processed_bytes = output_buffer.getvalue()
+                
+                metadata = {
+                    "original_size": original_size,
+                    "processed_size": processed_image.size,
+                    "platform": platform,
+                    "format_type": format_type,
+                    "quality_preset": quality_preset,
+                    "file_size_bytes": len(processed_bytes),
+                    "compression_ratio": len(image_data) / len(processed_bytes) if len(processed_bytes) > 0 else 1.0
+                }
+                
+                quality_metrics = None
+                if include_quality_metrics:
+                    quality_metrics = self._compute_quality_metrics(
+                        processed_image.size, "JPEG", processed_image.mode, len(processed_bytes)
+                    )
+                
+                logger.info(f"Image processed for {platform}: {original_size} → {processed_image.size}")
+                
+                results.append({
+                    "image_bytes": processed_bytes,
+                    "metadata": metadata,
+                    "quality_metrics": quality_metrics
+                })
+                
+            except Exception as e:
+                logger.error(f"Failed to process image for {platform}: {e}")
+                # Return original image as fallback
+                results.append({
+                    "image_bytes": image_data,
+                    "metadata": {"error": str(e), "fallback": True},
+                    "quality_metrics": None
+                })
+        
+        return results
+
+    def _get_target_size(self, platform: str, format_type: str) -> Tuple[int, int]:
+        """Resolve the pixel size for a platform format, falling back to platform defaults"""
+        platform_spec = self.PLATFORM_SPECS.get(platform, self.PLATFORM_SPECS["instagram"])
+        target_size = platform_spec.get(format_type) or platform_spec.get("default")
+        if not isinstance(target_size, tuple):
+            # Platforms like youtube have no "default" entry; use the first size listed
+            target_size = next(v for v in platform_spec.values() if isinstance(v, tuple))
+        return target_size
+
+    def _decode_for_targets(
+        self, image_data: bytes, targets: List[Tuple[int, int]]
+    ) -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Decode the source image once, as small as the largest target allows
+        
+        For JPEG sources, ``Image.draft`` lets libjpeg decode at 1/2, 1/4 or 1/8
+        scale directly, which avoids materialising full-resolution pixels that the
+        final resample would discard anyway.
+        
+        Returns:
+            Tuple of (RGB image, original source size)
+        """
+        image = Image.open(io.BytesIO(image_data))
+        original_size = image.size
+        
+        if image.format == "JPEG" and targets:
+            # Keep enough pixels so every crop can still be resampled down, never up
+            needed_width = max(
+                max(tw, int(th * original_size[0] / original_size[1])) for tw, th in targets
+            )
+            needed_height = max(
+                max(th, int(tw * original_size[1] / original_size[0])) for tw, th in targets
+            )
+            if needed_width < original_size[0] and needed_height < original_size[1]:
+                image.draft("RGB", (needed_width, needed_height))
+        
+        # Convert to RGB if needed (handles RGBA, P modes)
+        if image.mode != 'RGB':
+            # Handle transparency by adding white background
+            if image.mode in ('RGBA', 'LA'):
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.split()[-1])
+                image = background
+            else:
+                image = image.convert('RGB')
+        else:
+            image.load()
+        
+        return image, original_size
 
     def _smart_resize(self, image: Image.Image, target_size: Tuple[int, int]) -> Image.Image:
         """
@@ -193,7 +288,7 @@ class ImageProcessingService:
         
         if abs(original_ratio - target_ratio) < 0.01:
             # Aspect ratios are very similar, just resize
-            return image.resize(target_size, Image.Resampling.LANCZOS)
+            return self._resample(image, target_size)
         
         # Need to crop to match aspect ratio
         if original_ratio > target_ratio:
@@ -208,6 +303,17 @@ class ImageProcessingService:
             image = image.crop((0, top, original_width, top + new_height))
         
         # Now resize to target size
+        return self._resample(image, target_size)
+
+    def _resample(self, image: Image.Image, target_size: Tuple[int, int]) -> Image.Image:
+        """
+        LANCZOS resize, pre-shrinking with a cheap integer ``reduce`` when the
+        source is at least twice the target so the expensive filter runs on
+        fewer pixels
+        """
+        factor = min(image.width // (target_size[0] * 2), image.height // (target_size[1] * 2))
+        if factor >= 2:
+            image = image.reduce(factor)
         return image.resize(target_size, Image.Resampling.LANCZOS)
 
     def _enhance_image_quality(self, image: Image.Image, quality_preset: str) -> Image.Image:
@@ -327,52 +433,9 @@ class ImageProcessingService:
             Dict with quality metrics and recommendations
         """
         try:
+            # Only the header is needed for size/format/mode, so no pixel decode happens here
             image = Image.open(io.BytesIO(image_data))
-            width, height = image.size
-            
-            quality_metrics = {
-                "size": image.size,
-                "format": image.format,
-                "mode": image.mode,
-                "file_size_bytes": len(image_data),
-                "aspect_ratio": width / height,
-                "is_high_resolution": width >= 1080 and height >= 1080,
-                "is_square": abs(width - height) < 50,  # Allow some tolerance
-                "quality_score": 0,
-                "issues": [],
-                "recommendations": []
-            }
-            
-            # Calculate quality score (0-100)
-            score = 70  # Base score
-            
-            # Resolution scoring
-            if width >= 1920 and height >= 1080:
-                score += 20
-            elif width >= 1080 and height >= 1080:
-                score += 10
-            else:
-                quality_metrics["issues"].append("Low resolution")
-                quality_metrics["recommendations"].append("Use higher resolution images (min 1080px)")
-            
-            # File size scoring
-            file_size_mb = len(image_data) / (1024 * 1024)
-            if 0.1 <= file_size_mb <= 5:  # Good range
-                score += 10
-            elif file_size_mb > 10:
-                quality_metrics["issues"].append("Large file size")
-                quality_metrics["recommendations"].append("Optimize image compression")
-            
-            # Format scoring
-            if image.format in ['JPEG', 'PNG']:
-                score += 0  # Standard formats
-            else:
-                quality_metrics["issues"].append(f"Unusual format: {image.format}")
-                quality_metrics["recommendations"].append("Convert to JPEG or PNG")
-            
-            quality_metrics["quality_score"] = min(100, max(0, score))
-            
-            return quality_metrics
+            return self._compute_quality_metrics(image.size, image.format, image.mode, len(image_data))
             
         except Exception as e:
             logger.error(f"Failed to validate image quality: {e}")
@@ -383,6 +446,60 @@ class ImageProcessingService:
                 "recommendations": ["Check image file integrity"]
             }
 
+    def _compute_quality_metrics(
+        self,
+        size: Tuple[int, int],
+        image_format: Optional[str],
+        mode: str,
+        file_size_bytes: int
+    ) -> Dict[str, any]:
+        """Score an image from its dimensions, format and encoded size"""
+        width, height = size
+        
+        quality_metrics = {
+            "size": size,
+            "format": image_format,
+            "mode": mode,
+            "file_size_bytes": file_size_bytes,
+            "aspect_ratio": width / height,
+            "is_high_resolution": width >= 1080 and height >= 1080,
+            "is_square": abs(width - height) < 50,  # Allow some tolerance
+            "quality_score": 0,
+            "issues": [],
+            "recommendations": []
+        }
+        
+        # Calculate quality score (0-100)
+        score = 70  # Base score
+        
+        # Resolution scoring
+        if width >= 1920 and height >= 1080:
+            score += 20
+        elif width >= 1080 and height >= 1080:
+            score += 10
+        else:
+            quality_metrics["issues"].append("Low resolution")
+            quality_metrics["recommendations"].append("Use higher resolution images (min 1080px)")
+        
+        # File size scoring
+        file_size_mb = file_size_bytes / (1024 * 1024)
+        if 0.1 <= file_size_mb <= 5:  # Good range
+            score += 10
+        elif file_size_mb > 10:
+            quality_metrics["issues"].append("Large file size")
+            quality_metrics["recommendations"].append("Optimize image compression")
+        
+        # Format scoring
+        if image_format in ['JPEG', 'PNG']:
+            score += 0  # Standard formats
+        else:
+            quality_metrics["issues"].append(f"Unusual format: {image_format}")
+            quality_metrics["recommendations"].append("Convert to JPEG or PNG")
+        
+        quality_metrics["quality_score"] = min(100, max(0, score))
+        
+        return quality_metrics
+
     def get_platform_recommendations(self, platform: str) -> Dict[str, any]:
         """
         Get platform-specific recommendations for image optimization
@@ -0,0 +1,215 @@
+"""
+Precompiled multi-pattern keyword matcher
+Scores many keyword lexicons and extracts hashtags/mentions in a single pass over the text
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+
+@dataclass
+class KeywordScan:
+    """Result of scanning one text"""
+    term_counts: Dict[str, int] = field(default_factory=dict)
+    label_counts: Dict[str, int] = field(default_factory=dict)
+    label_distinct: Dict[str, int] = field(default_factory=dict)
+    hashtags: List[str] = field(default_factory=list)
+    mentions: List[str] = field(default_factory=list)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick style matcher over labelled keyword lexicons
+
+    Matching is case-insensitive substring matching and, like an Aho-Corasick
+    automaton, reports every occurrence of every pattern including overlapping
+    ones. The pattern trie is compiled once into a single regular expression so
+    the scan runs inside the C regex engine; a pure-Python automaton would be
+    slower than the per-keyword ``str.count`` loops it replaces.
+
+    The regex consumes leftmost-longest matches. Occurrences hidden by that
+    choice are recovered from tables built at init:
+    - patterns contained in a matched pattern (the automaton's output links)
+    - patterns that can start inside a matched pattern and run past its end,
+      which are re-checked only at the precomputed offsets where that is possible
+
+    Hashtags (#tag) and mentions (@user) are picked up by the same scan.
+    """
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        """
+        Args:
+            lexicons: Mapping of label -> keywords. A keyword may appear under several labels.
+        """
+        self.term_labels: Dict[str, Tuple[str, ...]] = {}
+        for label, keywords in lexicons.items():
+            for keyword in keywords:
+                term = keyword.lower()
+                if not term:
+                    continue
+                if "#" in term or "@" in term:
+                    raise ValueError(f"Keyword may not contain '#' or '@': {keyword!r}")
+                if label not in self.term_labels.get(term, ()):
+                    self.term_labels[term] = self.term_labels.get(term, ()) + (label,)
+        self.labels = tuple(lexicons)
+
+        terms = sorted(self.term_labels)
+        term_set = set(terms)
+
+        # Other patterns occurring inside each pattern (with multiplicity)
+        self._contained: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        # Offsets inside each pattern where another pattern may start and cross its end,
+        # and the characters that must follow the pattern for such a crossing to exist
+        self._crossing_offsets: Dict[str, Tuple[int, ...]] = {}
+        self._crossing_next: Dict[str, frozenset] = {}
+        for term in terms:
+            contained = Counter(
+                term[i:j]
+                for i in range(len(term))
+                for j in range(i + 1, len(term) + 1)
+                if term[i:j] in term_set
+            )
+            contained[term] -= 1
+            self._contained[term] = tuple((other, n) for other, n in contained.items() if n)
+
+            offsets, next_chars = [], set()
+            for i in range(1, len(term)):
+                overhang = len(term) - i
+                crossing = [other for other in terms if len(other) > overhang and other.startswith(term[i:])]
+                if crossing:
+                    offsets.append(i)
+                    next_chars.update(other[overhang] for other in crossing)
+            if offsets:
+                self._crossing_offsets[term] = tuple(offsets)
+                self._crossing_next[term] = frozenset(next_chars)
+
+        self._nesting_terms = frozenset(term for term, contained in self._contained.items() if contained)
+
+        # Longest pattern at a position determines all patterns starting there (its prefixes)
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            term: tuple(term[:n] for n in range(1, len(term) + 1) if term[:n] in term_set)
+            for term in terms
+        }
+
+        trie_pattern = self._trie_pattern(terms) if terms else "(?!)"
+        self._keyword_regex = re.compile(trie_pattern)
+        # Tokens are (keyword, next char, tag marker, tag body). Only the tag marker is
+        # consumed so keywords inside hashtags and mentions still count.
+        self._scan_regex = re.compile(f"({trie_pattern})(?=(.?))|([#@])(?=(\\w+))", re.DOTALL)
+
+    @staticmethod
+    def _trie_pattern(terms: List[str]) -> str:
+        """Compile a sorted term list into a trie-shaped regex that prefers the longest match"""
+        root: Dict[str, dict] = {}
+        for term in terms:
+            node = root
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def to_regex(node: Dict[str, dict]) -> str:
+            terminal = "" in node
+            branches = [re.escape(char) + to_regex(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            if len(branches) == 1 and not terminal:
+                return branches[0]
+            body = "(?:" + "|".join(branches) + ")"
+            return body + "?" if terminal else body
+
+        return to_regex(root)
+
+    def scan(self, text: str) -> KeywordScan:
+        """Count every keyword occurrence and collect hashtags/mentions in one pass"""
+        lowered = text.lower()
+        tokens = self._scan_regex.findall(lowered)
+
+        crossing_next = self._crossing_next
+        matched = [term for term, _, _, _ in tokens if term]
+        # Positions are only needed for tags, or where the following character could
+        # extend a crossing pattern
+        needs_positions = len(matched) != len(tokens) or any(
+            next_char in crossing_next[term]
+            for term, next_char, _, _ in tokens
+            if term in crossing_next
+        )
+
+        counts = Counter(matched)
+        nesting = [(term, counts[term]) for term in self._nesting_terms.intersection(counts)]
+        for term, n in nesting:
+            for contained, k in self._contained[term]:
+                counts[contained] += n * k
+
+        hashtags: List[str] = []
+        mentions: List[str] = []
+        if needs_positions:
+            # Crossing occurrences are listed individually, so they are not expanded
+            counts.update(self._locate_tokens(text, lowered, tokens, hashtags, mentions))
+
+        label_counts: Dict[str, int] = {}
+        label_distinct: Dict[str, int] = {}
+        term_labels = self.term_labels
+        for term, n in counts.items():
+            for label in term_labels[term]:
+                label_counts[label] = label_counts.get(label, 0) + n
+                label_distinct[label] = label_distinct.get(label, 0) + 1
+
+        return KeywordScan(
+            term_counts=dict(counts),
+            label_counts=label_counts,
+            label_distinct=label_distinct,
+            hashtags=hashtags,
+            mentions=mentions,
+        )
+
+    def _locate_tokens(
+        self,
+        text: str,
+        lowered: str,
+        tokens: List[Tuple[str, str, str, str]],
+        hashtags: List[str],
+        mentions: List[str]
+    ) -> List[str]:
+        """
+        Recover token positions, collecting tags and crossing occurrences
+
+        Tokens come back in text order and each one is the first place at or
+        after the previous token where any token can start, so ``str.find`` from
+        a running cursor gives its exact position without re-running the regex.
+        """
+        # Lowercasing can change length for a few non-ASCII characters; tags then come from the lowered text
+        tag_source = text if len(lowered) == len(text) else lowered
+        crossing_next = self._crossing_next
+        crossing: List[str] = []
+        cursor = 0
+
+        for term, next_char, marker, body in tokens:
+            if term:
+                start = lowered.find(term, cursor)
+                cursor = start + len(term)
+                if term in crossing_next and next_char in crossing_next[term]:
+                    crossing.extend(self._crossing_terms(lowered, term, start, cursor))
+            else:
+                start = lowered.find(marker + body, cursor)
+                cursor = start + 1
+                tag = tag_source[start:start + 1 + len(body)]
+                (hashtags if marker == "#" else mentions).append(tag)
+
+        return crossing
+
+    def _crossing_terms(self, lowered: str, term: str, start: int, end: int) -> List[str]:
+        """Patterns starting inside the matched term that run past its end"""
+        found = []
+        for offset in self._crossing_offsets[term]:
+            crossing = self._keyword_regex.match(lowered, start + offset)
+            if crossing is None or crossing.end() <= end:
+                continue
+            overhang = end - (start + offset)
+            found.extend(prefix for prefix in self._prefixes[crossing.group()] if len(prefix) > overhang)
+        return found
+
+    def scan_many(self, texts: Iterable[str]) -> List[KeywordScan]:
+        """Scan a batch of texts with the shared compiled matcher"""
+        scan = self.scan
+        return [scan(text) for text in texts]
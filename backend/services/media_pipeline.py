@@ -0,0 +1,204 @@
+"""
+Media pipeline for publisher adapters
+Streams media downloads to bounded spool files, uploads items concurrently and
+caches platform media ids by content hash so re-posting an asset skips the upload
+"""
+import asyncio
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterator, List, Optional, Tuple
+
+import httpx
+
+from backend.core.config import get_settings
+from backend.services.http_transport import shared_transport
+from backend.services.rate_limit import AsyncRateLimiter
+from backend.services.redis_cache import redis_cache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class MediaDownloadError(Exception):
+    """Media URL could not be fetched (or exceeded the size limit)"""
+    pass
+
+
+@dataclass
+class MediaItem:
+    """Downloaded media held in a spool file (memory up to spool_max_bytes, disk beyond)"""
+    url: str
+    media_type: str
+    size: int
+    sha256: str
+    file: tempfile.SpooledTemporaryFile = field(repr=False)
+
+    @property
+    def is_image(self) -> bool:
+        return self.media_type.startswith("image/")
+
+    @property
+    def is_video(self) -> bool:
+        return self.media_type.startswith("video/")
+
+    @property
+    def filename(self) -> str:
+        return f"{self.sha256[:16]}.{self.media_type.split('/')[-1]}"
+
+    def read(self) -> bytes:
+        """Whole payload in memory; only for items no larger than one chunk"""
+        self.file.seek(0)
+        return self.file.read()
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        """Yield the payload chunk by chunk for segmented uploads"""
+        self.file.seek(0)
+        while True:
+            chunk = self.file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def rewind(self) -> tempfile.SpooledTemporaryFile:
+        """File object positioned at the start, for streamed multipart uploads"""
+        self.file.seek(0)
+        return self.file
+
+    def close(self):
+        self.file.close()
+
+
+# upload(item) -> (media_id, cache_ttl_seconds)
+MediaUploader = Callable[[MediaItem], Awaitable[Tuple[str, int]]]
+
+
+class MediaPipeline:
+    """
+    Download and upload the media of a post concurrently
+
+    Each item is streamed in ``chunk_size`` pieces into a spool file that keeps
+    at most ``spool_max_bytes`` in memory, hashed on the way, then handed to the
+    platform uploader unless its id is cached for that account. Items in flight
+    across the whole process are capped by ``max_concurrency``, so peak memory
+    stays around ``max_concurrency * (spool_max_bytes + chunk_size)`` however
+    many posts publish at once.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        chunk_size: int = 1024 * 1024,
+        spool_max_bytes: int = 1024 * 1024,
+        max_media_bytes: int = 512 * 1024 * 1024,
+        download_timeout: float = 60.0
+    ):
+        """
+        Args:
+            max_concurrency: Media items downloaded/uploaded at once per process
+            chunk_size: Read size for downloads and segment size for chunked uploads
+            spool_max_bytes: Bytes per item kept in memory before spilling to disk
+            max_media_bytes: Largest media file accepted
+            download_timeout: Timeout for each media download
+        """
+        self.chunk_size = chunk_size
+        self.spool_max_bytes = spool_max_bytes
+        self.max_media_bytes = max_media_bytes
+        self.download_timeout = download_timeout
+        self._limiter = AsyncRateLimiter(max_concurrency=max_concurrency, requests_per_minute=0)
+        self.stats = {
+            "downloaded": 0,
+            "uploaded": 0,
+            "cache_hits": 0,
+            "failed": 0,
+            "bytes_downloaded": 0
+        }
+
+    async def download(self, url: str) -> MediaItem:
+        """Stream a media URL into a spool file, hashing as it arrives"""
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_max_bytes)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with httpx.AsyncClient(timeout=self.download_timeout, transport=shared_transport("media")) as client:
+                async with client.stream("GET", url, follow_redirects=True) as response:
+                    if response.status_code != 200:
+                        raise MediaDownloadError(f"Failed to download media from {url}: {response.status_code}")
+                    media_type = response.headers.get("content-type", "image/jpeg").split(";")[0].strip()
+
+                    async for chunk in response.aiter_bytes(self.chunk_size):
+                        size += len(chunk)
+                        if size > self.max_media_bytes:
+                            raise MediaDownloadError(f"Media at {url} exceeds {self.max_media_bytes} bytes")
+                        digest.update(chunk)
+                        spool.write(chunk)
+        except Exception:
+            spool.close()
+            raise
+
+        self.stats["downloaded"] += 1
+        self.stats["bytes_downloaded"] += size
+        return MediaItem(url=url, media_type=media_type, size=size, sha256=digest.hexdigest(), file=spool)
+
+    async def upload_all(
+        self,
+        media_urls: List[str],
+        upload: MediaUploader,
+        platform: str,
+        cache_scope: str
+    ) -> List[Optional[str]]:
+        """
+        Download and upload every media URL concurrently
+
+        Args:
+            media_urls: Media to attach, in post order
+            upload: Platform uploader returning (media_id, seconds the id stays usable)
+            platform: Cache namespace platform (e.g. "x", "meta")
+            cache_scope: Account the media ids belong to (ids are not shareable across accounts)
+
+        Returns:
+            Media ids in the order of media_urls; None for items that failed
+        """
+        results = await asyncio.gather(
+            *(self._process(url, upload, platform, cache_scope) for url in media_urls),
+            return_exceptions=True
+        )
+
+        media_ids = []
+        for url, result in zip(media_urls, results):
+            if isinstance(result, BaseException):
+                self.stats["failed"] += 1
+                logger.error(f"Error processing media {url}: {result}")
+                media_ids.append(None)
+            else:
+                media_ids.append(result)
+        return media_ids
+
+    async def _process(self, url: str, upload: MediaUploader, platform: str, cache_scope: str) -> str:
+        async with self._limiter.slot():
+            item = await self.download(url)
+            try:
+                resource_id = f"{cache_scope}:{item.sha256}"
+                cached = await redis_cache.get(platform, "media_id", resource_id=resource_id)
+                if cached:
+                    self.stats["cache_hits"] += 1
+                    logger.info(f"Reusing uploaded {platform} media {cached} for {url}")
+                    return cached
+
+                media_id, ttl = await upload(item)
+                self.stats["uploaded"] += 1
+                if ttl > 0:
+                    await redis_cache.set(platform, "media_id", media_id, resource_id=resource_id, ttl=ttl)
+                return media_id
+            finally:
+                item.close()
+
+
+# Process-wide pipeline shared by publisher adapters
+media_pipeline = MediaPipeline(
+    max_concurrency=settings.media_pipeline_max_concurrency,
+    chunk_size=settings.media_upload_chunk_size,
+    spool_max_bytes=settings.media_spool_max_bytes,
+    max_media_bytes=settings.media_max_bytes
+)
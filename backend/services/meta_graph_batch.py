@@ -0,0 +1,304 @@
+"""
+Meta Graph API batch executor
+Packs many Graph sub-requests into single POST /?batch= calls and fans results back to callers
+"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlencode
+
+import httpx
+
+from backend.core.config import get_settings
+from backend.services.http_transport import shared_transport
+from backend.services.rate_limit import exponential_backoff_with_jitter
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Graph API hard limit on sub-requests per batch
+MAX_BATCH_SIZE = 50
+
+# Graph error codes worth retrying: unknown/service errors, throttling, temporary issues
+TRANSIENT_ERROR_CODES = {1, 2, 4, 17, 32, 341, 613}
+
+
+class GraphBatchError(Exception):
+    """Error for a single Graph batch sub-request (or the whole batch call)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, error: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.error = error or {}
+
+
+@dataclass
+class GraphRequest:
+    """One queued sub-request and the future its caller awaits"""
+    method: str
+    relative_url: str
+    future: asyncio.Future
+    body: Optional[Dict[str, Any]] = None
+    access_token: Optional[str] = None
+    attempts: int = 0
+
+    def to_batch_item(self) -> Dict[str, Any]:
+        item = {"method": self.method.upper(), "relative_url": self.relative_url}
+        if self.body:
+            item["body"] = urlencode(self.body, doseq=True)
+        return item
+
+
+class GraphBatchExecutor:
+    """
+    Queue Graph API calls and send them as batch requests
+
+    ``submit`` returns a future immediately. Queued requests are flushed when
+    ``max_batch_size`` are waiting or ``flush_interval`` seconds after the first
+    one was queued, whichever comes first; ``flush`` (or leaving the ``async
+    with`` block) sends everything still queued and waits for the answers.
+
+    Each sub-request succeeds or fails on its own. Transient failures (5xx,
+    throttling codes, sub-requests Graph did not get to) are retried in a later
+    batch; other errors are raised from the caller's future as GraphBatchError.
+
+    Executors are cheap and bound to the running event loop; create one per
+    operation rather than sharing one across loops.
+    """
+
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        graph_version: Optional[str] = None,
+        max_batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_base_delay: float = 1.0,
+        timeout: float = 60.0
+    ):
+        """
+        Args:
+            access_token: Default token for the batch; sub-requests may carry their own
+            graph_version: Graph API version, defaults to META_GRAPH_VERSION
+            max_batch_size: Sub-requests per batch call (capped at 50)
+            flush_interval: Seconds a partial batch waits for more requests
+            max_retries: Retries per sub-request for transient failures
+            retry_base_delay: Base delay for exponential retry backoff
+            timeout: HTTP timeout for one batch call
+        """
+        self.access_token = access_token
+        self.base_url = f"https://graph.facebook.com/{graph_version or settings.meta_graph_version}"
+        self.max_batch_size = min(max_batch_size or settings.meta_graph_batch_size, MAX_BATCH_SIZE)
+        self.flush_interval = settings.meta_graph_batch_flush_interval if flush_interval is None else flush_interval
+        self.max_retries = settings.meta_graph_batch_max_retries if max_retries is None else max_retries
+        self.retry_base_delay = retry_base_delay
+        self.timeout = timeout
+
+        self._pending: List[GraphRequest] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self.stats = {
+            "submitted": 0,
+            "batch_requests": 0,
+            "retries": 0,
+            "failed": 0
+        }
+
+    async def __aenter__(self) -> "GraphBatchExecutor":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.flush()
+
+    def submit(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Dict[str, Any]] = None,
+        access_token: Optional[str] = None
+    ) -> asyncio.Future:
+        """
+        Queue a Graph API call
+
+        Args:
+            method: HTTP method (GET, POST, DELETE)
+            path: Graph path relative to the version, e.g. "{post_id}/insights"
+            params: Query parameters
+            body: Form body for POST requests
+            access_token: Token for this sub-request if it differs from the batch token
+
+        Returns:
+            Future resolving to the decoded response body
+        """
+        query = dict(params or {})
+        if access_token and access_token != self.access_token:
+            query["access_token"] = access_token
+        relative_url = path.lstrip("/")
+        if query:
+            relative_url = f"{relative_url}?{urlencode(query, doseq=True)}"
+
+        request = GraphRequest(
+            method=method,
+            relative_url=relative_url,
+            future=asyncio.get_running_loop().create_future(),
+            body=body,
+            access_token=access_token
+        )
+        self.stats["submitted"] += 1
+        self._enqueue(request)
+        return request.future
+
+    async def request(self, method: str, path: str, **kwargs) -> Any:
+        """Queue a Graph API call and wait for its result"""
+        return await self.submit(method, path, **kwargs)
+
+    async def execute(self, calls: Iterable[Dict[str, Any]]) -> List[Any]:
+        """
+        Run many calls and return results in order
+
+        Args:
+            calls: Dicts of ``submit`` keyword arguments (method, path, params, body, access_token)
+
+        Returns:
+            Response bodies, or the GraphBatchError for calls that failed
+        """
+        futures = [self.submit(**call) for call in calls]
+        await self.flush()
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    async def flush(self):
+        """Send everything queued (including pending retries) and wait for the answers"""
+        while self._pending or self._inflight:
+            if self._pending:
+                self._send_pending(send_partial=True)
+            if self._inflight:
+                await asyncio.gather(*list(self._inflight), return_exceptions=True)
+
+    def _enqueue(self, request: GraphRequest):
+        self._pending.append(request)
+        if len(self._pending) >= self.max_batch_size:
+            self._send_pending()
+        elif self._flush_timer is None:
+            loop = asyncio.get_running_loop()
+            self._flush_timer = loop.call_later(self.flush_interval, self._send_pending, True)
+
+    def _send_pending(self, send_partial: bool = False):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        while len(self._pending) >= self.max_batch_size or (send_partial and self._pending):
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+        if self._pending:
+            loop = asyncio.get_running_loop()
+            self._flush_timer = loop.call_later(self.flush_interval, self._send_pending, True)
+
+    async def _send_batch(self, batch: List[GraphRequest]):
+        retry: List[GraphRequest] = []
+        try:
+            results = await self._post_batch(batch)
+        except Exception as e:
+            logger.warning(f"Graph batch of {len(batch)} failed: {e}")
+            error = e if isinstance(e, GraphBatchError) else GraphBatchError(f"Graph batch request failed: {e}")
+            for request in batch:
+                self._retry_or_fail(request, error, retry)
+        else:
+            for index, request in enumerate(batch):
+                result = results[index] if index < len(results) else None
+                self._resolve(request, result, retry)
+
+        if retry:
+            attempt = max(request.attempts for request in retry) - 1
+            await asyncio.sleep(exponential_backoff_with_jitter(attempt, base_delay=self.retry_base_delay))
+            for request in retry:
+                self._enqueue(request)
+
+    async def _post_batch(self, batch: List[GraphRequest]) -> List[Optional[Dict[str, Any]]]:
+        data = {
+            "batch": json.dumps([request.to_batch_item() for request in batch]),
+            "include_headers": "false"
+        }
+        # Graph requires a top-level token even when every sub-request carries its own
+        fallback_token = self.access_token or next((r.access_token for r in batch if r.access_token), None)
+        if fallback_token:
+            data["access_token"] = fallback_token
+
+        async with httpx.AsyncClient(timeout=self.timeout, transport=shared_transport("meta")) as client:
+            response = await client.post(f"{self.base_url}/", data=data)
+        self.stats["batch_requests"] += 1
+
+        if response.status_code >= 400:
+            error = self._decode_error(response.text)
+            raise GraphBatchError(
+                f"Graph batch returned {response.status_code}: {error.get('message', response.text)}",
+                status_code=response.status_code,
+                error=error
+            )
+
+        results = response.json()
+        if not isinstance(results, list):
+            # e.g. an error object served with status 200
+            error = results.get("error", {}) if isinstance(results, dict) else {}
+            raise GraphBatchError(
+                f"Graph batch returned {type(results).__name__} instead of a result list: "
+                f"{error.get('message', str(results)[:200])}",
+                status_code=response.status_code,
+                error=error
+            )
+        return results
+
+    def _resolve(self, request: GraphRequest, result: Optional[Dict[str, Any]], retry: List[GraphRequest]):
+        if request.future.done():
+            return
+        if not isinstance(result, dict):
+            # Graph returns null for sub-requests it did not complete in time
+            self._retry_or_fail(request, GraphBatchError("Graph batch sub-request was not processed"), retry)
+            return
+
+        status_code = result.get("code", 500)
+        body_text = result.get("body")
+        if status_code < 400:
+            try:
+                request.future.set_result(json.loads(body_text) if body_text else {})
+            except ValueError:
+                request.future.set_result(body_text)
+            return
+
+        error = self._decode_error(body_text)
+        exc = GraphBatchError(
+            f"Graph API error ({error.get('code', status_code)}): {error.get('message', 'Unknown error')}",
+            status_code=status_code,
+            error=error
+        )
+        if status_code >= 500 or error.get("code") in TRANSIENT_ERROR_CODES or error.get("is_transient"):
+            self._retry_or_fail(request, exc, retry)
+        else:
+            self.stats["failed"] += 1
+            request.future.set_exception(exc)
+
+    def _retry_or_fail(self, request: GraphRequest, exc: GraphBatchError, retry: List[GraphRequest]):
+        if request.future.done():
+            return
+        if request.attempts < self.max_retries:
+            request.attempts += 1
+            self.stats["retries"] += 1
+            retry.append(request)
+        else:
+            self.stats["failed"] += 1
+            request.future.set_exception(exc)
+
+    @staticmethod
+    def _decode_error(body_text: Optional[str]) -> Dict[str, Any]:
+        try:
+            body = json.loads(body_text) if body_text else {}
+        except ValueError:
+            return {}
+        return body.get("error", {}) if isinstance(body, dict) else {}
@@ -3,10 +3,12 @@ Meta page token service for partner OAuth flows
 Handles Facebook Page discovery and page access token exchange
 """
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import httpx
 
 from backend.core.config import get_settings
+from backend.services.http_transport import shared_transport
+from backend.services.meta_graph_batch import GraphBatchExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +45,7 @@ class MetaPageTokenService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(transport=shared_transport("meta")) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -54,6 +56,20 @@ class MetaPageTokenService:
                     logger.warning("User has no Facebook Pages")
                     return []
                 
+                # Instagram usernames, looked up in one Graph batch when several pages are linked
+                ig_lookups = [
+                    (page_data["instagram_business_account"]["id"], page_data.get("access_token"))
+                    for page_data in pages_data
+                    if page_data.get("instagram_business_account")
+                ]
+                if len(ig_lookups) > 1:
+                    ig_usernames = await self._get_instagram_usernames(ig_lookups)
+                else:
+                    ig_usernames = {
+                        ig_id: await self._get_instagram_username(ig_id, page_token)
+                        for ig_id, page_token in ig_lookups
+                    }
+                
                 # Transform pages data with computed flags
                 pages = []
                 for page_data in pages_data:
@@ -68,15 +84,9 @@ class MetaPageTokenService:
                     # Include Instagram Business account details if available
                     ig_account = page_data.get("instagram_business_account")
                     if ig_account:
-                        # Get Instagram username if available
-                        ig_username = await self._get_instagram_username(
-                            ig_account["id"], 
-                            page_data.get("access_token")
-                        )
-                        
                         page["instagram_business_account"] = {
                             "id": ig_account["id"],
-                            "username": ig_username
+                            "username": ig_usernames.get(ig_account["id"])
                         }
                     
                     pages.append(page)
@@ -117,7 +127,7 @@ class MetaPageTokenService:
                 "access_token": page_token
             }
             
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(transport=shared_transport("meta")) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -128,6 +138,36 @@ class MetaPageTokenService:
             logger.warning(f"Failed to get Instagram username for {instagram_id}: {e}")
             return None
     
+    async def _get_instagram_usernames(self, accounts: List[Tuple[str, Optional[str]]]) -> Dict[str, Optional[str]]:
+        """
+        Get Instagram usernames for several Business accounts in Graph batch requests
+        
+        Args:
+            accounts: (Instagram Business account ID, page access token) pairs
+            
+        Returns:
+            Username (or None if not available) keyed by Instagram account ID
+        """
+        usernames: Dict[str, Optional[str]] = {}
+        futures = {}
+        async with GraphBatchExecutor(graph_version=self.graph_version) as batch:
+            for instagram_id, page_token in accounts:
+                if page_token:
+                    futures[instagram_id] = batch.submit(
+                        "GET", instagram_id, params={"fields": "username"}, access_token=page_token
+                    )
+                else:
+                    usernames[instagram_id] = None
+        
+        for instagram_id, future in futures.items():
+            try:
+                usernames[instagram_id] = future.result().get("username")
+            except Exception as e:
+                logger.warning(f"Failed to get Instagram username for {instagram_id}: {e}")
+                usernames[instagram_id] = None
+        
+        return usernames
+    
     async def exchange_for_page_token(self, user_access_token: str, page_id: str) -> Dict[str, Any]:
         """
         Exchange user token for page-specific access token
@@ -154,7 +194,7 @@ class MetaPageTokenService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(transport=shared_transport("meta")) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -211,7 +251,7 @@ class MetaPageTokenService:
                 "access_token": page_access_token
             }
             
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(transport=shared_transport("meta")) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -240,7 +280,7 @@ class MetaPageTokenService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(transport=shared_transport("meta")) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -12,6 +12,8 @@ import httpx
 
 from backend.core.config import get_settings
 from backend.core.encryption import decrypt_token
+from backend.services.http_transport import shared_transport
+from backend.services.meta_graph_batch import GraphBatchError, GraphBatchExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,9 @@ logger = logging.getLogger(__name__)
 class MetaWebhookService:
     """Service for handling Meta (Facebook/Instagram) webhooks"""
     
+    PAGE_SUBSCRIBED_FIELDS = "feed,mentions,messaging,message_deliveries,messaging_postbacks"
+    INSTAGRAM_SUBSCRIBED_FIELDS = "feed,comments,mentions,story_insights"
+    
     def __init__(self, settings=None):
         """
         Initialize Meta webhook service
@@ -131,11 +136,11 @@ class MetaWebhookService:
             url = f"{self.base_url}/{page_id}/subscribed_apps"
             
             params = {
-                "subscribed_fields": "feed,mentions,messaging,message_deliveries,messaging_postbacks",
+                "subscribed_fields": self.PAGE_SUBSCRIBED_FIELDS,
                 "access_token": page_access_token
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
                 response = await client.post(url, params=params)
                 response.raise_for_status()
                 
@@ -156,6 +161,62 @@ class MetaWebhookService:
             logger.error(f"Error subscribing Page {page_id} webhooks: {e}")
             return False
     
+    async def subscribe_connection_webhooks(
+        self,
+        page_id: str,
+        page_access_token: str,
+        instagram_id: Optional[str] = None
+    ) -> Dict[str, bool]:
+        """
+        Subscribe a Page and its linked Instagram account in one Graph batch request
+        
+        Args:
+            page_id: Facebook Page ID
+            page_access_token: Page access token
+            instagram_id: Instagram Business account ID, if linked
+            
+        Returns:
+            Dict with "page" and "instagram" success flags (instagram is True when not linked)
+        """
+        results = {"page": False, "instagram": True}
+        try:
+            async with GraphBatchExecutor(access_token=page_access_token, graph_version=self.graph_version) as batch:
+                page_future = batch.submit(
+                    "POST", f"{page_id}/subscribed_apps", params={"subscribed_fields": self.PAGE_SUBSCRIBED_FIELDS}
+                )
+                instagram_future = None
+                if instagram_id:
+                    instagram_future = batch.submit(
+                        "POST", f"{instagram_id}/subscribed_apps", params={"subscribed_fields": self.INSTAGRAM_SUBSCRIBED_FIELDS}
+                    )
+        except Exception as e:
+            logger.error(f"Error subscribing Page {page_id} webhooks: {e}")
+            return {"page": False, "instagram": not instagram_id}
+        
+        try:
+            results["page"] = bool(page_future.result().get("success", False))
+            if results["page"]:
+                logger.info(f"Successfully subscribed Page {page_id} to webhooks")
+            else:
+                logger.warning(f"Page {page_id} webhook subscription returned success=false")
+        except Exception as e:
+            logger.error(f"Error subscribing Page {page_id} webhooks: {e}")
+        
+        if instagram_future is not None:
+            try:
+                instagram_future.result()
+                logger.info(f"Successfully subscribed Instagram {instagram_id} to webhooks")
+            except GraphBatchError as e:
+                # Instagram webhook subscriptions may not be available for all account types
+                results["instagram"] = e.status_code == 400
+                if not results["instagram"]:
+                    logger.warning(f"Instagram {instagram_id} webhook subscription failed: {e}")
+            except Exception as e:
+                results["instagram"] = False
+                logger.error(f"Error subscribing Instagram {instagram_id} webhooks: {e}")
+        
+        return results
+    
     async def unsubscribe_page_webhooks(self, page_id: str, page_access_token: str) -> bool:
         """
         Unsubscribe a Facebook Page from app webhooks
@@ -174,7 +235,7 @@ class MetaWebhookService:
                 "access_token": page_access_token
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
                 response = await client.delete(url, params=params)
                 
                 # Both 200 and 400 are acceptable (400 might mean already unsubscribed)
@@ -207,11 +268,11 @@ class MetaWebhookService:
             url = f"{self.base_url}/{instagram_id}/subscribed_apps"
             
             params = {
-                "subscribed_fields": "feed,comments,mentions,story_insights",
+                "subscribed_fields": self.INSTAGRAM_SUBSCRIBED_FIELDS,
                 "access_token": page_access_token
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
                 response = await client.post(url, params=params)
                 
                 # Instagram webhook subscriptions may not be available for all account types
@@ -244,7 +305,7 @@ class MetaWebhookService:
                 "access_token": page_access_token
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
                 response = await client.delete(url, params=params)
                 
                 # Both 200 and 400 are acceptable
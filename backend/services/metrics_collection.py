@@ -34,8 +34,8 @@ class InstagramInsight:
 class FacebookInsights:
     def __init__(self):
         pass
-from backend.integrations.twitter_client import twitter_client
-from backend.integrations.instagram_client import instagram_client
+from backend.integrations.twitter_client import async_twitter_client as twitter_client
+from backend.integrations.instagram_client import async_instagram_client as instagram_client
 from backend.integrations.facebook_client import facebook_client
 
 settings = get_settings()
@@ -394,17 +394,22 @@ class SocialMediaMetricsCollector:
                         ContentItem.status == "published"
                     ).order_by(ContentItem.published_at.desc()).limit(self.batch_sizes[Platform.FACEBOOK]).all()
                     
-                    # Collect metrics for each content item
+                    content_items = [
+                        content_item for content_item in content_items
+                        if self._should_collect_metrics(content_item, Platform.FACEBOOK, force_collection)
+                    ]
+                    if not content_items:
+                        continue
+                    
+                    # Get Facebook insights for all items in Graph batch requests
+                    insights_by_post = await facebook_client.get_posts_insights(
+                        access_token=account.access_token,
+                        post_ids=[content_item.platform_post_id for content_item in content_items]
+                    )
+                    
                     for content_item in content_items:
-                        if not self._should_collect_metrics(content_item, Platform.FACEBOOK, force_collection):
-                            continue
-                        
                         try:
-                            # Get Facebook insights
-                            insights = await facebook_client.get_post_insights(
-                                access_token=account.access_token,
-                                post_id=content_item.platform_post_id
-                            )
+                            insights = insights_by_post[content_item.platform_post_id]
                             
                             # Convert to unified metrics
                             unified_metrics = self._facebook_to_unified_metrics(insights, content_item)
@@ -414,9 +419,6 @@ class SocialMediaMetricsCollector:
                             
                             total_metrics += 1
                             
-                            # Brief delay to respect rate limits
-                            await asyncio.sleep(0.2)
-                            
                         except Exception as e:
                             error_msg = f"Failed to collect Facebook metrics for content {content_item.id}: {e}"
                             errors.append(error_msg)
@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session
 
 from backend.db.models import SocialConnection, SocialAudit
 from backend.services.rate_limit import (
-    get_token_bucket, get_circuit_breaker, 
+    get_token_bucket, get_circuit_breaker, get_admission_controller,
     RetryableError, FatalError, exponential_backoff_with_jitter
 )
 from backend.services.publisher_adapters.meta_adapter import MetaAdapter
@@ -47,6 +47,7 @@ class PublishRunner:
     def __init__(self):
         self.token_bucket = get_token_bucket()
         self.circuit_breaker = get_circuit_breaker()
+        self.admission = get_admission_controller()
         self.meta_adapter = MetaAdapter()
         self.x_adapter = XAdapter()
     
@@ -82,15 +83,19 @@ class PublishRunner:
         }
         
         try:
-            # Step 1: Check circuit breaker
-            if not self.circuit_breaker.allow(org_id, platform):
-                cb_state = self.circuit_breaker.get_state(org_id, platform)
-                retry_after = cb_state.get('remaining_cooldown_s', 120)
+            # Step 1: Circuit breaker and rate limit in one Redis round trip
+            admission = self.admission.admit(org_id, platform)
+            
+            if admission.reason == 'circuit_open':
+                retry_after = admission.retry_after_s
                 
                 metrics.update({
                     'result': 'circuit_open',
                     'retry_after_s': retry_after,
-                    'circuit_state': cb_state
+                    'circuit_state': {
+                        'state': admission.circuit_state,
+                        'remaining_cooldown_s': retry_after
+                    }
                 })
                 
                 await self._log_publish_attempt(
@@ -105,11 +110,9 @@ class PublishRunner:
                     metrics=metrics
                 )
             
-            # Step 2: Check rate limiting
-            if not self.token_bucket.acquire(org_id, platform, tokens=1):
-                remaining = self.token_bucket.get_remaining(org_id, platform)
-                reset_time = self.token_bucket.get_reset_time(org_id, platform)
-                retry_after = max(1, reset_time - time.time())
+            if not admission.allowed:
+                remaining = admission.remaining
+                retry_after = max(1, admission.retry_after_s)
                 
                 metrics.update({
                     'result': 'rate_limited',
@@ -134,7 +137,7 @@ class PublishRunner:
                     metrics=metrics
                 )
             
-            # Step 3: Attempt actual publishing
+            # Step 2: Attempt actual publishing
             try:
                 logger.info(f"Publishing to {platform} for org {org_id}, attempt {attempt + 1}")
                 
@@ -217,8 +220,9 @@ class PublishRunner:
         org_id = str(connection.organization_id)
         platform = connection.platform
         
-        # Record failure in circuit breaker
+        # Record failure in circuit breaker; leased tokens must not bypass it
         self.circuit_breaker.record_failure(org_id, platform)
+        self.admission.drop_lease(org_id, platform)
         
         metrics.update({
             'result': 'failure',
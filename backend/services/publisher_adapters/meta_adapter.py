@@ -2,18 +2,24 @@
 Meta (Facebook/Instagram) publishing adapter for Phase 8
 Handles Meta Graph API publishing with proper error mapping
 """
+import json
 import logging
-from typing import Tuple, Optional, List
+from typing import Dict, Tuple, Optional, List
 import httpx
 from datetime import datetime
 
 from backend.db.models import SocialConnection
 from backend.core.encryption import decrypt_token
 from backend.services.rate_limit import RetryableError, FatalError
+from backend.services.http_transport import shared_transport
+from backend.services.media_pipeline import MediaItem, media_pipeline
 from backend.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Graph error codes for temporary issues
+RETRYABLE_GRAPH_CODES = [1, 2, 4, 17, 341]
+
 
 class MetaAdapter:
     """Adapter for publishing to Meta platforms (Facebook/Instagram)"""
@@ -22,6 +28,7 @@ class MetaAdapter:
         self.settings = get_settings()
         self.graph_version = getattr(self.settings, 'meta_graph_version', 'v18.0')
         self.base_url = f"https://graph.facebook.com/{self.graph_version}"
+        self.video_url = f"https://graph-video.facebook.com/{self.graph_version}"
     
     async def publish(
         self, 
@@ -78,14 +85,43 @@ class MetaAdapter:
                 "access_token": decrypted_token
             }
             
-            # Add media if provided
+            # Add media if provided: photos are uploaded unpublished and attached,
+            # a video is uploaded in chunks and published as the post itself.
+            # Nothing is published while uploading, so a rejected or retried
+            # post never leaves a published video behind.
             if media_urls:
-                # For simplicity, add first media URL as link
-                # In production, you'd upload media separately and reference
-                data["link"] = media_urls[0]
+                videos: List[Dict[str, str]] = []
+                uploaded = await media_pipeline.upload_all(
+                    media_urls,
+                    upload=lambda item: self._upload_media_item(page_id, decrypted_token, item, videos),
+                    platform="meta",
+                    cache_scope=str(page_id)
+                )
+                
+                video_ids = {video["video_id"] for video in videos}
+                photo_ids = [media_id for media_id in uploaded if media_id and media_id not in video_ids]
+                
+                if videos and (photo_ids or len(videos) > 1):
+                    await self.delete_unpublished_photos(photo_ids, decrypted_token)
+                    raise FatalError(
+                        f"Meta posts take photos or a single video, got {len(photo_ids)} photos "
+                        f"and {len(videos)} videos"
+                    )
+                
+                if videos:
+                    video_id = await self.publish_video(page_id, decrypted_token, content, videos[0])
+                    logger.info(f"Successfully published video to Meta: {video_id}")
+                    return True, video_id, None
+                
+                if photo_ids:
+                    for index, photo_id in enumerate(photo_ids):
+                        data[f"attached_media[{index}]"] = json.dumps({"media_fbid": photo_id})
+                else:
+                    # Nothing could be uploaded; fall back to linking the first media URL
+                    data["link"] = media_urls[0]
             
             # Make API request
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
                 try:
                     response = await client.post(url, data=data)
                     
@@ -138,9 +174,7 @@ class MetaAdapter:
                             error_message = error_data.get("error", {}).get("message", "Bad request")
                             
                             # Some 400 errors are retryable (temporary issues)
-                            retryable_codes = [1, 2, 4, 17, 341]  # Common temporary error codes
-                            
-                            if error_code in retryable_codes:
+                            if error_code in RETRYABLE_GRAPH_CODES:
                                 logger.warning(f"Retryable Meta API error: {error_message}")
                                 raise RetryableError(f"Meta API error: {error_message}")
                             else:
@@ -230,4 +264,149 @@ class MetaAdapter:
                 "posts_per_hour": 200,
                 "posts_per_day": 1000
             }
-        }
\ No newline at end of file
+        }
+    
+    async def _upload_media_item(
+        self,
+        page_id: str,
+        access_token: str,
+        item: MediaItem,
+        videos: List[Dict[str, str]]
+    ) -> Tuple[str, int]:
+        """
+        Upload one pipeline item for a page post, without publishing anything
+        
+        Unpublished photo ids are consumed when attached, so nothing is cached
+        (cache TTL 0). Uploaded videos are collected in ``videos`` for the
+        publish step.
+        """
+        if item.is_video:
+            upload = await self.upload_video_chunked(page_id, access_token, item)
+            videos.append(upload)
+            return upload["video_id"], 0
+        
+        return await self.upload_photo(page_id, access_token, item), 0
+    
+    async def upload_photo(self, page_id: str, access_token: str, item: MediaItem) -> str:
+        """
+        Upload a photo as unpublished so it can be attached to a feed post
+        
+        The multipart body is streamed from the item's spool file.
+        
+        Returns:
+            Photo id (media_fbid)
+        """
+        async with httpx.AsyncClient(timeout=60.0, transport=shared_transport("meta")) as client:
+            result = await self._graph_media_request(
+                client,
+                f"{self.base_url}/{page_id}/photos",
+                data={"published": "false", "access_token": access_token},
+                files={"source": (item.filename, item.rewind(), item.media_type)}
+            )
+        
+        photo_id = result.get("id")
+        if not photo_id:
+            raise RetryableError("No photo ID returned from Meta API")
+        return photo_id
+    
+    async def upload_video_chunked(self, page_id: str, access_token: str, item: MediaItem) -> Dict[str, str]:
+        """
+        Upload a video with the resumable start/transfer phases
+        
+        Each transfer sends at most ``media_upload_chunk_size`` bytes of the
+        range Graph asks for next, read from the item's spool file. The upload
+        is left unfinished: ``publish_video`` finishes and publishes it.
+        
+        Returns:
+            Dict with the ``video_id`` and ``upload_session_id``
+        """
+        url = f"{self.video_url}/{page_id}/videos"
+        chunk_size = self.settings.media_upload_chunk_size
+        
+        async with httpx.AsyncClient(timeout=120.0, transport=shared_transport("meta")) as client:
+            start = await self._graph_media_request(client, url, data={
+                "upload_phase": "start",
+                "file_size": str(item.size),
+                "access_token": access_token
+            })
+            session_id = start["upload_session_id"]
+            start_offset, end_offset = int(start["start_offset"]), int(start["end_offset"])
+            
+            while start_offset < end_offset:
+                item.file.seek(start_offset)
+                chunk = item.file.read(min(end_offset - start_offset, chunk_size))
+                transfer = await self._graph_media_request(
+                    client,
+                    url,
+                    data={
+                        "upload_phase": "transfer",
+                        "upload_session_id": session_id,
+                        "start_offset": str(start_offset),
+                        "access_token": access_token
+                    },
+                    files={"video_file_chunk": (item.filename, chunk, "application/octet-stream")}
+                )
+                start_offset, end_offset = int(transfer["start_offset"]), int(transfer["end_offset"])
+        
+        return {"video_id": start["video_id"], "upload_session_id": session_id}
+    
+    async def publish_video(self, page_id: str, access_token: str, description: str, upload: Dict[str, str]) -> str:
+        """
+        Finish a video upload from ``upload_video_chunked``, publishing it as a page post
+        
+        Returns:
+            Video id (the id of the published post)
+        """
+        async with httpx.AsyncClient(timeout=120.0, transport=shared_transport("meta")) as client:
+            await self._graph_media_request(client, f"{self.video_url}/{page_id}/videos", data={
+                "upload_phase": "finish",
+                "upload_session_id": upload["upload_session_id"],
+                "description": description,
+                "published": "true",
+                "access_token": access_token
+            })
+        return upload["video_id"]
+    
+    async def delete_unpublished_photos(self, photo_ids: List[str], access_token: str) -> None:
+        """Best-effort removal of unpublished photos a rejected post will not attach"""
+        if not photo_ids:
+            return
+        async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
+            for photo_id in photo_ids:
+                try:
+                    response = await client.delete(f"{self.base_url}/{photo_id}", params={"access_token": access_token})
+                    if response.status_code != 200:
+                        logger.warning(f"Could not delete unpublished Meta photo {photo_id}: {response.status_code}")
+                except httpx.HTTPError as e:
+                    logger.warning(f"Could not delete unpublished Meta photo {photo_id}: {e}")
+    
+    async def _graph_media_request(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        data: dict,
+        files: Optional[dict] = None
+    ) -> dict:
+        """POST a media upload call and map Graph errors to Retryable/FatalError"""
+        try:
+            response = await client.post(url, data=data, files=files)
+        except httpx.TimeoutException:
+            raise RetryableError("Meta media upload timeout")
+        except httpx.HTTPError as e:
+            raise RetryableError(f"Meta media upload network error: {str(e)}")
+        
+        if response.status_code == 200:
+            return response.json()
+        
+        try:
+            error = response.json().get("error", {})
+        except ValueError:
+            error = {}
+        error_msg = f"Meta media upload failed ({response.status_code}): {error.get('message', 'Unknown error')}"
+        
+        if response.status_code == 429 or response.status_code >= 500 or error.get("code") in RETRYABLE_GRAPH_CODES:
+            logger.warning(error_msg)
+            raise RetryableError(error_msg)
+        
+        logger.error(error_msg)
+        raise FatalError(error_msg)
@@ -2,7 +2,9 @@
 X (Twitter) publishing adapter for Phase 8
 Handles X API v2 publishing with proper error mapping
 """
+import asyncio
 import logging
+import time
 from typing import Tuple, Optional, List
 import httpx
 import base64
@@ -11,10 +13,18 @@ from datetime import datetime
 from backend.db.models import SocialConnection
 from backend.core.encryption import decrypt_token
 from backend.services.rate_limit import RetryableError, FatalError
+from backend.services.http_transport import shared_transport
+from backend.services.media_pipeline import MediaItem, media_pipeline
 from backend.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# X API v1.1 media upload endpoint (simple and chunked INIT/APPEND/FINALIZE/STATUS)
+MEDIA_UPLOAD_URL = "https://upload.twitter.com/1.1/media/upload.json"
+
+# Uploaded media ids stay attachable for 24h; stop reusing them an hour early
+MEDIA_ID_TTL_MARGIN_S = 3600
+
 
 class XAdapter:
     """Adapter for publishing to X (Twitter)"""
@@ -70,35 +80,17 @@ class XAdapter:
                 "text": content
             }
             
-            # Upload media if provided
+            # Upload media if provided (downloaded and uploaded concurrently, ids cached per account)
             media_ids = []
             if media_urls:
                 logger.info(f"Processing {len(media_urls)} media items for X")
-                for media_url in media_urls:
-                    try:
-                        # Download media from URL
-                        async with httpx.AsyncClient(timeout=30.0) as media_client:
-                            media_response = await media_client.get(media_url)
-                            if media_response.status_code == 200:
-                                media_data = media_response.content
-                                media_type = media_response.headers.get("content-type", "image/jpeg")
-                                
-                                # Upload to X
-                                success, media_id, upload_error = await self.upload_media(
-                                    connection, media_data, media_type
-                                )
-                                
-                                if success and media_id:
-                                    media_ids.append(media_id)
-                                    logger.info(f"Successfully uploaded media: {media_id}")
-                                else:
-                                    logger.warning(f"Failed to upload media from {media_url}: {upload_error}")
-                            else:
-                                logger.warning(f"Failed to download media from {media_url}: {media_response.status_code}")
-                    except Exception as e:
-                        logger.error(f"Error processing media {media_url}: {e}")
-                        # Continue with other media items
-                        continue
+                uploaded = await media_pipeline.upload_all(
+                    media_urls,
+                    upload=lambda item: self._upload_media_item(connection, item),
+                    platform="x",
+                    cache_scope=connection.platform_account_id or str(connection.id)
+                )
+                media_ids = [media_id for media_id in uploaded if media_id]
             
             # Add media IDs to tweet data
             if media_ids:
@@ -114,7 +106,7 @@ class XAdapter:
             }
             
             # Make API request
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("x")) as client:
                 try:
                     response = await client.post(url, json=tweet_data, headers=headers)
                     
@@ -330,9 +322,6 @@ class XAdapter:
             
             logger.info(f"Uploading media to X, size: {len(media_data)} bytes, type: {media_type}")
             
-            # X API v1.1 media upload endpoint
-            upload_url = "https://upload.twitter.com/1.1/media/upload.json"
-            
             # Prepare headers
             headers = {
                 "Authorization": f"Bearer {decrypted_token}"
@@ -351,85 +340,16 @@ class XAdapter:
             }
             
             # Upload media
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                try:
-                    response = await client.post(
-                        upload_url, 
-                        headers=headers,
-                        files=files,
-                        data=data
-                    )
-                    
-                    logger.debug(f"X media upload response: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        media_id = str(result.get("media_id"))
-                        
-                        if not media_id:
-                            raise Exception("No media_id returned from X API")
-                        
-                        logger.info(f"Successfully uploaded media to X: {media_id}")
-                        return True, media_id, None
-                    
-                    elif response.status_code == 429:
-                        # Rate limiting
-                        error_msg = "Rate limited by X media upload API"
-                        logger.warning(error_msg)
-                        raise RetryableError(error_msg)
-                    
-                    elif response.status_code in [500, 502, 503, 504]:
-                        # Server errors
-                        error_msg = f"X media upload server error: {response.status_code}"
-                        logger.warning(error_msg)
-                        raise RetryableError(error_msg)
-                    
-                    elif response.status_code == 401:
-                        # Authentication error
-                        error_msg = "Authentication failed for media upload"
-                        logger.error(error_msg)
-                        raise FatalError(error_msg)
-                    
-                    elif response.status_code == 403:
-                        # Forbidden - check specific error
-                        try:
-                            error_data = response.json()
-                            error_detail = error_data.get("errors", [{}])[0].get("message", "Permission denied")
-                            error_msg = f"Media upload forbidden: {error_detail}"
-                        except:
-                            error_msg = "Media upload permission denied"
-                        
-                        logger.error(error_msg)
-                        raise FatalError(error_msg)
-                    
-                    elif response.status_code == 400:
-                        # Bad request - usually media format issues
-                        try:
-                            error_data = response.json()
-                            error_detail = error_data.get("errors", [{}])[0].get("message", "Bad request")
-                            error_msg = f"Media upload failed: {error_detail}"
-                        except:
-                            error_msg = "Invalid media format or size"
-                        
-                        logger.error(error_msg)
-                        raise FatalError(error_msg)
-                    
-                    else:
-                        # Other errors
-                        error_msg = f"Unexpected media upload response: {response.status_code}"
-                        logger.warning(error_msg)
-                        raise RetryableError(error_msg)
-                        
-                except httpx.TimeoutException:
-                    error_msg = "Media upload timeout"
-                    logger.warning(error_msg)
-                    raise RetryableError(error_msg)
-                
-                except httpx.NetworkError as e:
-                    error_msg = f"Media upload network error: {str(e)}"
-                    logger.warning(error_msg)
-                    raise RetryableError(error_msg)
-                
+            async with httpx.AsyncClient(timeout=60.0, transport=shared_transport("x")) as client:
+                result = await self._media_request(client, headers, data=data, files=files)
+            
+            media_id = str(result.get("media_id_string") or result.get("media_id") or "")
+            if not media_id:
+                raise Exception("No media_id returned from X API")
+            
+            logger.info(f"Successfully uploaded media to X: {media_id}")
+            return True, media_id, None
+            
         except RetryableError:
             raise
         except FatalError:
@@ -437,4 +357,172 @@ class XAdapter:
         except Exception as e:
             error_msg = f"Unexpected error in X media upload: {str(e)}"
             logger.error(error_msg)
-            raise RetryableError(error_msg)
\ No newline at end of file
+            raise RetryableError(error_msg)
+    
+    async def upload_media_chunked(
+        self,
+        connection: SocialConnection,
+        item: MediaItem
+    ) -> Tuple[str, int]:
+        """
+        Upload media with the chunked INIT/APPEND/FINALIZE flow
+        
+        Segments are read from the item's spool file one at a time, so a large
+        video never sits in memory. Video and GIF processing is polled via
+        STATUS until X reports it ready, for at most
+        ``media_processing_timeout_s``.
+        
+        Args:
+            connection: SocialConnection with X tokens
+            item: Downloaded media item
+            
+        Returns:
+            Tuple of (media_id, seconds the media id stays attachable)
+        """
+        access_token = connection.access_tokens.get("access_token")
+        if not access_token:
+            raise FatalError("No access token found")
+        try:
+            decrypted_token = decrypt_token(access_token)
+        except Exception as e:
+            raise FatalError(f"Failed to decrypt access token: {str(e)}")
+        
+        headers = {"Authorization": f"Bearer {decrypted_token}"}
+        if item.media_type == "image/gif":
+            media_category = "tweet_gif"
+        elif item.is_image:
+            media_category = "tweet_image"
+        else:
+            media_category = "tweet_video"
+        
+        logger.info(f"Chunked upload to X, size: {item.size} bytes, type: {item.media_type}")
+        
+        async with httpx.AsyncClient(timeout=60.0, transport=shared_transport("x")) as client:
+            init = await self._media_request(client, headers, data={
+                "command": "INIT",
+                "total_bytes": str(item.size),
+                "media_type": item.media_type,
+                "media_category": media_category
+            })
+            media_id = str(init.get("media_id_string") or init.get("media_id") or "")
+            if not media_id:
+                raise RetryableError("No media_id returned from X media INIT")
+            
+            for segment_index, chunk in enumerate(item.iter_chunks(media_pipeline.chunk_size)):
+                await self._media_request(
+                    client,
+                    headers,
+                    data={"command": "APPEND", "media_id": media_id, "segment_index": str(segment_index)},
+                    files={"media": (item.filename, chunk, "application/octet-stream")}
+                )
+            
+            result = await self._media_request(client, headers, data={"command": "FINALIZE", "media_id": media_id})
+            processing = result.get("processing_info")
+            deadline = time.monotonic() + self.settings.media_processing_timeout_s
+            while processing and processing.get("state") in ("pending", "in_progress"):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RetryableError(
+                        f"X media {media_id} still processing after {self.settings.media_processing_timeout_s:.0f}s"
+                    )
+                await asyncio.sleep(min(processing.get("check_after_secs", 1), remaining))
+                result = await self._media_request(
+                    client, headers, params={"command": "STATUS", "media_id": media_id}
+                )
+                processing = result.get("processing_info")
+            
+            if processing and processing.get("state") == "failed":
+                error = processing.get("error", {}).get("message", "processing failed")
+                raise FatalError(f"X media processing failed: {error}")
+        
+        logger.info(f"Successfully uploaded media to X: {media_id}")
+        return media_id, int(result.get("expires_after_secs", 86400))
+    
+    async def _upload_media_item(self, connection: SocialConnection, item: MediaItem) -> Tuple[str, int]:
+        """Upload one pipeline item: small images in one request, anything larger in chunks"""
+        if item.is_image and item.media_type != "image/gif" and item.size <= media_pipeline.chunk_size:
+            success, media_id, error = await self.upload_media(connection, item.read(), item.media_type)
+            if not success or not media_id:
+                raise RetryableError(error or "X media upload failed")
+            return media_id, 86400 - MEDIA_ID_TTL_MARGIN_S
+        
+        media_id, expires_after = await self.upload_media_chunked(connection, item)
+        return media_id, max(0, expires_after - MEDIA_ID_TTL_MARGIN_S)
+    
+    async def _media_request(
+        self,
+        client: httpx.AsyncClient,
+        headers: dict,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+        params: Optional[dict] = None
+    ) -> dict:
+        """POST (or GET for STATUS) to the media upload endpoint and map errors"""
+        try:
+            if params is not None:
+                response = await client.get(MEDIA_UPLOAD_URL, headers=headers, params=params)
+            else:
+                response = await client.post(MEDIA_UPLOAD_URL, headers=headers, data=data, files=files)
+            
+            logger.debug(f"X media upload response: {response.status_code}")
+            
+            if 200 <= response.status_code < 300:
+                return response.json() if response.content else {}
+            
+            elif response.status_code == 429:
+                # Rate limiting
+                error_msg = "Rate limited by X media upload API"
+                logger.warning(error_msg)
+                raise RetryableError(error_msg)
+            
+            elif response.status_code in [500, 502, 503, 504]:
+                # Server errors
+                error_msg = f"X media upload server error: {response.status_code}"
+                logger.warning(error_msg)
+                raise RetryableError(error_msg)
+            
+            elif response.status_code == 401:
+                # Authentication error
+                error_msg = "Authentication failed for media upload"
+                logger.error(error_msg)
+                raise FatalError(error_msg)
+            
+            elif response.status_code == 403:
+                # Forbidden - check specific error
+                try:
+                    error_data = response.json()
+                    error_detail = error_data.get("errors", [{}])[0].get("message", "Permission denied")
+                    error_msg = f"Media upload forbidden: {error_detail}"
+                except:
+                    error_msg = "Media upload permission denied"
+                
+                logger.error(error_msg)
+                raise FatalError(error_msg)
+            
+            elif response.status_code == 400:
+                # Bad request - usually media format issues
+                try:
+                    error_data = response.json()
+                    error_detail = error_data.get("errors", [{}])[0].get("message", "Bad request")
+                    error_msg = f"Media upload failed: {error_detail}"
+                except:
+                    error_msg = "Invalid media format or size"
+                
+                logger.error(error_msg)
+                raise FatalError(error_msg)
+            
+            else:
+                # Other errors
+                error_msg = f"Unexpected media upload response: {response.status_code}"
+                logger.warning(error_msg)
+                raise RetryableError(error_msg)
+                
+        except httpx.TimeoutException:
+            error_msg = "Media upload timeout"
+            logger.warning(error_msg)
+            raise RetryableError(error_msg)
+        
+        except httpx.NetworkError as e:
+            error_msg = f"Media upload network error: {str(e)}"
+            logger.warning(error_msg)
+            raise RetryableError(error_msg)
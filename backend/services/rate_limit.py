@@ -4,9 +4,13 @@ Implements token bucket algorithm and circuit breaker pattern for tenant isolati
 """
 import time
 import math
+import asyncio
 import random
 import logging
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
+from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any, Tuple
 import redis
 from redis import Redis
@@ -15,6 +19,129 @@ from backend.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Atomic token bucket consume: returns {acquired (1/0), tokens remaining}
+TOKEN_BUCKET_ACQUIRE_SCRIPT = """
+    local key = KEYS[1]
+    local now = tonumber(ARGV[1])
+    local tokens_requested = tonumber(ARGV[2])
+    local capacity = tonumber(ARGV[3])
+    local refill_rate = tonumber(ARGV[4])
+    local window_s = tonumber(ARGV[5])
+    
+    -- Get current bucket state
+    local bucket = redis.call('HMGET', key, 'tokens', 'last_refill')
+    local current_tokens = tonumber(bucket[1]) or capacity
+    local last_refill = tonumber(bucket[2]) or now
+    
+    -- Calculate tokens to add based on time elapsed
+    local elapsed = now - last_refill
+    local tokens_to_add = math.floor(elapsed * refill_rate / window_s)
+    
+    -- Refill bucket (cap at capacity)
+    current_tokens = math.min(capacity, current_tokens + tokens_to_add)
+    
+    -- Check if we can satisfy the request
+    if current_tokens >= tokens_requested then
+        -- Consume tokens
+        current_tokens = current_tokens - tokens_requested
+        
+        -- Update bucket state
+        redis.call('HMSET', key, 'tokens', current_tokens, 'last_refill', now)
+        redis.call('EXPIRE', key, window_s * 2)  -- TTL for cleanup
+        
+        return {1, current_tokens}  -- Success + remaining tokens
+    else
+        -- Not enough tokens - update refill time but don't consume
+        redis.call('HMSET', key, 'tokens', current_tokens, 'last_refill', now)
+        redis.call('EXPIRE', key, window_s * 2)
+        
+        return {0, current_tokens}  -- Rate limited + remaining tokens
+    end
+"""
+
+# Token bucket level after refill, without consuming
+TOKEN_BUCKET_REMAINING_SCRIPT = """
+    local key = KEYS[1]
+    local now = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local refill_rate = tonumber(ARGV[3])
+    local window_s = tonumber(ARGV[4])
+    
+    local bucket = redis.call('HMGET', key, 'tokens', 'last_refill')
+    local current_tokens = tonumber(bucket[1]) or capacity
+    local last_refill = tonumber(bucket[2]) or now
+    
+    local elapsed = now - last_refill
+    local tokens_to_add = math.floor(elapsed * refill_rate / window_s)
+    
+    return math.min(capacity, current_tokens + tokens_to_add)
+"""
+
+# Fused publish admission: circuit breaker check plus token bucket refill/consume
+# in one call. Grants between ARGV[2] and ARGV[3] tokens (more than one only for
+# worker leases, never while half-open). Returns
+# {status (1 admitted, 0 rate limited, -1 circuit open), granted, remaining,
+#  retry_after_s, reset_after_s, circuit_state}
+ADMISSION_SCRIPT = """
+    local cb_key = KEYS[1]
+    local bucket_key = KEYS[2]
+    local now = tonumber(ARGV[1])
+    local min_tokens = tonumber(ARGV[2])
+    local max_tokens = tonumber(ARGV[3])
+    local capacity = tonumber(ARGV[4])
+    local refill_rate = tonumber(ARGV[5])
+    local window_s = tonumber(ARGV[6])
+    local cooldown_s = tonumber(ARGV[7])
+    
+    -- Circuit breaker (same transitions as CircuitBreaker.allow)
+    local cb = redis.call('HMGET', cb_key, 'last_failure', 'state')
+    local last_failure = tonumber(cb[1]) or 0
+    local circuit_state = cb[2] or 'closed'
+    
+    if circuit_state == 'open' then
+        if now - last_failure >= cooldown_s then
+            redis.call('HSET', cb_key, 'state', 'half-open')
+            redis.call('EXPIRE', cb_key, cooldown_s * 2)
+            circuit_state = 'half-open'
+        else
+            return {-1, 0, 0, tostring(cooldown_s - (now - last_failure)), '0', circuit_state}
+        end
+    end
+    
+    if circuit_state == 'half-open' then
+        -- Single probe requests only
+        max_tokens = min_tokens
+    end
+    
+    -- Token bucket with continuous (fractional) refill
+    local per_second = refill_rate / window_s
+    local bucket = redis.call('HMGET', bucket_key, 'tokens', 'last_refill')
+    local tokens = tonumber(bucket[1]) or capacity
+    local last_refill = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - last_refill) * per_second)
+    
+    local granted = 0
+    if tokens >= min_tokens then
+        granted = math.min(max_tokens, math.floor(tokens))
+        tokens = tokens - granted
+    end
+    
+    redis.call('HMSET', bucket_key, 'tokens', tostring(tokens), 'last_refill', tostring(now))
+    redis.call('EXPIRE', bucket_key, window_s * 2)
+    
+    local retry_after = 0
+    if granted == 0 then
+        retry_after = (min_tokens - tokens) / per_second
+    end
+    local reset_after = (capacity - tokens) / per_second
+    local status = 0
+    if granted > 0 then
+        status = 1
+    end
+    
+    return {status, granted, math.floor(tokens), tostring(retry_after), tostring(reset_after), circuit_state}
+"""
+
 
 class TokenBucket:
     """Token bucket rate limiter for per-tenant throttling"""
@@ -42,6 +169,8 @@ class TokenBucket:
         self.refill_rate = refill_rate
         self.capacity = capacity
         self.window_s = window_s
+        self._acquire_script = redis_client.register_script(TOKEN_BUCKET_ACQUIRE_SCRIPT)
+        self._remaining_script = redis_client.register_script(TOKEN_BUCKET_REMAINING_SCRIPT)
     
     def acquire(self, org_id: str, platform: str, tokens: int = 1) -> bool:
         """
@@ -59,55 +188,10 @@ class TokenBucket:
             key = f"{self.key_prefix}:{org_id}:{platform}"
             now = time.time()
             
-            # Use Redis Lua script for atomic bucket operations
-            lua_script = """
-                local key = KEYS[1]
-                local now = tonumber(ARGV[1])
-                local tokens_requested = tonumber(ARGV[2])
-                local capacity = tonumber(ARGV[3])
-                local refill_rate = tonumber(ARGV[4])
-                local window_s = tonumber(ARGV[5])
-                
-                -- Get current bucket state
-                local bucket = redis.call('HMGET', key, 'tokens', 'last_refill')
-                local current_tokens = tonumber(bucket[1]) or capacity
-                local last_refill = tonumber(bucket[2]) or now
-                
-                -- Calculate tokens to add based on time elapsed
-                local elapsed = now - last_refill
-                local tokens_to_add = math.floor(elapsed * refill_rate / window_s)
-                
-                -- Refill bucket (cap at capacity)
-                current_tokens = math.min(capacity, current_tokens + tokens_to_add)
-                
-                -- Check if we can satisfy the request
-                if current_tokens >= tokens_requested then
-                    -- Consume tokens
-                    current_tokens = current_tokens - tokens_requested
-                    
-                    -- Update bucket state
-                    redis.call('HMSET', key, 'tokens', current_tokens, 'last_refill', now)
-                    redis.call('EXPIRE', key, window_s * 2)  -- TTL for cleanup
-                    
-                    return {1, current_tokens}  -- Success + remaining tokens
-                else
-                    -- Not enough tokens - update refill time but don't consume
-                    redis.call('HMSET', key, 'tokens', current_tokens, 'last_refill', now)
-                    redis.call('EXPIRE', key, window_s * 2)
-                    
-                    return {0, current_tokens}  -- Rate limited + remaining tokens
-                end
-            """
-            
-            result = self.redis.eval(
-                lua_script,
-                1,
-                key,
-                str(now),
-                str(tokens),
-                str(self.capacity),
-                str(self.refill_rate),
-                str(self.window_s)
+            # Registered script: EVALSHA, falling back to EVAL only on NOSCRIPT
+            result = self._acquire_script(
+                keys=[key],
+                args=[str(now), str(tokens), str(self.capacity), str(self.refill_rate), str(self.window_s)]
             )
             
             success = bool(result[0])
@@ -141,31 +225,9 @@ class TokenBucket:
             key = f"{self.key_prefix}:{org_id}:{platform}"
             now = time.time()
             
-            lua_script = """
-                local key = KEYS[1]
-                local now = tonumber(ARGV[1])
-                local capacity = tonumber(ARGV[2])
-                local refill_rate = tonumber(ARGV[3])
-                local window_s = tonumber(ARGV[4])
-                
-                local bucket = redis.call('HMGET', key, 'tokens', 'last_refill')
-                local current_tokens = tonumber(bucket[1]) or capacity
-                local last_refill = tonumber(bucket[2]) or now
-                
-                local elapsed = now - last_refill
-                local tokens_to_add = math.floor(elapsed * refill_rate / window_s)
-                
-                return math.min(capacity, current_tokens + tokens_to_add)
-            """
-            
-            result = self.redis.eval(
-                lua_script,
-                1,
-                key,
-                str(now),
-                str(self.capacity),
-                str(self.refill_rate),
-                str(self.window_s)
+            result = self._remaining_script(
+                keys=[key],
+                args=[str(now), str(self.capacity), str(self.refill_rate), str(self.window_s)]
             )
             
             return int(result)
@@ -190,7 +252,7 @@ class TokenBucket:
             now = time.time()
             
             bucket_data = self.redis.hmget(key, 'tokens', 'last_refill')
-            current_tokens = int(bucket_data[0]) if bucket_data[0] else self.capacity
+            current_tokens = float(bucket_data[0]) if bucket_data[0] else self.capacity
             last_refill = float(bucket_data[1]) if bucket_data[1] else now
             
             # Calculate elapsed time and current token count after refill
@@ -436,6 +498,240 @@ class CircuitBreaker:
             }
 
 
+@dataclass
+class AdmissionDecision:
+    """Outcome of one publish admission check"""
+    allowed: bool
+    reason: str  # admitted, circuit_open, rate_limited
+    remaining: int
+    retry_after_s: float = 0.0
+    reset_at: float = 0.0
+    circuit_state: str = "closed"
+    leased: bool = False
+
+
+class AdmissionController:
+    """
+    Single-round-trip publish admission for tenant isolation
+    
+    One registered script (EVALSHA) checks the circuit breaker, refills and
+    consumes the token bucket and reports remaining tokens, reset and
+    retry-after times, replacing separate allow/acquire/get_remaining/
+    get_reset_time calls. State lives in the same keys as CircuitBreaker and
+    TokenBucket, so record_success/record_failure and status reads still apply.
+    
+    With ``lease_size`` > 1 a worker claims up to that many tokens per call and
+    serves later admissions for the same org/platform locally until the lease
+    is used up or ``lease_ttl_s`` passes. Leased tokens skip the breaker check,
+    so a breaker opened by another worker is seen at most ``lease_ttl_s`` late;
+    local failures drop the lease immediately via ``drop_lease``.
+    """
+    
+    def __init__(
+        self,
+        redis_client: Redis,
+        bucket_prefix: str = "rate",
+        breaker_prefix: str = "cb",
+        refill_rate: int = 60,
+        capacity: int = 60,
+        window_s: int = 60,
+        cooldown_s: int = 120,
+        lease_size: int = 0,
+        lease_ttl_s: float = 5.0
+    ):
+        """
+        Initialize admission controller
+        
+        Args:
+            redis_client: Redis client for state storage
+            bucket_prefix: Key prefix shared with TokenBucket
+            breaker_prefix: Key prefix shared with CircuitBreaker
+            refill_rate: Tokens added per window
+            capacity: Maximum tokens in bucket
+            window_s: Time window in seconds for rate calculation
+            cooldown_s: Seconds an open circuit waits before half-open
+            lease_size: Tokens a worker may claim per call (0/1 disables leasing)
+            lease_ttl_s: Seconds unused leased tokens stay valid
+        """
+        self.redis = redis_client
+        self.bucket_prefix = bucket_prefix
+        self.breaker_prefix = breaker_prefix
+        self.refill_rate = refill_rate
+        self.capacity = capacity
+        self.window_s = window_s
+        self.cooldown_s = cooldown_s
+        self.lease_size = max(1, lease_size)
+        self.lease_ttl_s = lease_ttl_s
+        self._admit_script = redis_client.register_script(ADMISSION_SCRIPT)
+        self._leases: Dict[Tuple[str, str], list] = {}  # (org, platform) -> [tokens, expires_at]
+        self._lock = threading.Lock()
+        self.stats = {
+            "admissions": 0,
+            "rejections": 0,
+            "lease_hits": 0,
+            "redis_calls": 0
+        }
+    
+    def admit(self, org_id: str, platform: str) -> AdmissionDecision:
+        """
+        Check breaker and take one token for a publish attempt
+        
+        Args:
+            org_id: Organization ID for tenant isolation
+            platform: Platform name (meta, x, etc.)
+            
+        Returns:
+            AdmissionDecision with remaining tokens and retry/reset timing
+        """
+        now = time.time()
+        
+        if self.lease_size > 1:
+            with self._lock:
+                lease = self._leases.get((org_id, platform))
+                if lease and lease[0] > 0 and lease[1] > now:
+                    lease[0] -= 1
+                    self.stats["admissions"] += 1
+                    self.stats["lease_hits"] += 1
+                    return AdmissionDecision(allowed=True, reason="admitted", remaining=lease[0], leased=True)
+        
+        try:
+            self.stats["redis_calls"] += 1
+            result = self._admit_script(
+                keys=[f"{self.breaker_prefix}:{org_id}:{platform}", f"{self.bucket_prefix}:{org_id}:{platform}"],
+                args=[
+                    str(now), "1", str(self.lease_size), str(self.capacity),
+                    str(self.refill_rate), str(self.window_s), str(self.cooldown_s)
+                ]
+            )
+        except Exception as e:
+            logger.error(f"Error in publish admission for {org_id}:{platform}: {e}")
+            # Fail open - allow request if Redis is unavailable
+            self.stats["admissions"] += 1
+            return AdmissionDecision(allowed=True, reason="admitted", remaining=self.capacity)
+        
+        status, granted, remaining = int(result[0]), int(result[1]), int(result[2])
+        retry_after, reset_after = float(result[3]), float(result[4])
+        circuit_state = result[5].decode() if isinstance(result[5], bytes) else str(result[5])
+        
+        if status == -1:
+            self.stats["rejections"] += 1
+            logger.warning(f"Circuit breaker OPEN for org {org_id} platform {platform}")
+            return AdmissionDecision(
+                allowed=False, reason="circuit_open", remaining=0,
+                retry_after_s=retry_after, circuit_state=circuit_state
+            )
+        
+        if status == 0:
+            self.stats["rejections"] += 1
+            logger.warning(
+                f"Rate limit exceeded for org {org_id} platform {platform}: "
+                f"{remaining}/{self.capacity} tokens remaining"
+            )
+            return AdmissionDecision(
+                allowed=False, reason="rate_limited", remaining=remaining,
+                retry_after_s=retry_after, reset_at=now + reset_after, circuit_state=circuit_state
+            )
+        
+        if granted > 1:
+            with self._lock:
+                self._leases[(org_id, platform)] = [granted - 1, now + self.lease_ttl_s]
+        
+        self.stats["admissions"] += 1
+        return AdmissionDecision(
+            allowed=True, reason="admitted", remaining=remaining + granted - 1,
+            reset_at=now + reset_after, circuit_state=circuit_state
+        )
+    
+    def drop_lease(self, org_id: str, platform: str) -> None:
+        """Forget locally leased tokens (e.g. after a failure that may open the breaker)"""
+        with self._lock:
+            self._leases.pop((org_id, platform), None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Admission counters including Redis calls per admission"""
+        admissions = self.stats["admissions"] + self.stats["rejections"]
+        return {
+            **self.stats,
+            "redis_calls_per_admission": round(self.stats["redis_calls"] / admissions, 3) if admissions else 0.0,
+            "active_leases": len(self._leases)
+        }
+
+
+class AsyncRateLimiter:
+    """
+    In-process concurrency and request-rate budget for outbound provider calls
+    
+    Callers wrap each provider request in ``slot()``. Asyncio primitives are
+    rebound whenever a new event loop is seen (e.g. Celery tasks using
+    ``asyncio.run``), so one instance can live at module level.
+    """
+    
+    def __init__(self, max_concurrency: int, requests_per_minute: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._loop = None
+        self._semaphore = None
+        self._lock = None
+        self._next_start = 0.0
+    
+    def _bind_to_running_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._lock = asyncio.Lock()
+            self._next_start = 0.0
+        return loop
+    
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot, spacing request starts by the rate budget."""
+        loop = self._bind_to_running_loop()
+        async with self._semaphore:
+            if self.min_interval:
+                async with self._lock:
+                    now = loop.time()
+                    start_at = max(now, self._next_start)
+                    self._next_start = start_at + self.min_interval
+                if start_at > now:
+                    await asyncio.sleep(start_at - now)
+            yield
+
+
+class AdaptiveRateLimiter(AsyncRateLimiter):
+    """
+    AsyncRateLimiter whose request rate backs off when the provider pushes back
+    
+    ``penalize()`` halves the request rate (optionally pausing new starts for a
+    provider-supplied retry-after), ``reward()`` recovers it additively towards
+    the configured rate, so sustained 429s settle just under the real quota.
+    """
+    
+    def __init__(self, max_concurrency: int, requests_per_minute: int, min_requests_per_minute: int = 1):
+        super().__init__(max_concurrency, requests_per_minute)
+        self.max_rpm = float(requests_per_minute)
+        self.min_rpm = float(max(1, min(min_requests_per_minute, requests_per_minute or 1)))
+        self.current_rpm = self.max_rpm
+    
+    def _apply_rate(self):
+        self.min_interval = 60.0 / self.current_rpm if self.current_rpm > 0 else 0.0
+    
+    def penalize(self, retry_after: Optional[float] = None):
+        """Halve the request rate after a rate-limit response"""
+        if self.max_rpm > 0:
+            self.current_rpm = max(self.min_rpm, self.current_rpm / 2)
+            self._apply_rate()
+            logger.warning(f"Provider rate limited; backing off to {self.current_rpm:.1f} requests/min")
+        if retry_after and self._loop is not None:
+            self._next_start = max(self._next_start, self._loop.time() + retry_after)
+    
+    def reward(self):
+        """Recover one request/min towards the configured rate after a success"""
+        if 0 < self.current_rpm < self.max_rpm:
+            self.current_rpm = min(self.max_rpm, self.current_rpm + 1)
+            self._apply_rate()
+
+
 class RetryableError(Exception):
     """Error that should trigger retry with backoff"""
     pass
@@ -467,6 +763,7 @@ def exponential_backoff_with_jitter(attempt: int, base_delay: float = 1.0, max_d
 # Singleton instances
 _token_bucket = None
 _circuit_breaker = None
+_admission_controller = None
 
 
 def get_token_bucket(redis_client: Optional[Redis] = None) -> TokenBucket:
@@ -543,4 +840,46 @@ def get_circuit_breaker(redis_client: Optional[Redis] = None) -> CircuitBreaker:
             cooldown_s=getattr(settings, 'cb_cooldown_s', 120)
         )
     
-    return _circuit_breaker
\ No newline at end of file
+    return _circuit_breaker
+
+
+def get_admission_controller(redis_client: Optional[Redis] = None) -> AdmissionController:
+    """
+    Get publish admission controller instance
+    
+    Args:
+        redis_client: Redis client (will create default if not provided)
+        
+    Returns:
+        AdmissionController instance
+    """
+    global _admission_controller
+    
+    if _admission_controller is None:
+        if redis_client is None:
+            # Create a simple Redis client for now
+            try:
+                settings = get_settings()
+                redis_url = getattr(settings, 'redis_url', 'redis://localhost:6379/0')
+                redis_client = redis.from_url(redis_url, decode_responses=False)
+            except ImportError:
+                # Mock Redis client if not available
+                from unittest.mock import Mock
+                redis_client = Mock()
+                logger.warning("Redis not available, using mock client")
+        
+        settings = get_settings()
+        
+        _admission_controller = AdmissionController(
+            redis_client=redis_client,
+            bucket_prefix="rate",
+            breaker_prefix="cb",
+            refill_rate=getattr(settings, 'publish_bucket_capacity', 60),
+            capacity=getattr(settings, 'publish_bucket_capacity', 60),
+            window_s=getattr(settings, 'publish_bucket_window_s', 60),
+            cooldown_s=getattr(settings, 'cb_cooldown_s', 120),
+            lease_size=getattr(settings, 'publish_admission_lease_size', 0),
+            lease_ttl_s=getattr(settings, 'publish_admission_lease_ttl_s', 5.0)
+        )
+    
+    return _admission_controller
\ No newline at end of file
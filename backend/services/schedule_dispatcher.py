@@ -0,0 +1,336 @@
+"""
+Scheduled post dispatcher
+Keeps ContentSchedule due times in a Redis sorted set and hands due posts to
+Celery with an exact ETA instead of scanning the schedule table on a timer
+"""
+import logging
+import math
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis import Redis
+from sqlalchemy.orm import Session
+
+from backend.core.config import get_settings
+from backend.db.models import ContentSchedule
+
+logger = logging.getLogger(__name__)
+
+# Atomically pop up to ARGV[2] members scored at or before ARGV[1]; concurrent
+# dispatchers never receive the same schedule
+CLAIM_DUE_SCRIPT = """
+    local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, tonumber(ARGV[2]))
+    for i = 1, #items, 2 do
+        redis.call('ZREM', KEYS[1], items[i])
+    end
+    return items
+"""
+
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class ScheduleDispatcher:
+    """
+    Due-time index and dispatcher for scheduled posts
+
+    Pending schedules live in ``{prefix}:due`` scored by their due timestamp,
+    so finding due work is O(log N) however many posts are queued. Each
+    dispatch run claims everything due within ``lookahead_s`` and enqueues
+    ``publish_via_connection`` with ``eta=scheduled_for``; the Celery worker
+    timer fires it on time, so the run interval only bounds how far ahead
+    work is handed over, not how late it goes out.
+
+    A schedule is enqueued at most once per idempotency key (``SET NX`` on
+    ``{prefix}:claimed:<key>``), and its row moves from ``scheduled`` to
+    ``publishing`` so index rebuilds skip it.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        key_prefix: str = "schedule",
+        lookahead_s: float = 90.0,
+        batch_size: int = 500,
+        claim_ttl_s: int = 7 * 24 * 3600,
+        lag_samples: int = 1000
+    ):
+        """
+        Initialize dispatcher
+
+        Args:
+            redis_client: Redis client for the due index, claims and lag samples
+            key_prefix: Prefix for Redis keys
+            lookahead_s: Hand over schedules due within this many seconds
+            batch_size: Schedules claimed per round trip
+            claim_ttl_s: How long an idempotency claim blocks re-dispatch
+            lag_samples: Recent dispatch lag samples kept for percentiles
+        """
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.due_key = f"{key_prefix}:due"
+        self.lag_key = f"{key_prefix}:dispatch_lag"
+        self.lookahead_s = lookahead_s
+        self.batch_size = batch_size
+        self.claim_ttl_s = claim_ttl_s
+        self.lag_samples = lag_samples
+        self._claim_due = redis_client.register_script(CLAIM_DUE_SCRIPT)
+        self.stats = {
+            "dispatched": 0,
+            "duplicates": 0,
+            "stale": 0,
+            "enqueue_errors": 0
+        }
+
+    def claim_key(self, idempotency_key: str) -> str:
+        return f"{self.key_prefix}:claimed:{idempotency_key}"
+
+    def add(self, schedule_id: str, due_at: datetime):
+        """Index a schedule (re-adding moves it to the new due time)"""
+        self.redis.zadd(self.due_key, {str(schedule_id): _timestamp(due_at)})
+
+    def remove(self, schedule_id: str):
+        """Drop a schedule from the index (e.g. when it is cancelled)"""
+        self.redis.zrem(self.due_key, str(schedule_id))
+
+    def pending_count(self) -> int:
+        """Number of schedules waiting in the index"""
+        return int(self.redis.zcard(self.due_key))
+
+    def next_due(self) -> Optional[datetime]:
+        """Due time of the earliest indexed schedule"""
+        head = self.redis.zrange(self.due_key, 0, 0, withscores=True)
+        if not head:
+            return None
+        return datetime.fromtimestamp(float(head[0][1]), tz=timezone.utc)
+
+    def register(self, schedule: ContentSchedule, db: Session) -> bool:
+        """
+        Index a newly created schedule
+
+        Schedules already inside the lookahead window would otherwise wait for
+        the next dispatch run, so they are handed to Celery straight away.
+
+        Returns:
+            True if the schedule was enqueued immediately
+        """
+        if schedule.scheduled_for is None:
+            return False
+        try:
+            if _timestamp(schedule.scheduled_for) > time.time() + self.lookahead_s:
+                self.add(str(schedule.id), schedule.scheduled_for)
+                return False
+            return self._dispatch_rows([schedule], db) == 1
+        except Exception as e:
+            # The periodic rebuild picks the row up from the database index
+            logger.error(f"Error indexing schedule {schedule.id}: {e}")
+            return False
+
+    def claim_due(self, horizon: float) -> List[Tuple[str, float]]:
+        """Pop up to batch_size schedules due at or before horizon"""
+        items = self._claim_due(keys=[self.due_key], args=[horizon, self.batch_size])
+        pairs = []
+        for i in range(0, len(items), 2):
+            member = items[i].decode() if isinstance(items[i], bytes) else str(items[i])
+            pairs.append((member, float(items[i + 1])))
+        return pairs
+
+    def dispatch_due(self, db: Session, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Enqueue every schedule due within the lookahead window
+
+        Returns:
+            Counts for this run plus the next due time left in the index
+        """
+        now = time.time() if now is None else now
+        horizon = now + self.lookahead_s
+        claimed = 0
+        dispatched = 0
+
+        while True:
+            batch = self.claim_due(horizon)
+            if not batch:
+                break
+            claimed += len(batch)
+            scores = dict(batch)
+            rows = db.query(ContentSchedule).filter(
+                ContentSchedule.id.in_([uuid.UUID(schedule_id) for schedule_id in scores])
+            ).all()
+
+            ready = []
+            for row in rows:
+                if row.status != "scheduled" or row.scheduled_for is None:
+                    self.stats["stale"] += 1
+                elif _timestamp(row.scheduled_for) > horizon:
+                    # Rescheduled since it was indexed; put it back at its new time
+                    self.add(str(row.id), row.scheduled_for)
+                else:
+                    ready.append(row)
+            self.stats["stale"] += len(scores) - len(rows)
+
+            dispatched += self._dispatch_rows(ready, db)
+            if len(batch) < self.batch_size:
+                break
+
+        next_due = self.next_due()
+        if claimed:
+            logger.info(f"Dispatched {dispatched}/{claimed} due schedules")
+        return {
+            "claimed": claimed,
+            "dispatched": dispatched,
+            "pending": self.pending_count(),
+            "next_due": next_due.isoformat() if next_due else None
+        }
+
+    def _dispatch_rows(self, rows: List[ContentSchedule], db: Session) -> int:
+        if not rows:
+            return 0
+
+        pipe = self.redis.pipeline(transaction=False)
+        for row in rows:
+            pipe.set(self.claim_key(row.idempotency_key or str(row.id)), str(row.id), nx=True, ex=self.claim_ttl_s)
+        claims = pipe.execute()
+
+        enqueued = []
+        for row, claimed in zip(rows, claims):
+            if not claimed:
+                self.stats["duplicates"] += 1
+                continue
+            try:
+                self._enqueue(row)
+                enqueued.append(row.id)
+            except Exception as e:
+                logger.error(f"Error enqueuing schedule {row.id}: {e}")
+                self.stats["enqueue_errors"] += 1
+                self.redis.delete(self.claim_key(row.idempotency_key or str(row.id)))
+                self.add(str(row.id), row.scheduled_for)
+
+        if enqueued:
+            db.query(ContentSchedule).filter(
+                ContentSchedule.id.in_(enqueued),
+                ContentSchedule.status == "scheduled"
+            ).update({"status": "publishing"}, synchronize_session=False)
+            db.commit()
+            self.stats["dispatched"] += len(enqueued)
+        return len(enqueued)
+
+    def _enqueue(self, schedule: ContentSchedule) -> str:
+        from backend.tasks.publish_tasks import enqueue_publish_task
+
+        return enqueue_publish_task(
+            connection_id=str(schedule.connection_id),
+            content=schedule.content,
+            media_urls=schedule.media_urls or [],
+            content_hash=schedule.content_hash,
+            scheduled_time=schedule.scheduled_for,
+            idempotency_key=schedule.idempotency_key,
+            eta=schedule.scheduled_for
+        )
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Re-index every pending schedule from the database
+
+        Streams ``status = 'scheduled'`` rows (served by the scheduled_for and
+        status indexes) so schedules created before the dispatcher existed, or
+        lost with Redis, are picked up again.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        indexed = 0
+        rows = db.query(ContentSchedule.id, ContentSchedule.scheduled_for).filter(
+            ContentSchedule.status == "scheduled",
+            ContentSchedule.scheduled_for.isnot(None)
+        ).yield_per(self.batch_size)
+
+        for schedule_id, scheduled_for in rows:
+            pipe.zadd(self.due_key, {str(schedule_id): _timestamp(scheduled_for)})
+            indexed += 1
+            if indexed % self.batch_size == 0:
+                pipe.execute()
+        pipe.execute()
+
+        logger.info(f"Re-indexed {indexed} pending schedules")
+        return indexed
+
+    def record_lag(self, scheduled_for: datetime, started_at: Optional[float] = None):
+        """Record how late a scheduled publish actually started"""
+        started_at = time.time() if started_at is None else started_at
+        lag_ms = max(0.0, (started_at - _timestamp(scheduled_for)) * 1000)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.lpush(self.lag_key, round(lag_ms, 1))
+            pipe.ltrim(self.lag_key, 0, self.lag_samples - 1)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error recording dispatch lag: {e}")
+
+    def get_lag_stats(self) -> Dict[str, Any]:
+        """Dispatch lag percentiles (ms) over the most recent samples"""
+        samples = sorted(float(value) for value in self.redis.lrange(self.lag_key, 0, -1))
+        return {
+            "samples": len(samples),
+            "p50_ms": _percentile(samples, 50),
+            "p95_ms": _percentile(samples, 95),
+            "p99_ms": _percentile(samples, 99),
+            "max_ms": samples[-1] if samples else 0.0
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size, next due time, dispatch counters and lag percentiles"""
+        try:
+            next_due = self.next_due()
+            return {
+                **self.stats,
+                "pending": self.pending_count(),
+                "next_due": next_due.isoformat() if next_due else None,
+                "dispatch_lag": self.get_lag_stats()
+            }
+        except Exception as e:
+            logger.error(f"Error getting schedule dispatcher stats: {e}")
+            return {**self.stats, "error": str(e)}
+
+
+# Singleton instance
+_schedule_dispatcher = None
+
+
+def get_schedule_dispatcher(redis_client: Optional[Redis] = None) -> ScheduleDispatcher:
+    """
+    Get schedule dispatcher instance
+
+    Args:
+        redis_client: Redis client (will create default if not provided)
+
+    Returns:
+        ScheduleDispatcher instance
+    """
+    global _schedule_dispatcher
+
+    if _schedule_dispatcher is None:
+        settings = get_settings()
+        if redis_client is None:
+            import redis
+            redis_client = redis.from_url(settings.redis_url, decode_responses=False)
+
+        _schedule_dispatcher = ScheduleDispatcher(
+            redis_client=redis_client,
+            key_prefix="schedule",
+            lookahead_s=settings.schedule_dispatch_lookahead_s,
+            batch_size=settings.schedule_dispatch_batch_size,
+            claim_ttl_s=settings.schedule_dispatch_claim_ttl_s,
+            lag_samples=settings.schedule_dispatch_lag_samples
+        )
+
+    return _schedule_dispatcher
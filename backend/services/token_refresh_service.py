@@ -4,18 +4,35 @@ Handles automatic token refresh for Meta and X connections to maintain health
 """
 import logging
 import base64
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, Tuple
 import httpx
 
 from backend.core.config import get_settings
 from backend.core.encryption import encrypt_token, decrypt_token
+from backend.services.http_transport import shared_transport
+from backend.services.connection_snapshots import ConnectionSnapshot, ConnectionUpdate, ConnectionAuditEntry
 from backend.db.models import SocialConnection, SocialAudit
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class TokenRefreshOutcome:
+    """Result of the network phase of a token refresh"""
+    success: bool
+    new_expiry: Optional[datetime]
+    message: str
+    updates: Optional[Dict[str, Any]] = None
+    audit_status: Optional[str] = None
+    audit_metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    def as_tuple(self) -> Tuple[bool, Optional[datetime], str]:
+        return self.success, self.new_expiry, self.message
+
+
 class TokenRefreshService:
     """Service for refreshing OAuth tokens to maintain connection health"""
     
@@ -51,16 +68,63 @@ class TokenRefreshService:
         Returns:
             Tuple of (success, new_expiry, status_message)
         """
+        outcome = await self.refresh_meta_tokens(ConnectionSnapshot.from_connection(connection))
+        return await self._apply_refresh(connection, db, outcome)
+    
+    async def refresh_x_connection(
+        self,
+        connection: SocialConnection,
+        db: Session
+    ) -> Tuple[bool, Optional[datetime], str]:
+        """
+        Refresh X (Twitter) connection tokens using OAuth2 refresh token
+        
+        Args:
+            connection: SocialConnection instance
+            db: Database session
+            
+        Returns:
+            Tuple of (success, new_expiry, status_message)
+        """
+        outcome = await self.refresh_x_tokens(ConnectionSnapshot.from_connection(connection))
+        return await self._apply_refresh(connection, db, outcome)
+    
+    async def refresh_tokens(self, snapshot: ConnectionSnapshot) -> TokenRefreshOutcome:
+        """
+        Refresh a connection snapshot's tokens without touching the database
+        
+        Args:
+            snapshot: ConnectionSnapshot of a Meta or X connection
+            
+        Returns:
+            TokenRefreshOutcome; persist it with ``refresh_update`` and ``refresh_audit``
+        """
+        if snapshot.platform == "meta":
+            return await self.refresh_meta_tokens(snapshot)
+        if snapshot.platform == "x":
+            return await self.refresh_x_tokens(snapshot)
+        return TokenRefreshOutcome(False, None, f"Unsupported platform: {snapshot.platform}")
+    
+    async def refresh_meta_tokens(self, snapshot: ConnectionSnapshot) -> TokenRefreshOutcome:
+        """
+        Network phase of a Meta token refresh
+        
+        Args:
+            snapshot: ConnectionSnapshot of a Meta connection
+            
+        Returns:
+            TokenRefreshOutcome with the connection updates on success
+        """
         try:
-            logger.info(f"Starting Meta token refresh for connection {connection.id}")
+            logger.info(f"Starting Meta token refresh for connection {snapshot.id}")
             
             if not self.meta_app_id or not self.meta_app_secret:
-                return False, None, "Meta app credentials not configured"
+                return TokenRefreshOutcome(False, None, "Meta app credentials not configured")
             
             # Get current user token
-            encrypted_user_token = connection.access_tokens.get("access_token")
+            encrypted_user_token = snapshot.access_tokens.get("access_token")
             if not encrypted_user_token:
-                return False, None, "No user access token found"
+                return TokenRefreshOutcome(False, None, "No user access token found")
             
             user_access_token = decrypt_token(encrypted_user_token)
             
@@ -71,7 +135,7 @@ class TokenRefreshService:
             # Always attempt to exchange for long-lived token
             try:
                 new_user_token, new_expires_at = await self._exchange_for_long_lived_token(user_access_token)
-                logger.info(f"Successfully exchanged for long-lived token for connection {connection.id}")
+                logger.info(f"Successfully exchanged for long-lived token for connection {snapshot.id}")
             except Exception as e:
                 logger.warning(f"Failed to exchange for long-lived token: {e}, using existing token")
                 # Continue with existing token - might still be valid
@@ -79,20 +143,20 @@ class TokenRefreshService:
             # Step 2: Validate token via debug endpoint
             is_valid = await self._validate_meta_token(new_user_token)
             if not is_valid:
-                return False, None, "User token validation failed"
+                return TokenRefreshOutcome(False, None, "User token validation failed")
             
             # Step 3: Re-derive page access token
-            page_id = connection.platform_account_id
+            page_id = snapshot.platform_account_id
             try:
                 new_page_token = await self._get_page_access_token(page_id, new_user_token)
             except Exception as e:
                 logger.error(f"Failed to re-derive page token: {e}")
-                return False, None, f"Page token derivation failed: {str(e)}"
+                return TokenRefreshOutcome(False, None, f"Page token derivation failed: {str(e)}")
             
-            # Step 4: Update connection with new tokens
+            # Step 4: New connection tokens
             updates = {
                 "access_tokens": {
-                    **connection.access_tokens,
+                    **snapshot.access_tokens,
                     "access_token": encrypt_token(new_user_token),
                     "page_token": encrypt_token(new_page_token)
                 },
@@ -100,63 +164,49 @@ class TokenRefreshService:
                 "token_expires_at": new_expires_at
             }
             
-            self._update_connection(db, connection, updates)
-            
-            # Create success audit log
-            await self._create_refresh_audit(
-                db, connection, "refresh", "success", 
-                {
+            success_msg = f"Meta token refresh successful, expires: {new_expires_at}"
+            logger.info(f"Meta token refresh completed for connection {snapshot.id}: {success_msg}")
+            return TokenRefreshOutcome(
+                True, new_expires_at, success_msg,
+                updates=updates,
+                audit_status="success",
+                audit_metadata={
                     "platform": "meta",
-                    "old_expiry": connection.token_expires_at.isoformat() if connection.token_expires_at else None,
+                    "old_expiry": snapshot.token_expires_at.isoformat() if snapshot.token_expires_at else None,
                     "new_expiry": new_expires_at.isoformat() if new_expires_at else None,
                     "page_id": page_id
                 }
             )
             
-            success_msg = f"Meta token refresh successful, expires: {new_expires_at}"
-            logger.info(f"Meta token refresh completed for connection {connection.id}: {success_msg}")
-            return True, new_expires_at, success_msg
-            
         except Exception as e:
             error_msg = f"Meta token refresh failed: {str(e)}"
-            logger.error(f"Meta token refresh error for connection {connection.id}: {error_msg}")
-            
-            # Create failure audit log
-            try:
-                await self._create_refresh_audit(
-                    db, connection, "refresh", "failure",
-                    {"platform": "meta", "error": str(e)}
-                )
-            except Exception as audit_error:
-                logger.error(f"Failed to create audit log: {audit_error}")
-            
-            return False, None, error_msg
+            logger.error(f"Meta token refresh error for connection {snapshot.id}: {error_msg}")
+            return TokenRefreshOutcome(
+                False, None, error_msg,
+                audit_status="failure",
+                audit_metadata={"platform": "meta", "error": str(e)}
+            )
     
-    async def refresh_x_connection(
-        self,
-        connection: SocialConnection,
-        db: Session
-    ) -> Tuple[bool, Optional[datetime], str]:
+    async def refresh_x_tokens(self, snapshot: ConnectionSnapshot) -> TokenRefreshOutcome:
         """
-        Refresh X (Twitter) connection tokens using OAuth2 refresh token
+        Network phase of an X OAuth2 token refresh
         
         Args:
-            connection: SocialConnection instance
-            db: Database session
+            snapshot: ConnectionSnapshot of an X connection
             
         Returns:
-            Tuple of (success, new_expiry, status_message)
+            TokenRefreshOutcome with the connection updates on success
         """
         try:
-            logger.info(f"Starting X token refresh for connection {connection.id}")
+            logger.info(f"Starting X token refresh for connection {snapshot.id}")
             
             if not self.x_client_id or not self.x_client_secret:
-                return False, None, "X client credentials not configured"
+                return TokenRefreshOutcome(False, None, "X client credentials not configured")
             
             # Get current refresh token
-            encrypted_refresh_token = connection.access_tokens.get("refresh_token")
+            encrypted_refresh_token = snapshot.access_tokens.get("refresh_token")
             if not encrypted_refresh_token:
-                return False, None, "No refresh token found"
+                return TokenRefreshOutcome(False, None, "No refresh token found")
             
             refresh_token = decrypt_token(encrypted_refresh_token)
             
@@ -165,16 +215,16 @@ class TokenRefreshService:
                 new_tokens = await self._refresh_x_oauth_tokens(refresh_token)
             except Exception as e:
                 logger.error(f"X OAuth2 token refresh failed: {e}")
-                return False, None, f"Token refresh API call failed: {str(e)}"
+                return TokenRefreshOutcome(False, None, f"Token refresh API call failed: {str(e)}")
             
             # Calculate new expiry
             expires_in = new_tokens.get("expires_in", 7200)  # Default 2 hours
             new_expires_at = self._now_utc() + timedelta(seconds=expires_in)
             
-            # Update connection with new tokens
+            # New connection tokens
             updates = {
                 "access_tokens": {
-                    **connection.access_tokens,
+                    **snapshot.access_tokens,
                     "access_token": encrypt_token(new_tokens["access_token"]),
                     "refresh_token": encrypt_token(new_tokens["refresh_token"])
                 },
@@ -182,32 +232,78 @@ class TokenRefreshService:
                 "token_expires_at": new_expires_at
             }
             
-            self._update_connection(db, connection, updates)
-            
-            # Create success audit log
-            await self._create_refresh_audit(
-                db, connection, "refresh", "success",
-                {
+            success_msg = f"X token refresh successful, expires: {new_expires_at}"
+            logger.info(f"X token refresh completed for connection {snapshot.id}: {success_msg}")
+            return TokenRefreshOutcome(
+                True, new_expires_at, success_msg,
+                updates=updates,
+                audit_status="success",
+                audit_metadata={
                     "platform": "x",
-                    "old_expiry": connection.token_expires_at.isoformat() if connection.token_expires_at else None,
+                    "old_expiry": snapshot.token_expires_at.isoformat() if snapshot.token_expires_at else None,
                     "new_expiry": new_expires_at.isoformat(),
                     "expires_in_seconds": expires_in
                 }
             )
             
-            success_msg = f"X token refresh successful, expires: {new_expires_at}"
-            logger.info(f"X token refresh completed for connection {connection.id}: {success_msg}")
-            return True, new_expires_at, success_msg
-            
         except Exception as e:
             error_msg = f"X token refresh failed: {str(e)}"
-            logger.error(f"X token refresh error for connection {connection.id}: {error_msg}")
+            logger.error(f"X token refresh error for connection {snapshot.id}: {error_msg}")
+            return TokenRefreshOutcome(
+                False, None, error_msg,
+                audit_status="failure",
+                audit_metadata={"platform": "x", "error": str(e)}
+            )
+    
+    def refresh_update(self, snapshot: ConnectionSnapshot, outcome: TokenRefreshOutcome) -> Optional[ConnectionUpdate]:
+        """
+        Batched write for a refresh outcome (None when there is nothing to write)
+        
+        A row changed since the snapshot is still written unless its token
+        expiry changed too, i.e. its tokens were replaced concurrently (manual
+        refresh or reconnect); those newer tokens are kept.
+        """
+        if not outcome.updates:
+            return None
+        
+        def merge(connection: SocialConnection, proposed: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            if connection.token_expires_at != snapshot.token_expires_at:
+                return None
+            return proposed
+        
+        return ConnectionUpdate(snapshot=snapshot, values=outcome.updates, merge=merge)
+    
+    def refresh_audit(self, snapshot: ConnectionSnapshot, outcome: TokenRefreshOutcome) -> Optional[ConnectionAuditEntry]:
+        """Audit row for a refresh outcome (None when the attempt is not audited)"""
+        if not outcome.audit_status:
+            return None
+        return ConnectionAuditEntry(snapshot, "refresh", outcome.audit_status, outcome.audit_metadata)
+    
+    async def _apply_refresh(
+        self,
+        connection: SocialConnection,
+        db: Session,
+        outcome: TokenRefreshOutcome
+    ) -> Tuple[bool, Optional[datetime], str]:
+        """Write a refresh outcome through an already open session"""
+        try:
+            if outcome.updates:
+                self._update_connection(db, connection, outcome.updates)
+            if outcome.audit_status:
+                await self._create_refresh_audit(
+                    db, connection, "refresh", outcome.audit_status, outcome.audit_metadata
+                )
+            return outcome.as_tuple()
+            
+        except Exception as e:
+            error_msg = f"{connection.platform} token refresh failed: {str(e)}"
+            logger.error(f"Token refresh error for connection {connection.id}: {error_msg}")
             
             # Create failure audit log
             try:
                 await self._create_refresh_audit(
                     db, connection, "refresh", "failure",
-                    {"platform": "x", "error": str(e)}
+                    {"platform": connection.platform, "error": str(e)}
                 )
             except Exception as audit_error:
                 logger.error(f"Failed to create audit log: {audit_error}")
@@ -225,7 +321,7 @@ class TokenRefreshService:
             "fb_exchange_token": short_token
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
             response = await client.get(url, params=params)
             response.raise_for_status()
             
@@ -252,7 +348,7 @@ class TokenRefreshService:
                 "access_token": f"{self.meta_app_id}|{self.meta_app_secret}"
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -274,7 +370,7 @@ class TokenRefreshService:
             "access_token": user_token
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("meta")) as client:
             response = await client.get(url, params=params)
             response.raise_for_status()
             
@@ -305,16 +401,16 @@ class TokenRefreshService:
             "refresh_token": refresh_token
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("x")) as client:
             response = await client.post(url, headers=headers, data=data)
             response.raise_for_status()
             
             token_data = response.json()
             
             required_fields = ["access_token", "refresh_token"]
-            for field in required_fields:
-                if field not in token_data:
-                    raise ValueError(f"Missing {field} in token response")
+            for required_field in required_fields:
+                if required_field not in token_data:
+                    raise ValueError(f"Missing {required_field} in token response")
             
             return token_data
     
@@ -324,8 +420,8 @@ class TokenRefreshService:
     
     def _update_connection(self, db: Session, connection: SocialConnection, updates: Dict[str, Any]) -> None:
         """Update connection with new data"""
-        for field, value in updates.items():
-            setattr(connection, field, value)
+        for name, value in updates.items():
+            setattr(connection, name, value)
         
         db.commit()
         db.refresh(connection)
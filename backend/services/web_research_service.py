@@ -10,12 +10,13 @@ import re
 import json
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-import aiohttp
+import httpx
 import requests
 from urllib.parse import quote_plus
 from dataclasses import dataclass
 
 from backend.core.config import get_settings
+from backend.services.http_transport import shared_transport
 def log_api_error(endpoint: str, method: str, error: Exception, request_data: Optional[Dict] = None, user_id: Optional[int] = None):
     """Production-ready error logging with structured format"""
     logger.error(
@@ -93,8 +94,9 @@ class WebResearchService:
         
         try:
             # Initialize HTTP session
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30)
+            async with httpx.AsyncClient(
+                timeout=30.0,
+                transport=shared_transport("web_search")
             ) as session:
                 self.session = session
                 
@@ -285,24 +287,24 @@ class WebResearchService:
             "hl": "en"
         }
         
-        async with self.session.post(url, headers=headers, json=payload) as response:
-            if response.status == 200:
-                data = await response.json()
-                results = []
-                
-                # Process organic results
-                for item in data.get('organic', [])[:max_results]:
-                    results.append(WebSearchResult(
-                        title=item.get('title', ''),
-                        url=item.get('link', ''),
-                        snippet=item.get('snippet', ''),
-                        date=item.get('date'),
-                        source='serper'
-                    ))
-                
-                return results
-            else:
-                raise Exception(f"Serper API returned {response.status}")
+        response = await self.session.post(url, headers=headers, json=payload)
+        if response.status_code == 200:
+            data = response.json()
+            results = []
+            
+            # Process organic results
+            for item in data.get('organic', [])[:max_results]:
+                results.append(WebSearchResult(
+                    title=item.get('title', ''),
+                    url=item.get('link', ''),
+                    snippet=item.get('snippet', ''),
+                    date=item.get('date'),
+                    source='serper'
+                ))
+            
+            return results
+        else:
+            raise Exception(f"Serper API returned {response.status_code}")
     
     async def _search_duckduckgo(self, query: str, max_results: int) -> List[WebSearchResult]:
         """Search using DuckDuckGo Instant Answer API"""
@@ -316,34 +318,34 @@ class WebResearchService:
                 'skip_disambig': '1'
             }
             
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    results = []
-                    
-                    # Extract abstract if available
-                    abstract = data.get('Abstract', '')
-                    if abstract:
+            response = await self.session.get(url, params=params)
+            if response.status_code == 200:
+                data = response.json()
+                results = []
+                
+                # Extract abstract if available
+                abstract = data.get('Abstract', '')
+                if abstract:
+                    results.append(WebSearchResult(
+                        title=data.get('Heading', query),
+                        url=data.get('AbstractURL', ''),
+                        snippet=abstract,
+                        source='duckduckgo'
+                    ))
+                
+                # Extract related topics
+                for topic in data.get('RelatedTopics', [])[:max_results-1]:
+                    if isinstance(topic, dict) and 'Text' in topic:
                         results.append(WebSearchResult(
-                            title=data.get('Heading', query),
-                            url=data.get('AbstractURL', ''),
-                            snippet=abstract,
+                            title=topic.get('Text', '').split(' - ')[0],
+                            url=topic.get('FirstURL', ''),
+                            snippet=topic.get('Text', ''),
                             source='duckduckgo'
                         ))
-                    
-                    # Extract related topics
-                    for topic in data.get('RelatedTopics', [])[:max_results-1]:
-                        if isinstance(topic, dict) and 'Text' in topic:
-                            results.append(WebSearchResult(
-                                title=topic.get('Text', '').split(' - ')[0],
-                                url=topic.get('FirstURL', ''),
-                                snippet=topic.get('Text', ''),
-                                source='duckduckgo'
-                            ))
-                    
-                    return results
-                else:
-                    raise Exception(f"DuckDuckGo API returned {response.status}")
+                
+                return results
+            else:
+                raise Exception(f"DuckDuckGo API returned {response.status_code}")
                     
         except Exception as e:
             logger.warning(f"DuckDuckGo search error: {e}")
@@ -15,6 +15,8 @@ from enum import Enum
 from fastapi import WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 
+from backend.core.serialization import dumps_str
+
 logger = logging.getLogger(__name__)
 
 class MessageType(str, Enum):
@@ -55,7 +57,7 @@ class WebSocketMessage:
         }
     
     def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+        return dumps_str(self.to_dict())
 
 class ConnectionManager:
     """Manages WebSocket connections and message broadcasting"""
@@ -113,25 +115,30 @@ class ConnectionManager:
             logger.debug(f"No WebSocket connections found for user {user_id}")
             return
         
-        connections = self.user_connections[user_id].copy()
-        for websocket in connections:
-            await self._send_to_websocket(websocket, message)
+        await self._send_frame_to_user(user_id, message.to_json())
     
     async def send_to_all_users(self, message: WebSocketMessage, exclude_user: Optional[int] = None):
         """Send a message to all connected users"""
+        frame = message.to_json()  # Encoded once for every recipient
         for user_id in list(self.user_connections.keys()):
             if exclude_user and user_id == exclude_user:
                 continue
-            await self.send_to_user(user_id, message)
+            await self._send_frame_to_user(user_id, frame)
+    
+    async def _send_frame_to_user(self, user_id: int, frame: str):
+        """Send an encoded message to all connections for a specific user"""
+        for websocket in self.user_connections.get(user_id, []).copy():
+            await self._send_to_websocket(websocket, frame)
     
     async def broadcast_to_user_sessions(self, user_id: int, message: WebSocketMessage):
         """Broadcast to all sessions of a specific user"""
         await self.send_to_user(user_id, message)
     
-    async def _send_to_websocket(self, websocket: WebSocket, message: WebSocketMessage):
-        """Send a message to a specific WebSocket connection"""
+    async def _send_to_websocket(self, websocket: WebSocket, message):
+        """Send a message (or an already encoded frame) to a specific WebSocket connection"""
         try:
-            await websocket.send_text(message.to_json())
+            frame = message if isinstance(message, str) else message.to_json()
+            await websocket.send_text(frame)
         except Exception as e:
             logger.warning(f"Failed to send WebSocket message: {e}")
             # Clean up failed connection
@@ -6,6 +6,8 @@ import logging
 from typing import Dict, Any, Optional
 import httpx
 
+from backend.services.http_transport import shared_transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,7 +46,7 @@ class XConnectionService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(transport=shared_transport("x")) as client:
                 response = await client.get(url, params=params, headers=headers)
                 response.raise_for_status()
                 
@@ -11,6 +11,8 @@ import httpx
 
 from backend.core.config import get_settings
 from backend.core.encryption import decrypt_token
+from backend.services.http_transport import shared_transport
+from backend.services.connection_snapshots import ConnectionSnapshot, ConnectionUpdate
 from backend.db.models import SocialConnection
 from sqlalchemy.orm import Session
 
@@ -48,22 +50,52 @@ class XMentionsService:
             connection: SocialConnection instance for X platform
             db: Database session
             
+        Returns:
+            Dictionary with polling results and statistics
+        """
+        result = await self.poll_snapshot(ConnectionSnapshot.from_connection(connection))
+        if not result.get("success"):
+            return result
+        
+        try:
+            if result["since_id"] != result["previous_since_id"]:
+                await self._update_since_id(connection, db, result["since_id"])
+            
+            # Update last checked timestamp
+            connection.last_checked_at = datetime.now(timezone.utc)
+            db.commit()
+            return result
+            
+        except Exception as e:
+            error_msg = f"X mentions polling failed: {str(e)}"
+            logger.error(f"X mentions poll error for connection {connection.id}: {error_msg}")
+            return {"success": False, "error": error_msg}
+    
+    async def poll_snapshot(self, snapshot: ConnectionSnapshot) -> Dict[str, Any]:
+        """
+        Fetch and process new mentions for a connection snapshot, without touching the database
+        
+        The caller persists the new since_id, e.g. with ``since_id_update``.
+        
+        Args:
+            snapshot: ConnectionSnapshot of an X connection
+            
         Returns:
             Dictionary with polling results and statistics
         """
         try:
-            logger.info(f"Starting X mentions poll for connection {connection.id}")
+            logger.info(f"Starting X mentions poll for connection {snapshot.id}")
             
             # Get decrypted access token
-            encrypted_token = connection.access_tokens.get("access_token")
+            encrypted_token = snapshot.access_tokens.get("access_token")
             if not encrypted_token:
                 return {"success": False, "error": "No access token found"}
             
             access_token = decrypt_token(encrypted_token)
-            user_id = connection.platform_account_id
+            user_id = snapshot.platform_account_id
             
             # Get since_id from connection metadata
-            since_id = connection.platform_metadata.get("mentions_since_id") if connection.platform_metadata else None
+            since_id = snapshot.platform_metadata.get("mentions_since_id")
             
             # Poll mentions from X API
             try:
@@ -72,7 +104,7 @@ class XMentionsService:
                 if e.response.status_code == 429:
                     # Rate limited - calculate backoff
                     backoff_seconds = self._calculate_rate_limit_backoff(e.response)
-                    logger.warning(f"Rate limited on connection {connection.id}, backoff: {backoff_seconds}s")
+                    logger.warning(f"Rate limited on connection {snapshot.id}, backoff: {backoff_seconds}s")
                     return {
                         "success": False,
                         "error": "rate_limited",
@@ -85,7 +117,7 @@ class XMentionsService:
                     return {"success": False, "error": f"HTTP {e.response.status_code}"}
             
             except Exception as e:
-                logger.error(f"Error fetching mentions for connection {connection.id}: {e}")
+                logger.error(f"Error fetching mentions for connection {snapshot.id}: {e}")
                 return {"success": False, "error": str(e)}
             
             # Process mentions data
@@ -108,7 +140,7 @@ class XMentionsService:
                     
                     # Process the mention
                     try:
-                        await self._process_mention(tweet, connection)
+                        await self._process_mention(tweet, snapshot)
                         processed_ids.append(tweet_id)
                         self._processed_tweet_ids.add(tweet_id)
                         new_mentions_count += 1
@@ -121,32 +153,56 @@ class XMentionsService:
                         # Don't update since_id if processing fails
                         continue
             
-            # Only update since_id if we successfully processed at least one mention
-            # or if we got a successful API response (even if no new mentions)
             if new_since_id != since_id:
-                await self._update_since_id(connection, db, new_since_id)
-                logger.info(f"Updated since_id for connection {connection.id}: {since_id} -> {new_since_id}")
-            
-            # Update last checked timestamp
-            connection.last_checked_at = datetime.now(timezone.utc)
-            db.commit()
+                logger.info(f"New since_id for connection {snapshot.id}: {since_id} -> {new_since_id}")
             
             result = {
                 "success": True,
                 "new_mentions": new_mentions_count,
                 "processed_ids": processed_ids,
                 "since_id": new_since_id,
+                "previous_since_id": since_id,
                 "total_fetched": len(tweets)
             }
             
-            logger.info(f"X mentions poll completed for connection {connection.id}: {result}")
+            logger.info(f"X mentions poll completed for connection {snapshot.id}: {result}")
             return result
             
         except Exception as e:
             error_msg = f"X mentions polling failed: {str(e)}"
-            logger.error(f"X mentions poll error for connection {connection.id}: {error_msg}")
+            logger.error(f"X mentions poll error for connection {snapshot.id}: {error_msg}")
             return {"success": False, "error": error_msg}
     
+    def since_id_update(self, snapshot: ConnectionSnapshot, result: Dict[str, Any]) -> ConnectionUpdate:
+        """
+        Batched write for a successful poll: new since_id and last checked timestamp
+        
+        If the row changed since the snapshot (another poll or a token refresh),
+        the update is re-applied on the fresh row keeping the higher since_id.
+        
+        Args:
+            snapshot: ConnectionSnapshot the poll ran against
+            result: Successful result from ``poll_snapshot``
+            
+        Returns:
+            ConnectionUpdate for ``apply_connection_updates``
+        """
+        values = {"last_checked_at": datetime.now(timezone.utc)}
+        if result["since_id"] != result["previous_since_id"]:
+            values["platform_metadata"] = {**snapshot.platform_metadata, "mentions_since_id": result["since_id"]}
+        
+        def merge(connection: SocialConnection, proposed: Dict[str, Any]) -> Dict[str, Any]:
+            if "platform_metadata" in proposed:
+                current = connection.platform_metadata or {}
+                current_since_id = current.get("mentions_since_id")
+                proposed["platform_metadata"] = {
+                    **current,
+                    "mentions_since_id": max(current_since_id or "0", result["since_id"], key=int)
+                }
+            return proposed
+        
+        return ConnectionUpdate(snapshot=snapshot, values=values, merge=merge)
+    
     async def _fetch_mentions(self, user_id: str, access_token: str, since_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Fetch mentions from X API
@@ -174,13 +230,13 @@ class XMentionsService:
         if since_id:
             params["since_id"] = since_id
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=30.0, transport=shared_transport("x")) as client:
             response = await client.get(url, headers=headers, params=params)
             response.raise_for_status()
             
             return response.json()
     
-    async def _process_mention(self, tweet: Dict[str, Any], connection: SocialConnection) -> None:
+    async def _process_mention(self, tweet: Dict[str, Any], connection: ConnectionSnapshot) -> None:
         """
         Process a single mention tweet
         
@@ -189,7 +245,7 @@ class XMentionsService:
         
         Args:
             tweet: Tweet data from X API
-            connection: SocialConnection instance
+            connection: Snapshot of the polled connection
         """
         try:
             tweet_id = tweet["id"]
@@ -374,13 +374,12 @@ def process_scheduled_content(self):
         db = next(get_db())
         content_service = ContentPersistenceService(db)
         
-        # Get content scheduled for posting now (within the next hour)
+        # Only read content that is already due; later rows are picked up by later runs
         now = datetime.utcnow()
-        posting_window = now + timedelta(hours=1)
         
         scheduled_content = content_service.get_scheduled_content(
             user_id=None,  # Get for all users
-            before=posting_window
+            before=now
         )
         
         if not scheduled_content:
@@ -4,6 +4,9 @@ suppress_third_party_warnings()
 
 from celery import Celery
 from backend.core.config import get_settings
+from backend.tasks.worker_profiles import (
+    TASK_ROUTES, QueueTimeLimits, apply_worker_profile, get_worker_profile, register_profile_hooks
+)
 
 settings = get_settings()
 
@@ -18,6 +21,8 @@ celery_app = Celery(
         "backend.tasks.webhook_tasks",  # Webhook processing
         "backend.tasks.token_health_tasks",  # Token refresh and health
         "backend.tasks.x_polling_tasks",  # X mentions polling
+        "backend.tasks.publish_tasks",  # Connection-based publishing
+        "backend.tasks.schedule_dispatch_tasks",  # Scheduled post dispatch
         # Disabled heavy tasks to prevent memory issues
         # "backend.tasks.content_tasks",  # CrewAI - uses 500MB+
         # "backend.tasks.research_tasks",  # CrewAI - uses 500MB+ 
@@ -25,6 +30,18 @@ celery_app = Celery(
     ]
 )
 
+# Pooled outbound HTTP connections are reset per worker process and reported on exit
+from backend.services.http_transport import register_celery_transport_hooks
+register_celery_transport_hooks()
+
+# Async task bodies share one persistent event loop per worker process
+from backend.services.async_bridge import register_celery_bridge_hooks
+register_celery_bridge_hooks()
+
+# Vector indexes can be loaded once in the parent and shared copy-on-write (SHARED_INDEX_PRELOAD)
+from backend.core.shared_index import register_celery_index_hooks
+register_celery_index_hooks()
+
 celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
@@ -36,18 +53,21 @@ celery_app.conf.update(
     task_time_limit=5 * 60,  # 5 minutes (reduced from 10)
     task_soft_time_limit=4 * 60,  # 4 minutes (reduced from 8)
     
-    # MEMORY OPTIMIZATION: Force single-process, serial execution
-    worker_concurrency=1,  # Only 1 process at a time
-    worker_prefetch_multiplier=1,  # Only 1 task prefetched
-    worker_max_tasks_per_child=5,  # Restart after 5 tasks (was 10)
-    worker_max_memory_per_child=200000,  # 200MB limit (was 300MB)
+    # Queue routing; each task gets the time limits of its queue
+    task_routes=TASK_ROUTES,
+    task_annotations=[QueueTimeLimits()],
+    # Redis broker: workers drain their queues in the listed (priority) order
+    broker_transport_options={'queue_order_strategy': 'priority'},
     
-    # Use threads instead of processes to reduce memory overhead
-    worker_pool='threads',  # Use thread pool instead of process pool
     worker_disable_rate_limits=True,
     worker_pool_restarts=True,
 )
 
+# Worker topology: pool, concurrency, queues and recycling come from the selected profile
+# (CELERY_WORKER_PROFILE=realtime|io|cpu|all, see backend/tasks/worker_profiles.py)
+apply_worker_profile(celery_app, get_worker_profile(settings.celery_worker_profile))
+register_profile_hooks(celery_app)
+
 # Production autonomous schedule for fully automated operation
 celery_app.conf.beat_schedule = {
     # Daily autonomous content generation at 6 AM UTC
@@ -78,6 +98,20 @@ celery_app.conf.beat_schedule = {
         'options': {'queue': 'posting'},
     },
     
+    # Hand scheduled posts due within the lookahead to Celery with an exact ETA
+    'scheduled-post-dispatch': {
+        'task': 'backend.tasks.schedule_dispatch_tasks.dispatch_due_schedules',
+        'schedule': settings.schedule_dispatch_interval_s,
+        'options': {'queue': 'posting', 'expires': settings.schedule_dispatch_interval_s},
+    },
+    
+    # Re-index pending schedules from the database - hourly
+    'scheduled-post-reindex': {
+        'task': 'backend.tasks.schedule_dispatch_tasks.rebuild_schedule_index',
+        'schedule': 60.0 * 60.0,  # Hourly
+        'options': {'queue': 'posting', 'expires': 600},  # 10 min expiry
+    },
+    
     # Lightweight research tasks (memory optimized)
     'lightweight-research': {
         'task': 'backend.tasks.lightweight_research_tasks.lightweight_daily_research',
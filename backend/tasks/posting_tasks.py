@@ -7,6 +7,10 @@ from backend.agents.tools import twitter_tool
 from backend.db.database import get_db
 from backend.db.models import ContentLog
 from backend.core.feature_flags import ff
+from backend.services.campaign_planner import get_campaign_planner
+from backend.tasks.publish_tasks import publish_via_connection
+from celery import group
+from celery.result import GroupResult
 import logging
 import hashlib
 from datetime import datetime, timedelta
@@ -183,25 +187,38 @@ def publish_post(content, platform, post_id=None, user_id=None, idempotency_key=
 
 @celery_app.task
 def batch_publish_posts(posts):
-    """Publish multiple posts across different platforms"""
+    """
+    Publish multiple posts across different platforms as one campaign
+    
+    Targets are paced per (organization, platform) token bucket and sent as a
+    single Celery group; poll get_campaign_progress with the campaign_id.
+    Posts with a connection_id go through publish_via_connection, others
+    through publish_post.
+    """
     try:
-        results = []
+        plan = get_campaign_planner().plan(posts)
         
-        for post in posts:
-            result = publish_post.apply_async(
-                args=[post['content'], post['platform']],
-                kwargs={'post_id': post.get('id')}
-            )
-            
+        campaign = group([
+            _publish_signature(dispatch.target).set(countdown=dispatch.countdown_s)
+            for dispatch in plan.dispatches
+        ]).apply_async()
+        campaign.save()
+        
+        results = []
+        for dispatch, task_result in zip(plan.dispatches, campaign.results):
             results.append({
-                'original_post': post,
-                'task_id': result.id,
+                'original_post': dispatch.target,
+                'task_id': task_result.id,
+                'countdown_s': dispatch.countdown_s,
                 'status': 'queued'
             })
         
         return {
             'status': 'success',
             'message': f'Batch publishing initiated for {len(posts)} posts',
+            'campaign_id': campaign.id,
+            'estimated_duration_s': plan.duration_s,
+            'groups': plan.groups,
             'results': results
         }
         
@@ -212,6 +229,61 @@ def batch_publish_posts(posts):
             'message': f'Batch publishing failed: {str(exc)}'
         }
 
+def _publish_signature(post):
+    """Celery signature publishing one campaign target"""
+    if post.get('connection_id'):
+        media_urls = post.get('media_urls') or []
+        content_hash = post.get('content_hash') or hashlib.sha256(
+            (post['content'] + "".join(sorted(media_urls))).encode()
+        ).hexdigest()
+        payload_dict = {
+            'content': post['content'],
+            'media_urls': media_urls,
+            'idempotency_key': post.get('idempotency_key')
+        }
+        return publish_via_connection.s(str(post['connection_id']), payload_dict, content_hash, None)
+    
+    return publish_post.s(post['content'], post['platform'], post_id=post.get('id'))
+
+@celery_app.task
+def get_campaign_progress(campaign_id):
+    """Aggregate progress of a batch_publish_posts campaign"""
+    try:
+        campaign = GroupResult.restore(campaign_id, app=celery_app)
+        if campaign is None:
+            return {'status': 'not_found', 'campaign_id': campaign_id}
+        
+        total = len(campaign.results)
+        succeeded = failed = completed = 0
+        for task_result in campaign.results:
+            if not task_result.ready():
+                continue
+            completed += 1
+            outcome = task_result.result
+            # publish_via_connection reports fatal errors as a result, not an exception
+            if task_result.failed() or (isinstance(outcome, dict) and outcome.get('success') is False):
+                failed += 1
+            else:
+                succeeded += 1
+        
+        return {
+            'status': 'completed' if completed == total else 'in_progress',
+            'campaign_id': campaign_id,
+            'total': total,
+            'completed': completed,
+            'succeeded': succeeded,
+            'failed': failed,
+            'pending': total - completed,
+            'percent': round(100.0 * completed / total, 1) if total else 100.0
+        }
+        
+    except Exception as exc:
+        logger.error(f"Campaign progress lookup failed: {str(exc)}")
+        return {
+            'status': 'error',
+            'message': f'Campaign progress lookup failed: {str(exc)}'
+        }
+
 @celery_app.task
 def validate_post_content(content, platform):
     """Validate post content against platform requirements"""
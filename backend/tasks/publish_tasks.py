@@ -8,11 +8,13 @@ from typing import Dict, Any, Optional
 from celery import Task
 from sqlalchemy.orm import Session
 
-from backend.tasks.celery_app import celery
+from backend.tasks.celery_app import celery_app as celery
 from backend.db.database import get_db
 from backend.db.models import SocialConnection, ContentSchedule
 from backend.services.publish_runner import get_publish_runner, PublishPayload
 from backend.services.rate_limit import RetryableError, FatalError
+from backend.services.http_transport import run_blocking
+from backend.services.schedule_dispatcher import get_schedule_dispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +72,10 @@ def publish_via_connection(
             f"attempt {self.request.retries + 1}"
         )
         
+        # Dispatch lag: how late the first attempt started against the schedule
+        if scheduled_time and self.request.retries == 0:
+            get_schedule_dispatcher().record_lag(datetime.fromisoformat(scheduled_time))
+        
         # Load connection
         connection = db.query(SocialConnection).filter(
             SocialConnection.id == connection_id
@@ -110,12 +116,12 @@ def publish_via_connection(
         
         # Run resilient publish
         runner = get_publish_runner()
-        result = await runner.run_publish(
+        result = run_blocking(runner.run_publish(
             connection=connection,
             payload=payload,
             db=db,
             attempt=self.request.retries
-        )
+        ))
         
         # Handle result
         if result.success:
@@ -328,7 +334,8 @@ def enqueue_publish_task(
     content_hash: str,
     scheduled_time: Optional[datetime] = None,
     idempotency_key: Optional[str] = None,
-    delay_s: float = 0
+    delay_s: float = 0,
+    eta: Optional[datetime] = None
 ) -> str:
     """
     Enqueue a publish task
@@ -341,6 +348,7 @@ def enqueue_publish_task(
         scheduled_time: When content was scheduled
         idempotency_key: Unique key for this schedule
         delay_s: Delay before executing task
+        eta: Exact time to execute the task (takes precedence over delay_s)
         
     Returns:
         Celery task ID
@@ -353,7 +361,13 @@ def enqueue_publish_task(
     
     scheduled_time_str = scheduled_time.isoformat() if scheduled_time else None
     
-    if delay_s > 0:
+    if eta is not None:
+        # Run exactly when due; the worker holds the task until then
+        task = publish_via_connection.apply_async(
+            args=[connection_id, payload_dict, content_hash, scheduled_time_str],
+            eta=eta
+        )
+    elif delay_s > 0:
         # Schedule task for future execution
         eta = datetime.now(timezone.utc).timestamp() + delay_s
         task = publish_via_connection.apply_async(
@@ -0,0 +1,50 @@
+"""
+Celery tasks for scheduled post dispatch
+Hands due ContentSchedule rows to publish_via_connection and keeps the Redis due index in sync with the database
+"""
+import logging
+from typing import Dict, Any
+
+from backend.db.database import get_db
+from backend.services.schedule_dispatcher import get_schedule_dispatcher
+from backend.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, name='backend.tasks.schedule_dispatch_tasks.dispatch_due_schedules')
+def dispatch_due_schedules(self) -> Dict[str, Any]:
+    """
+    Enqueue schedules due within the dispatcher lookahead, each with eta=scheduled_for
+
+    Returns:
+        Dispatch counts, pending index size and the next due time
+    """
+    db = next(get_db())
+    try:
+        return get_schedule_dispatcher().dispatch_due(db)
+    except Exception as e:
+        logger.error(f"Scheduled post dispatch failed: {e}")
+        return {'error': str(e)}
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, name='backend.tasks.schedule_dispatch_tasks.rebuild_schedule_index')
+def rebuild_schedule_index(self) -> Dict[str, Any]:
+    """
+    Re-index pending schedules from the database (startup backfill and Redis loss recovery)
+
+    Returns:
+        Number of schedules indexed and dispatcher stats
+    """
+    db = next(get_db())
+    try:
+        dispatcher = get_schedule_dispatcher()
+        indexed = dispatcher.rebuild(db)
+        return {'indexed': indexed, 'stats': dispatcher.get_stats()}
+    except Exception as e:
+        logger.error(f"Schedule index rebuild failed: {e}")
+        return {'error': str(e)}
+    finally:
+        db.close()
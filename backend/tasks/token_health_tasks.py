@@ -2,7 +2,6 @@
 Celery tasks for token health management
 Handles automated token refresh and health auditing
 """
-import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List
@@ -10,9 +9,13 @@ from celery import Celery
 from sqlalchemy.orm import Session
 
 from backend.core.config import get_settings
-from backend.db.database import get_db
+from backend.db.database import get_db, SessionLocal
 from backend.db.models import SocialConnection, SocialAudit
+from backend.services.connection_snapshots import (
+    ConnectionSnapshot, apply_connection_updates, load_snapshots, short_session
+)
 from backend.services.token_refresh_service import get_token_refresh_service
+from backend.services.http_transport import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +55,9 @@ def audit_all_tokens() -> Dict[str, Any]:
     - Attempting to refresh their tokens
     - Creating audit logs for all refresh attempts
     
+    Connections are read in one short transaction and refreshed with no
+    session checked out; new tokens and audit rows are written in one batch.
+    
     Returns:
         Dictionary with audit results and statistics
     """
@@ -63,75 +69,83 @@ def audit_all_tokens() -> Dict[str, Any]:
         start_time = datetime.now(timezone.utc)
         logger.info("Starting nightly token health audit")
         
-        # Get database session
-        db_gen = get_db()
-        db: Session = next(db_gen)
+        # Phase 1: read the connections needing refresh in a short transaction
+        with short_session(SessionLocal) as db:
+            snapshots = load_snapshots(_find_connections_needing_refresh(db))
         
-        try:
-            # Find connections that need token refresh
-            connections_to_refresh = _find_connections_needing_refresh(db)
-            
-            audit_results = {
-                "audit_time": start_time.isoformat(),
-                "connections_checked": len(connections_to_refresh),
-                "refresh_attempts": 0,
-                "refresh_successes": 0,
-                "refresh_failures": 0,
-                "platforms": {"meta": 0, "x": 0},
-                "errors": []
-            }
-            
-            # Refresh each connection
-            refresh_service = get_token_refresh_service()
-            
-            for connection in connections_to_refresh:
-                try:
-                    audit_results["refresh_attempts"] += 1
-                    audit_results["platforms"][connection.platform] += 1
-                    
-                    logger.info(f"Refreshing connection {connection.id} ({connection.platform})")
-                    
-                    # Refresh based on platform
-                    if connection.platform == "meta":
-                        success, new_expiry, message = asyncio.run(refresh_service.refresh_meta_connection(connection, db))
-                    elif connection.platform == "x":
-                        success, new_expiry, message = asyncio.run(refresh_service.refresh_x_connection(connection, db))
-                    else:
-                        logger.warning(f"Unknown platform for refresh: {connection.platform}")
-                        continue
-                    
-                    if success:
-                        audit_results["refresh_successes"] += 1
-                        logger.info(f"Successfully refreshed connection {connection.id}: {message}")
-                    else:
-                        audit_results["refresh_failures"] += 1
-                        logger.warning(f"Failed to refresh connection {connection.id}: {message}")
-                        audit_results["errors"].append({
-                            "connection_id": str(connection.id),
-                            "platform": connection.platform,
-                            "error": message
-                        })
+        audit_results = {
+            "audit_time": start_time.isoformat(),
+            "connections_checked": len(snapshots),
+            "refresh_attempts": 0,
+            "refresh_successes": 0,
+            "refresh_failures": 0,
+            "platforms": {"meta": 0, "x": 0},
+            "write_conflicts": [],
+            "errors": []
+        }
+        
+        # Phase 2: refresh each connection with no database session checked out
+        refresh_service = get_token_refresh_service()
+        updates = []
+        audits = []
+        
+        for snapshot in snapshots:
+            try:
+                if snapshot.platform not in audit_results["platforms"]:
+                    logger.warning(f"Unknown platform for refresh: {snapshot.platform}")
+                    continue
+                
+                audit_results["refresh_attempts"] += 1
+                audit_results["platforms"][snapshot.platform] += 1
                 
-                except Exception as e:
+                logger.info(f"Refreshing connection {snapshot.id} ({snapshot.platform})")
+                
+                outcome = run_blocking(refresh_service.refresh_tokens(snapshot))
+                
+                update = refresh_service.refresh_update(snapshot, outcome)
+                if update:
+                    updates.append(update)
+                audit = refresh_service.refresh_audit(snapshot, outcome)
+                if audit:
+                    audits.append(audit)
+                
+                if outcome.success:
+                    audit_results["refresh_successes"] += 1
+                    logger.info(f"Successfully refreshed connection {snapshot.id}: {outcome.message}")
+                else:
                     audit_results["refresh_failures"] += 1
-                    error_msg = f"Exception refreshing connection {connection.id}: {str(e)}"
-                    logger.error(error_msg)
+                    logger.warning(f"Failed to refresh connection {snapshot.id}: {outcome.message}")
                     audit_results["errors"].append({
-                        "connection_id": str(connection.id),
-                        "platform": connection.platform if connection else "unknown",
-                        "error": str(e)
+                        "connection_id": str(snapshot.id),
+                        "platform": snapshot.platform,
+                        "error": outcome.message
                     })
             
-            # Calculate audit duration
-            end_time = datetime.now(timezone.utc)
-            audit_duration = (end_time - start_time).total_seconds()
-            audit_results["audit_duration_seconds"] = audit_duration
-            
-            logger.info(f"Token health audit completed: {audit_results}")
-            return audit_results
-            
-        finally:
-            db.close()
+            except Exception as e:
+                audit_results["refresh_failures"] += 1
+                error_msg = f"Exception refreshing connection {snapshot.id}: {str(e)}"
+                logger.error(error_msg)
+                audit_results["errors"].append({
+                    "connection_id": str(snapshot.id),
+                    "platform": snapshot.platform,
+                    "error": str(e)
+                })
+        
+        # Phase 3: new tokens and audit rows in one short write transaction
+        try:
+            written = apply_connection_updates(updates, audits, session_factory=SessionLocal)
+            audit_results["write_conflicts"] = written["conflicts"]
+        except Exception as e:
+            logger.error(f"Failed to save token refresh results: {e}")
+            audit_results["errors"].append({"error": f"Failed to save refresh results: {str(e)}"})
+        
+        # Calculate audit duration
+        end_time = datetime.now(timezone.utc)
+        audit_duration = (end_time - start_time).total_seconds()
+        audit_results["audit_duration_seconds"] = audit_duration
+        
+        logger.info(f"Token health audit completed: {audit_results}")
+        return audit_results
     
     except Exception as e:
         error_msg = f"Token health audit failed: {str(e)}"
@@ -160,52 +174,56 @@ def refresh_connection(connection_id: str) -> Dict[str, Any]:
         
         logger.info(f"Manual refresh requested for connection {connection_id}")
         
-        # Get database session
-        db_gen = get_db()
-        db: Session = next(db_gen)
-        
-        try:
-            # Find the connection
+        # Find the connection
+        with short_session(SessionLocal) as db:
             connection = db.query(SocialConnection).filter(
                 SocialConnection.id == connection_id,
                 SocialConnection.is_active == True
             ).first()
-            
-            if not connection:
-                return {
-                    "status": "failed",
-                    "error": "Connection not found or inactive",
-                    "connection_id": connection_id
-                }
-            
-            # Refresh based on platform
-            refresh_service = get_token_refresh_service()
-            
-            if connection.platform == "meta":
-                success, new_expiry, message = asyncio.run(refresh_service.refresh_meta_connection(connection, db))
-            elif connection.platform == "x":
-                success, new_expiry, message = asyncio.run(refresh_service.refresh_x_connection(connection, db))
-            else:
-                return {
-                    "status": "failed",
-                    "error": f"Unsupported platform: {connection.platform}",
-                    "connection_id": connection_id
-                }
-            
-            result = {
-                "status": "success" if success else "failed",
-                "connection_id": connection_id,
-                "platform": connection.platform,
-                "message": message,
-                "new_expiry": new_expiry.isoformat() if new_expiry else None,
-                "refresh_time": datetime.now(timezone.utc).isoformat()
+            snapshot = ConnectionSnapshot.from_connection(connection) if connection else None
+        
+        if not snapshot:
+            return {
+                "status": "failed",
+                "error": "Connection not found or inactive",
+                "connection_id": connection_id
             }
-            
-            logger.info(f"Manual refresh completed for connection {connection_id}: {result}")
-            return result
-            
-        finally:
-            db.close()
+        
+        if snapshot.platform not in ("meta", "x"):
+            return {
+                "status": "failed",
+                "error": f"Unsupported platform: {snapshot.platform}",
+                "connection_id": connection_id
+            }
+        
+        # Refresh with no session checked out, then write tokens and audit together
+        refresh_service = get_token_refresh_service()
+        outcome = run_blocking(refresh_service.refresh_tokens(snapshot))
+        
+        update = refresh_service.refresh_update(snapshot, outcome)
+        audit = refresh_service.refresh_audit(snapshot, outcome)
+        written = apply_connection_updates(
+            [update] if update else [], [audit] if audit else [], session_factory=SessionLocal
+        )
+        
+        success = outcome.success
+        message = outcome.message
+        if update and written["conflicts"]:
+            # Tokens were replaced concurrently; keep those rather than ours
+            success = False
+            message = "Connection tokens changed during refresh; newer tokens kept"
+        
+        result = {
+            "status": "success" if success else "failed",
+            "connection_id": connection_id,
+            "platform": snapshot.platform,
+            "message": message,
+            "new_expiry": outcome.new_expiry.isoformat() if success and outcome.new_expiry else None,
+            "refresh_time": datetime.now(timezone.utc).isoformat()
+        }
+        
+        logger.info(f"Manual refresh completed for connection {connection_id}: {result}")
+        return result
     
     except Exception as e:
         error_msg = f"Manual refresh failed for connection {connection_id}: {str(e)}"
@@ -4,7 +4,6 @@ Handles asynchronous processing of webhook events with retries and DLQ
 """
 import json
 import logging
-import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional
 from celery import Celery
@@ -12,6 +11,7 @@ from celery.exceptions import Retry
 
 from backend.core.config import get_settings
 from backend.services.meta_webhook_service import get_meta_webhook_service
+from backend.services.http_transport import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +70,7 @@ def process_meta_event(self, entry: Dict[str, Any], event_info: Dict[str, Any])
         normalized_entry = webhook_service.normalize_webhook_entry(entry)
         
         # Process different types of events
-        result = asyncio.run(_process_normalized_entry(normalized_entry, event_info))
+        result = run_blocking(_process_normalized_entry(normalized_entry, event_info))
         
         # Calculate processing time
         processing_time = (datetime.now(timezone.utc) - start_time).total_seconds()
@@ -112,7 +112,7 @@ def process_meta_event(self, entry: Dict[str, Any], event_info: Dict[str, Any])
             raise self.retry(countdown=retry_delay, exc=e)
         else:
             # Send to Dead Letter Queue
-            asyncio.run(_send_to_dlq(entry, event_info, str(e), self.request.retries))
+            run_blocking(_send_to_dlq(entry, event_info, str(e), self.request.retries))
             
             logger.error(
                 f"Meta webhook processing failed permanently: task_id={self.request.id}, "
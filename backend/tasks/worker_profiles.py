@@ -0,0 +1,223 @@
+"""
+Declarative Celery worker profiles and queue routing
+
+Each profile is one worker deployment: the queues it consumes (in priority
+order), its pool, concurrency, prefetch and recycling limits. Latency-sensitive
+I/O queues run on a high-concurrency threads pool while long research and
+content generation run on prefork, so a posting task never waits behind a
+research run.
+
+Select a profile with ``CELERY_WORKER_PROFILE=<name>`` (``celery_app`` applies
+it), or print the equivalent command line with
+``python -m backend.tasks.worker_profiles <name>``.
+"""
+import logging
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QueueSpec:
+    """A queue and the time limits applied to every task routed to it"""
+    name: str
+    soft_time_limit: int
+    time_limit: int
+
+
+@dataclass(frozen=True)
+class WorkerProfile:
+    """One worker deployment: queues (highest priority first), pool and recycling"""
+    name: str
+    queues: List[QueueSpec]
+    pool: str
+    concurrency: int
+    prefetch_multiplier: int = 1
+    max_tasks_per_child: Optional[int] = None
+    max_memory_per_child_kb: Optional[int] = None
+
+    @property
+    def queue_names(self) -> List[str]:
+        return [queue.name for queue in self.queues]
+
+    def worker_options(self) -> Dict[str, Any]:
+        """Celery settings for a worker started with this profile"""
+        options = {
+            "worker_pool": self.pool,
+            "worker_concurrency": self.concurrency,
+            "worker_prefetch_multiplier": self.prefetch_multiplier,
+            "worker_max_tasks_per_child": self.max_tasks_per_child,
+            "worker_max_memory_per_child": self.max_memory_per_child_kb,
+        }
+        if self.pool != "prefork":
+            # Only prefork recycles children; other pools are recycled by check_memory_recycle
+            options["worker_max_tasks_per_child"] = None
+            options["worker_max_memory_per_child"] = None
+        return options
+
+    def command(self, app: str = "backend.tasks.celery_app") -> str:
+        """Equivalent ``celery worker`` command line"""
+        return (
+            f"celery -A {app} worker --loglevel=info -n {self.name}@%h "
+            f"-P {self.pool} -c {self.concurrency} --prefetch-multiplier={self.prefetch_multiplier} "
+            f"-Q {','.join(self.queue_names)}"
+        )
+
+
+# Queues and their time limits (seconds)
+POSTING = QueueSpec("posting", soft_time_limit=4 * 60, time_limit=5 * 60)
+WEBHOOK_PROCESSING = QueueSpec("webhook_processing", soft_time_limit=60, time_limit=90)
+X_POLLING = QueueSpec("x_polling", soft_time_limit=4 * 60, time_limit=5 * 60)
+TOKEN_HEALTH = QueueSpec("token_health", soft_time_limit=10 * 60, time_limit=12 * 60)
+METRICS = QueueSpec("metrics", soft_time_limit=15 * 60, time_limit=20 * 60)
+REPORTS = QueueSpec("reports", soft_time_limit=15 * 60, time_limit=20 * 60)
+AUTONOMOUS = QueueSpec("autonomous", soft_time_limit=55 * 60, time_limit=60 * 60)
+RESEARCH = QueueSpec("research", soft_time_limit=55 * 60, time_limit=60 * 60)
+LEGACY = QueueSpec("celery", soft_time_limit=4 * 60, time_limit=5 * 60)
+
+QUEUES = {
+    queue.name: queue
+    for queue in (POSTING, WEBHOOK_PROCESSING, X_POLLING, TOKEN_HEALTH, METRICS, REPORTS, AUTONOMOUS, RESEARCH, LEGACY)
+}
+
+WORKER_PROFILES: Dict[str, WorkerProfile] = {
+    # Publishing and inbound events: short network-bound tasks, drained first
+    "realtime": WorkerProfile(
+        name="realtime",
+        queues=[POSTING, WEBHOOK_PROCESSING, X_POLLING],
+        pool="threads",
+        concurrency=32,
+        prefetch_multiplier=4,
+        max_memory_per_child_kb=400 * 1024,
+    ),
+    # Periodic maintenance and analytics: network-bound, not latency-sensitive
+    "io": WorkerProfile(
+        name="io",
+        queues=[TOKEN_HEALTH, METRICS, REPORTS, LEGACY],
+        pool="threads",
+        concurrency=8,
+        prefetch_multiplier=2,
+        max_memory_per_child_kb=400 * 1024,
+    ),
+    # Research and content generation: long, memory-heavy runs isolated in children
+    "cpu": WorkerProfile(
+        name="cpu",
+        queues=[AUTONOMOUS, RESEARCH],
+        pool="prefork",
+        concurrency=2,
+        prefetch_multiplier=1,
+        max_tasks_per_child=5,
+        max_memory_per_child_kb=300 * 1024,
+    ),
+    # Single small worker for every queue (memory-constrained hosts), posting first
+    "all": WorkerProfile(
+        name="all",
+        queues=[POSTING, WEBHOOK_PROCESSING, X_POLLING, TOKEN_HEALTH, METRICS, REPORTS, AUTONOMOUS, RESEARCH, LEGACY],
+        pool="threads",
+        concurrency=4,
+        prefetch_multiplier=1,
+        max_memory_per_child_kb=200 * 1024,
+    ),
+}
+
+# Task name (glob) -> queue; beat entries name their queue explicitly as well
+TASK_ROUTES = {
+    "publish_tasks.*": {"queue": POSTING.name},
+    "backend.tasks.posting_tasks.*": {"queue": POSTING.name},
+    "backend.tasks.schedule_dispatch_tasks.*": {"queue": POSTING.name},
+    "autonomous_content_posting": {"queue": POSTING.name},
+    "backend.tasks.webhook_tasks.*": {"queue": WEBHOOK_PROCESSING.name},
+    "backend.tasks.x_polling_tasks.*": {"queue": X_POLLING.name},
+    "backend.tasks.token_health_tasks.*": {"queue": TOKEN_HEALTH.name},
+    "autonomous_metrics_collection": {"queue": METRICS.name},
+    "autonomous_weekly_report": {"queue": REPORTS.name},
+    "autonomous_daily_content_generation": {"queue": AUTONOMOUS.name},
+    "backend.tasks.lightweight_research_tasks.*": {"queue": RESEARCH.name},
+}
+
+
+def route_for(task_name: str) -> Optional[str]:
+    """Queue a task name routes to (None = default queue)"""
+    from fnmatch import fnmatchcase
+
+    for pattern, route in TASK_ROUTES.items():
+        if fnmatchcase(task_name, pattern):
+            return route["queue"]
+    return None
+
+
+class QueueTimeLimits:
+    """``task_annotations`` entry giving each task the time limits of the queue it routes to"""
+
+    def annotate(self, task) -> Optional[Dict[str, int]]:
+        if task.name.startswith("celery."):
+            return None
+        queue = QUEUES[route_for(task.name) or LEGACY.name]
+        return {"soft_time_limit": queue.soft_time_limit, "time_limit": queue.time_limit}
+
+
+def get_worker_profile(name: str) -> WorkerProfile:
+    """Look up a profile by name"""
+    if name not in WORKER_PROFILES:
+        raise ValueError(f"Unknown worker profile '{name}'; expected one of {sorted(WORKER_PROFILES)}")
+    return WORKER_PROFILES[name]
+
+
+def apply_worker_profile(app, profile: WorkerProfile):
+    """Configure a Celery app to run as the given profile"""
+    from kombu import Queue
+
+    app.conf.update(
+        task_queues=[Queue(name) for name in profile.queue_names],
+        **profile.worker_options()
+    )
+    app.conf.worker_profile = profile.name
+    logger.info(f"Celery worker profile '{profile.name}': {profile.pool} x{profile.concurrency} on {profile.queue_names}")
+
+
+def register_profile_hooks(app):
+    """Recycle non-prefork workers whose memory passed the profile limit"""
+    from celery.signals import task_postrun
+
+    @task_postrun.connect(weak=False)
+    def _recycle_on_memory(sender=None, **kwargs):
+        check_memory_recycle(app)
+
+
+def check_memory_recycle(app) -> bool:
+    """
+    Warm-shutdown a threads/solo worker whose peak RSS passed the profile limit
+
+    Prefork recycles children itself via worker_max_memory_per_child; other
+    pools run in one process, so the whole worker exits after its current
+    tasks and the process supervisor starts a fresh one.
+    """
+    profile = WORKER_PROFILES.get(getattr(app.conf, "worker_profile", None) or "")
+    if profile is None or profile.pool == "prefork" or not profile.max_memory_per_child_kb or resource is None:
+        return False
+
+    # ru_maxrss is in KB on Linux
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if peak_rss_kb <= profile.max_memory_per_child_kb:
+        return False
+
+    logger.warning(
+        f"Worker profile '{profile.name}' peak RSS {peak_rss_kb} KB exceeds "
+        f"{profile.max_memory_per_child_kb} KB; recycling worker"
+    )
+    from celery.worker import state
+    state.should_stop = 0
+    return True
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or sorted(WORKER_PROFILES)
+    for profile_name in names:
+        print(get_worker_profile(profile_name).command())
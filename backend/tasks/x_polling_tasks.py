@@ -2,19 +2,21 @@
 Celery tasks for X (Twitter) mentions polling
 Handles automated polling with rate limiting and organization-level throttling
 """
-import asyncio
 import logging
 import json
 import redis
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List
 from celery import Celery
-from sqlalchemy.orm import Session
 
 from backend.core.config import get_settings
-from backend.db.database import get_db
-from backend.db.models import SocialConnection, SocialAudit
+from backend.db.database import SessionLocal
+from backend.db.models import SocialConnection
+from backend.services.connection_snapshots import (
+    ConnectionAuditEntry, ConnectionSnapshot, apply_connection_updates, load_snapshots, short_session
+)
 from backend.services.x_mentions_service import get_x_mentions_service
+from backend.services.http_transport import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -71,7 +73,9 @@ def poll_all_x_mentions() -> Dict[str, Any]:
     Poll mentions for all active X connections with organization-level rate limiting
     
     This task runs every 15 minutes to poll for new mentions across all X connections.
-    Uses Redis-based token bucket for rate limiting per organization.
+    Uses Redis-based token bucket for rate limiting per organization. The
+    connections are read in one short transaction, polled with no session
+    checked out, and the new since_ids and audit rows written in one batch.
     
     Returns:
         Dictionary with polling results and statistics
@@ -84,144 +88,136 @@ def poll_all_x_mentions() -> Dict[str, Any]:
         start_time = datetime.now(timezone.utc)
         logger.info("Starting X mentions polling for all connections")
         
-        # Get database session
-        db_gen = get_db()
-        db: Session = next(db_gen)
-        
-        try:
-            # Find all active X connections
-            x_connections = db.query(SocialConnection).filter(
+        # Phase 1: read the work set in a short transaction
+        with short_session(SessionLocal) as db:
+            x_snapshots = load_snapshots(db.query(SocialConnection).filter(
                 SocialConnection.is_active == True,
                 SocialConnection.platform == "x",
                 SocialConnection.revoked_at.is_(None)
-            ).all()
-            
-            poll_results = {
-                "poll_time": start_time.isoformat(),
-                "total_connections": len(x_connections),
-                "connections_polled": 0,
-                "connections_skipped": 0,
-                "total_new_mentions": 0,
-                "rate_limited_orgs": [],
-                "errors": []
-            }
-            
-            # Get Redis client for rate limiting
-            redis_client = get_redis_client()
-            
-            # Group connections by organization for rate limiting
-            org_connections = {}
-            for conn in x_connections:
-                org_id = str(conn.organization_id)
-                if org_id not in org_connections:
-                    org_connections[org_id] = []
-                org_connections[org_id].append(conn)
-            
-            # Poll each organization's connections with rate limiting
-            mentions_service = get_x_mentions_service()
-            
-            for org_id, connections in org_connections.items():
-                try:
-                    # Check organization rate limit
-                    if redis_client and not _check_org_rate_limit(redis_client, org_id):
-                        logger.warning(f"Organization {org_id} rate limited for X mentions polling")
-                        poll_results["rate_limited_orgs"].append(org_id)
-                        poll_results["connections_skipped"] += len(connections)
-                        continue
-                    
-                    # Poll mentions for each connection in this org
-                    for connection in connections:
-                        try:
-                            logger.info(f"Polling mentions for X connection {connection.id}")
+            ).all())
+        
+        poll_results = {
+            "poll_time": start_time.isoformat(),
+            "total_connections": len(x_snapshots),
+            "connections_polled": 0,
+            "connections_skipped": 0,
+            "total_new_mentions": 0,
+            "rate_limited_orgs": [],
+            "write_conflicts": [],
+            "errors": []
+        }
+        
+        # Get Redis client for rate limiting
+        redis_client = get_redis_client()
+        
+        # Group connections by organization for rate limiting
+        org_connections = {}
+        for snapshot in x_snapshots:
+            org_id = str(snapshot.organization_id)
+            if org_id not in org_connections:
+                org_connections[org_id] = []
+            org_connections[org_id].append(snapshot)
+        
+        # Phase 2: poll X with no database session checked out
+        mentions_service = get_x_mentions_service()
+        updates = []
+        audits = []
+        
+        for org_id, snapshots in org_connections.items():
+            try:
+                # Check organization rate limit
+                if redis_client and not _check_org_rate_limit(redis_client, org_id):
+                    logger.warning(f"Organization {org_id} rate limited for X mentions polling")
+                    poll_results["rate_limited_orgs"].append(org_id)
+                    poll_results["connections_skipped"] += len(snapshots)
+                    continue
+                
+                # Poll mentions for each connection in this org
+                for snapshot in snapshots:
+                    try:
+                        logger.info(f"Polling mentions for X connection {snapshot.id}")
+                        
+                        result = run_blocking(mentions_service.poll_snapshot(snapshot))
+                        
+                        if result.get("success"):
+                            poll_results["connections_polled"] += 1
+                            poll_results["total_new_mentions"] += result.get("new_mentions", 0)
                             
-                            result = asyncio.run(mentions_service.poll_mentions(connection, db))
+                            updates.append(mentions_service.since_id_update(snapshot, result))
+                            audits.append(_poll_audit(
+                                snapshot, "success",
+                                {
+                                    "new_mentions": result.get("new_mentions", 0),
+                                    "since_id": result.get("since_id"),
+                                    "total_fetched": result.get("total_fetched", 0)
+                                }
+                            ))
                             
-                            if result.get("success"):
-                                poll_results["connections_polled"] += 1
-                                poll_results["total_new_mentions"] += result.get("new_mentions", 0)
-                                
-                                # Create audit log for successful poll
-                                asyncio.run(_create_poll_audit(
-                                    db, connection, "poll_mentions", "success",
-                                    {
-                                        "new_mentions": result.get("new_mentions", 0),
-                                        "since_id": result.get("since_id"),
-                                        "total_fetched": result.get("total_fetched", 0)
-                                    }
-                                ))
-                                
-                            elif result.get("error") == "rate_limited":
-                                # Handle rate limiting
-                                poll_results["connections_skipped"] += 1
-                                logger.warning(f"Connection {connection.id} rate limited: {result}")
-                                
-                                # Create audit log for rate limit
-                                asyncio.run(_create_poll_audit(
-                                    db, connection, "poll_mentions", "rate_limited",
-                                    {
-                                        "backoff_seconds": result.get("backoff_seconds"),
-                                        "retry_after": result.get("retry_after", {}).isoformat() if result.get("retry_after") else None
-                                    }
-                                ))
-                                
-                            else:
-                                # Handle other errors
-                                poll_results["connections_skipped"] += 1
-                                error_msg = result.get("error", "unknown error")
-                                poll_results["errors"].append({
-                                    "connection_id": str(connection.id),
-                                    "error": error_msg
-                                })
-                                
-                                # Create audit log for error
-                                asyncio.run(_create_poll_audit(
-                                    db, connection, "poll_mentions", "failure",
-                                    {"error": error_msg}
-                                ))
-                        
-                        except Exception as e:
+                        elif result.get("error") == "rate_limited":
+                            # Handle rate limiting
+                            poll_results["connections_skipped"] += 1
+                            logger.warning(f"Connection {snapshot.id} rate limited: {result}")
+                            
+                            audits.append(_poll_audit(
+                                snapshot, "rate_limited",
+                                {
+                                    "backoff_seconds": result.get("backoff_seconds"),
+                                    "retry_after": result.get("retry_after", {}).isoformat() if result.get("retry_after") else None
+                                }
+                            ))
+                            
+                        else:
+                            # Handle other errors
                             poll_results["connections_skipped"] += 1
-                            error_msg = f"Exception polling connection {connection.id}: {str(e)}"
-                            logger.error(error_msg)
+                            error_msg = result.get("error", "unknown error")
                             poll_results["errors"].append({
-                                "connection_id": str(connection.id),
-                                "error": str(e)
+                                "connection_id": str(snapshot.id),
+                                "error": error_msg
                             })
                             
-                            # Create audit log for exception
-                            try:
-                                asyncio.run(_create_poll_audit(
-                                    db, connection, "poll_mentions", "failure",
-                                    {"error": str(e), "exception": True}
-                                ))
-                            except:
-                                pass  # Don't fail the whole task for audit errors
+                            audits.append(_poll_audit(snapshot, "failure", {"error": error_msg}))
                     
-                    # Update rate limit counter for this organization
-                    if redis_client:
-                        _update_org_rate_limit(redis_client, org_id, len(connections))
+                    except Exception as e:
+                        poll_results["connections_skipped"] += 1
+                        error_msg = f"Exception polling connection {snapshot.id}: {str(e)}"
+                        logger.error(error_msg)
+                        poll_results["errors"].append({
+                            "connection_id": str(snapshot.id),
+                            "error": str(e)
+                        })
+                        
+                        audits.append(_poll_audit(snapshot, "failure", {"error": str(e), "exception": True}))
                 
-                except Exception as e:
-                    error_msg = f"Error polling organization {org_id}: {str(e)}"
-                    logger.error(error_msg)
-                    poll_results["errors"].append({
-                        "organization_id": org_id,
-                        "error": str(e)
-                    })
-            
-            # Calculate polling duration
-            end_time = datetime.now(timezone.utc)
-            poll_duration = (end_time - start_time).total_seconds()
-            poll_results["poll_duration_seconds"] = poll_duration
-            
-            # Reset session cache to avoid memory leaks
-            mentions_service.reset_session_cache()
+                # Update rate limit counter for this organization
+                if redis_client:
+                    _update_org_rate_limit(redis_client, org_id, len(snapshots))
             
-            logger.info(f"X mentions polling completed: {poll_results}")
-            return poll_results
-            
-        finally:
-            db.close()
+            except Exception as e:
+                error_msg = f"Error polling organization {org_id}: {str(e)}"
+                logger.error(error_msg)
+                poll_results["errors"].append({
+                    "organization_id": org_id,
+                    "error": str(e)
+                })
+        
+        # Phase 3: since_ids and audit rows in one short write transaction
+        try:
+            written = apply_connection_updates(updates, audits, session_factory=SessionLocal)
+            poll_results["write_conflicts"] = written["conflicts"]
+        except Exception as e:
+            logger.error(f"Failed to save X mentions poll results: {e}")
+            poll_results["errors"].append({"error": f"Failed to save poll results: {str(e)}"})
+        
+        # Calculate polling duration
+        end_time = datetime.now(timezone.utc)
+        poll_duration = (end_time - start_time).total_seconds()
+        poll_results["poll_duration_seconds"] = poll_duration
+        
+        # Reset session cache to avoid memory leaks
+        mentions_service.reset_session_cache()
+        
+        logger.info(f"X mentions polling completed: {poll_results}")
+        return poll_results
     
     except Exception as e:
         error_msg = f"X mentions polling failed: {str(e)}"
@@ -250,60 +246,57 @@ def poll_connection_mentions(connection_id: str) -> Dict[str, Any]:
         
         logger.info(f"Manual mentions poll requested for connection {connection_id}")
         
-        # Get database session
-        db_gen = get_db()
-        db: Session = next(db_gen)
-        
-        try:
-            # Find the connection
+        # Find the connection
+        with short_session(SessionLocal) as db:
             connection = db.query(SocialConnection).filter(
                 SocialConnection.id == connection_id,
                 SocialConnection.is_active == True,
                 SocialConnection.platform == "x"
             ).first()
-            
-            if not connection:
-                return {
-                    "status": "failed",
-                    "error": "X connection not found or inactive",
-                    "connection_id": connection_id
-                }
-            
-            # Poll mentions
-            mentions_service = get_x_mentions_service()
-            result = asyncio.run(mentions_service.poll_mentions(connection, db))
-            
-            # Create audit log
-            if result.get("success"):
-                asyncio.run(_create_poll_audit(
-                    db, connection, "poll_mentions", "success",
-                    {
-                        "new_mentions": result.get("new_mentions", 0),
-                        "since_id": result.get("since_id"),
-                        "total_fetched": result.get("total_fetched", 0),
-                        "manual_poll": True
-                    }
-                ))
-            else:
-                asyncio.run(_create_poll_audit(
-                    db, connection, "poll_mentions", "failure",
-                    {
-                        "error": result.get("error"),
-                        "manual_poll": True
-                    }
-                ))
-            
-            poll_result = {
-                **result,
-                "connection_id": connection_id,
-                "poll_time": datetime.now(timezone.utc).isoformat()
+            snapshot = ConnectionSnapshot.from_connection(connection) if connection else None
+        
+        if not snapshot:
+            return {
+                "status": "failed",
+                "error": "X connection not found or inactive",
+                "connection_id": connection_id
             }
-            
-            logger.info(f"Manual mentions poll completed for connection {connection_id}: {poll_result}")
-            return poll_result
-            
-        finally:
-            db.close()
+        
+        # Poll mentions with no session checked out
+        mentions_service = get_x_mentions_service()
+        result = run_blocking(mentions_service.poll_snapshot(snapshot))
+        
+        # Save since_id and audit log
+        if result.get("success"):
+            updates = [mentions_service.since_id_update(snapshot, result)]
+            audit = _poll_audit(
+                snapshot, "success",
+                {
+                    "new_mentions": result.get("new_mentions", 0),
+                    "since_id": result.get("since_id"),
+                    "total_fetched": result.get("total_fetched", 0),
+                    "manual_poll": True
+                }
+            )
+        else:
+            updates = []
+            audit = _poll_audit(
+                snapshot, "failure",
+                {
+                    "error": result.get("error"),
+                    "manual_poll": True
+                }
+            )
+        apply_connection_updates(updates, [audit], session_factory=SessionLocal)
+        
+        poll_result = {
+            **result,
+            "connection_id": connection_id,
+            "poll_time": datetime.now(timezone.utc).isoformat()
+        }
+        
+        logger.info(f"Manual mentions poll completed for connection {connection_id}: {poll_result}")
+        return poll_result
     
     except Exception as e:
         error_msg = f"Manual mentions poll failed for connection {connection_id}: {str(e)}"
@@ -377,40 +370,20 @@ def _update_org_rate_limit(redis_client: redis.Redis, org_id: str, request_count
         logger.warning(f"Error updating rate limit: {e}")
 
 
-async def _create_poll_audit(
-    db: Session,
-    connection: SocialConnection,
-    action: str,
-    status: str,
-    metadata: Dict[str, Any]
-) -> None:
+def _poll_audit(snapshot: ConnectionSnapshot, status: str, metadata: Dict[str, Any]) -> ConnectionAuditEntry:
     """
-    Create audit log for mentions polling operation
+    Audit row for a mentions polling operation, written with the batched results
     
     Args:
-        db: Database session
-        connection: SocialConnection instance
-        action: Action type (e.g., 'poll_mentions')
+        snapshot: Snapshot of the polled connection
         status: Status ('success', 'failure', 'rate_limited')
         metadata: Additional metadata
     """
-    try:
-        audit = SocialAudit(
-            organization_id=connection.organization_id,
-            connection_id=connection.id,
-            action=action,
-            platform=connection.platform,
-            user_id=None,  # System operation
-            status=status,
-            audit_metadata={
-                **metadata,
-                "platform_account_id": connection.platform_account_id,
-                "platform_username": connection.platform_username
-            }
-        )
-        db.add(audit)
-        db.commit()
-        
-    except Exception as e:
-        logger.error(f"Failed to create poll audit log: {e}")
-        # Don't raise - audit logging shouldn't break the main operation
\ No newline at end of file
+    return ConnectionAuditEntry(
+        snapshot, "poll_mentions", status,
+        {
+            **metadata,
+            "platform_account_id": snapshot.platform_account_id,
+            "platform_username": snapshot.platform_username
+        }
+    )
@@ -8,10 +8,24 @@ from datetime import datetime, timezone, timedelta
 from sqlalchemy.orm import Session
 
 from backend.db.models import SocialConnection, SocialAudit, Organization, User
+from backend.services.token_refresh_service import TokenRefreshOutcome, TokenRefreshService
 from backend.tasks.token_health_tasks import audit_all_tokens, refresh_connection, _find_connections_needing_refresh
 from backend.tests.conftest import TestingSessionLocal
 
 
+def _refresh_returning(**by_platform):
+    """refresh_tokens mock answering (success, new_expiry, message) per platform"""
+    async def refresh(snapshot):
+        success, new_expiry, message = by_platform[snapshot.platform]
+        return TokenRefreshOutcome(
+            success, new_expiry, message,
+            updates={"token_expires_at": new_expiry} if success else None,
+            audit_status="success" if success else "failure",
+            audit_metadata={"platform": snapshot.platform}
+        )
+    return AsyncMock(side_effect=refresh)
+
+
 class TestTokenHealthAuditIntegration:
     """Integration tests for token health audit"""
     
@@ -153,10 +167,10 @@ class TestTokenHealthAuditIntegration:
 
     @patch('backend.tasks.token_health_tasks.is_partner_oauth_enabled')
     @patch('backend.tasks.token_health_tasks.get_token_refresh_service')
-    @patch('backend.tasks.token_health_tasks.get_db')
+    @patch('backend.tasks.token_health_tasks.SessionLocal')
     def test_audit_all_tokens_success(
         self, 
-        mock_get_db, 
+        mock_session_local, 
         mock_get_refresh_service,
         mock_feature_enabled,
         db_session,
@@ -165,19 +179,17 @@ class TestTokenHealthAuditIntegration:
     ):
         """Test successful token audit with refreshes"""
         mock_feature_enabled.return_value = True
-        mock_get_db.return_value = iter([db_session])
+        mock_session_local.return_value = db_session
         
         # Mock refresh service
-        mock_refresh_service = MagicMock()
+        mock_refresh_service = TokenRefreshService(settings=MagicMock())
         mock_get_refresh_service.return_value = mock_refresh_service
         
         # Mock successful refreshes
         new_expiry = datetime.now(timezone.utc) + timedelta(days=60)
-        mock_refresh_service.refresh_meta_connection = AsyncMock(
-            return_value=(True, new_expiry, "Meta refresh successful")
-        )
-        mock_refresh_service.refresh_x_connection = AsyncMock(
-            return_value=(True, new_expiry, "X refresh successful")
+        mock_refresh_service.refresh_tokens = _refresh_returning(
+            meta=(True, new_expiry, "Meta refresh successful"),
+            x=(True, new_expiry, "X refresh successful")
         )
         
         result = audit_all_tokens()
@@ -191,15 +203,14 @@ class TestTokenHealthAuditIntegration:
         assert len(result["errors"]) == 0
         
         # Verify refresh methods were called
-        mock_refresh_service.refresh_meta_connection.assert_called()
-        mock_refresh_service.refresh_x_connection.assert_called()
+        assert {call.args[0].platform for call in mock_refresh_service.refresh_tokens.call_args_list} == {"meta", "x"}
 
     @patch('backend.tasks.token_health_tasks.is_partner_oauth_enabled')
     @patch('backend.tasks.token_health_tasks.get_token_refresh_service')
-    @patch('backend.tasks.token_health_tasks.get_db')
+    @patch('backend.tasks.token_health_tasks.SessionLocal')
     def test_audit_all_tokens_with_failures(
         self,
-        mock_get_db,
+        mock_session_local,
         mock_get_refresh_service,
         mock_feature_enabled,
         db_session,
@@ -207,14 +218,14 @@ class TestTokenHealthAuditIntegration:
     ):
         """Test token audit with some refresh failures"""
         mock_feature_enabled.return_value = True
-        mock_get_db.return_value = iter([db_session])
+        mock_session_local.return_value = db_session
         
         # Mock refresh service with failure
-        mock_refresh_service = MagicMock()
+        mock_refresh_service = TokenRefreshService(settings=MagicMock())
         mock_get_refresh_service.return_value = mock_refresh_service
         
-        mock_refresh_service.refresh_meta_connection = AsyncMock(
-            return_value=(False, None, "Token validation failed")
+        mock_refresh_service.refresh_tokens = _refresh_returning(
+            meta=(False, None, "Token validation failed")
         )
         
         result = audit_all_tokens()
@@ -229,10 +240,10 @@ class TestTokenHealthAuditIntegration:
 
     @patch('backend.tasks.token_health_tasks.is_partner_oauth_enabled')
     @patch('backend.tasks.token_health_tasks.get_token_refresh_service')
-    @patch('backend.tasks.token_health_tasks.get_db')
+    @patch('backend.tasks.token_health_tasks.SessionLocal')
     def test_refresh_connection_task_success(
         self,
-        mock_get_db,
+        mock_session_local,
         mock_get_refresh_service,
         mock_feature_enabled,
         db_session,
@@ -240,15 +251,15 @@ class TestTokenHealthAuditIntegration:
     ):
         """Test individual connection refresh task"""
         mock_feature_enabled.return_value = True
-        mock_get_db.return_value = iter([db_session])
+        mock_session_local.return_value = db_session
         
         # Mock refresh service
-        mock_refresh_service = MagicMock()
+        mock_refresh_service = TokenRefreshService(settings=MagicMock())
         mock_get_refresh_service.return_value = mock_refresh_service
         
         new_expiry = datetime.now(timezone.utc) + timedelta(days=60)
-        mock_refresh_service.refresh_meta_connection = AsyncMock(
-            return_value=(True, new_expiry, "Refresh successful")
+        mock_refresh_service.refresh_tokens = _refresh_returning(
+            meta=(True, new_expiry, "Refresh successful")
         )
         
         result = refresh_connection(str(expiring_meta_connection.id))
@@ -259,14 +270,14 @@ class TestTokenHealthAuditIntegration:
         assert "successful" in result["message"]
         assert result["new_expiry"] is not None
         
-        mock_refresh_service.refresh_meta_connection.assert_called_once()
+        mock_refresh_service.refresh_tokens.assert_called_once()
 
     @patch('backend.tasks.token_health_tasks.is_partner_oauth_enabled')
-    @patch('backend.tasks.token_health_tasks.get_db')
-    def test_refresh_connection_not_found(self, mock_get_db, mock_feature_enabled, db_session):
+    @patch('backend.tasks.token_health_tasks.SessionLocal')
+    def test_refresh_connection_not_found(self, mock_session_local, mock_feature_enabled, db_session):
         """Test refresh task with non-existent connection"""
         mock_feature_enabled.return_value = True
-        mock_get_db.return_value = iter([db_session])
+        mock_session_local.return_value = db_session
         
         result = refresh_connection("nonexistent-connection-id")
         
@@ -275,10 +286,10 @@ class TestTokenHealthAuditIntegration:
 
     @patch('backend.tasks.token_health_tasks.is_partner_oauth_enabled')
     @patch('backend.tasks.token_health_tasks.get_token_refresh_service')
-    @patch('backend.tasks.token_health_tasks.get_db')
+    @patch('backend.tasks.token_health_tasks.SessionLocal')
     def test_refresh_connection_unsupported_platform(
         self,
-        mock_get_db,
+        mock_session_local,
         mock_get_refresh_service,
         mock_feature_enabled,
         db_session,
@@ -286,7 +297,7 @@ class TestTokenHealthAuditIntegration:
     ):
         """Test refresh task with unsupported platform"""
         mock_feature_enabled.return_value = True
-        mock_get_db.return_value = iter([db_session])
+        mock_session_local.return_value = db_session
         
         # Create connection with unsupported platform
         unsupported_connection = SocialConnection(
@@ -312,15 +323,15 @@ class TestTokenHealthAuditIntegration:
         initial_audit_count = db_session.query(SocialAudit).count()
         
         with patch('backend.tasks.token_health_tasks.is_partner_oauth_enabled', return_value=True):
-            with patch('backend.tasks.token_health_tasks.get_db', return_value=iter([db_session])):
+            with patch('backend.tasks.token_health_tasks.SessionLocal', return_value=db_session):
                 with patch('backend.tasks.token_health_tasks.get_token_refresh_service') as mock_get_service:
                     # Mock successful refresh
-                    mock_refresh_service = MagicMock()
+                    mock_refresh_service = TokenRefreshService(settings=MagicMock())
                     mock_get_service.return_value = mock_refresh_service
                     
                     new_expiry = datetime.now(timezone.utc) + timedelta(days=60)
-                    mock_refresh_service.refresh_meta_connection = AsyncMock(
-                        return_value=(True, new_expiry, "Refresh successful")
+                    mock_refresh_service.refresh_tokens = _refresh_returning(
+                        meta=(True, new_expiry, "Refresh successful")
                     )
                     
                     # Run audit
@@ -352,15 +363,15 @@ class TestTokenHealthAuditIntegration:
         assert connection is not None
         
         with patch('backend.tasks.token_health_tasks.is_partner_oauth_enabled', return_value=True):
-            with patch('backend.tasks.token_health_tasks.get_db', return_value=iter([db_session])):
+            with patch('backend.tasks.token_health_tasks.SessionLocal', return_value=db_session):
                 with patch('backend.tasks.token_health_tasks.get_token_refresh_service') as mock_get_service:
                     # Mock successful refresh
-                    mock_refresh_service = MagicMock()
+                    mock_refresh_service = TokenRefreshService(settings=MagicMock())
                     mock_get_service.return_value = mock_refresh_service
                     
                     new_expiry = datetime.now(timezone.utc) + timedelta(days=60)
-                    mock_refresh_service.refresh_meta_connection = AsyncMock(
-                        return_value=(True, new_expiry, "Refresh successful")
+                    mock_refresh_service.refresh_tokens = _refresh_returning(
+                        meta=(True, new_expiry, "Refresh successful")
                     )
                     
                     # Run audit
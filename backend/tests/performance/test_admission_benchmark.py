@@ -0,0 +1,93 @@
+"""
+Publish admission benchmark against a local Redis
+
+Compares Redis commands and latency per publish attempt for:
+- legacy path: CircuitBreaker.allow + TokenBucket.acquire (+ get_remaining/get_reset_time when rejected)
+- fused AdmissionController.admit (one EVALSHA)
+- fused admission with worker token leases
+
+Skipped when no Redis is reachable at REDIS_URL (default redis://localhost:6379/15).
+"""
+import os
+import statistics
+import time
+import uuid
+import pytest
+
+import redis
+
+from backend.services.rate_limit import AdmissionController, CircuitBreaker, TokenBucket
+
+ATTEMPTS = 500
+
+
+@pytest.fixture
+def local_redis():
+    client = redis.from_url(os.getenv("ADMISSION_BENCH_REDIS_URL", "redis://localhost:6379/15"))
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("local Redis not available")
+    yield client
+    client.close()
+
+
+def _commands_processed(client) -> int:
+    return int(client.info("stats")["total_commands_processed"])
+
+
+def _run(client, attempt):
+    """Run ATTEMPTS publish admissions; return (redis commands per attempt, p50 ms, p99 ms)"""
+    latencies = []
+    before = _commands_processed(client)
+    for _ in range(ATTEMPTS):
+        start = time.perf_counter()
+        attempt()
+        latencies.append((time.perf_counter() - start) * 1000)
+    # The INFO call that closes the measurement counts itself
+    commands = _commands_processed(client) - before - 1
+    latencies.sort()
+    return commands / ATTEMPTS, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+@pytest.mark.performance
+class TestAdmissionBenchmark:
+    """Benchmark Redis ops and latency per publish admission"""
+
+    def test_fused_admission_cuts_round_trips(self, local_redis):
+        """Test fused admission needs one command per attempt and leases fewer still"""
+        org = f"bench-{uuid.uuid4()}"
+        limits = dict(refill_rate=ATTEMPTS * 100, capacity=ATTEMPTS * 10, window_s=60)
+
+        bucket = TokenBucket(local_redis, key_prefix="bench_rate", **limits)
+        breaker = CircuitBreaker(local_redis, key_prefix="bench_cb")
+
+        def legacy():
+            if breaker.allow(org, "meta") and not bucket.acquire(org, "meta"):
+                bucket.get_remaining(org, "meta")
+                bucket.get_reset_time(org, "meta")
+
+        fused = AdmissionController(local_redis, bucket_prefix="bench_rate", breaker_prefix="bench_cb", **limits)
+        leased = AdmissionController(
+            local_redis, bucket_prefix="bench_rate", breaker_prefix="bench_cb", lease_size=10, lease_ttl_s=30, **limits
+        )
+
+        # Load the scripts once so NOSCRIPT fallbacks do not skew the counts
+        legacy()
+        fused.admit(org, "meta")
+        leased.admit(org, "meta")
+
+        results = {
+            "legacy": _run(local_redis, legacy),
+            "fused": _run(local_redis, lambda: fused.admit(org, "meta")),
+            "leased": _run(local_redis, lambda: leased.admit(org, "meta")),
+        }
+        for name, (ops, p50, p99) in results.items():
+            print(f"{name:>7}: {ops:.2f} Redis commands/publish, p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+
+        local_redis.delete(f"bench_rate:{org}:meta", f"bench_cb:{org}:meta")
+
+        assert results["legacy"][0] >= 2
+        assert results["fused"][0] == pytest.approx(1.0)
+        assert results["leased"][0] <= 0.15
+        assert results["fused"][1] < results["legacy"][1]
@@ -0,0 +1,111 @@
+"""
+Async bridge benchmark
+
+Compares per-task overhead of ``asyncio.run`` (fresh loop per call, as Celery
+tasks used to do) with the persistent async bridge, for a no-op coroutine and
+for an HTTP request through the shared transport against a local keep-alive
+server.
+"""
+import asyncio
+import statistics
+import threading
+import time
+import pytest
+
+import httpx
+
+from backend.services.async_bridge import AsyncBridge
+from backend.services.http_transport import ConnectionPool
+
+CALLS = 200
+
+
+def _serve_keepalive():
+    """Run a minimal keep-alive HTTP server in a thread; return (base_url, connection counter, stop)"""
+    connections = []
+    ready = threading.Event()
+    state = {}
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        state["url"] = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        state["stop"] = asyncio.Event()
+        state["loop"] = asyncio.get_running_loop()
+        ready.set()
+        await state["stop"].wait()
+        server.close()
+
+    thread = threading.Thread(target=asyncio.run, args=(main(),), daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        state["loop"].call_soon_threadsafe(state["stop"].set)
+        thread.join(5)
+
+    return state["url"], connections, stop
+
+
+def _time_calls(run, make_coro):
+    latencies = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        run(make_coro())
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies), statistics.mean(latencies)
+
+
+@pytest.mark.performance
+class TestAsyncBridgeBenchmark:
+    """Benchmark per-task overhead of asyncio.run versus the persistent bridge"""
+
+    def test_bridge_reuses_connections_and_cuts_overhead(self):
+        """Test bridged HTTP calls keep one connection and beat a fresh loop per call"""
+        base_url, connections, stop_server = _serve_keepalive()
+        pool = ConnectionPool(http2=False)
+        bridge = AsyncBridge(name="bench-bridge")
+
+        async def noop():
+            return None
+
+        async def request():
+            async with httpx.AsyncClient(transport=pool.transport("bench")) as client:
+                return (await client.get(f"{base_url}/ping")).status_code
+
+        try:
+            results = {
+                "asyncio.run noop": _time_calls(asyncio.run, noop),
+                "bridge noop": _time_calls(bridge.run, noop),
+            }
+            before = len(connections)
+            results["asyncio.run http"] = _time_calls(asyncio.run, request)
+            fresh_connections = len(connections) - before
+
+            before = len(connections)
+            results["bridge http"] = _time_calls(bridge.run, request)
+            bridged_connections = len(connections) - before
+
+            for name, (p50, mean) in results.items():
+                print(f"{name:>17}: p50 {p50:.3f} ms, mean {mean:.3f} ms")
+            print(f"connections opened: asyncio.run {fresh_connections}, bridge {bridged_connections}")
+            print(f"bridge stats: {bridge.get_stats()}")
+
+            assert fresh_connections == CALLS
+            assert bridged_connections == 1
+            assert results["bridge http"][0] < results["asyncio.run http"][0]
+        finally:
+            bridge.run(pool.close_all())
+            bridge.stop()
+            stop_server()
@@ -0,0 +1,159 @@
+"""
+Concurrent request throughput: sync vs async database session
+
+Serves the content history page two ways from the same SQLite file, with
+every statement delayed by 20 ms in the thread that executes it (a stand-in
+for a PostgreSQL round trip, and long enough that it, not the in-process
+request overhead, dominates a single request):
+- the previous shape: ``async def`` handler on a sync ``Session``, so each
+  query blocks the event loop
+- the migrated ``GET /api/content/history`` on ``AsyncSession`` (aiosqlite),
+  where the delay is spent in the driver thread while the loop serves others
+
+Throughput is measured at 1, 8 and 32 concurrent requests. The sync path
+stays flat; the async path scales with concurrency until the in-process
+request overhead (client, routing, ORM) saturates the loop.
+"""
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, Query
+from sqlalchemy import create_engine, desc
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, load_only, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+import backend.db.models  # noqa: F401 - registers every table on Base.metadata
+from backend.api import content_history
+from backend.api.content_history import history_item_encoder
+from backend.core.serialization import FastJSONResponse
+from backend.db.async_database import get_async_db
+from backend.db.database import Base
+from backend.db.models import ContentItem, User
+
+aiosqlite = pytest.importorskip("aiosqlite")
+
+LATENCY_S = 0.02
+POOL_SIZE = 32
+REQUESTS = 64
+
+
+def _slow(stmt):
+    time.sleep(LATENCY_S)
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, email="ada@example.com", username="ada", hashed_password="hash", is_active=True))
+    now = datetime.utcnow()
+    db.add_all([ContentItem(
+        user_id=1, content=f"post {i}", platform="twitter", content_type="text", created_at=now - timedelta(hours=i)
+    ) for i in range(200)])
+    db.commit()
+    db.close()
+    engine.dispose()
+    return path
+
+
+def _sync_app(path):
+    def creator():
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.set_trace_callback(_slow)
+        return conn
+
+    engine = create_engine("sqlite://", creator=creator, poolclass=QueuePool, pool_size=POOL_SIZE, max_overflow=0)
+    factory = sessionmaker(bind=engine)
+
+    def get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    @app.get("/api/content/history")
+    async def history(user_id: int = Query(...), page_size: int = Query(20), db: Session = Depends(get_db)):
+        query = db.query(ContentItem).filter(ContentItem.user_id == user_id).order_by(desc(ContentItem.created_at))
+        total_count = query.count()
+        items = query.options(
+            load_only(*[getattr(ContentItem, name) for name in history_item_encoder.fields])
+        ).limit(page_size).all()
+        return FastJSONResponse({"items": history_item_encoder.encode_rows(items), "total_count": total_count})
+
+    return app, engine
+
+
+def _async_app(path):
+    async def creator():
+        conn = await aiosqlite.connect(path)
+        await conn.set_trace_callback(_slow)
+        return conn
+
+    engine = create_async_engine(
+        "sqlite+aiosqlite://", async_creator=creator,
+        poolclass=AsyncAdaptedQueuePool, pool_size=POOL_SIZE, max_overflow=0
+    )
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(content_history.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app, engine
+
+
+async def _throughput(app, concurrency):
+    """Requests per second for ``REQUESTS`` requests with ``concurrency`` in flight"""
+    limit = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one():
+            async with limit:
+                response = await client.get("/api/content/history", params={"user_id": 1})
+                assert response.status_code == 200
+                assert response.json()["total_count"] == 200
+
+        await asyncio.gather(*(one() for _ in range(concurrency)))  # warm the pool
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(REQUESTS)))
+        return REQUESTS / (time.perf_counter() - start)
+
+
+@pytest.mark.performance
+class TestAsyncDatabaseBenchmark:
+    """Benchmark throughput under concurrency for sync and async sessions"""
+
+    @pytest.mark.asyncio
+    async def test_async_session_scales_with_concurrency(self, path):
+        """Test the async path scales with concurrent requests while the sync path flattens"""
+        sync_app, sync_engine = _sync_app(path)
+        async_app, async_engine = _async_app(path)
+        results = {}
+        try:
+            for concurrency in (1, 8, 32):
+                results[concurrency] = (
+                    await _throughput(sync_app, concurrency),
+                    await _throughput(async_app, concurrency),
+                )
+        finally:
+            sync_engine.dispose()
+            await async_engine.dispose()
+
+        for concurrency, (sync_rps, async_rps) in results.items():
+            print(f"concurrency {concurrency:>2}: sync {sync_rps:7.1f} req/s, async {async_rps:7.1f} req/s")
+
+        assert results[32][0] < 2 * results[1][0]
+        assert results[32][1] > 3 * results[1][1]
+        assert results[32][1] > 3 * results[32][0]
@@ -0,0 +1,116 @@
+"""
+Queue latency benchmark against a local Redis broker
+
+Measures posting task queue latency (send to start) while a research backlog
+is being worked, for:
+- the old topology: one single-threaded worker consuming every queue
+- worker profiles: a realtime worker on ``posting`` and a separate research worker
+
+Research tasks sleep rather than spin so both in-process workers are not
+competing for the GIL; the point is queueing, not CPU contention.
+
+Skipped when no Redis is reachable at QUEUE_BENCH_REDIS_URL (default redis://localhost:6379/14).
+"""
+import os
+import statistics
+import time
+from contextlib import ExitStack
+import pytest
+
+import redis
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+
+from backend.tasks.worker_profiles import WORKER_PROFILES
+
+BROKER_URL = os.getenv("QUEUE_BENCH_REDIS_URL", "redis://localhost:6379/14")
+POSTS = 50
+RESEARCH_BACKLOG = 20
+RESEARCH_SECONDS = 0.5
+
+
+@pytest.fixture
+def broker():
+    client = redis.from_url(BROKER_URL)
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("local Redis not available")
+    client.flushdb()
+    yield client
+    client.flushdb()
+    client.close()
+
+
+def _bench_app(latencies):
+    app = Celery("queue_bench", broker=BROKER_URL)
+    app.conf.update(
+        task_routes={"bench.research": {"queue": "research"}, "bench.post": {"queue": "posting"}},
+        broker_transport_options={"queue_order_strategy": "priority"},
+        worker_prefetch_multiplier=1,
+        task_serializer="json",
+        accept_content=["json"],
+    )
+
+    @app.task(name="bench.research")
+    def research():
+        time.sleep(RESEARCH_SECONDS)
+
+    @app.task(name="bench.post")
+    def post(sent_at):
+        latencies.append((time.time() - sent_at) * 1000)
+
+    return app
+
+
+def _measure(workers, with_research: bool):
+    """Start workers [(pool, concurrency, queues)], optionally queue research, then time posting"""
+    latencies = []
+    apps = [_bench_app(latencies) for _ in workers]
+    with ExitStack() as stack:
+        for app, (pool, concurrency, queues) in zip(apps, workers):
+            stack.enter_context(start_worker(
+                app, pool=pool, concurrency=concurrency, queues=queues,
+                perform_ping_check=False, shutdown_timeout=30
+            ))
+        sender = apps[0]
+        if with_research:
+            for _ in range(RESEARCH_BACKLOG):
+                sender.send_task("bench.research")
+            time.sleep(0.2)
+        for _ in range(POSTS):
+            sender.send_task("bench.post", args=[time.time()])
+            time.sleep(0.02)
+
+        deadline = time.time() + RESEARCH_BACKLOG * RESEARCH_SECONDS + 30
+        while len(latencies) < POSTS and time.time() < deadline:
+            time.sleep(0.05)
+
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+@pytest.mark.performance
+class TestQueueLatencyBenchmark:
+    """Benchmark posting queue latency under research load"""
+
+    def test_posting_p99_isolated_from_research(self, broker):
+        """Test posting p99 under research load stays near idle p99 with worker profiles"""
+        realtime = WORKER_PROFILES["realtime"]
+        profiles = [
+            ("threads", min(realtime.concurrency, 8), ["posting"]),
+            ("threads", WORKER_PROFILES["cpu"].concurrency, ["research"]),
+        ]
+        single = [("threads", 1, ["posting", "research"])]
+
+        results = {
+            "profiles idle": _measure(profiles, with_research=False),
+            "profiles + research": _measure(profiles, with_research=True),
+            "single + research": _measure(single, with_research=True),
+        }
+        for name, (p50, p99) in results.items():
+            print(f"{name:>20}: posting p50 {p50:.1f} ms, p99 {p99:.1f} ms")
+
+        idle_p99 = results["profiles idle"][1]
+        assert results["profiles + research"][1] < idle_p99 * 2 + 50
+        assert results["single + research"][1] > RESEARCH_SECONDS * 1000
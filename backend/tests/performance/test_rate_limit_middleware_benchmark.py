@@ -0,0 +1,111 @@
+"""
+Rate limit middleware benchmark against a local Redis
+
+Measures Redis commands and latency per request through RateLimitMiddleware for:
+- the previous check: PING, ZCARD, two GETs and a seven-command pipeline
+- the scripted check (one EVALSHA)
+- the scripted check with local pre-check allowances
+
+Skipped when no Redis is reachable at RATE_LIMIT_BENCH_REDIS_URL (default redis://localhost:6379/13).
+"""
+import asyncio
+import os
+import statistics
+import time
+import uuid
+import pytest
+
+import redis
+import redis.asyncio as aioredis
+
+from backend.core.security_middleware import SLIDING_WINDOW_SCRIPT, RateLimitMiddleware
+
+REDIS_URL = os.getenv("RATE_LIMIT_BENCH_REDIS_URL", "redis://localhost:6379/13")
+REQUESTS = 500
+
+
+@pytest.fixture
+def local_redis():
+    client = redis.from_url(REDIS_URL)
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("local Redis not available")
+    yield client
+    client.flushdb()
+    client.close()
+
+
+async def _legacy_check(client, client_ip):
+    """The per-request sequence the middleware used before the scripted check"""
+    await client.ping()
+    now = time.time()
+    burst_key = f"rate_limit:{client_ip}:burst"
+    minute_key = f"rate_limit:{client_ip}:minute:{int(now // 60)}"
+    hour_key = f"rate_limit:{client_ip}:hour:{int(now // 3600)}"
+    await client.zcard(burst_key)
+    await client.get(minute_key)
+    await client.get(hour_key)
+    pipe = client.pipeline()
+    pipe.zadd(burst_key, {str(now): now})
+    pipe.zremrangebyscore(burst_key, 0, now - 10)
+    pipe.expire(burst_key, 15)
+    pipe.incr(minute_key)
+    pipe.expire(minute_key, 70)
+    pipe.incr(hour_key)
+    pipe.expire(hour_key, 3700)
+    await pipe.execute()
+
+
+def _commands_processed(client) -> int:
+    return int(client.info("stats")["total_commands_processed"])
+
+
+def _measure(sync_client, check):
+    async def run():
+        latencies = []
+        for _ in range(REQUESTS):
+            start = time.perf_counter()
+            await check()
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    before = _commands_processed(sync_client)
+    latencies = asyncio.run(run())
+    # The INFO call that closes the measurement counts itself
+    commands = _commands_processed(sync_client) - before - 1
+    latencies.sort()
+    return commands / REQUESTS, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+def _middleware(**options):
+    middleware = RateLimitMiddleware(
+        None, requests_per_minute=REQUESTS * 10, requests_per_hour=REQUESTS * 100, burst_limit=REQUESTS * 10, **options
+    )
+    middleware.redis_client = aioredis.from_url(REDIS_URL, decode_responses=True)
+    middleware._rate_script = middleware.redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+    return middleware
+
+
+@pytest.mark.performance
+class TestRateLimitMiddlewareBenchmark:
+    """Benchmark Redis commands and latency per rate-limited request"""
+
+    def test_scripted_check_cuts_round_trips(self, local_redis):
+        """Test the scripted check costs one command per request and the pre-check fewer"""
+        legacy = _middleware()
+        scripted = _middleware()
+        prechecked = _middleware(local_precheck=True, precheck_share=4, precheck_ttl=1.0)
+
+        results = {
+            "legacy": _measure(local_redis, lambda: _legacy_check(legacy.redis_client, f"bench-{uuid.uuid4()}")),
+            "scripted": _measure(local_redis, lambda: scripted._redis_rate_check("bench-scripted")),
+            "scripted + precheck": _measure(local_redis, lambda: prechecked._redis_rate_check("bench-precheck")),
+        }
+        for name, (commands, p50, p99) in results.items():
+            print(f"{name:>20}: {commands:.2f} Redis commands/request, p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+
+        assert results["legacy"][0] >= 5
+        assert results["scripted"][0] <= 1.05
+        assert results["scripted + precheck"][0] < results["scripted"][0]
+        assert results["scripted"][1] < results["legacy"][1]
@@ -0,0 +1,94 @@
+"""
+Dashboard polling benchmark
+
+Polls GET /api/content/analytics/summary for a user with 500 content items
+(in-memory SQLite) and compares:
+- recomputing the summary on every poll (cache disabled)
+- a poll revalidated with If-None-Match (one cache lookup, empty 304)
+- a poll without a validator (one cache lookup, stored gzip body)
+"""
+import timeit
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import backend.db.models  # noqa: F401 - registers every table on Base.metadata
+from backend.api import content_history
+from backend.db.database import Base, get_db
+from backend.db.models import ContentItem, User
+
+URL = "/api/content/analytics/summary?user_id=1&days=30"
+FIELD = "content_history.analytics_summary:/api/content/analytics/summary?days=30&user_id=1"
+
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add(User(id=1, email="ada@example.com", username="ada", hashed_password="hash", is_active=True))
+    now = datetime.utcnow()
+    db.add_all([ContentItem(
+        user_id=1, content="Launching our new AI scheduling feature today! " * 4,
+        platform=["twitter", "instagram", "linkedin"][i % 3], content_type="text", status="published",
+        likes_count=i, shares_count=i // 2, comments_count=i // 3, reach_count=i * 40,
+        engagement_rate=0.01 * (i % 9), performance_tier=["high", "medium", "low"][i % 3],
+        topic_category="product", sentiment="positive", created_at=now - timedelta(hours=i)
+    ) for i in range(500)])
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        session = factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(content_history.router)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    engine.dispose()
+
+
+def _best_of(fn, number=50):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+@pytest.mark.performance
+class TestResponseCacheBenchmark:
+    """Benchmark dashboard polls with and without the response cache"""
+
+    def test_cached_poll_faster_than_recompute(self, client):
+        """Test revalidated and cached polls beat recomputing the summary"""
+        cache = content_history.response_cache
+        with patch.object(cache, "redis_url", None), patch.object(cache, "_redis", None):
+            cache.invalidate(cache.scope_for(1))
+            with patch.object(cache, "enabled", False):
+                uncached = client.get(URL)
+                if uncached.status_code != 200:
+                    pytest.skip(f"analytics summary unavailable: {uncached.status_code}")
+                recompute = _best_of(lambda: client.get(URL))
+
+            cached = client.get(URL)
+            etag = cached.headers["etag"]
+            revalidate = _best_of(lambda: client.get(URL, headers={"If-None-Match": etag}))
+            full = _best_of(lambda: client.get(URL, headers={"Accept-Encoding": "gzip"}))
+            compressed = cache.get(cache.scope_for(1), FIELD)
+            cache.invalidate(cache.scope_for(1))
+
+        assert cached.json() == uncached.json()
+        for name, seconds in (("recompute", recompute), ("304 revalidation", revalidate), ("cached gzip body", full)):
+            print(f"{name:>18}: {seconds * 1000:7.3f} ms")
+        if compressed is not None:
+            print(f"{'body size':>18}: {len(uncached.content)} B -> {len(compressed.gzip_body)} B gzip")
+        assert revalidate < recompute
+        assert full < recompute
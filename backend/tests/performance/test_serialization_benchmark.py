@@ -0,0 +1,118 @@
+"""
+JSON serialization benchmark
+
+Compares the previous encoding path with the serialization layer on
+representative payloads:
+- a 100-row content history page: ContentHistoryItem per row + stdlib JSONResponse
+  vs RowEncoder + FastJSONResponse
+- rendering a 200-item analytics-style summary, as the default response class
+  does after response_model serialization: JSONResponse vs FastJSONResponse
+- a websocket broadcast frame
+- 5000-entry vector metadata file, ``json.dump(indent=2)`` vs ``dump_file``
+
+Skipped when orjson is not installed (the layer then falls back to the stdlib).
+"""
+import json
+import os
+import timeit
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from backend.api.content_history import ContentHistoryItem, history_item_encoder
+from backend.core import serialization
+from backend.core.serialization import FastJSONResponse, dump_file
+from backend.services.websocket_manager import MessageType, WebSocketMessage
+
+NOW = datetime(2026, 5, 1, tzinfo=timezone.utc)
+
+
+def _history_rows(count=100):
+    return [SimpleNamespace(
+        id=f"content-{i}", content="Launching our new AI scheduling feature today! " * 4,
+        platform="twitter", content_type="text", status="published",
+        published_at=NOW - timedelta(hours=i), scheduled_for=None,
+        likes_count=i * 3, shares_count=i, comments_count=None, reach_count=i * 40,
+        engagement_rate=0.042, performance_tier="high", viral_score=0.3,
+        topic_category="product", sentiment="positive", tone="professional",
+        hashtags=["#ai", "#launch"], keywords=["scheduling", "automation"], ai_generated=True,
+        created_at=NOW - timedelta(hours=i), updated_at=None,
+    ) for i in range(count)]
+
+
+def _history_before(rows):
+    items = [ContentHistoryItem(
+        id=row.id, content=row.content, platform=row.platform, content_type=row.content_type,
+        status=row.status, published_at=row.published_at, scheduled_for=row.scheduled_for,
+        likes_count=row.likes_count or 0, shares_count=row.shares_count or 0,
+        comments_count=row.comments_count or 0, reach_count=row.reach_count or 0,
+        engagement_rate=row.engagement_rate or 0.0, performance_tier=row.performance_tier or "unknown",
+        viral_score=row.viral_score or 0.0, topic_category=row.topic_category, sentiment=row.sentiment,
+        tone=row.tone, hashtags=row.hashtags or [], keywords=row.keywords or [],
+        ai_generated=row.ai_generated or False, created_at=row.created_at, updated_at=row.updated_at,
+    ) for row in rows]
+    content = {"items": [item.model_dump(mode="json") for item in items], "total_count": len(rows), "page": 1}
+    return JSONResponse(content).body
+
+
+def _history_after(rows):
+    return FastJSONResponse({"items": history_item_encoder.encode_rows(rows), "total_count": len(rows), "page": 1}).body
+
+
+def _summary():
+    return {
+        "platforms_summary": {f"platform-{i}": i for i in range(20)},
+        "recent_trends": [
+            {"date": NOW - timedelta(days=i), "engagement_rate": 0.01 * i, "posts": i, "top_hashtags": ["#ai", "#ml"]}
+            for i in range(200)
+        ],
+    }
+
+
+def _metadata(count=5000):
+    return {str(i): {"content_id": f"c{i}", "metadata": {"type": "post", "engagement_rate": 2.5},
+                     "created_at": NOW.isoformat(), "vector_norm": 1.0} for i in range(count)}
+
+
+def _best_of(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+@pytest.mark.performance
+class TestSerializationBenchmark:
+    """Benchmark previous vs new encoding on representative payloads"""
+
+    def test_serializer_faster_on_representative_payloads(self, tmp_path):
+        """Test every payload encodes faster through the serialization layer"""
+        if not serialization.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+
+        rows = _history_rows()
+        summary = jsonable_encoder(_summary())
+        message = WebSocketMessage(type=list(MessageType)[0], data=summary, user_id=1)
+        metadata = _metadata()
+        stdlib_path, fast_path = str(tmp_path / "stdlib.json"), str(tmp_path / "fast.json")
+
+        def stdlib_metadata():
+            with open(stdlib_path, "w", encoding="utf-8") as f:
+                json.dump(metadata, f, indent=2, default=str, ensure_ascii=False)
+
+        cases = {
+            "content history page (100 rows)": (lambda: _history_before(rows), lambda: _history_after(rows), 50),
+            "analytics summary render": (lambda: JSONResponse(summary).body, lambda: FastJSONResponse(summary).body, 200),
+            "websocket frame": (lambda: json.dumps(message.to_dict()), message.to_json, 200),
+            "vector metadata (5000 entries)": (stdlib_metadata, lambda: dump_file(fast_path, metadata, default=str), 5),
+        }
+
+        assert json.loads(_history_before(rows)) == json.loads(_history_after(rows))
+
+        for name, (before, after, number) in cases.items():
+            before_s, after_s = _best_of(before, number), _best_of(after, number)
+            print(f"{name:>32}: {before_s * 1000:8.3f} ms -> {after_s * 1000:8.3f} ms ({before_s / after_s:4.1f}x)")
+            assert after_s < before_s, name
+
+        print(f"{'metadata file size':>32}: {os.path.getsize(stdlib_path) / 1024:.0f} KiB -> "
+              f"{os.path.getsize(fast_path) / 1024:.0f} KiB")
@@ -0,0 +1,92 @@
+"""
+Shared vector index memory benchmark
+
+Forks worker processes that each load the same vector array and scan it (as a
+flat search does), once as private ``np.load`` copies and once memory-mapped
+from a published snapshot, and compares how much each worker's RSS grows:
+``RssAnon`` is the worker's own copy, ``RssFile`` is page cache shared by every
+process mapping the snapshot.
+
+Skipped where ``/proc/self/status`` or ``fork`` is unavailable.
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from backend.core.shared_index import IndexSnapshots, load_array, save_array
+
+WORKERS = 4
+VECTORS = 16000
+DIMENSION = 1024  # 16000 x 1024 float32 = 62.5 MiB
+
+
+def _rss_mib():
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in ("RssAnon", "RssFile"):
+                values[name] = int(value.split()[0]) / 1024
+    return values
+
+
+def _worker(path, mapped, result_fd):
+    before = _rss_mib()
+    vectors = load_array(path) if mapped else np.load(path)
+    query = np.ones(DIMENSION, dtype=np.float32)
+    float(np.dot(vectors, query).max())
+    after = _rss_mib()
+    os.write(result_fd, json.dumps({key: after[key] - before[key] for key in after}).encode())
+
+
+def _run_workers(path, mapped):
+    children = []
+    for _ in range(WORKERS):
+        result_read, result_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(result_read)
+                _worker(path, mapped, result_write)
+            finally:
+                os._exit(0)
+        os.close(result_write)
+        children.append((pid, result_read))
+
+    results = []
+    for pid, result_read in children:
+        with os.fdopen(result_read) as f:
+            results.append(json.loads(f.read()))
+        os.waitpid(pid, 0)
+    return results
+
+
+@pytest.mark.performance
+class TestSharedIndexBenchmark:
+    """Benchmark per-worker memory for private vs memory-mapped vector arrays"""
+
+    def test_mapped_index_not_copied_per_worker(self, tmp_path):
+        """Test mapped workers add no private copy of the index to their RSS"""
+        if not os.path.exists("/proc/self/status") or not hasattr(os, "fork"):
+            pytest.skip("needs /proc/self/status and fork")
+
+        snapshots = IndexSnapshots(str(tmp_path))
+        with snapshots.publish() as directory:
+            vectors = np.random.default_rng(0).random((VECTORS, DIMENSION), dtype=np.float32)
+            save_array(os.path.join(directory, "vectors.npy"), vectors)
+            del vectors
+        path = snapshots.path("vectors.npy", snapshots.current_version())
+        index_mib = os.path.getsize(path) / 2 ** 20
+
+        private = _run_workers(path, mapped=False)
+        mapped = _run_workers(path, mapped=True)
+
+        for name, results in (("private copy", private), ("memory-mapped", mapped)):
+            print(f"{name:>13}: per worker RssAnon +{max(r['RssAnon'] for r in results):.1f} MiB, "
+                  f"RssFile (shared) +{max(r['RssFile'] for r in results):.1f} MiB "
+                  f"({WORKERS} workers, index {index_mib:.1f} MiB)")
+
+        assert min(r["RssAnon"] for r in private) > 0.9 * index_mib
+        assert max(r["RssAnon"] for r in mapped) < 0.1 * index_mib
@@ -0,0 +1,111 @@
+"""
+Unit tests for the persistent event-loop bridge
+Tests loop reuse across calls, soft time limit cancellation, error propagation and fork/stop handling
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+
+from celery.exceptions import SoftTimeLimitExceeded
+
+from backend.services import async_bridge as bridge_module
+from backend.services.async_bridge import AsyncBridge
+
+
+@pytest.fixture
+def bridge():
+    bridge = AsyncBridge(name="test-bridge")
+    yield bridge
+    bridge.stop()
+
+
+class TestAsyncBridge:
+    """Test AsyncBridge"""
+
+    def test_calls_share_one_loop(self, bridge):
+        """Test successive calls run on the same long-lived loop"""
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = bridge.run(current_loop())
+        second = bridge.run(current_loop())
+
+        assert first is second
+        assert first.is_running()
+        stats = bridge.get_stats()
+        assert stats["calls"] == 2
+        assert stats["loop_starts"] == 1
+
+    def test_errors_propagate(self, bridge):
+        """Test exceptions, including TimeoutError from the coroutine, reach the caller unchanged"""
+        async def fail(exc):
+            raise exc
+
+        with pytest.raises(ValueError):
+            bridge.run(fail(ValueError("boom")))
+        with pytest.raises(TimeoutError):
+            bridge.run(fail(TimeoutError("upstream")), timeout=5)
+        assert bridge.get_stats()["timeouts"] == 0
+
+    def test_timeout_cancels_coroutine(self, bridge):
+        """Test hitting the timeout cancels the coroutine on the loop and raises SoftTimeLimitExceeded"""
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(SoftTimeLimitExceeded):
+            bridge.run(slow(), timeout=0.05)
+
+        assert bridge.run(asyncio.wait_for(cancelled.wait(), 1)) is True
+        assert bridge.get_stats()["timeouts"] == 1
+
+    def test_task_soft_limit_used_by_default(self, bridge):
+        """Test the remaining soft time limit of the current task bounds the call"""
+        bridge_module._task_context.soft_limit = 0.2
+        bridge_module._task_context.started = time.monotonic() - 0.15
+        try:
+            with pytest.raises(SoftTimeLimitExceeded):
+                bridge.run(asyncio.sleep(10))
+        finally:
+            bridge_module._task_context.soft_limit = None
+
+    def test_rejects_running_loop(self, bridge):
+        """Test calling from inside an event loop fails instead of deadlocking"""
+        async def nested():
+            bridge.run(asyncio.sleep(0))
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(nested())
+
+    def test_new_loop_after_fork(self, bridge):
+        """Test a process with a different pid starts its own loop"""
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        parent_loop = bridge.run(current_loop())
+        with patch.object(bridge_module.os, "getpid", return_value=-1):
+            child_loop = bridge.run(current_loop())
+
+        assert child_loop is not parent_loop
+        assert bridge.get_stats()["loop_starts"] == 2
+        parent_loop.call_soon_threadsafe(parent_loop.stop)
+
+    def test_stop_closes_loop(self):
+        """Test stop drains the loop and a later call starts a fresh one"""
+        bridge = AsyncBridge(name="test-bridge")
+        bridge.run(asyncio.sleep(0))
+        loop = bridge._loop
+
+        bridge.stop()
+
+        assert loop.is_closed()
+        assert bridge.get_stats()["loop_running"] is False
+        bridge.run(asyncio.sleep(0))
+        assert bridge.get_stats()["loop_starts"] == 2
+        bridge.stop()
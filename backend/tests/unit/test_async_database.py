@@ -0,0 +1,151 @@
+"""
+Unit tests for the async database path
+Tests async URL mapping, pool registration and metrics, the async auth dependency and migrated read endpoints
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+import backend.db.models  # noqa: F401 - registers every table on Base.metadata
+from backend.auth import dependencies
+from backend.auth.dependencies import AuthUser
+from backend.auth.principal_cache import PrincipalCache
+from backend.db.async_database import create_async_db_engine, get_async_db, to_async_url
+from backend.db.database import Base
+from backend.db.models import ContentItem, Notification, User
+from backend.services.connection_pool_manager import ConnectionPoolManager
+
+
+@pytest.fixture
+def database(tmp_path):
+    """File database seeded through a sync engine, read through an aiosqlite engine"""
+    path = tmp_path / "app.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+    db = sessionmaker(bind=sync_engine)()
+    db.add(User(id=1, email="ada@example.com", username="ada", hashed_password="hash", is_active=True))
+    now = datetime.utcnow()
+    db.add_all([ContentItem(
+        id=f"c{i}", user_id=1, content=f"post {i}", platform="twitter" if i % 2 else "linkedin",
+        content_type="text", created_at=now - timedelta(hours=i)
+    ) for i in range(5)])
+    db.add_all([Notification(
+        id=f"n{i}", user_id=1, title="t", message="m", notification_type="goal_progress",
+        priority="high" if i < 2 else "low", is_read=i == 0, created_at=now - timedelta(minutes=i)
+    ) for i in range(4)])
+    db.commit()
+    db.close()
+    sync_engine.dispose()
+    return f"sqlite:///{path}"
+
+
+@pytest.fixture
+def pool_manager():
+    manager = ConnectionPoolManager()
+    with patch("backend.services.connection_pool_manager.connection_pool_manager", manager):
+        yield manager
+
+
+class TestAsyncEngine:
+    """Test engine construction and pool tracking"""
+
+    def test_async_url(self):
+        """Test sync URLs map to async drivers and sslmode becomes asyncpg's ssl argument"""
+        url, connect_args = to_async_url("postgresql://u:p@db:5432/app?sslmode=require")
+        assert url.drivername == "postgresql+asyncpg"
+        assert "sslmode" not in url.query
+        assert connect_args["ssl"] == "require"
+
+        url, connect_args = to_async_url("sqlite:///./test.db")
+        assert url.drivername == "sqlite+aiosqlite"
+        assert connect_args == {}
+
+        with pytest.raises(ValueError):
+            to_async_url("mssql://db/app")
+
+    @pytest.mark.asyncio
+    async def test_pool_registered_and_measured(self, database, pool_manager):
+        """Test the async pool reports checkouts and passes health checks"""
+        engine = create_async_db_engine(database, pool_name="async", poolclass=AsyncAdaptedQueuePool, pool_size=3)
+        try:
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("SELECT 1")
+                assert pool_manager.get_pool_metrics("async")["checked_out"] == 1
+
+            metrics = pool_manager.get_pool_metrics("async")
+            health = await pool_manager.health_check_pools()
+        finally:
+            await pool_manager.close_async_pool("async")
+
+        assert metrics["checked_out"] == 0
+        assert metrics["total_connections"] == 1
+        assert health["pools"]["async"]["healthy"] is True
+        assert "async" not in pool_manager.async_pools
+
+
+class TestAsyncEndpoints:
+    """Test migrated handlers on the async session"""
+
+    @pytest_asyncio.fixture
+    async def client(self, database, pool_manager):
+        from backend.api import content_history, notifications
+
+        engine = create_async_db_engine(database)
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with factory() as db:
+                yield db
+                await db.commit()
+
+        app = FastAPI()
+        app.include_router(content_history.router)
+        app.include_router(notifications.router)
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        app.dependency_overrides[dependencies.get_current_user_async] = lambda: AuthUser(
+            user_id="1", email="ada@example.com", username="ada", auth_method="local"
+        )
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            client.statements = statements
+            yield client
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_content_history_page(self, client):
+        """Test filtering, counting and paging through the async session"""
+        response = await client.get("/api/content/history", params={
+            "user_id": 1, "platforms": "twitter", "page_size": 1, "sort_order": "asc"
+        })
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["total_count"] == 2
+        assert body["total_pages"] == 2
+        assert [item["id"] for item in body["items"]] == ["c3"]
+
+    @pytest.mark.asyncio
+    async def test_notifications_summary(self, client):
+        """Test summary counts come from one aggregate query and the user from the async session"""
+        cache = PrincipalCache(local_ttl=60)
+        with patch.object(dependencies, "principal_cache", cache):
+            response = await client.get("/api/notifications/summary")
+            client.statements.clear()
+            listing = await client.get("/api/notifications/", params={"unread_only": True})
+
+        body = response.json()
+        assert response.status_code == 200
+        assert (body["total_notifications"], body["unread_count"], body["high_priority_count"]) == (4, 3, 1)
+        assert [n["id"] for n in body["recent_notifications"]] == ["n0", "n1", "n2", "n3"]
+        assert [n["id"] for n in listing.json()] == ["n1", "n2", "n3"]
+        # Second request: user from the principal cache, a single query for the page
+        assert len([sql for sql in client.statements if sql.lstrip().upper().startswith("SELECT")]) == 1
@@ -0,0 +1,115 @@
+"""
+Unit tests for the async Twitter/Instagram integration clients
+Tests shared-transport requests, Graph field expansion and the blocking Celery wrappers
+"""
+import importlib
+import pytest
+from unittest.mock import patch
+
+import httpx
+
+from backend.integrations.instagram_client import AsyncInstagramClient, InstagramClient
+from backend.integrations.twitter_client import AsyncTwitterClient, TwitterClient
+
+# The integrations package re-exports client instances under the module names
+instagram_module = importlib.import_module("backend.integrations.instagram_client")
+twitter_module = importlib.import_module("backend.integrations.twitter_client")
+
+
+def _mock_transport(handler, requests):
+    def record(request):
+        requests.append(request)
+        return handler(request)
+    return httpx.MockTransport(record)
+
+
+class TestAsyncInstagramClient:
+    """Test AsyncInstagramClient"""
+
+    @pytest.mark.asyncio
+    async def test_business_account_found_via_field_expansion(self):
+        """Test page -> IG lookup costs one pages call however many pages there are"""
+        requests = []
+
+        def handler(request):
+            if request.url.path.endswith("/me/accounts"):
+                pages = [{"id": f"page{i}", "access_token": f"pt{i}"} for i in range(20)]
+                pages[7]["instagram_business_account"] = {"id": "ig7"}
+                return httpx.Response(200, json={"data": pages})
+            return httpx.Response(200, json={"id": "ig7", "username": "brand", "followers_count": 42})
+
+        transport = _mock_transport(handler, requests)
+        with patch.object(instagram_module, "shared_transport", return_value=transport):
+            profile = await AsyncInstagramClient("id", "secret").get_user_info("user-token")
+
+        assert len(requests) == 2
+        assert "instagram_business_account" in requests[0].url.params["fields"]
+        assert requests[1].url.params["access_token"] == "pt7"
+        assert profile["username"] == "brand"
+        assert profile["page_access_token"] == "pt7"
+
+    @pytest.mark.asyncio
+    async def test_no_linked_account_raises(self):
+        """Test pages without a linked business account raise InstagramAPIError"""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"data": [{"id": "p", "access_token": "t"}]}))
+
+        with patch.object(instagram_module, "shared_transport", return_value=transport):
+            with pytest.raises(instagram_module.InstagramAPIError):
+                await AsyncInstagramClient("id", "secret").get_user_info("user-token")
+
+
+class TestAsyncTwitterClient:
+    """Test AsyncTwitterClient"""
+
+    @pytest.mark.asyncio
+    async def test_post_tweet_uses_bearer_token_and_tracks_rate_limits(self):
+        """Test tweets are posted on the shared transport with rate-limit headers recorded"""
+        requests = []
+
+        def handler(request):
+            return httpx.Response(
+                201,
+                json={"data": {"id": "123", "text": "hello"}},
+                headers={"x-rate-limit-limit": "300", "x-rate-limit-remaining": "299", "x-rate-limit-reset": "0"}
+            )
+
+        client = AsyncTwitterClient("id", "secret")
+        transport = _mock_transport(handler, requests)
+        with patch.object(twitter_module, "shared_transport", return_value=transport), \
+             patch.object(twitter_module, "log_content_event"):
+            result = await client.post_tweet("token", "hello", user_id=1)
+
+        assert result["id"] == "123"
+        assert requests[0].headers["Authorization"] == "Bearer token"
+        assert client.rate_limits["tweets"]["remaining"] == 299
+
+
+class TestBlockingWrappers:
+    """Test the thin synchronous wrappers kept for Celery"""
+
+    def test_wrapper_runs_async_client_outside_event_loop(self):
+        """Test the blocking wrapper returns the async client's result"""
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"data": {"id": "1", "username": "me", "name": "Me"}})
+        )
+        client = TwitterClient("id", "secret")
+
+        with patch.object(twitter_module, "shared_transport", return_value=transport):
+            result = client.validate_connection("token")
+
+        assert result["is_valid"] is True
+        assert result["username"] == "me"
+
+    @pytest.mark.asyncio
+    async def test_wrapper_refuses_to_block_running_loop(self):
+        """Test calling the blocking wrapper from async code fails fast"""
+        with pytest.raises(RuntimeError):
+            InstagramClient("id", "secret").get_user_info("token")
+
+    def test_wrapper_shares_helpers_and_state(self):
+        """Test pure helpers and rate-limit state come from the wrapped async client"""
+        async_client = AsyncInstagramClient("id", "secret")
+        client = InstagramClient(async_client=async_client)
+
+        assert client.extract_hashtags("#Hello world #AI") == ["#hello", "#ai"]
+        assert client.rate_limits is async_client.rate_limits
@@ -0,0 +1,192 @@
+"""
+Unit tests for the batched audit log sink
+Tests size/time-triggered batch writes, overflow policies, shutdown drain and non-blocking request auditing
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from backend.core.audit_logger import AuditLog, AuditLogger, AuditTrackingMiddleware, Base
+from backend.core.audit_sink import AuditSink
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def make_sink(engine, tmp_path):
+    sinks = []
+
+    def make(**options):
+        options.setdefault("spill_path", str(tmp_path / "spill.jsonl"))
+        sink = AuditSink(engine, AuditLog.__table__, **options)
+        sinks.append(sink)
+        return sink
+
+    yield make
+    for sink in sinks:
+        sink.close(timeout=2)
+
+
+def _row(event_type="api_call", **flags):
+    return {
+        "timestamp": datetime.utcnow(),
+        "event_type": event_type,
+        "resource": "/api/posts",
+        "outcome": "success",
+        "details": {"status_code": 200},
+        "compliance_flags": flags,
+    }
+
+
+def _count(engine):
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(AuditLog.__table__)).scalar()
+
+
+class TestAuditSinkWrites:
+    """Test background batch writing"""
+
+    def test_writes_in_size_triggered_batches(self, engine, make_sink):
+        """Test rows are written in batches of batch_size"""
+        sink = make_sink(batch_size=10, flush_interval=60)
+
+        for _ in range(25):
+            assert sink.submit(_row()) is True
+        sink.close()
+
+        assert _count(engine) == 25
+        assert sink.get_stats()["batches"] == 3
+
+    def test_time_trigger_flushes_partial_batch(self, engine, make_sink):
+        """Test a partial batch is written once flush_interval passes"""
+        sink = make_sink(batch_size=1000, flush_interval=0.05)
+
+        sink.submit(_row())
+
+        assert sink.flush(timeout=2) is True
+        assert _count(engine) == 1
+
+    def test_failed_batch_is_spilled(self, make_sink):
+        """Test a batch the database rejects lands in the spill file"""
+        sink = make_sink(batch_size=2, flush_interval=60)
+
+        with patch.object(sink, "_insert", side_effect=RuntimeError("db down")):
+            sink.submit(_row())
+            sink.submit(_row())
+            sink.flush(timeout=2)
+
+        stats = sink.get_stats()
+        assert stats["write_errors"] == 1
+        assert stats["spilled"] == 2
+        assert len(sink.spill_path.read_text().splitlines()) == 2
+
+
+class TestAuditSinkOverflow:
+    """Test overflow policies and spill replay"""
+
+    def test_spill_and_replay(self, engine, make_sink):
+        """Test overflowed rows are spilled to disk and replayed into the table"""
+        sink = make_sink(max_queue=2, overflow_policy="spill")
+
+        with patch.object(sink, "_ensure_writer"):
+            results = [sink.submit(_row()) for _ in range(5)]
+
+        assert results == [True, True, False, False, False]
+        assert sink.get_stats()["spilled"] == 3
+        assert json.loads(sink.spill_path.read_text().splitlines()[0])["event_type"] == "api_call"
+
+        assert sink.replay_spill() == 3
+        assert _count(engine) == 3
+        assert not sink.spill_path.exists()
+
+    def test_failed_replay_keeps_unwritten_rows(self, engine, make_sink):
+        """Test rows not yet written when a replay fails go back to the spill file"""
+        sink = make_sink(max_queue=1, batch_size=2, overflow_policy="spill")
+        with patch.object(sink, "_ensure_writer"):
+            for _ in range(6):
+                sink.submit(_row())
+        insert = sink._insert
+        calls = []
+
+        def failing_insert(rows):
+            calls.append(len(rows))
+            if len(calls) == 2:
+                raise RuntimeError("database unavailable")
+            insert(rows)
+
+        with patch.object(sink, "_insert", side_effect=failing_insert), pytest.raises(RuntimeError):
+            sink.replay_spill()
+
+        assert _count(engine) == 2
+        assert len(sink.spill_path.read_text().splitlines()) == 3
+        assert not list(sink.spill_path.parent.glob("*.replaying"))
+
+        assert sink.replay_spill() == 3
+        assert _count(engine) == 5
+
+    def test_sample_keeps_security_events(self, make_sink):
+        """Test sampling drops most routine rows but always keeps security-relevant ones"""
+        sink = make_sink(max_queue=1, overflow_policy="sample", sample_every=3)
+
+        with patch.object(sink, "_ensure_writer"):
+            sink.submit(_row())
+            for _ in range(6):
+                sink.submit(_row())
+            sink.submit(_row("user_failed_login", security_relevant=True))
+
+        spilled = [json.loads(line)["event_type"] for line in sink.spill_path.read_text().splitlines()]
+        assert spilled == ["api_call", "api_call", "user_failed_login"]
+        assert sink.get_stats()["dropped"] == 4
+
+    def test_unknown_policy(self, engine):
+        """Test an unknown overflow policy is rejected"""
+        with pytest.raises(ValueError):
+            AuditSink(engine, AuditLog.__table__, overflow_policy="block")
+
+
+class TestAuditTrackingLatency:
+    """Test request auditing does not wait on persistence"""
+
+    def test_request_does_not_wait_for_audit_write(self, engine, make_sink):
+        """Test a slow audit database does not add to request latency, and close drains the row"""
+        sink = make_sink(batch_size=1, flush_interval=60)
+        audit_logger = AuditLogger(sink=sink)
+        insert = sink._insert
+
+        def slow_insert(rows):
+            time.sleep(0.5)
+            insert(rows)
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        async def receive():
+            return {"type": "http.request"}
+
+        async def send(message):
+            pass
+
+        middleware = AuditTrackingMiddleware(app, audit_logger=audit_logger)
+        scope = {"type": "http", "method": "GET", "path": "/api/posts", "headers": [], "client": ("10.0.0.1", 1)}
+
+        with patch.object(sink, "_insert", side_effect=slow_insert):
+            start = time.perf_counter()
+            asyncio.run(middleware(scope, receive, send))
+            elapsed = time.perf_counter() - start
+            audit_logger.close()
+
+        assert elapsed < 0.25
+        assert _count(engine) == 1
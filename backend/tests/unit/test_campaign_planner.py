@@ -0,0 +1,147 @@
+"""
+Unit tests for campaign fan-out planning
+Tests per-(org, platform) pacing from token bucket refill rates, connection-based grouping
+and the grouped batch dispatch
+"""
+import uuid
+
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+
+from backend.services.campaign_planner import CampaignPlanner, load_connection_groups
+
+
+def _bucket(remaining=0, refill_rate=60, window_s=60):
+    bucket = Mock()
+    bucket.get_remaining.return_value = remaining
+    bucket.refill_rate = refill_rate
+    bucket.window_s = window_s
+    return bucket
+
+
+def _targets(org, platform, count):
+    return [
+        {"organization_id": org, "platform": platform, "connection_id": f"{org}-{i}", "content": "hi"}
+        for i in range(count)
+    ]
+
+
+class TestCampaignPlanner:
+    """Test CampaignPlanner"""
+
+    def test_targets_spaced_by_refill_rate(self):
+        """Test an empty bucket spaces targets at window_s / (refill_rate * headroom)"""
+        planner = CampaignPlanner(_bucket(remaining=0, refill_rate=30, window_s=60), headroom=1.0)
+
+        plan = planner.plan(_targets("org1", "x", 4))
+
+        assert [d.countdown_s for d in plan.dispatches] == [2.0, 4.0, 6.0, 8.0]
+        assert plan.duration_s == 8.0
+
+    def test_available_tokens_spent_first(self):
+        """Test tokens already in the bucket (less headroom) dispatch immediately"""
+        planner = CampaignPlanner(_bucket(remaining=10, refill_rate=60, window_s=60), headroom=0.5)
+
+        plan = planner.plan(_targets("org1", "meta", 7))
+
+        assert [d.countdown_s for d in plan.dispatches] == [0.0] * 5 + [2.0, 4.0]
+        assert plan.groups["org1:meta"]["burst"] == 5
+
+    def test_groups_paced_independently(self):
+        """Test each (org, platform) group gets its own schedule and target order is kept"""
+        bucket = _bucket(remaining=0, refill_rate=60, window_s=60)
+        planner = CampaignPlanner(bucket, headroom=1.0)
+        targets = [t for pair in zip(_targets("a", "x", 3), _targets("b", "x", 3)) for t in pair]
+
+        plan = planner.plan(targets)
+
+        assert [d.target for d in plan.dispatches] == targets
+        assert [d.countdown_s for d in plan.dispatches] == [1.0, 1.0, 2.0, 2.0, 3.0, 3.0]
+        assert bucket.get_remaining.call_count == 2
+
+    def test_platform_max_rps_caps_burst(self):
+        """Test the platform request rate still spaces targets while tokens are plentiful"""
+        planner = CampaignPlanner(_bucket(remaining=100), platform_max_rps={"x": 2}, headroom=1.0)
+
+        plan = planner.plan(_targets("org1", "x", 4))
+
+        assert [d.countdown_s for d in plan.dispatches] == [0.0, 0.5, 1.0, 1.5]
+
+    def test_thousand_target_campaign_duration_is_predictable(self):
+        """Test 1,000 targets over 10 orgs finish in (100 - burst) refill intervals"""
+        planner = CampaignPlanner(_bucket(remaining=60, refill_rate=60, window_s=60), headroom=0.9)
+        targets = [t for org in range(10) for t in _targets(f"org{org}", "x", 100)]
+
+        plan = planner.plan(targets)
+
+        assert len(plan.groups) == 10
+        assert plan.duration_s == pytest.approx((100 - 54) / 0.9)
+
+
+class TestConnectionGrouping:
+    """Test connection targets are paced by the key the publish runner admits them by"""
+
+    def test_connection_org_and_platform_win(self):
+        """Test a connection's organization and platform replace the target's own fields"""
+        bucket = _bucket(remaining=0, refill_rate=60, window_s=60)
+        lookup = Mock(return_value={"c1": ("org-a", "meta"), "c2": ("org-a", "meta")})
+        planner = CampaignPlanner(bucket, headroom=1.0, connection_groups=lookup)
+        targets = [
+            {"connection_id": "c1", "user_id": 7, "platform": "facebook", "content": "hi"},
+            {"connection_id": "c2", "organization_id": "org-b", "content": "hi"},
+            {"connection_id": "missing", "organization_id": "org-b", "platform": "x", "content": "hi"},
+        ]
+
+        plan = planner.plan(targets)
+
+        assert sorted(lookup.call_args[0][0]) == ["c1", "c2", "missing"]
+        assert set(plan.groups) == {"org-a:meta", "org-b:x"}
+        assert [d.countdown_s for d in plan.dispatches] == [1.0, 2.0, 1.0]
+        bucket.get_remaining.assert_any_call("org-a", "meta")
+
+    def test_lookup_failure_falls_back_to_target_fields(self):
+        """Test planning still succeeds when connections cannot be loaded"""
+        planner = CampaignPlanner(_bucket(), headroom=1.0, connection_groups=Mock(side_effect=RuntimeError("db down")))
+
+        plan = planner.plan(_targets("org1", "x", 2))
+
+        assert set(plan.groups) == {"org1:x"}
+
+    def test_load_connection_groups(self):
+        """Test connections are read in one query and keyed by the ids as given"""
+        org_id, connection_id = uuid.uuid4(), uuid.uuid4()
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = [
+            Mock(id=connection_id, organization_id=org_id, platform="meta")
+        ]
+
+        with patch("backend.db.database.SessionLocal", return_value=db):
+            groups = load_connection_groups([str(connection_id).upper(), str(uuid.uuid4()), "not-a-uuid"])
+
+        assert groups == {str(connection_id).upper(): (str(org_id), "meta")}
+        db.query.assert_called_once()
+        db.close.assert_called_once()
+
+
+class TestBatchPublishPosts:
+    """Test batch_publish_posts campaign dispatch"""
+
+    def test_campaign_sent_as_one_group_with_countdowns(self):
+        """Test targets go out as one saved group whose id tracks campaign progress"""
+        from backend.tasks import posting_tasks
+
+        planner = CampaignPlanner(_bucket(remaining=0, refill_rate=60, window_s=60), headroom=1.0)
+        campaign = MagicMock(id="campaign-1")
+        campaign.results = [Mock(id="t1"), Mock(id="t2")]
+
+        with patch.object(posting_tasks, "get_campaign_planner", return_value=planner), \
+             patch.object(posting_tasks, "group") as group:
+            group.return_value.apply_async.return_value = campaign
+            result = posting_tasks.batch_publish_posts(_targets("org1", "x", 2))
+
+        signatures = list(group.call_args[0][0])
+        assert [s.options["countdown"] for s in signatures] == [1.0, 2.0]
+        assert all(s.task == "publish_tasks.publish_via_connection" for s in signatures)
+        campaign.save.assert_called_once()
+        assert result["campaign_id"] == "campaign-1"
+        assert [r["task_id"] for r in result["results"]] == ["t1", "t2"]
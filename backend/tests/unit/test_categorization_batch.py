@@ -0,0 +1,154 @@
+"""
+Unit tests for batched AI content categorization
+Tests request packing, content-hash caching, bounded concurrency and rate-limit backoff
+"""
+import asyncio
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+from openai import RateLimitError
+
+from backend.services import content_categorization
+from backend.services.content_categorization import ContentCategorizer
+from backend.services.rate_limit import AdaptiveRateLimiter
+
+
+def _answer(post_id, category="technology"):
+    return {
+        "id": post_id,
+        "topic_category": category,
+        "confidence": 0.9,
+        "sentiment": "positive",
+        "tone": "casual",
+        "reading_level": "beginner",
+        "keywords": ["ai"],
+    }
+
+
+class _FakeCompletions:
+    """Fake chat completions API answering packed and single prompts"""
+
+    def __init__(self, delay=0.01, drop_ids=()):
+        self.delay = delay
+        self.drop_ids = set(drop_ids)
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+
+        prompt = kwargs["messages"][-1]["content"]
+        if "Posts:" in prompt:
+            posts = json.loads(prompt.split("Posts:", 1)[1].strip())
+            body = {"items": [_answer(p["id"]) for p in posts if p["id"] not in self.drop_ids]}
+        else:
+            body = _answer(0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(body)))])
+
+
+@pytest.fixture
+def categorizer():
+    cat = ContentCategorizer()
+    cat.async_client = SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions()))
+    with patch.object(content_categorization.settings, "openai_api_key", "sk-test"), \
+         patch.object(content_categorization.settings, "categorization_pack_size", 4), \
+         patch.object(content_categorization, "categorization_limiter",
+                      AdaptiveRateLimiter(max_concurrency=2, requests_per_minute=0)):
+        yield cat
+
+
+class TestBatchCategorization:
+    """Test categorize_batch in AI mode"""
+
+    @pytest.mark.asyncio
+    async def test_short_posts_are_packed(self, categorizer):
+        """Test ten short posts take three packed requests and keep input order"""
+        items = [(f"AI post number {i}", "twitter") for i in range(10)]
+
+        results = await categorizer.categorize_batch(items)
+
+        completions = categorizer.async_client.chat.completions
+        assert len(completions.requests) == 3
+        assert all(r["response_format"] == {"type": "json_object"} for r in completions.requests)
+        assert [r.topic_category for r in results] == ["technology"] * 10
+        assert categorizer.last_batch_stats["packed_items"] == 10
+        assert categorizer.last_batch_stats["items_per_second"] > 0
+
+    @pytest.mark.asyncio
+    async def test_unchanged_content_is_served_from_cache(self, categorizer):
+        """Test re-categorizing the same batch makes no model requests"""
+        items = [(f"AI post number {i}", "twitter") for i in range(5)] + [("x" * 2000, "linkedin")]
+
+        await categorizer.categorize_batch(items)
+        first_requests = len(categorizer.async_client.chat.completions.requests)
+        await categorizer.categorize_batch(items)
+
+        assert len(categorizer.async_client.chat.completions.requests) == first_requests
+        assert categorizer.last_batch_stats["cached"] == 6
+
+    @pytest.mark.asyncio
+    async def test_duplicates_in_batch_sent_once(self, categorizer):
+        """Test identical items share one answer"""
+        items = [("Same AI post", "twitter")] * 6
+
+        results = await categorizer.categorize_batch(items)
+
+        assert len(categorizer.async_client.chat.completions.requests) == 1
+        assert len(results) == 6
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_by_limiter(self, categorizer):
+        """Test long posts never exceed the limiter's concurrency"""
+        items = [(f"long post {i} " + "x" * 1000, "twitter") for i in range(8)]
+
+        await categorizer.categorize_batch(items)
+
+        completions = categorizer.async_client.chat.completions
+        assert len(completions.requests) == 8
+        assert completions.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_pack_answers_fall_back_uncached(self, categorizer):
+        """Test items the model omits get keyword results and are retried next time"""
+        categorizer.async_client.chat.completions.drop_ids = {1}
+        items = [("AI tips", "twitter"), ("Great marketing campaigns", "twitter")]
+
+        results = await categorizer.categorize_batch(items)
+
+        assert results[0].tone == "casual"
+        assert results[1].topic_category == "marketing"
+        assert categorizer._get_cached_result(*items[1]) is None
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_backs_off_and_retries(self, categorizer):
+        """Test a 429 halves the limiter rate and the request is retried"""
+        limiter = AdaptiveRateLimiter(max_concurrency=2, requests_per_minute=600)
+        completions = categorizer.async_client.chat.completions
+        original_create = completions.create
+        calls = []
+
+        async def flaky_create(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+                raise RateLimitError("slow down", response=httpx.Response(429, request=request), body=None)
+            return await original_create(**kwargs)
+
+        completions.create = flaky_create
+        with patch.object(content_categorization, "categorization_limiter", limiter), \
+             patch.object(content_categorization, "exponential_backoff_with_jitter", return_value=0):
+            result = await categorizer.categorize_content("AI launch", "twitter")
+
+        assert len(calls) == 2
+        assert result.tone == "casual"
+        assert limiter.current_rpm == 301
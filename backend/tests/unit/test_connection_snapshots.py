@@ -0,0 +1,248 @@
+"""
+Unit tests for short transactions around platform calls
+Tests optimistic batched writes and that polling/refresh tasks hold no session during network I/O
+"""
+import asyncio
+import json
+import threading
+import uuid
+from datetime import datetime, timezone, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.db.models import SocialConnection, SocialAudit
+from backend.services.connection_snapshots import (
+    ConnectionAuditEntry, ConnectionSnapshot, ConnectionUpdate, apply_connection_updates
+)
+from backend.services.token_refresh_service import TokenRefreshOutcome, TokenRefreshService
+from backend.services.x_mentions_service import XMentionsService
+
+SLOW_SECONDS = 0.3
+
+
+class _FakeQuery:
+    """Query whose builder methods all chain and whose results are fixed rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def all(self):
+        return list(self.rows)
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+class _TrackingSessions:
+    """Session factory counting sessions (and so pooled connections) checked out"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.open = 0
+        self.max_open = 0
+        self.added = []
+        self.commits = 0
+
+    def __call__(self):
+        self.open += 1
+        self.max_open = max(self.max_open, self.open)
+        sessions = self
+
+        class _Session:
+            def query(self, *models):
+                return _FakeQuery(sessions.rows)
+
+            def add_all(self, objects):
+                sessions.added.extend(objects)
+
+            def commit(self):
+                sessions.commits += 1
+
+            def rollback(self):
+                pass
+
+            def close(self):
+                sessions.open -= 1
+
+        return _Session()
+
+
+def _connection(platform="x", **fields):
+    connection = SocialConnection(
+        id=uuid.uuid4(),
+        organization_id=uuid.uuid4(),
+        platform=platform,
+        platform_account_id="acct_1",
+        platform_username="brand",
+        platform_metadata=fields.pop("platform_metadata", {"mentions_since_id": "100"}),
+        token_expires_at=fields.pop("token_expires_at", None),
+        updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        **fields
+    )
+    connection.access_tokens = {"access_token": "enc_access", "refresh_token": "enc_refresh"}
+    return connection
+
+
+def _serve_slow(body, observe):
+    """Slow HTTP server in a thread; ``observe()`` runs when each request arrives"""
+    ready = threading.Event()
+    state = {}
+
+    async def handle(reader, writer):
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            observe()
+            await asyncio.sleep(SLOW_SECONDS)
+            payload = json.dumps(body).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        state["url"] = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        state["stop"] = asyncio.Event()
+        state["loop"] = asyncio.get_running_loop()
+        ready.set()
+        await state["stop"].wait()
+        server.close()
+
+    thread = threading.Thread(target=asyncio.run, args=(main(),), daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        state["loop"].call_soon_threadsafe(state["stop"].set)
+        thread.join(5)
+
+    return state["url"], stop
+
+
+class TestApplyConnectionUpdates:
+    """Test the batched optimistic write"""
+
+    def test_applies_updates_and_audits_in_one_commit(self):
+        """Test matching versions are written and audits inserted with a single commit"""
+        row = _connection()
+        sessions = _TrackingSessions([row])
+        snapshot = ConnectionSnapshot.from_connection(row)
+
+        written = apply_connection_updates(
+            [ConnectionUpdate(snapshot, {"platform_metadata": {"mentions_since_id": "150"}})],
+            [ConnectionAuditEntry(snapshot, "poll_mentions", "success")],
+            session_factory=sessions
+        )
+
+        assert written["applied"] == [str(row.id)]
+        assert row.platform_metadata == {"mentions_since_id": "150"}
+        assert isinstance(sessions.added[0], SocialAudit)
+        assert sessions.commits == 1
+        assert sessions.open == 0
+
+    def test_since_id_merge_keeps_highest(self):
+        """Test a poll racing a newer poll keeps the higher since_id"""
+        row = _connection()
+        snapshot = ConnectionSnapshot.from_connection(row)
+        update = XMentionsService(settings=MagicMock()).since_id_update(
+            snapshot, {"since_id": "150", "previous_since_id": "100"}
+        )
+        row.platform_metadata = {"mentions_since_id": "200", "page_id": "p1"}
+        row.updated_at = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+        written = apply_connection_updates([update], session_factory=_TrackingSessions([row]))
+
+        assert written["merged"] == [str(row.id)]
+        assert row.platform_metadata == {"mentions_since_id": "200", "page_id": "p1"}
+
+    def test_refresh_conflict_keeps_concurrent_tokens(self):
+        """Test a refresh is skipped when the row's tokens were replaced since the snapshot"""
+        row = _connection()
+        snapshot = ConnectionSnapshot.from_connection(row)
+        new_expiry = datetime.now(timezone.utc) + timedelta(hours=2)
+        outcome = TokenRefreshOutcome(True, new_expiry, "ok", updates={"token_expires_at": new_expiry})
+        update = TokenRefreshService(settings=MagicMock()).refresh_update(snapshot, outcome)
+        concurrent_expiry = datetime.now(timezone.utc) + timedelta(days=60)
+        row.token_expires_at = concurrent_expiry
+        row.updated_at = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+        written = apply_connection_updates([update], session_factory=_TrackingSessions([row]))
+
+        assert written["conflicts"] == [str(row.id)]
+        assert row.token_expires_at == concurrent_expiry
+
+
+class TestNoSessionDuringNetworkIO:
+    """Test tasks release their database session before calling slow platform APIs"""
+
+    @pytest.fixture(autouse=True)
+    def plain_tokens(self):
+        with patch("backend.services.x_mentions_service.decrypt_token", side_effect=lambda t: t), \
+                patch("backend.services.token_refresh_service.decrypt_token", side_effect=lambda t: t), \
+                patch("backend.services.token_refresh_service.encrypt_token", side_effect=lambda t: f"enc:{t}"):
+            yield
+
+    def test_poll_all_x_mentions(self):
+        """Test no session is open while X responds slowly, and results land in one write"""
+        from backend.tasks import x_polling_tasks
+
+        row = _connection()
+        sessions = _TrackingSessions([row])
+        open_during_request = []
+        base_url, stop = _serve_slow(
+            {"data": [{"id": "150", "text": "hi @brand"}]},
+            lambda: open_during_request.append(sessions.open)
+        )
+        service = XMentionsService(settings=MagicMock())
+        service.base_url = base_url
+        try:
+            with patch.object(x_polling_tasks, "SessionLocal", sessions), \
+                    patch.object(x_polling_tasks, "is_partner_oauth_enabled", return_value=True), \
+                    patch.object(x_polling_tasks, "get_redis_client", return_value=None), \
+                    patch.object(x_polling_tasks, "get_x_mentions_service", return_value=service):
+                result = x_polling_tasks.poll_all_x_mentions()
+        finally:
+            stop()
+
+        assert result["connections_polled"] == 1
+        assert open_during_request == [0]
+        assert sessions.max_open == 1
+        assert sessions.commits == 1
+        assert row.platform_metadata["mentions_since_id"] == "150"
+        assert [audit.action for audit in sessions.added] == ["poll_mentions"]
+
+    def test_audit_all_tokens(self):
+        """Test no session is open while the token endpoint responds slowly"""
+        from backend.tasks import token_health_tasks
+
+        row = _connection()
+        sessions = _TrackingSessions([row])
+        open_during_request = []
+        base_url, stop = _serve_slow(
+            {"access_token": "new_access", "refresh_token": "new_refresh", "expires_in": 7200},
+            lambda: open_during_request.append(sessions.open)
+        )
+        service = TokenRefreshService(settings=MagicMock(x_client_id="id", x_client_secret="secret"))
+        service.x_base_url = base_url
+        try:
+            with patch.object(token_health_tasks, "SessionLocal", sessions), \
+                    patch.object(token_health_tasks, "is_partner_oauth_enabled", return_value=True), \
+                    patch.object(token_health_tasks, "get_token_refresh_service", return_value=service):
+                result = token_health_tasks.audit_all_tokens()
+        finally:
+            stop()
+
+        assert result["refresh_successes"] == 1
+        assert open_during_request == [0]
+        assert sessions.max_open == 1
+        assert sessions.commits == 1
+        assert row.token_expires_at is not None
+        assert row.access_tokens["refresh_token"] == "enc:new_refresh"
@@ -0,0 +1,110 @@
+"""
+Unit tests for shared outbound HTTP transports
+Tests connection reuse across short-lived clients, reuse metrics and per-loop pools
+"""
+import asyncio
+import pytest
+
+import httpx
+
+from backend.services.http_transport import ConnectionPool
+
+
+async def _start_keepalive_server():
+    """Minimal HTTP/1.1 server answering every request on a kept-alive connection"""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 11\r\n\r\n{\"ok\":true}")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}", connections
+
+
+class TestSharedTransport:
+    """Test pooled transports behind per-call clients"""
+
+    @pytest.mark.asyncio
+    async def test_per_call_clients_reuse_one_connection(self):
+        """Test sequential `async with AsyncClient` calls share a single TCP connection"""
+        pool = ConnectionPool(http2=False)
+        server, base_url, connections = await _start_keepalive_server()
+        try:
+            for _ in range(5):
+                async with httpx.AsyncClient(transport=pool.transport("x")) as client:
+                    response = await client.get(f"{base_url}/2/tweets")
+                    assert response.json() == {"ok": True}
+
+            stats = pool.get_stats()
+            assert len(connections) == 1
+            assert stats["total_requests"] == 5
+            assert stats["total_connections"] == 1
+            assert stats["connection_reuse"] == 4
+            assert stats["hosts"]["127.0.0.1"]["reuse_ratio"] == 0.8
+        finally:
+            await pool.close_all()
+            server.close()
+            await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_existing_trace_hook_still_called(self):
+        """Test a caller's own trace extension keeps receiving events"""
+        pool = ConnectionPool(http2=False)
+        server, base_url, _ = await _start_keepalive_server()
+        events = []
+
+        async def trace(event_name, info):
+            events.append(event_name)
+
+        try:
+            async with httpx.AsyncClient(transport=pool.transport("meta")) as client:
+                await client.get(f"{base_url}/me", extensions={"trace": trace})
+
+            assert "connection.connect_tcp.complete" in events
+            assert pool.get_stats()["total_connections"] == 1
+        finally:
+            await pool.close_all()
+            server.close()
+            await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_platform_limits_override(self):
+        """Test per-platform connection limits and a single transport per platform"""
+        pool = ConnectionPool(max_connections=20, max_keepalive=10, http2=False, platform_limits={"x": 4})
+
+        transport = pool.transport("x")
+
+        assert pool.transport("x") is transport
+        assert transport._transport._pool._max_connections == 4
+        assert transport._transport._pool._max_keepalive_connections == 4
+        await pool.close_all()
+
+
+class TestPerLoopPools:
+    """Test pools never cross event loops"""
+
+    def test_each_loop_gets_its_own_transport(self):
+        """Test asyncio.run calls (as in Celery tasks) get separate pools and closed loops are pruned"""
+        pool = ConnectionPool(http2=False)
+
+        async def grab():
+            return pool.transport("x")
+
+        first = asyncio.run(grab())
+        second = asyncio.run(grab())
+
+        assert first is not second
+        assert len(pool._loop_transports) == 1
+        assert pool.get_stats()["active_pools"] == 0
@@ -0,0 +1,124 @@
+"""
+Unit tests for concurrent multi-platform image batch generation
+Tests master image reuse, bounded concurrency and streamed results
+"""
+import asyncio
+import base64
+import io
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from PIL import Image
+
+from backend.services.image_generation_service import ImageGenerationService
+from backend.services.rate_limit import AsyncRateLimiter
+
+
+def _png_base64(size=(1024, 768)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 80, 40)).save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+class _SlowImages:
+    """Fake images API that records peak concurrency"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self.payload = _png_base64()
+
+    async def generate(self, **kwargs):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return SimpleNamespace(data=[SimpleNamespace(b64_json=self.payload, url=None)])
+
+
+@pytest.fixture
+def service():
+    svc = ImageGenerationService()
+    svc.async_client = SimpleNamespace(images=_SlowImages())
+    return svc
+
+
+class TestBatchImageGeneration:
+    """Test concurrent batch generation"""
+
+    @pytest.mark.asyncio
+    async def test_shared_master_generates_once_per_variation(self, service):
+        """Test one model call serves every platform for a variation"""
+        with patch("backend.services.image_generation_service.generation_limiter",
+                   AsyncRateLimiter(max_concurrency=3, requests_per_minute=0)):
+            results = await service.generate_content_images(
+                content_text="Launch day",
+                platforms=["instagram", "twitter", "facebook"],
+                image_count=3,
+                generate_alt_text=False
+            )
+
+        assert service.async_client.images.calls == 3
+        assert service.async_client.images.peak == 3
+        assert results["instagram"][0]["processing"]["final_size"] == (1080, 1080)
+        assert results["twitter"][0]["processing"]["final_size"] == (1200, 675)
+        for platform in ("instagram", "twitter", "facebook"):
+            assert [img["metadata"]["batch_info"]["batch_index"] for img in results[platform]] == [0, 1, 2]
+            assert all(img["status"] == "success" for img in results[platform])
+
+    @pytest.mark.asyncio
+    async def test_per_platform_mode_runs_concurrently(self, service):
+        """Test independent generations overlap instead of running back to back"""
+        with patch("backend.services.image_generation_service.generation_limiter",
+                   AsyncRateLimiter(max_concurrency=4, requests_per_minute=0)):
+            results = await service.generate_content_images(
+                content_text="Launch day",
+                platforms=["instagram", "twitter"],
+                image_count=2,
+                generate_alt_text=False,
+                share_master_image=False
+            )
+
+        assert service.async_client.images.calls == 4
+        assert service.async_client.images.peak == 4
+        assert len(results["twitter"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_each_image_with_progress(self, service):
+        """Test streamed events report progress per completed image"""
+        events = []
+        with patch("backend.services.image_generation_service.generation_limiter",
+                   AsyncRateLimiter(max_concurrency=2, requests_per_minute=0)):
+            async for event in service.stream_content_images(
+                content_text="Launch day",
+                platforms=["instagram", "twitter"],
+                image_count=2,
+                generate_alt_text=False
+            ):
+                events.append(event)
+
+        assert [e["completed"] for e in events] == [1, 2, 3, 4]
+        assert all(e["total"] == 4 for e in events)
+        assert {(e["platform"], e["batch_index"]) for e in events} == {
+            ("instagram", 0), ("instagram", 1), ("twitter", 0), ("twitter", 1)
+        }
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_reported_per_platform(self, service):
+        """Test a failing master yields an error result for each platform"""
+        service.async_client.images.generate = AsyncMock(side_effect=RuntimeError("quota"))
+
+        results = await service.generate_content_images(
+            content_text="Launch day",
+            platforms=["instagram", "twitter"],
+            image_count=1,
+            generate_alt_text=False
+        )
+
+        assert results["instagram"][0]["status"] == "error"
+        assert results["twitter"][0]["error"] == "quota"
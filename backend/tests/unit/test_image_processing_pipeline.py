@@ -0,0 +1,150 @@
+"""
+Unit tests for the decode-once image rendition pipeline
+Tests draft-mode decoding, multi-platform renditions and in-memory quality metrics
+"""
+import io
+import time
+import pytest
+from unittest.mock import patch
+from PIL import Image
+
+from backend.services.image_processing_service import ImageProcessingService
+
+
+def _make_image_bytes(size=(3000, 2000), fmt="JPEG", mode="RGB"):
+    """Encode a synthetic gradient image of the given size"""
+    image = Image.linear_gradient("L").resize(size).convert(mode)
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, quality=90)
+    return buffer.getvalue()
+
+
+class TestImageRenditionPipeline:
+    """Test the single-decode rendition pipeline"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = ImageProcessingService()
+        self.jpeg_bytes = _make_image_bytes()
+
+    def test_renditions_match_platform_sizes(self):
+        """Test every requested rendition is produced at its platform size"""
+        renditions = self.service.process_renditions(
+            self.jpeg_bytes,
+            [("instagram", "square"), ("twitter", "default"), ("facebook", "default")]
+        )
+
+        assert [r["metadata"]["processed_size"] for r in renditions] == [
+            (1080, 1080), (1200, 675), (1200, 630)
+        ]
+        for rendition in renditions:
+            assert rendition["metadata"]["original_size"] == (3000, 2000)
+            assert Image.open(io.BytesIO(rendition["image_bytes"])).format == "JPEG"
+
+    def test_source_decoded_once_for_all_renditions(self):
+        """Test the source bytes are opened a single time for several renditions"""
+        with patch("backend.services.image_processing_service.Image.open", wraps=Image.open) as mock_open:
+            self.service.process_renditions(
+                self.jpeg_bytes, [("instagram", "square"), ("twitter", "default")]
+            )
+
+        assert mock_open.call_count == 1
+
+    def test_jpeg_draft_mode_reduces_decode_size(self):
+        """Test JPEG sources are decoded at reduced scale when targets are small"""
+        large = _make_image_bytes(size=(4800, 3200))
+
+        image, original_size = self.service._decode_for_targets(large, [(1200, 675)])
+
+        assert original_size == (4800, 3200)
+        assert image.size[0] < 4800
+        assert image.size[0] >= 1200 and image.size[1] >= 675
+
+    def test_draft_mode_skipped_for_non_jpeg(self):
+        """Test PNG sources are decoded at full size"""
+        png = _make_image_bytes(size=(1600, 1600), fmt="PNG")
+
+        image, original_size = self.service._decode_for_targets(png, [(1080, 1080)])
+
+        assert image.size == original_size == (1600, 1600)
+
+    def test_rgba_source_flattened_to_rgb(self):
+        """Test transparent sources are composited onto white"""
+        rgba = _make_image_bytes(size=(800, 800), fmt="PNG", mode="RGBA")
+
+        rendition = self.service.process_renditions(rgba, [("instagram", "square")])[0]
+
+        assert Image.open(io.BytesIO(rendition["image_bytes"])).mode == "RGB"
+
+    def test_quality_metrics_match_revalidation(self):
+        """Test in-memory metrics agree with re-decoding the encoded output"""
+        rendition = self.service.process_renditions(self.jpeg_bytes, [("instagram", "square")])[0]
+
+        revalidated = self.service.validate_image_quality(rendition["image_bytes"])
+
+        assert rendition["quality_metrics"] == revalidated
+
+    def test_resize_for_platform_keeps_contract(self):
+        """Test the single-rendition API still returns (bytes, metadata)"""
+        processed, metadata = self.service.resize_for_platform(self.jpeg_bytes, "twitter")
+
+        assert isinstance(processed, bytes)
+        assert metadata["processed_size"] == (1200, 675)
+        assert metadata["platform"] == "twitter"
+
+    def test_platform_without_default_format(self):
+        """Test platforms lacking a default size fall back to their first size"""
+        processed, metadata = self.service.resize_for_platform(self.jpeg_bytes, "youtube")
+
+        assert metadata["processed_size"] == (1280, 720)
+
+    def test_invalid_bytes_fall_back_to_original(self):
+        """Test undecodable input is returned unchanged with an error"""
+        renditions = self.service.process_renditions(b"not an image", [("instagram", "square")])
+
+        assert renditions[0]["image_bytes"] == b"not an image"
+        assert renditions[0]["metadata"]["fallback"] is True
+        assert renditions[0]["quality_metrics"] is None
+
+
+@pytest.mark.slow
+class TestImageRenditionPipelinePerformance:
+    """Benchmark the pipeline against per-platform full decodes"""
+
+    def test_multi_rendition_cpu_and_decoded_pixels(self):
+        """Test one draft decode for three renditions beats three full-resolution passes"""
+        service = ImageProcessingService()
+        source = _make_image_bytes(size=(4800, 3200))
+        targets = [("instagram", "square"), ("twitter", "default"), ("facebook", "default")]
+        decoded_pixels = {"legacy": 0, "pipeline": 0}
+
+        def legacy():
+            # Previous behaviour: full decode, crop and LANCZOS per platform
+            for platform, format_type in targets:
+                image = Image.open(io.BytesIO(source)).convert("RGB")
+                decoded_pixels["legacy"] = max(decoded_pixels["legacy"], image.width * image.height)
+                target = service._get_target_size(platform, format_type)
+                ratio = target[0] / target[1]
+                width = min(image.width, int(image.height * ratio))
+                height = min(image.height, int(image.width / ratio))
+                image = image.crop((0, 0, width, height)).resize(target, Image.Resampling.LANCZOS)
+                image = service._enhance_image_quality(image, "standard")
+                image.save(io.BytesIO(), format="JPEG", quality=90, optimize=True, progressive=True)
+                service.validate_image_quality(source)
+
+        def pipeline():
+            service.process_renditions(source, targets)
+
+        def measure(func):
+            start = time.perf_counter()
+            func()
+            return time.perf_counter() - start
+
+        legacy_time = measure(legacy)
+        pipeline_time = measure(pipeline)
+        image, _ = service._decode_for_targets(source, [service._get_target_size(*t) for t in targets])
+        decoded_pixels["pipeline"] = image.width * image.height
+
+        assert pipeline_time < legacy_time
+        # Peak pixel memory is proportional to the decoded source size
+        assert decoded_pixels["pipeline"] < decoded_pixels["legacy"]
@@ -0,0 +1,174 @@
+"""
+Unit tests for the precompiled keyword matcher
+Tests overlapping match semantics, hashtag/mention extraction and categorizer equivalence
+"""
+import random
+import re
+import time
+import pytest
+
+from backend.services.keyword_matcher import KeywordMatcher
+from backend.services.content_categorization import ContentCategorizer
+
+
+def _brute_force_counts(lexicons, text):
+    """Every occurrence of every keyword, overlapping ones included"""
+    lowered = text.lower()
+    counts = {}
+    for term in {k.lower() for keywords in lexicons.values() for k in keywords}:
+        n = sum(1 for i in range(len(lowered)) if lowered.startswith(term, i))
+        if n:
+            counts[term] = n
+    return counts
+
+
+def _legacy_keyword_categorization(categorizer, content):
+    """Per-keyword str.count scoring used before the matcher"""
+    content_lower = content.lower()
+    category_scores = {}
+    for category, info in categorizer.base_categories.items():
+        score = sum(content_lower.count(keyword.lower()) for keyword in info["keywords"])
+        if len(content) > 0:
+            category_scores[category] = score / (len(content) / 100)
+    if category_scores:
+        best_category = max(category_scores, key=category_scores.get)
+        return best_category, min(category_scores[best_category] * 0.3, 1.0)
+    return "general", 0.5
+
+
+SAMPLE_POSTS = [
+    "Our AI automation platform is amazing! #Tech #AI @OpenAI",
+    "5 tips to grow your startup: leadership, strategy and growth #business",
+    "Breaking news: industry report shows advertising spend up 20% https://example.com/report",
+    "Terrible service, worst experience ever. I hate waiting. @support",
+    "Big SALE today - buy one, get one! Limited offer on fitness gear #wellness",
+    "Behind-the-scenes with our team: culture, story and personal experience",
+    "How-to guide: learn budget finance and investment basics for the economy?",
+    "",
+    "no keywords here at all",
+    "AIndustry advertisingreat amazingreat ##double #tag@mention",
+]
+
+
+@pytest.fixture(scope="module")
+def categorizer():
+    return ContentCategorizer()
+
+
+class TestKeywordMatcher:
+    """Test matcher semantics"""
+
+    def test_matches_every_overlapping_occurrence(self):
+        """Test counts equal a brute-force scan, including nested and crossing matches"""
+        rng = random.Random(7)
+        for _ in range(500):
+            words = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(6)]
+            lexicons = {"x": words[:3], "y": words[3:]}
+            matcher = KeywordMatcher(lexicons)
+            text = "".join(rng.choice("abcAB #") for _ in range(40))
+
+            assert matcher.scan(text).term_counts == _brute_force_counts(lexicons, text)
+
+    def test_label_counts_and_distinct_terms(self):
+        """Test per-label totals and distinct-term counts, with shared keywords"""
+        matcher = KeywordMatcher({"tech": ["ai", "tech"], "edu": ["tips", "ai"]})
+
+        scan = matcher.scan("AI tips: ai and TECH")
+
+        assert scan.label_counts == {"tech": 3, "edu": 3}
+        assert scan.label_distinct == {"tech": 2, "edu": 2}
+
+    def test_hashtags_and_mentions_share_the_scan(self):
+        """Test tags keep original casing and keywords inside tags still count"""
+        matcher = KeywordMatcher({"tech": ["ai"]})
+
+        scan = matcher.scan("Hello #OpenAI and @AIBot, mail bob@ai.dev ##x")
+
+        assert scan.hashtags == ["#OpenAI", "#x"]
+        assert scan.mentions == ["@AIBot", "@ai"]
+        assert scan.term_counts == {"ai": 4}
+
+    def test_rejects_tag_characters_in_keywords(self):
+        """Test keywords containing tag markers are refused"""
+        with pytest.raises(ValueError):
+            KeywordMatcher({"tags": ["#ai"]})
+
+
+class TestCategorizerKeywordPath:
+    """Test ContentCategorizer on top of the matcher"""
+
+    @pytest.mark.parametrize("post", SAMPLE_POSTS)
+    def test_scores_match_legacy_counting(self, categorizer, post):
+        """Test category and confidence are unchanged from per-keyword counting"""
+        assert categorizer._keyword_based_categorization(post) == _legacy_keyword_categorization(categorizer, post)
+
+    def test_fallback_fields_from_single_scan(self, categorizer):
+        """Test sentiment, tone and tags of the keyword path"""
+        result = categorizer._keyword_categorize(
+            "Amazing and awesome deal: buy now! #Sale @Shop https://shop.example.com", "twitter"
+        )
+
+        assert result.sentiment == "positive"
+        assert result.tone == "promotional"
+        assert result.hashtags == ["#Sale"]
+        assert result.mentions == ["@Shop"]
+        assert result.links == ["https://shop.example.com"]
+
+    @pytest.mark.asyncio
+    async def test_batch_without_ai_uses_keyword_path(self, categorizer):
+        """Test categorize_batch(use_ai=False) returns ordered keyword results"""
+        items = [(post, "linkedin") for post in SAMPLE_POSTS]
+
+        results = await categorizer.categorize_batch(items, use_ai=False)
+
+        assert [r.topic_category for r in results] == [
+            _legacy_keyword_categorization(categorizer, post)[0] for post in SAMPLE_POSTS
+        ]
+        assert all(r.tone == "professional" for r in results)
+
+
+def _legacy_fallback_signals(categorizer, content):
+    """Category, sentiment/tone keyword checks and tag regexes as separate passes"""
+    category = _legacy_keyword_categorization(categorizer, content)
+    content_lower = content.lower()
+    positive = sum(1 for word in categorizer.POSITIVE_WORDS if word in content_lower)
+    negative = sum(1 for word in categorizer.NEGATIVE_WORDS if word in content_lower)
+    educational = "tips" in content_lower
+    promotional = any(word in content_lower for word in categorizer.PROMOTIONAL_WORDS)
+    return (category, positive, negative, educational, promotional,
+            re.findall(r'#\w+', content), re.findall(r'@\w+', content))
+
+
+def _matcher_fallback_signals(categorizer, content):
+    scan = categorizer.keyword_matcher.scan(content)
+    return (
+        categorizer._keyword_based_categorization(content, scan),
+        scan.label_distinct.get("sentiment:positive", 0),
+        scan.label_distinct.get("sentiment:negative", 0),
+        "tone:educational" in scan.label_counts,
+        "tone:promotional" in scan.label_counts,
+        scan.hashtags,
+        scan.mentions,
+    )
+
+
+@pytest.mark.slow
+class TestKeywordMatcherPerformance:
+    """Benchmark the single-pass matcher against per-keyword scans"""
+
+    def test_100k_posts(self, categorizer):
+        """Test 100k posts produce identical signals faster than the per-keyword scans"""
+        rng = random.Random(42)
+        posts = [rng.choice(SAMPLE_POSTS) + f" {i}" for i in range(100_000)]
+
+        def measure(func):
+            start = time.perf_counter()
+            results = [func(categorizer, post) for post in posts]
+            return time.perf_counter() - start, results
+
+        legacy_seconds, legacy = measure(_legacy_fallback_signals)
+        matcher_seconds, matched = measure(_matcher_fallback_signals)
+
+        print(f"\n100k posts: per-keyword {legacy_seconds:.2f}s, matcher {matcher_seconds:.2f}s")
+        assert matched == legacy
+        assert matcher_seconds < legacy_seconds
@@ -0,0 +1,206 @@
+"""
+Unit tests for lazy router registration and lazy service proxies
+Tests on-demand router imports, route priority, background warm-up and LazyProxy construction
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api._registry import ROUTER_MANIFEST, RouterSpec
+from backend.core.lazy import LazyProxy
+from backend.core.lazy_routers import LazyRouterLoader, LazyRouterMiddleware
+
+
+def _router(prefix, label, path="/items"):
+    router = APIRouter(prefix=prefix)
+
+    @router.get(path)
+    def endpoint():
+        return {"router": label}
+
+    return router
+
+
+class _Imports:
+    """Fake module importer recording which manifest entries were imported"""
+
+    def __init__(self, routers):
+        self.routers = routers
+        self.imported = []
+
+    def __call__(self, spec):
+        self.imported.append(spec.module)
+        router = self.routers[spec.module]
+        if isinstance(router, Exception):
+            raise router
+        return router
+
+
+_LOAD_MANIFEST = """
+import json
+from fastapi import FastAPI
+from backend.api._registry import ROUTER_MANIFEST, load_router
+from backend.core.lazy_routers import LazyRouterLoader
+
+loader = LazyRouterLoader(FastAPI(), ROUTER_MANIFEST, load_router)
+loader.load_all()
+print(json.dumps(loader.failed))
+"""
+
+
+def _load_manifest(**env):
+    """(name, error) of manifest routers that fail to load in a fresh interpreter, as at app startup"""
+    result = subprocess.run(
+        [sys.executable, "-c", _LOAD_MANIFEST],
+        capture_output=True, text=True, timeout=300,
+        cwd=Path(__file__).resolve().parents[3], env={**os.environ, **env}
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return [tuple(failure) for failure in json.loads(result.stdout.strip().splitlines()[-1])]
+
+
+def _lazy_app(routers, manifest):
+    app = FastAPI()
+    imports = _Imports(routers)
+    loaded, failed = [], []
+    loader = LazyRouterLoader(app, manifest, imports, loaded=loaded, failed=failed)
+    app.add_middleware(LazyRouterMiddleware, loader=loader)
+    return app, loader, imports
+
+
+class TestLazyRouterLoader:
+    """Test routers are imported on first use"""
+
+    def test_only_matching_router_imported(self):
+        """Test a request imports just the routers for its path prefix"""
+        manifest = [RouterSpec("goals", ("/api/goals",)), RouterSpec("memory", ("/api/memory",))]
+        app, loader, imports = _lazy_app(
+            {"goals": _router("/api/goals", "goals"), "memory": _router("/api/memory", "memory")}, manifest
+        )
+        client = TestClient(app)
+
+        assert imports.imported == []
+        assert client.get("/api/goals/items").json() == {"router": "goals"}
+        assert imports.imported == ["goals"]
+
+        client.get("/api/goals/items")
+        assert imports.imported == ["goals"]
+        assert loader.get_stats()["pending"] == ["memory"]
+
+    def test_manifest_order_wins_over_load_order(self):
+        """Test overlapping routers keep manifest priority and fallbacks stay last"""
+        manifest = [RouterSpec("content", ("/api/content",)), RouterSpec("content_history", ("/api/content",))]
+        app, loader, _ = _lazy_app({
+            "content": _router("/api/content", "content"),
+            "content_history": _router("/api/content", "history"),
+        }, manifest)
+
+        @app.get("/api/content/items")
+        def fallback():
+            return {"router": "fallback"}
+
+        loader.load(1)
+        loader.load(0)
+
+        assert TestClient(app).get("/api/content/items").json() == {"router": "content"}
+
+    def test_openapi_loads_everything(self):
+        """Test the OpenAPI schema includes routers nobody has requested yet"""
+        manifest = [RouterSpec("goals", ("/api/goals",)), RouterSpec("memory", ("/api/memory",))]
+        app, loader, _ = _lazy_app(
+            {"goals": _router("/api/goals", "goals"), "memory": _router("/api/memory", "memory")}, manifest
+        )
+
+        paths = TestClient(app).get("/openapi.json").json()["paths"]
+
+        assert set(paths) == {"/api/goals/items", "/api/memory/items"}
+        assert loader.all_loaded
+
+    def test_import_failure_recorded_once(self):
+        """Test a router that fails to import is reported and not retried"""
+        manifest = [RouterSpec("broken", ("/api/broken",))]
+        app, loader, imports = _lazy_app({"broken": ImportError("No module named 'filetype'")}, manifest)
+        client = TestClient(app)
+
+        assert client.get("/api/broken/items").status_code == 404
+        client.get("/api/broken/items")
+
+        assert imports.imported == ["broken"]
+        assert loader.failed == [("broken", "No module named 'filetype'")]
+
+    def test_warm_up_loads_remaining(self):
+        """Test the background warm-up imports every pending router"""
+        manifest = [RouterSpec("goals", ("/api/goals",)), RouterSpec("memory", ("/api/memory",))]
+        app, loader, imports = _lazy_app(
+            {"goals": _router("/api/goals", "goals"), "memory": _router("/api/memory", "memory")}, manifest
+        )
+
+        asyncio.run(loader.warm_up())
+
+        assert imports.imported == ["goals", "memory"]
+        assert loader.loaded == ["goals", "memory"]
+        assert loader.get_stats()["pending"] == []
+
+    def test_manifest_matches_router_modules(self):
+        """Test every manifest entry names a router module and only API prefixes"""
+        for spec in ROUTER_MANIFEST:
+            assert spec.paths and all(path.startswith("/api/") for path in spec.paths)
+        assert len({spec.module for spec in ROUTER_MANIFEST}) == len(ROUTER_MANIFEST)
+
+    def test_manifest_tables_defined_once(self):
+        """Test loading the manifest in order never redefines an ORM table"""
+        failed = _load_manifest()
+
+        assert [name for name, error in failed if "already defined" in error] == []
+
+    def test_whole_manifest_loads(self):
+        """Test every manifest router imports and registers"""
+        for module in ("filetype", "psutil", "pytz"):
+            pytest.importorskip(module)
+
+        assert _load_manifest(OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY") or "sk-test") == []
+
+
+class TestLazyProxy:
+    """Test lazily built singletons"""
+
+    def test_built_once_on_first_use(self):
+        """Test the factory runs once, on first attribute access, even under concurrency"""
+        calls = []
+
+        class Service:
+            def __init__(self):
+                calls.append(1)
+                self.name = "service"
+
+        proxy = LazyProxy(Service)
+        assert calls == [] and not proxy.is_initialized
+
+        threads = [threading.Thread(target=lambda: proxy.name) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == [1]
+        assert proxy.name == "service"
+
+    def test_patch_object_through_proxy(self):
+        """Test mock.patch.object on a proxy patches and restores the underlying instance"""
+        class Service:
+            def generate(self):
+                return "real"
+
+        proxy = LazyProxy(Service)
+        with patch.object(proxy, "generate", return_value="mocked"):
+            assert proxy.generate() == "mocked"
+        assert proxy.generate() == "real"
@@ -0,0 +1,261 @@
+"""
+Unit tests for the publisher media pipeline
+Tests concurrent ordered uploads, content-hash id caching, failure isolation, X chunked upload
+and the Meta video upload/publish split
+"""
+import asyncio
+import hashlib
+import re
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+
+from backend.services.media_pipeline import MediaPipeline
+from backend.services.publisher_adapters.meta_adapter import MetaAdapter
+from backend.services.publisher_adapters.x_adapter import XAdapter
+from backend.services.rate_limit import FatalError, RetryableError
+
+
+def _media_transport(payloads, status_codes=None):
+    """Serve payloads[path] as image/png, with optional per-path status codes"""
+    status_codes = status_codes or {}
+
+    async def handler(request):
+        path = request.url.path
+        return httpx.Response(
+            status_codes.get(path, 200),
+            content=payloads.get(path, b""),
+            headers={"content-type": "image/png"}
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def cache():
+    with patch("backend.services.media_pipeline.redis_cache") as mock_cache:
+        mock_cache.get = AsyncMock(return_value=None)
+        mock_cache.set = AsyncMock(return_value=True)
+        yield mock_cache
+
+
+class TestMediaPipeline:
+    """Test MediaPipeline"""
+
+    @pytest.mark.asyncio
+    async def test_uploads_run_concurrently_and_keep_order(self, cache):
+        """Test items upload in parallel and ids come back in media_urls order"""
+        payloads = {f"/{i}.png": f"img-{i}".encode() for i in range(3)}
+        pipeline = MediaPipeline(max_concurrency=3, chunk_size=4)
+        in_flight = {"now": 0, "peak": 0}
+
+        async def upload(item):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01 * (3 - int(item.url[-5])))
+            in_flight["now"] -= 1
+            return f"id-{item.read().decode()}", 3600
+
+        with patch("backend.services.media_pipeline.shared_transport", return_value=_media_transport(payloads)):
+            ids = await pipeline.upload_all(
+                [f"https://cdn.test/{i}.png" for i in range(3)], upload, platform="x", cache_scope="acct"
+            )
+
+        assert ids == ["id-img-0", "id-img-1", "id-img-2"]
+        assert in_flight["peak"] == 3
+        assert cache.set.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_media_id_skips_upload(self, cache):
+        """Test a media id cached for the same account and content hash is reused"""
+        payload = b"same-bytes"
+        cache.get.return_value = "cached-id"
+        upload = AsyncMock()
+        pipeline = MediaPipeline()
+
+        with patch("backend.services.media_pipeline.shared_transport", return_value=_media_transport({"/a.png": payload})):
+            ids = await pipeline.upload_all(["https://cdn.test/a.png"], upload, platform="x", cache_scope="acct")
+
+        assert ids == ["cached-id"]
+        upload.assert_not_awaited()
+        cache.get.assert_awaited_once_with(
+            "x", "media_id", resource_id=f"acct:{hashlib.sha256(payload).hexdigest()}"
+        )
+        assert pipeline.stats["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_items_return_none(self, cache):
+        """Test download failures and oversize media do not sink the other items"""
+        payloads = {"/ok.png": b"ok", "/big.png": b"x" * 64}
+        upload = AsyncMock(return_value=("id-ok", 0))
+        pipeline = MediaPipeline(max_media_bytes=32, chunk_size=8)
+        transport = _media_transport(payloads, status_codes={"/gone.png": 404})
+
+        with patch("backend.services.media_pipeline.shared_transport", return_value=transport):
+            ids = await pipeline.upload_all(
+                ["https://cdn.test/ok.png", "https://cdn.test/gone.png", "https://cdn.test/big.png"],
+                upload,
+                platform="meta",
+                cache_scope="page"
+            )
+
+        assert ids == ["id-ok", None, None]
+        assert pipeline.stats["failed"] == 2
+        cache.set.assert_not_awaited()
+
+
+class TestXChunkedUpload:
+    """Test X INIT/APPEND/FINALIZE media upload"""
+
+    @pytest.mark.asyncio
+    async def test_segments_streamed_from_spool(self, cache):
+        """Test a large item is sent as chunk_size APPEND segments between INIT and FINALIZE"""
+        payload = b"v" * 10
+        commands = []
+
+        async def x_handler(request):
+            if request.method == "GET":
+                commands.append(request.url.params["command"])
+                return httpx.Response(200, json={"media_id_string": "m1", "processing_info": {"state": "succeeded"}})
+            body = request.content
+            for command in ("INIT", "APPEND", "FINALIZE"):
+                if f"name=\"command\"\r\n\r\n{command}".encode() in body or f"command={command}".encode() in body:
+                    commands.append(command)
+            if commands[-1] == "INIT":
+                return httpx.Response(202, json={"media_id_string": "m1"})
+            if commands[-1] == "APPEND":
+                return httpx.Response(204)
+            return httpx.Response(
+                200, json={"media_id_string": "m1", "processing_info": {"state": "pending", "check_after_secs": 0}}
+            )
+
+        pipeline = MediaPipeline(chunk_size=4)
+        connection = Mock(id="conn", platform_account_id="acct", access_tokens={"access_token": "enc"})
+        adapter = XAdapter()
+
+        with patch("backend.services.media_pipeline.shared_transport", return_value=_media_transport({"/v.mp4": payload})), \
+             patch("backend.services.publisher_adapters.x_adapter.shared_transport", return_value=httpx.MockTransport(x_handler)), \
+             patch("backend.services.publisher_adapters.x_adapter.media_pipeline", pipeline), \
+             patch("backend.services.publisher_adapters.x_adapter.decrypt_token", return_value="token"):
+            ids = await pipeline.upload_all(
+                ["https://cdn.test/v.mp4"],
+                lambda item: adapter._upload_media_item(connection, item),
+                platform="x",
+                cache_scope="acct"
+            )
+
+        assert ids == ["m1"]
+        assert commands == ["INIT", "APPEND", "APPEND", "APPEND", "FINALIZE", "STATUS"]
+        assert cache.set.await_args.kwargs["ttl"] == 86400 - 3600
+
+    @pytest.mark.asyncio
+    async def test_processing_poll_gives_up_after_timeout(self, cache):
+        """Test media stuck in processing fails the upload instead of polling forever"""
+        statuses = []
+
+        async def x_handler(request):
+            if request.method == "GET":
+                statuses.append(request.url.params["command"])
+            return httpx.Response(
+                200, json={"media_id_string": "m1", "processing_info": {"state": "in_progress", "check_after_secs": 0.01}}
+            )
+
+        pipeline = MediaPipeline(chunk_size=4)
+        connection = Mock(id="conn", platform_account_id="acct", access_tokens={"access_token": "enc"})
+        adapter = XAdapter()
+
+        with patch("backend.services.media_pipeline.shared_transport", return_value=_media_transport({"/v.mp4": b"v" * 4})), \
+             patch("backend.services.publisher_adapters.x_adapter.shared_transport", return_value=httpx.MockTransport(x_handler)), \
+             patch("backend.services.publisher_adapters.x_adapter.decrypt_token", return_value="token"), \
+             patch.object(adapter.settings, "media_processing_timeout_s", 0.05):
+            item = await pipeline.download("https://cdn.test/v.mp4")
+            with pytest.raises(RetryableError, match="still processing"):
+                await asyncio.wait_for(adapter.upload_media_chunked(connection, item), timeout=1)
+
+        assert 1 <= len(statuses) <= 6
+
+
+class _Graph:
+    """Fake Graph API recording upload phases, transfer offsets, posts and deletions"""
+
+    def __init__(self, video_size):
+        self.video_size = video_size
+        self.calls = []
+
+    def _field(self, body, name):
+        match = re.search(rf'name="{name}"\r\n\r\n([^\r]*)'.encode(), body) or re.search(rf"{name}=([^&]*)".encode(), body)
+        return match.group(1).decode() if match else None
+
+    async def __call__(self, request):
+        path = request.url.path
+        if request.method == "DELETE":
+            self.calls.append(("delete", path.rsplit("/", 1)[-1]))
+            return httpx.Response(200, json={"success": True})
+        if path.endswith("/photos"):
+            self.calls.append(("photo",))
+            return httpx.Response(200, json={"id": f"photo-{self.calls.count(('photo',))}"})
+        if path.endswith("/feed"):
+            self.calls.append(("feed",))
+            return httpx.Response(200, json={"id": "post-1"})
+
+        phase = self._field(request.content, "upload_phase")
+        if phase == "start":
+            self.calls.append(("start",))
+            return httpx.Response(200, json={
+                "upload_session_id": "s1", "video_id": "v1", "start_offset": "0", "end_offset": str(self.video_size)
+            })
+        if phase == "transfer":
+            offset = int(self._field(request.content, "start_offset"))
+            self.calls.append(("transfer", offset))
+            sent = len(request.content.split(b"application/octet-stream\r\n\r\n")[1].rsplit(b"\r\n--", 1)[0])
+            return httpx.Response(200, json={"start_offset": str(offset + sent), "end_offset": str(self.video_size)})
+        self.calls.append((phase, self._field(request.content, "published")))
+        return httpx.Response(200, json={"success": True})
+
+
+def _typed_transport(payloads):
+    """Serve payloads[path] = (content type, bytes)"""
+    async def handler(request):
+        media_type, content = payloads[request.url.path]
+        return httpx.Response(200, content=content, headers={"content-type": media_type})
+
+    return httpx.MockTransport(handler)
+
+
+class TestMetaMediaPublish:
+    """Test Meta uploads never publish and the publish step publishes once"""
+
+    async def _publish(self, graph, payloads):
+        adapter = MetaAdapter()
+        connection = Mock(
+            id="conn", platform="meta", access_tokens={"page_token": "enc"}, platform_metadata={"page_id": "page"}
+        )
+        with patch("backend.services.media_pipeline.shared_transport", return_value=_typed_transport(payloads)), \
+             patch("backend.services.publisher_adapters.meta_adapter.shared_transport", return_value=httpx.MockTransport(graph)), \
+             patch("backend.services.publisher_adapters.meta_adapter.media_pipeline", MediaPipeline(chunk_size=4)), \
+             patch("backend.services.publisher_adapters.meta_adapter.decrypt_token", return_value="token"), \
+             patch.object(adapter.settings, "media_upload_chunk_size", 4):
+            return await adapter.publish(connection, "hello", [f"https://cdn.test{path}" for path in payloads])
+
+    @pytest.mark.asyncio
+    async def test_video_transfers_capped_and_published_once(self, cache):
+        """Test transfers send at most one chunk each and only the publish step finishes the upload"""
+        graph = _Graph(video_size=10)
+
+        result = await self._publish(graph, {"/v.mp4": ("video/mp4", b"v" * 10)})
+
+        assert result == (True, "v1", None)
+        assert graph.calls == [("start",), ("transfer", 0), ("transfer", 4), ("transfer", 8), ("finish", "true")]
+
+    @pytest.mark.asyncio
+    async def test_mixed_photos_and_video_rejected(self, cache):
+        """Test a photo+video post fails before publishing and its unpublished photos are deleted"""
+        graph = _Graph(video_size=4)
+
+        with pytest.raises(FatalError, match="photos or a single video"):
+            await self._publish(graph, {"/a.png": ("image/png", b"img"), "/v.mp4": ("video/mp4", b"vvvv")})
+
+        assert ("finish", "true") not in graph.calls
+        assert ("feed",) not in graph.calls
+        assert [call for call in graph.calls if call[0] == "delete"] == [("delete", "photo-1")]
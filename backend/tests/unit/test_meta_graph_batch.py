@@ -0,0 +1,197 @@
+"""
+Unit tests for the Meta Graph API batch executor
+Tests packing, per-item errors and retries, timed flushes and batched callers against a mock Graph server
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+from backend.services import meta_graph_batch
+from backend.services.meta_graph_batch import GraphBatchError, GraphBatchExecutor
+from backend.services.meta_page_token_service import MetaPageTokenService
+from backend.services.meta_webhook_service import MetaWebhookService
+
+
+class MockGraphServer:
+    """Answers POST /?batch= with one result per sub-request"""
+
+    def __init__(self, answer=None):
+        self.answer = answer or (lambda item, query, attempt: (200, {"id": item["path"]}))
+        self.batches = []
+        self.attempts = {}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        form = parse_qs(request.content.decode())
+        if "batch" not in form:
+            return self.handle_direct(request)
+
+        items = json.loads(form["batch"][0])
+        self.batches.append({"items": items, "access_token": form.get("access_token", [None])[0]})
+        results = []
+        for item in items:
+            url = urlsplit(item["relative_url"])
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            key = item["relative_url"]
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+            answer = self.answer({"path": url.path, **item}, query, self.attempts[key])
+            if answer is None:
+                results.append(None)
+            else:
+                code, body = answer
+                results.append({"code": code, "body": json.dumps(body)})
+        return httpx.Response(200, json=results)
+
+    def handle_direct(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, json={"error": {"message": "unexpected direct call"}})
+
+
+@pytest.fixture
+def graph():
+    server = MockGraphServer()
+    with patch.object(meta_graph_batch, "shared_transport", return_value=httpx.MockTransport(server.handle)):
+        yield server
+
+
+class TestGraphBatchExecutor:
+    """Test GraphBatchExecutor"""
+
+    @pytest.mark.asyncio
+    async def test_packs_up_to_fifty_per_batch(self, graph):
+        """Test 120 calls take three batch requests and results map back in order"""
+        async with GraphBatchExecutor(access_token="token", flush_interval=10) as batch:
+            futures = [batch.submit("GET", f"post{i}/insights", params={"metric": "post_reach"}) for i in range(120)]
+
+        assert [len(b["items"]) for b in graph.batches] == [50, 50, 20]
+        assert [f.result()["id"] for f in futures] == [f"post{i}/insights" for i in range(120)]
+        assert graph.batches[0]["items"][0]["relative_url"] == "post0/insights?metric=post_reach"
+        assert batch.stats["batch_requests"] == 3
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushed_by_timer(self, graph):
+        """Test queued calls go out after flush_interval without an explicit flush"""
+        batch = GraphBatchExecutor(access_token="token", flush_interval=0.01)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(batch.request("GET", "a"), batch.request("GET", "b")), timeout=1
+        )
+
+        assert [r["id"] for r in results] == ["a", "b"]
+        assert len(graph.batches) == 1
+
+    @pytest.mark.asyncio
+    async def test_per_item_errors_and_retries(self, graph):
+        """Test permanent errors fail only their caller and transient ones are retried"""
+        def answer(item, query, attempt):
+            if item["path"] == "bad":
+                return 400, {"error": {"code": 100, "message": "Invalid parameter"}}
+            if item["path"] == "flaky" and attempt == 1:
+                return 500, {"error": {"code": 2, "message": "Service temporarily unavailable"}}
+            if item["path"] == "slow" and attempt == 1:
+                return None
+            return 200, {"id": item["path"]}
+
+        graph.answer = answer
+        with patch.object(meta_graph_batch, "exponential_backoff_with_jitter", return_value=0):
+            batch = GraphBatchExecutor(access_token="token")
+            results = await batch.execute([
+                {"method": "GET", "path": "ok"},
+                {"method": "GET", "path": "bad"},
+                {"method": "GET", "path": "flaky"},
+                {"method": "GET", "path": "slow"},
+            ])
+
+        assert results[0] == {"id": "ok"}
+        assert isinstance(results[1], GraphBatchError)
+        assert results[1].status_code == 400
+        assert results[2] == {"id": "flaky"}
+        assert results[3] == {"id": "slow"}
+        assert len(graph.batches) == 2
+        assert batch.stats["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted_raise(self, graph):
+        """Test a sub-request that keeps failing transiently raises after max_retries"""
+        graph.answer = lambda item, query, attempt: (503, {"error": {"code": 1, "message": "Unknown error"}})
+
+        with patch.object(meta_graph_batch, "exponential_backoff_with_jitter", return_value=0):
+            batch = GraphBatchExecutor(access_token="token", max_retries=2)
+            results = await batch.execute([{"method": "GET", "path": "down"}])
+
+        assert isinstance(results[0], GraphBatchError)
+        assert len(graph.batches) == 3
+
+    @pytest.mark.asyncio
+    async def test_non_list_response_retried_then_raised(self):
+        """Test an error object served with status 200 fails callers instead of leaving them waiting"""
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"error": {"code": 1, "message": "An unknown error occurred"}})
+        )
+        with patch.object(meta_graph_batch, "shared_transport", return_value=transport), \
+             patch.object(meta_graph_batch, "exponential_backoff_with_jitter", return_value=0):
+            batch = GraphBatchExecutor(access_token="token", max_retries=1)
+            results = await asyncio.wait_for(batch.execute([{"method": "GET", "path": "a"}]), timeout=1)
+
+        assert isinstance(results[0], GraphBatchError)
+        assert "An unknown error occurred" in str(results[0])
+        assert batch.stats["batch_requests"] == 2
+
+    @pytest.mark.asyncio
+    async def test_per_item_tokens_and_fallback(self, graph):
+        """Test sub-request tokens go in relative_url and the first one doubles as batch token"""
+        batch = GraphBatchExecutor()
+        await batch.execute([
+            {"method": "GET", "path": "ig1", "params": {"fields": "username"}, "access_token": "page1"},
+            {"method": "GET", "path": "ig2", "params": {"fields": "username"}, "access_token": "page2"},
+        ])
+
+        sent = graph.batches[0]
+        assert sent["access_token"] == "page1"
+        assert sent["items"][1]["relative_url"] == "ig2?fields=username&access_token=page2"
+
+
+class TestBatchedCallers:
+    """Test services using the batch executor"""
+
+    @pytest.mark.asyncio
+    async def test_instagram_usernames_in_one_batch(self, graph):
+        """Test several linked pages resolve usernames with one batch call"""
+        graph.answer = lambda item, query, attempt: (200, {"username": f"user_{item['path']}"})
+        pages = {
+            "data": [
+                {"id": f"page{i}", "name": f"Page {i}", "access_token": f"pt{i}",
+                 "instagram_business_account": {"id": f"ig{i}"}}
+                for i in range(5)
+            ]
+        }
+
+        with patch("backend.services.meta_page_token_service.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(meta_graph_version="v18.0")
+            service = MetaPageTokenService()
+
+        with patch("backend.services.meta_page_token_service.shared_transport",
+                   return_value=httpx.MockTransport(lambda request: httpx.Response(200, json=pages))):
+            result = await service.list_pages_with_instagram("user-token")
+
+        assert len(graph.batches) == 1
+        assert [p["instagram_business_account"]["username"] for p in result] == [f"user_ig{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_connection_webhooks_subscribed_in_one_batch(self, graph):
+        """Test page and Instagram subscriptions share one request; IG 400 counts as success"""
+        def answer(item, query, attempt):
+            if item["path"] == "ig1/subscribed_apps":
+                return 400, {"error": {"code": 100, "message": "Unsupported account type"}}
+            return 200, {"success": True}
+
+        graph.answer = answer
+        service = MetaWebhookService(settings=MagicMock(meta_app_secret="secret", meta_graph_version="v18.0"))
+
+        result = await service.subscribe_connection_webhooks("page1", "page-token", "ig1")
+
+        assert result == {"page": True, "instagram": True}
+        assert len(graph.batches) == 1
+        assert [item["method"] for item in graph.batches[0]["items"]] == ["POST", "POST"]
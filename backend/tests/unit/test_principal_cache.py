@@ -0,0 +1,166 @@
+"""
+Unit tests for the authenticated principal cache
+Tests query-free cache hits in get_current_active_user, the Redis tier and invalidation on user changes
+"""
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import backend.db.models  # noqa: F401 - registers every table on Base.metadata
+from backend.auth import principal_cache as principal_cache_module
+from backend.auth.dependencies import AuthUser, get_current_active_user
+from backend.auth.principal_cache import Principal, PrincipalCache
+from backend.db.database import Base
+from backend.db.models import User
+
+
+class _FakeRedis:
+    """Dict-backed stand-in for the sync Redis client"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def sessions():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    factory = sessionmaker(bind=engine)
+
+    db = factory()
+    db.add(User(id=1, email="ada@example.com", username="ada", hashed_password="hash", tier="pro", is_active=True))
+    db.commit()
+    db.close()
+
+    factory.statements = statements
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def cache():
+    cache = PrincipalCache(local_ttl=60)
+    with patch.object(principal_cache_module, "principal_cache", cache), \
+            patch("backend.auth.dependencies.principal_cache", cache):
+        yield cache
+
+
+def _auth_user():
+    return AuthUser(user_id="1", email="ada@example.com", username="ada", auth_method="local")
+
+
+class TestCachedActiveUser:
+    """Test get_current_active_user with the principal cache"""
+
+    @pytest.mark.asyncio
+    async def test_hit_runs_no_query(self, sessions, cache):
+        """Test the second request gets a session-bound User without touching the database"""
+        db = sessions()
+        await get_current_active_user(_auth_user(), db)
+        db.close()
+
+        db = sessions()
+        sessions.statements.clear()
+        user = await get_current_active_user(_auth_user(), db)
+
+        assert sessions.statements == []
+        assert (user.id, user.tier) == (1, "pro")
+        assert user in db
+        # Columns outside the principal load on demand
+        assert user.hashed_password == "hash"
+        assert cache.get_stats()["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changes_to_cached_user_are_saved_and_invalidate(self, sessions, cache):
+        """Test an endpoint can modify the attached user and its commit drops the cached principal"""
+        db = sessions()
+        await get_current_active_user(_auth_user(), db)
+        db.close()
+
+        db = sessions()
+        user = await get_current_active_user(_auth_user(), db)
+        user.two_factor_enabled = True
+        db.commit()
+        db.close()
+
+        assert cache.get("ada@example.com") is None
+        db = sessions()
+        assert db.get(User, 1).two_factor_enabled is True
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_deactivation_takes_effect(self, sessions, cache):
+        """Test deactivating a cached user makes the next request fail with 403"""
+        db = sessions()
+        await get_current_active_user(_auth_user(), db)
+        db.get(User, 1).is_active = False
+        db.commit()
+        db.close()
+
+        with pytest.raises(HTTPException) as exc:
+            await get_current_active_user(_auth_user(), sessions())
+
+        assert exc.value.status_code == 403
+
+
+class TestPrincipalCacheTiers:
+    """Test the local LRU and Redis tiers"""
+
+    def _principal(self, email="ada@example.com", is_active=True):
+        return Principal(
+            id=1, email=email, username="ada", full_name=None, tier="pro", is_active=is_active,
+            is_superuser=False, is_verified=True, auth_provider="local", default_organization_id=None
+        )
+
+    def test_redis_tier_shared_between_processes(self):
+        """Test a principal cached by one process is served from Redis to another"""
+        redis_client = _FakeRedis()
+        PrincipalCache(redis_client=redis_client).set(self._principal())
+        other = PrincipalCache(redis_client=redis_client)
+
+        assert other.get("ada@example.com") == self._principal()
+        assert other.get("ada@example.com") == self._principal()
+        assert other.get_stats()["redis_hits"] == 1
+        assert other.get_stats()["local_hits"] == 1
+
+        other.invalidate("ada@example.com")
+        assert redis_client.data == {}
+
+    def test_lru_bound_and_inactive_not_cached(self):
+        """Test the local tier evicts least recently used entries and skips inactive users"""
+        cache = PrincipalCache(max_size=2)
+        for email in ("a@example.com", "b@example.com", "c@example.com"):
+            cache.set(self._principal(email))
+        cache.set(self._principal("d@example.com", is_active=False))
+
+        assert cache.get("a@example.com") is None
+        assert cache.get("c@example.com") is not None
+        assert cache.get("d@example.com") is None
+
+    def test_redis_errors_fall_back(self):
+        """Test a failing Redis tier is skipped until the retry interval passes"""
+        redis_client = _FakeRedis()
+        cache = PrincipalCache(redis_client=redis_client, local_ttl=0)
+
+        with patch.object(redis_client, "get", side_effect=ConnectionError("down")) as failing_get:
+            assert cache.get("ada@example.com") is None
+            assert cache.get("ada@example.com") is None
+
+        assert failing_get.call_count == 1
+        assert cache.get_stats()["redis_errors"] == 1
@@ -8,7 +8,9 @@ import pytest
 from unittest.mock import Mock, MagicMock
 import redis
 
-from backend.services.rate_limit import TokenBucket, exponential_backoff_with_jitter
+from backend.services.rate_limit import (
+    TokenBucket, AdmissionController, AsyncRateLimiter, AdaptiveRateLimiter, exponential_backoff_with_jitter
+)
 
 
 class TestTokenBucket:
@@ -17,6 +19,7 @@ class TestTokenBucket:
     def setup_method(self):
         """Set up test fixtures"""
         self.mock_redis = Mock(spec=redis.Redis)
+        self.mock_redis.register_script.side_effect = lambda script: Mock()
         self.bucket = TokenBucket(
             redis_client=self.mock_redis,
             key_prefix="test_rate",
@@ -43,20 +46,21 @@ class TestTokenBucket:
     def test_acquire_success_new_bucket(self):
         """Test successful token acquisition with new bucket"""
         # Mock Redis to return None (new bucket)
-        self.mock_redis.eval.return_value = [1, 9]  # Success, 9 tokens remaining
+        self.bucket._acquire_script.return_value = [1, 9]  # Success, 9 tokens remaining
         
         result = self.bucket.acquire("org123", "meta", 1)
         
         assert result is True
         
-        # Verify Redis script was called
-        self.mock_redis.eval.assert_called_once()
-        args = self.mock_redis.eval.call_args[0]
-        assert "test_rate:org123:meta" in args
+        # Verify the registered script was called (EVALSHA, not the full source)
+        self.bucket._acquire_script.assert_called_once()
+        self.mock_redis.eval.assert_not_called()
+        kwargs = self.bucket._acquire_script.call_args[1]
+        assert kwargs["keys"] == ["test_rate:org123:meta"]
     
     def test_acquire_success_existing_bucket(self):
         """Test successful token acquisition with existing bucket"""
-        self.mock_redis.eval.return_value = [1, 5]  # Success, 5 tokens remaining
+        self.bucket._acquire_script.return_value = [1, 5]  # Success, 5 tokens remaining
         
         result = self.bucket.acquire("org123", "x", 2)
         
@@ -64,7 +68,7 @@ class TestTokenBucket:
     
     def test_acquire_rate_limited(self):
         """Test rate limiting when insufficient tokens"""
-        self.mock_redis.eval.return_value = [0, 0]  # Rate limited, 0 tokens remaining
+        self.bucket._acquire_script.return_value = [0, 0]  # Rate limited, 0 tokens remaining
         
         result = self.bucket.acquire("org123", "meta", 3)
         
@@ -72,19 +76,19 @@ class TestTokenBucket:
     
     def test_acquire_multiple_tokens(self):
         """Test acquiring multiple tokens at once"""
-        self.mock_redis.eval.return_value = [1, 5]  # Success, 5 tokens remaining
+        self.bucket._acquire_script.return_value = [1, 5]  # Success, 5 tokens remaining
         
         result = self.bucket.acquire("org123", "meta", 5)
         
         assert result is True
         
         # Verify correct number of tokens requested
-        args = self.mock_redis.eval.call_args[0]
-        assert "5" in args  # tokens_requested parameter
+        args = self.bucket._acquire_script.call_args[1]["args"]
+        assert args[1] == "5"  # tokens_requested parameter
     
     def test_acquire_redis_error_fail_open(self):
         """Test fail-open behavior when Redis is unavailable"""
-        self.mock_redis.eval.side_effect = redis.RedisError("Connection failed")
+        self.bucket._acquire_script.side_effect = redis.RedisError("Connection failed")
         
         # Should allow request despite Redis error
         result = self.bucket.acquire("org123", "meta", 1)
@@ -93,7 +97,7 @@ class TestTokenBucket:
     
     def test_get_remaining_new_bucket(self):
         """Test getting remaining tokens for new bucket"""
-        self.mock_redis.eval.return_value = 10  # Full capacity
+        self.bucket._remaining_script.return_value = 10  # Full capacity
         
         remaining = self.bucket.get_remaining("org123", "meta")
         
@@ -101,7 +105,7 @@ class TestTokenBucket:
     
     def test_get_remaining_existing_bucket(self):
         """Test getting remaining tokens for existing bucket"""
-        self.mock_redis.eval.return_value = 7
+        self.bucket._remaining_script.return_value = 7
         
         remaining = self.bucket.get_remaining("org123", "meta")
         
@@ -109,7 +113,7 @@ class TestTokenBucket:
     
     def test_get_remaining_redis_error(self):
         """Test getting remaining tokens with Redis error"""
-        self.mock_redis.eval.side_effect = redis.RedisError("Connection failed")
+        self.bucket._remaining_script.side_effect = redis.RedisError("Connection failed")
         
         # Should return full capacity on error
         remaining = self.bucket.get_remaining("org123", "meta")
@@ -150,7 +154,7 @@ class TestTokenBucket:
     
     def test_tenant_isolation(self):
         """Test that different orgs have separate buckets"""
-        self.mock_redis.eval.return_value = [1, 9]
+        self.bucket._acquire_script.return_value = [1, 9]
         
         # Acquire tokens for different orgs
         result1 = self.bucket.acquire("org123", "meta", 1)
@@ -160,12 +164,12 @@ class TestTokenBucket:
         assert result2 is True
         
         # Verify different keys were used
-        assert self.mock_redis.eval.call_count == 2
-        calls = self.mock_redis.eval.call_args_list
+        assert self.bucket._acquire_script.call_count == 2
+        calls = self.bucket._acquire_script.call_args_list
         
         # Extract keys from Redis calls
-        key1 = calls[0][0][1]  # First call, second argument (key)
-        key2 = calls[1][0][1]  # Second call, second argument (key)
+        key1 = calls[0][1]["keys"][0]
+        key2 = calls[1][1]["keys"][0]
         
         assert key1 != key2
         assert "org123" in key1
@@ -173,7 +177,7 @@ class TestTokenBucket:
     
     def test_platform_isolation(self):
         """Test that different platforms have separate buckets"""
-        self.mock_redis.eval.return_value = [1, 9]
+        self.bucket._acquire_script.return_value = [1, 9]
         
         # Acquire tokens for different platforms
         result1 = self.bucket.acquire("org123", "meta", 1)
@@ -183,17 +187,100 @@ class TestTokenBucket:
         assert result2 is True
         
         # Verify different keys were used
-        assert self.mock_redis.eval.call_count == 2
-        calls = self.mock_redis.eval.call_args_list
+        assert self.bucket._acquire_script.call_count == 2
+        calls = self.bucket._acquire_script.call_args_list
         
-        key1 = calls[0][0][1]
-        key2 = calls[1][0][1]
+        key1 = calls[0][1]["keys"][0]
+        key2 = calls[1][1]["keys"][0]
         
         assert key1 != key2
         assert "meta" in key1
         assert "x" in key2
 
 
+class TestAdmissionController:
+    """Test fused circuit breaker + token bucket admission"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.mock_redis = Mock(spec=redis.Redis)
+        self.script = Mock()
+        self.mock_redis.register_script.return_value = self.script
+        self.admission = AdmissionController(
+            redis_client=self.mock_redis,
+            refill_rate=10,
+            capacity=10,
+            window_s=60,
+            cooldown_s=120
+        )
+    
+    def test_admitted_in_one_round_trip(self):
+        """Test breaker and bucket keys go to a single registered script call"""
+        self.script.return_value = [1, 1, 9, b"0", b"6", b"closed"]
+        
+        decision = self.admission.admit("org123", "meta")
+        
+        assert decision.allowed is True
+        assert decision.remaining == 9
+        self.script.assert_called_once()
+        self.mock_redis.eval.assert_not_called()
+        kwargs = self.script.call_args[1]
+        assert kwargs["keys"] == ["cb:org123:meta", "rate:org123:meta"]
+        assert kwargs["args"][1:3] == ["1", "1"]  # exactly one token without leasing
+    
+    def test_circuit_open_reports_cooldown(self):
+        """Test an open circuit rejects with the remaining cooldown as retry-after"""
+        self.script.return_value = [-1, 0, 0, b"42.5", b"0", b"open"]
+        
+        decision = self.admission.admit("org123", "x")
+        
+        assert decision.allowed is False
+        assert decision.reason == "circuit_open"
+        assert decision.retry_after_s == 42.5
+    
+    def test_rate_limited_reports_retry_and_reset(self):
+        """Test rate limiting returns retry-after and reset without extra calls"""
+        self.script.return_value = [0, 0, 0, b"3.0", b"60.0", b"closed"]
+        
+        decision = self.admission.admit("org123", "meta")
+        
+        assert decision.allowed is False
+        assert decision.reason == "rate_limited"
+        assert decision.retry_after_s == 3.0
+        assert decision.reset_at > time.time() + 59
+        assert self.script.call_count == 1
+    
+    def test_lease_serves_admissions_locally(self):
+        """Test a leased token batch is used before Redis is called again"""
+        admission = AdmissionController(redis_client=self.mock_redis, lease_size=5, lease_ttl_s=60)
+        self.script.return_value = [1, 5, 20, b"0", b"10", b"closed"]
+        
+        decisions = [admission.admit("org123", "meta") for _ in range(6)]
+        
+        assert all(d.allowed for d in decisions)
+        assert [d.leased for d in decisions] == [False, True, True, True, True, False]
+        assert self.script.call_count == 2
+        assert self.script.call_args[1]["args"][2] == "5"
+        assert admission.get_stats()["redis_calls_per_admission"] == pytest.approx(2 / 6, abs=0.001)
+    
+    def test_drop_lease_forces_redis_check(self):
+        """Test failures drop the local lease so the breaker is consulted again"""
+        admission = AdmissionController(redis_client=self.mock_redis, lease_size=5, lease_ttl_s=60)
+        self.script.return_value = [1, 5, 20, b"0", b"10", b"closed"]
+        admission.admit("org123", "meta")
+        
+        admission.drop_lease("org123", "meta")
+        self.script.return_value = [-1, 0, 0, b"120", b"0", b"open"]
+        
+        assert admission.admit("org123", "meta").reason == "circuit_open"
+    
+    def test_redis_error_fail_open(self):
+        """Test admission fails open when Redis is unavailable"""
+        self.script.side_effect = redis.RedisError("Connection failed")
+        
+        assert self.admission.admit("org123", "meta").allowed is True
+
+
 class TestExponentialBackoff:
     """Test exponential backoff with jitter calculation"""
     
@@ -249,4 +336,84 @@ class TestExponentialBackoff:
         
         # All should be in reasonable range (4s ±25%)
         for delay in delays:
-            assert 3.0 <= delay <= 5.0
\ No newline at end of file
+            assert 3.0 <= delay <= 5.0
+
+
+class TestAsyncRateLimiter:
+    """Test the in-process concurrency and rate budget"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        """Test no more than max_concurrency holders run at once"""
+        limiter = AsyncRateLimiter(max_concurrency=2, requests_per_minute=0)
+        active = 0
+        peak = 0
+
+        async def worker():
+            nonlocal active, peak
+            async with limiter.slot():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*[worker() for _ in range(6)])
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_request_starts_are_spaced_by_rate(self):
+        """Test request starts respect the per-minute budget"""
+        limiter = AsyncRateLimiter(max_concurrency=10, requests_per_minute=1200)  # 50ms apart
+        starts = []
+
+        async def worker():
+            async with limiter.slot():
+                starts.append(time.monotonic())
+
+        await asyncio.gather(*[worker() for _ in range(3)])
+
+        assert starts[-1] - starts[0] >= 0.09
+
+    def test_rebinds_across_event_loops(self):
+        """Test the limiter works from successive asyncio.run calls"""
+        limiter = AsyncRateLimiter(max_concurrency=1, requests_per_minute=0)
+
+        async def use():
+            async with limiter.slot():
+                return True
+
+        assert asyncio.run(use()) is True
+        assert asyncio.run(use()) is True
+
+
+class TestAdaptiveRateLimiter:
+    """Test rate backoff and recovery"""
+
+    def test_penalize_halves_and_reward_recovers(self):
+        """Test multiplicative decrease down to the floor and additive recovery to the cap"""
+        limiter = AdaptiveRateLimiter(max_concurrency=2, requests_per_minute=60, min_requests_per_minute=10)
+
+        for _ in range(5):
+            limiter.penalize()
+        assert limiter.current_rpm == 10
+        assert limiter.min_interval == pytest.approx(6.0)
+
+        for _ in range(100):
+            limiter.reward()
+        assert limiter.current_rpm == 60
+        assert limiter.min_interval == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_retry_after_delays_next_start(self):
+        """Test a provider retry-after pauses the next request start"""
+        limiter = AdaptiveRateLimiter(max_concurrency=1, requests_per_minute=6000)
+        async with limiter.slot():
+            pass
+
+        limiter.penalize(retry_after=0.1)
+        start = time.monotonic()
+        async with limiter.slot():
+            pass
+
+        assert time.monotonic() - start >= 0.09
@@ -0,0 +1,152 @@
+"""
+Unit tests for RateLimitMiddleware
+Tests the single-script Redis check, circuit fallback with background probe and local pre-check allowances
+"""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.core.security_middleware import RateLimitMiddleware
+
+
+def _middleware(script_result=(0, 1, 1, 1), **options):
+    middleware = RateLimitMiddleware(None, **options)
+    middleware.use_redis = True
+    middleware.redis_client = AsyncMock()
+    middleware._rate_script = AsyncMock(return_value=list(script_result))
+    return middleware
+
+
+class TestScriptedCheck:
+    """Test one scripted Redis call per request"""
+
+    @pytest.mark.asyncio
+    async def test_one_script_call_and_no_ping(self):
+        """Test a request costs one script call and no health check"""
+        middleware = _middleware(script_result=(0, 3, 7, 40), requests_per_minute=60)
+
+        limit_info, usage = await middleware._redis_rate_check("1.2.3.4")
+
+        assert limit_info is None
+        assert usage == {"minute": 7, "hour": 40}
+        middleware._rate_script.assert_awaited_once()
+        middleware.redis_client.ping.assert_not_awaited()
+        keys = middleware._rate_script.call_args.kwargs["keys"]
+        assert keys[0] == "rate_limit:1.2.3.4:burst"
+
+    @pytest.mark.asyncio
+    async def test_limited_result_maps_to_limit_type(self):
+        """Test the script's limit code becomes the matching 429 details"""
+        middleware = _middleware(script_result=(2, 5, 60, 60), requests_per_minute=60)
+
+        limit_info, _ = await middleware._redis_rate_check("1.2.3.4")
+
+        assert limit_info["limit_type"] == "minute"
+        assert limit_info["retry_after"] == 60
+
+    @pytest.mark.asyncio
+    async def test_redis_error_opens_circuit_until_probe_recovers(self):
+        """Test a failed call falls back to memory and later requests skip Redis until the probe succeeds"""
+        middleware = _middleware(health_check_interval=0.01)
+        middleware._rate_script.side_effect = ConnectionError("down")
+
+        assert (await middleware._redis_rate_check("1.2.3.4"))[0] is None
+        await middleware._redis_rate_check("1.2.3.4")
+
+        assert middleware._rate_script.await_count == 1
+        assert middleware.get_stats()["memory_checks"] == 2
+        assert middleware.get_stats()["redis_healthy"] is False
+
+        middleware._ensure_health_probe()
+        await asyncio.sleep(0.05)
+        middleware._probe_task.cancel()
+        assert middleware.get_stats()["redis_healthy"] is True
+
+
+class TestLocalPrecheck:
+    """Test local allowances for clients far under their limits"""
+
+    @pytest.mark.asyncio
+    async def test_allowance_skips_redis_and_is_recorded_later(self):
+        """Test requests inside an allowance skip Redis and are sent as pending with the next check"""
+        middleware = _middleware(
+            script_result=(0, 1, 1, 1), burst_limit=41, requests_per_minute=1000,
+            requests_per_hour=10000, local_precheck=True, precheck_share=4, precheck_ttl=60
+        )
+
+        await middleware._redis_rate_check("1.2.3.4")
+        for _ in range(10):
+            assert (await middleware._redis_rate_check("1.2.3.4"))[0] is None
+        assert middleware._rate_script.await_count == 1
+
+        await middleware._redis_rate_check("1.2.3.4")
+
+        assert middleware._rate_script.await_count == 2
+        assert middleware._rate_script.call_args.kwargs["args"][4] == 10
+        assert middleware.get_stats()["local_admits"] == 10
+
+    @pytest.mark.asyncio
+    async def test_no_allowance_near_limit(self):
+        """Test a client close to a limit is checked against Redis every time"""
+        middleware = _middleware(
+            script_result=(0, 8, 8, 8), burst_limit=10, local_precheck=True, precheck_share=4
+        )
+
+        await middleware._redis_rate_check("1.2.3.4")
+        await middleware._redis_rate_check("1.2.3.4")
+
+        assert middleware._rate_script.await_count == 2
+
+
+class TestDispatch:
+    """Test the middleware end to end"""
+
+    def test_headers_use_script_counts(self):
+        """Test remaining headers come from the scripted counts and a limit returns 429"""
+        app = FastAPI()
+
+        @app.get("/api/ping")
+        def ping():
+            return {"ok": True}
+
+        app.add_middleware(RateLimitMiddleware, requests_per_minute=60, requests_per_hour=1000)
+        client = TestClient(app)
+        client.get("/api/ping")
+        middleware = app.middleware_stack.app
+        middleware.use_redis = True
+        middleware._redis_healthy = True
+        middleware._rate_script = AsyncMock(return_value=[0, 1, 15, 100])
+        middleware._ensure_health_probe = lambda: None
+
+        response = client.get("/api/ping")
+        assert response.headers["X-RateLimit-Remaining-Minute"] == "45"
+        assert response.headers["X-RateLimit-Remaining-Hour"] == "900"
+
+        middleware._rate_script.return_value = [1, 10, 15, 100]
+        response = client.get("/api/ping")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "10"
+
+    def test_probe_cancelled_on_shutdown(self):
+        """Test the background Redis probe stops with the application"""
+        app = FastAPI()
+
+        @app.get("/api/ping")
+        def ping():
+            return {"ok": True}
+
+        app.add_middleware(RateLimitMiddleware, health_check_interval=60)
+        with TestClient(app) as client:
+            middleware = app.middleware_stack.app
+            middleware.use_redis = True
+            middleware.redis_client = AsyncMock()
+            middleware._rate_script = AsyncMock(return_value=[0, 1, 1, 1])
+            client.get("/api/ping")
+            task = middleware._probe_task
+            assert task is not None and not task.done()
+
+        assert task.cancelled()
+        assert middleware._probe_task is None
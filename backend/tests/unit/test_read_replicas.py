@@ -0,0 +1,134 @@
+"""
+Unit tests for read-replica routing
+Tests statement routing, read-your-writes stickiness, lag-aware fallback and pool registration,
+using two SQLite files as primary and replica
+"""
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import backend.db.models  # noqa: F401 - registers every table on Base.metadata
+from backend.db.database import Base
+from backend.db.models import User
+from backend.db.routing import ReplicaRouter, RoutingSession
+from backend.services.connection_pool_manager import ConnectionPoolManager
+
+
+def _engine(path, username):
+    """Database whose single user's name tells which engine answered"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, email="ada@example.com", username=username, hashed_password="hash", is_active=True))
+    db.commit()
+    db.close()
+    return engine
+
+
+@pytest.fixture
+def engines(tmp_path):
+    primary, replica = _engine(tmp_path / "primary.db", "primary"), _engine(tmp_path / "replica.db", "replica")
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def router(engines):
+    return ReplicaRouter({"replica-1": engines[1]}, max_lag_s=5.0, check_interval_s=60, lag_probe=lambda engine: 0.0)
+
+
+@pytest.fixture
+def sessions(engines, router):
+    return sessionmaker(class_=RoutingSession, router=router, bind=engines[0], expire_on_commit=False)
+
+
+def _source(db, **options):
+    return db.execute(select(User.username).where(User.id == 1).execution_options(**options)).scalar()
+
+
+class TestStatementRouting:
+    """Test which engine each statement goes to"""
+
+    def test_read_only_and_marked_reads(self, sessions):
+        """Test read-only sessions and marked queries read from the replica, everything else from the primary"""
+        db = sessions()
+        read_db = sessions(read_only=True)
+
+        assert _source(db) == "primary"
+        assert _source(db, use_replica=True) == "replica"
+        assert db.query(User.username).execution_options(use_replica=True).scalar() == "replica"
+        assert _source(read_db) == "replica"
+        assert _source(read_db, use_replica=False) == "primary"
+        assert read_db.execute(select(User.username).with_for_update()).scalar() == "primary"
+
+    def test_read_your_writes(self, sessions):
+        """Test a write pins the session, and sessions linked to it, to the primary"""
+        db = sessions()
+        read_db = sessions(read_only=True, linked=db)
+        assert _source(read_db) == "replica"
+
+        db.get(User, 1).username = "primary-updated"
+        db.commit()
+
+        assert _source(db, use_replica=True) == "primary-updated"
+        assert _source(read_db) == "primary-updated"
+
+    def test_no_router_stays_on_primary(self, engines):
+        """Test sessions without replicas never route"""
+        db = sessionmaker(class_=RoutingSession, bind=engines[0])(read_only=True)
+
+        assert _source(db, use_replica=True) == "primary"
+
+    def test_get_read_db_without_replicas(self):
+        """Test the dependency hands out the request session when no replicas are configured"""
+        from backend.db import database
+
+        db = object()
+        with patch.object(database, "replica_router", None):
+            assert list(database.get_read_db(db)) == [db]
+
+
+class TestLagFallback:
+    """Test lagging and failing replicas are skipped"""
+
+    def test_lagging_replica_falls_back(self, engines, sessions, router):
+        """Test reads go to the primary while the replica lags and return once it catches up"""
+        lag = {"s": 30.0}
+        router.lag_probe = lambda engine: lag["s"]
+        router.refresh(force=True)
+
+        assert _source(sessions(read_only=True)) == "primary"
+        assert router.get_stats()["replicas"]["replica-1"]["lag_s"] == 30.0
+        assert router.fallbacks == 1
+
+        lag["s"] = 0.5
+        router.refresh(force=True)
+        assert _source(sessions(read_only=True)) == "replica"
+
+    def test_unreachable_replica_falls_back(self, sessions, router):
+        """Test a failing lag probe marks the replica unhealthy"""
+        def probe(engine):
+            raise ConnectionError("replica down")
+
+        router.lag_probe = probe
+        router.refresh(force=True)
+
+        assert _source(sessions(read_only=True)) == "primary"
+        assert router.get_stats()["replicas"]["replica-1"]["error"] == "replica down"
+
+
+class TestPoolMonitoring:
+    """Test routed engines appear in the pool monitoring"""
+
+    def test_engines_registered(self, tmp_path, engines):
+        """Test primary and replica pools are tracked by name"""
+        manager = ConnectionPoolManager()
+        with patch("backend.services.connection_pool_manager.connection_pool_manager", manager):
+            router = ReplicaRouter.from_urls(engines[0], [f"sqlite:///{tmp_path / 'replica.db'}"])
+
+        assert set(manager.get_pool_metrics()) == {"primary", "replica-1"}
+        assert [replica.name for replica in router.replicas] == ["replica-1"]
+        router.replicas[0].engine.dispose()
@@ -0,0 +1,144 @@
+"""
+Unit tests for RequestValidationMiddleware
+Tests the compiled single-pass pattern scan and incremental body inspection without buffering
+"""
+import json
+
+import pytest
+
+from backend.core.security_middleware import RequestValidationMiddleware
+
+
+def _scope(method="GET", path="/api/posts", query_string=b"", headers=None):
+    return {
+        "type": "http",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "query_string": query_string,
+        "headers": [(b"host", b"testserver")] + (headers or []),
+        "client": ("10.0.0.1", 1234),
+    }
+
+
+class _BodyApp:
+    """App that reads the whole body chunk by chunk and echoes how much it saw"""
+
+    def __init__(self):
+        self.chunks = []
+        self.disconnected = False
+
+    async def __call__(self, scope, receive, send):
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                self.disconnected = True
+                raise RuntimeError("client disconnected")
+            self.chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": str(sum(map(len, self.chunks))).encode()})
+
+
+async def _run(middleware, scope, chunks=()):
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ] or [{"type": "http.request", "body": b"", "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    return sent[0]["status"], b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+
+
+class TestPatternScan:
+    """Test the compiled pattern set"""
+
+    def test_reports_category_and_pattern(self):
+        """Test each category is reported with the pattern that matched, case-insensitively"""
+        middleware = RequestValidationMiddleware(app=None)
+
+        assert middleware.check_suspicious_content("id=1 UNION SELECT pw") == \
+            "Potential SQL injection attempt: union select"
+        assert middleware.check_suspicious_content("<SCRIPT>alert(1)") == "Potential XSS attempt: <script"
+        assert middleware.check_suspicious_content("file=../../etc") == "Potential path traversal attempt: ../"
+        assert middleware.check_suspicious_content("just a normal post about union station") is None
+
+    @pytest.mark.asyncio
+    async def test_encoded_query_parameter_is_rejected(self):
+        """Test patterns are found in decoded query values"""
+        app = _BodyApp()
+        middleware = RequestValidationMiddleware(app)
+
+        status, body = await _run(middleware, _scope(query_string=b"q=%3Cscript%3Ealert(1)"))
+
+        assert status == 400
+        assert json.loads(body)["message"] == "Request contains suspicious content"
+        assert app.chunks == []
+
+    @pytest.mark.asyncio
+    async def test_skipped_headers_and_exempt_paths(self):
+        """Test cookies are not inspected and health checks bypass validation"""
+        middleware = RequestValidationMiddleware(_BodyApp())
+
+        assert (await _run(middleware, _scope(headers=[(b"cookie", b"x=../")])))[0] == 200
+        assert (await _run(middleware, _scope(path="/health", query_string=b"q=../")))[0] == 200
+        assert (await _run(middleware, _scope(headers=[(b"referer", b"javascript:alert(1)")])))[0] == 400
+
+
+class TestBodyInspection:
+    """Test body chunks are inspected as the app reads them"""
+
+    @pytest.mark.asyncio
+    async def test_pattern_split_across_chunks(self):
+        """Test a pattern straddling two chunks is rejected and the app sees a disconnect"""
+        app = _BodyApp()
+        middleware = RequestValidationMiddleware(app)
+
+        status, body = await _run(middleware, _scope("POST"), [b'{"text": "drop ta', b'ble users"}'])
+
+        assert status == 400
+        assert json.loads(body)["error"] == "Invalid request"
+        assert app.disconnected is True
+
+    @pytest.mark.asyncio
+    async def test_chunks_reach_app_unchanged(self):
+        """Test the app receives the client's own chunks rather than a buffered copy"""
+        app = _BodyApp()
+        middleware = RequestValidationMiddleware(app)
+        chunks = [b"a" * 4096, b"b" * 4096, b"c" * 4096]
+
+        status, body = await _run(middleware, _scope("PUT"), chunks)
+
+        assert status == 200
+        assert app.chunks == chunks
+
+    @pytest.mark.asyncio
+    async def test_only_first_10kb_inspected(self):
+        """Test content past the scan limit streams through uninspected"""
+        app = _BodyApp()
+        middleware = RequestValidationMiddleware(app)
+        chunks = [b"x" * 8192, b"y" * 8192 + b"<script>", b"z" * 65536]
+
+        status, body = await _run(middleware, _scope("POST"), chunks)
+
+        assert status == 200
+        assert body == str(sum(map(len, chunks))).encode()
+
+    @pytest.mark.asyncio
+    async def test_app_error_becomes_500(self):
+        """Test an exception raised before the response starts is returned as a 500"""
+        async def failing_app(scope, receive, send):
+            raise RuntimeError("database unavailable")
+
+        status, body = await _run(RequestValidationMiddleware(failing_app), _scope("POST"), [b'{"ok": true}'])
+
+        assert status == 500
+        assert json.loads(body)["error"] == "Internal server error"
@@ -0,0 +1,195 @@
+"""
+Unit tests for the deep research execution engine
+Tests search deduplication/caching, run checkpoints and concurrent topic research
+"""
+import asyncio
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from backend.agents.research_engine import (
+    ResearchExecutionEngine,
+    ResearchRunCheckpoint,
+    SearchResultCache,
+)
+from backend.agents.deep_research_agent import DeepResearchAgent, ResearchFinding, ResearchTopic
+
+
+def _finding(topic_name, idx=0):
+    now = datetime(2026, 10, 18, 12, 0, 0)
+    return ResearchFinding(
+        id=f"{topic_name}-{idx}",
+        topic=topic_name,
+        title=f"Finding {idx}",
+        content="content",
+        source_url="https://example.com",
+        source_type="news",
+        relevance_score=0.9,
+        credibility_score=0.8,
+        publish_date=now,
+        discovered_at=now,
+        keywords=["k"],
+        summary="summary",
+        insights=["insight"],
+        implications=["implication"],
+        trending_indicators={"urgency": "high"},
+    )
+
+
+class TestSearchResultCache:
+    """Test day-scoped search caching"""
+
+    @pytest.mark.asyncio
+    async def test_identical_in_flight_queries_share_one_fetch(self, tmp_path):
+        """Test concurrent identical queries trigger a single provider call"""
+        cache = SearchResultCache(tmp_path)
+        calls = []
+
+        async def fetch(query):
+            calls.append(query)
+            await asyncio.sleep(0.02)
+            return [{"url": "https://example.com", "title": query}]
+
+        results = await asyncio.gather(*[
+            cache.get_or_fetch("AI  Trends", fetch),
+            cache.get_or_fetch("ai trends", fetch),
+            cache.get_or_fetch("AI trends", fetch),
+        ])
+
+        assert len(calls) == 1
+        assert results[0] == results[1] == results[2]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_releases_waiters(self, tmp_path):
+        """Test waiters fetch for themselves when the fetching caller is cancelled"""
+        cache = SearchResultCache(tmp_path)
+        calls = []
+
+        async def fetch(query):
+            calls.append(query)
+            await asyncio.sleep(0.05 if len(calls) == 1 else 0)
+            return [{"url": "https://example.com", "title": query}]
+
+        leader = asyncio.create_task(cache.get_or_fetch("ai trends", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_fetch("ai trends", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        results = await asyncio.wait_for(waiter, timeout=1)
+
+        assert leader.cancelled()
+        assert results == [{"url": "https://example.com", "title": "ai trends"}]
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_results_persist_per_day(self, tmp_path):
+        """Test a new cache instance reuses results for the same day only"""
+        fetch = AsyncMock(return_value=[{"url": "https://example.com"}])
+
+        await SearchResultCache(tmp_path).get_or_fetch("fintech", fetch, day="20261018")
+        await SearchResultCache(tmp_path).get_or_fetch("fintech", fetch, day="20261018")
+        await SearchResultCache(tmp_path).get_or_fetch("fintech", fetch, day="20261019")
+
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_results_not_cached(self, tmp_path):
+        """Test failed (empty) searches are retried on the next call"""
+        cache = SearchResultCache(tmp_path)
+        fetch = AsyncMock(return_value=[])
+
+        await cache.get_or_fetch("fintech", fetch)
+        await cache.get_or_fetch("fintech", fetch)
+
+        assert fetch.await_count == 2
+
+
+class TestResearchRunCheckpoint:
+    """Test durable per-run checkpoints"""
+
+    def test_checkpoint_survives_restart(self, tmp_path):
+        """Test recorded topics are visible to a fresh checkpoint for the same run"""
+        run_date = datetime(2026, 10, 18)
+        ResearchRunCheckpoint(tmp_path, "fintech", run_date).record_topic("Trends", [_finding("Trends")])
+
+        resumed = ResearchRunCheckpoint(tmp_path, "fintech", run_date)
+
+        assert list(resumed.completed_topics()) == ["Trends"]
+        assert resumed.completed_topics()["Trends"][0]["id"] == "Trends-0"
+
+    def test_clear_removes_checkpoint(self, tmp_path):
+        """Test a finished run leaves nothing to resume"""
+        run_date = datetime(2026, 10, 18)
+        checkpoint = ResearchRunCheckpoint(tmp_path, "fintech", run_date)
+        checkpoint.record_topic("Trends", [])
+        checkpoint.clear()
+
+        assert ResearchRunCheckpoint(tmp_path, "fintech", run_date).completed_topics() == {}
+
+
+class TestConcurrentWeeklyResearch:
+    """Test conduct_weekly_research fan-out and resume"""
+
+    @pytest.fixture
+    def agent(self, tmp_path):
+        agent = DeepResearchAgent()
+        agent.engine = ResearchExecutionEngine(tmp_path)
+        agent._synthesize_intelligence = AsyncMock(return_value="report")
+        agent._store_intelligence_report = AsyncMock()
+        agent._update_knowledge_base = AsyncMock()
+        agent._generate_content_opportunities = AsyncMock()
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_wall_clock_tracks_slowest_topic(self, agent):
+        """Test topics run concurrently rather than back to back"""
+        topics = [ResearchTopic(name=f"Topic {i}", keywords=["k"], priority=5) for i in range(4)]
+
+        async def slow_research(topic):
+            await asyncio.sleep(0.1)
+            return [_finding(topic.name)]
+
+        agent._research_topic = slow_research
+
+        start = time.monotonic()
+        await agent.conduct_weekly_research("fintech", topics)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.3
+        findings = agent._synthesize_intelligence.await_args.args[1]
+        assert sorted(f.topic for f in findings) == [t.name for t in topics]
+        assert all(t.last_researched is not None for t in topics)
+
+    @pytest.mark.asyncio
+    async def test_crashed_run_resumes_from_checkpoint(self, agent):
+        """Test topics finished before a crash are not researched again"""
+        topics = [ResearchTopic(name=name, keywords=["k"], priority=5) for name in ("Done", "Pending")]
+        agent.engine.checkpoint("fintech", datetime.utcnow()).record_topic("Done", [_finding("Done")])
+        agent._research_topic = AsyncMock(side_effect=lambda topic: [_finding(topic.name)])
+
+        await agent.conduct_weekly_research("fintech", topics)
+
+        researched = [call.args[0].name for call in agent._research_topic.await_args_list]
+        assert researched == ["Pending"]
+        findings = agent._synthesize_intelligence.await_args.args[1]
+        assert {f.topic for f in findings} == {"Done", "Pending"}
+        assert isinstance(findings[0].publish_date, datetime)
+
+    @pytest.mark.asyncio
+    async def test_failed_topic_does_not_abort_run(self, agent):
+        """Test one failing topic leaves the others' findings intact"""
+        topics = [ResearchTopic(name=name, keywords=["k"], priority=5) for name in ("Good", "Bad")]
+
+        async def research(topic):
+            if topic.name == "Bad":
+                raise RuntimeError("boom")
+            return [_finding(topic.name)]
+
+        agent._research_topic = research
+
+        await agent.conduct_weekly_research("fintech", topics)
+
+        findings = agent._synthesize_intelligence.await_args.args[1]
+        assert [f.topic for f in findings] == ["Good"]
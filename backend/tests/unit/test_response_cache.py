@@ -0,0 +1,184 @@
+"""
+Unit tests for the dashboard response cache
+Tests ETag revalidation, key normalization, the Redis tier and invalidation on committed writes
+"""
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, Query
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import backend.db.models  # noqa: F401 - registers every table on Base.metadata
+from backend.core import response_cache as response_cache_module
+from backend.core.response_cache import ResponseCache, register_invalidation_hooks
+from backend.db.database import Base
+from backend.db.models import ContentItem, ContentPerformanceSnapshot, User
+
+
+class _FakeRedis:
+    """Dict-backed stand-in for the binary Redis client (hashes only)"""
+
+    def __init__(self):
+        self.data = {}
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = value
+
+    def expire(self, key, seconds):
+        pass
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        pass
+
+
+class Summary(BaseModel):
+    user_id: int
+    days: int
+    total: int
+
+
+def _app(cache, calls):
+    app = FastAPI()
+
+    @app.get("/summary", response_model=Summary)
+    @cache.cached("summary", scope="user_id")
+    async def summary(user_id: int = Query(...), days: int = Query(30)):
+        calls.append((user_id, days))
+        return Summary(user_id=user_id, days=days, total=len(calls))
+
+    return TestClient(app)
+
+
+class TestConditionalGet:
+    """Test cached endpoints answer polls from the cache"""
+
+    def test_etag_revalidation(self):
+        """Test a repeated poll with If-None-Match gets an empty 304 without running the endpoint"""
+        calls = []
+        client = _app(ResponseCache(local_ttl=60), calls)
+
+        first = client.get("/summary", params={"user_id": 1})
+        again = client.get("/summary", params={"user_id": 1}, headers={"If-None-Match": first.headers["etag"]})
+
+        assert first.status_code == 200
+        assert first.json() == {"user_id": 1, "days": 30, "total": 1}
+        assert first.headers["cache-control"] == "private, no-cache"
+        assert again.status_code == 304
+        assert again.content == b""
+        assert len(calls) == 1
+
+    def test_query_order_and_users(self):
+        """Test parameter order shares an entry while users and parameter values do not"""
+        calls = []
+        client = _app(ResponseCache(local_ttl=60), calls)
+
+        a = client.get("/summary?user_id=1&days=7")
+        b = client.get("/summary?days=7&user_id=1")
+        client.get("/summary?user_id=1&days=14")
+        client.get("/summary?user_id=2&days=7")
+
+        assert a.headers["etag"] == b.headers["etag"]
+        assert calls == [(1, 7), (1, 14), (2, 7)]
+
+    def test_gzip_stored_and_decoded_on_demand(self):
+        """Test the compressed body is sent to gzip clients and decompressed for the rest"""
+        client = _app(ResponseCache(local_ttl=60), [])
+
+        compressed = client.get("/summary?user_id=1", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/summary?user_id=1", headers={"Accept-Encoding": "identity"})
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in plain.headers
+        assert compressed.json() == plain.json()
+        assert compressed.headers["etag"] == plain.headers["etag"]
+
+    def test_redis_tier_shared(self):
+        """Test a second process serves the response stored by the first"""
+        redis_client, calls = _FakeRedis(), []
+        _app(ResponseCache(redis_client=redis_client), calls).get("/summary?user_id=1")
+        other = ResponseCache(redis_client=redis_client)
+
+        response = _app(other, calls).get("/summary?user_id=1")
+
+        assert response.json()["total"] == 1
+        assert len(calls) == 1
+        assert other.get_stats()["redis_hits"] == 1
+
+    def test_invalidate_drops_both_tiers(self):
+        """Test invalidation makes the next poll recompute, and a result computed across it is not stored"""
+        redis_client, calls = _FakeRedis(), []
+        cache = ResponseCache(redis_client=redis_client, local_ttl=60)
+        client = _app(cache, calls)
+        client.get("/summary?user_id=1")
+
+        cache.invalidate(cache.scope_for(1))
+        assert redis_client.data == {}
+        assert client.get("/summary?user_id=1").json()["total"] == 2
+
+        generation = cache.generation("user:1")
+        cache.invalidate("user:1")
+        cache.set("user:1", "stale", b"{}", generation)
+        assert cache.get("user:1", "stale") is None
+
+
+@pytest.fixture
+def sessions():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+
+    db = factory()
+    db.add(User(id=1, email="ada@example.com", username="ada", hashed_password="hash", is_active=True))
+    db.add(ContentItem(id="c1", user_id=1, content="hello", platform="twitter", content_type="text"))
+    db.commit()
+    db.close()
+
+    register_invalidation_hooks()
+    yield factory
+    engine.dispose()
+
+
+class TestWriteInvalidation:
+    """Test committed content and metrics writes invalidate their owner's responses"""
+
+    def test_commit_invalidates_owner(self, sessions):
+        """Test updates and new snapshots invalidate on commit only"""
+        with patch.object(response_cache_module.response_cache, "invalidate") as invalidate:
+            db = sessions()
+            db.get(ContentItem, "c1").likes_count = 5
+            db.flush()
+            invalidate.assert_not_called()
+            db.commit()
+            invalidate.assert_called_once_with("user:1")
+
+            # Owner looked up for a snapshot whose item is not loaded
+            invalidate.reset_mock()
+            db = sessions()
+            db.add(ContentPerformanceSnapshot(content_item_id="c1"))
+            db.commit()
+            invalidate.assert_called_once_with("user:1")
+
+    def test_rollback_discards(self, sessions):
+        """Test rolled-back writes invalidate nothing"""
+        with patch.object(response_cache_module.response_cache, "invalidate") as invalidate:
+            db = sessions()
+            db.get(ContentItem, "c1").likes_count = 5
+            db.flush()
+            db.rollback()
+            db.commit()
+
+            invalidate.assert_not_called()
@@ -0,0 +1,161 @@
+"""
+Unit tests for the scheduled post dispatcher
+Tests due-index claims, ETA hand-off, idempotency dedupe and dispatch lag percentiles
+"""
+import time
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, Mock, patch
+
+import redis
+
+from backend.db.models import ContentSchedule
+from backend.services.schedule_dispatcher import ScheduleDispatcher
+
+
+def _schedule(due_in_s: float, status: str = "scheduled", key: str = None) -> ContentSchedule:
+    return ContentSchedule(
+        id=uuid.uuid4(),
+        organization_id=uuid.uuid4(),
+        connection_id=uuid.uuid4(),
+        content="hello",
+        content_hash="hash",
+        media_urls=[],
+        scheduled_for=datetime.now(timezone.utc) + timedelta(seconds=due_in_s),
+        status=status,
+        idempotency_key=key or f"key-{uuid.uuid4()}"
+    )
+
+
+class TestScheduleDispatcher:
+    """Test ScheduleDispatcher"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.mock_redis = Mock(spec=redis.Redis)
+        self.claim_script = Mock(return_value=[])
+        self.mock_redis.register_script.return_value = self.claim_script
+        self.pipe = MagicMock()
+        self.mock_redis.pipeline.return_value = self.pipe
+        self.mock_redis.zrange.return_value = []
+        self.mock_redis.zcard.return_value = 0
+        self.dispatcher = ScheduleDispatcher(redis_client=self.mock_redis, lookahead_s=60, batch_size=100)
+        self.db = MagicMock()
+
+    def _claimable(self, rows):
+        self.claim_script.side_effect = [
+            [value for row in rows for value in (str(row.id).encode(), str(row.scheduled_for.timestamp()).encode())],
+            []
+        ]
+        self.db.query.return_value.filter.return_value.all.return_value = rows
+
+    def test_claim_due_decodes_members_and_scores(self):
+        """Test the Lua claim result is decoded into (schedule_id, due_ts) pairs"""
+        self.claim_script.return_value = [b"a", b"100.5", b"b", b"101"]
+
+        assert self.dispatcher.claim_due(200) == [("a", 100.5), ("b", 101.0)]
+        kwargs = self.claim_script.call_args[1]
+        assert kwargs["keys"] == ["schedule:due"]
+        assert kwargs["args"] == [200, 100]
+
+    def test_due_rows_enqueued_with_exact_eta(self):
+        """Test due schedules go to Celery with eta=scheduled_for and move to publishing"""
+        rows = [_schedule(5), _schedule(30)]
+        self._claimable(rows)
+        self.pipe.execute.return_value = [True, True]
+
+        with patch.object(self.dispatcher, "_enqueue") as enqueue:
+            result = self.dispatcher.dispatch_due(self.db)
+
+        assert result["dispatched"] == 2
+        assert [c.args[0] for c in enqueue.call_args_list] == rows
+        self.db.query.return_value.filter.return_value.update.assert_called_once_with(
+            {"status": "publishing"}, synchronize_session=False
+        )
+        self.db.commit.assert_called_once()
+
+    def test_duplicate_idempotency_key_not_enqueued_twice(self):
+        """Test a schedule whose idempotency key was already claimed is skipped"""
+        rows = [_schedule(5, key="same"), _schedule(6)]
+        self._claimable(rows)
+        self.pipe.execute.return_value = [None, True]
+
+        with patch.object(self.dispatcher, "_enqueue") as enqueue:
+            result = self.dispatcher.dispatch_due(self.db)
+
+        assert result["dispatched"] == 1
+        assert enqueue.call_args[0][0] is rows[1]
+        assert self.dispatcher.stats["duplicates"] == 1
+        self.pipe.set.assert_any_call("schedule:claimed:same", str(rows[0].id), nx=True, ex=self.dispatcher.claim_ttl_s)
+
+    def test_stale_and_rescheduled_rows(self):
+        """Test published rows are dropped and rows moved later go back into the index"""
+        published = _schedule(5, status="published")
+        moved = _schedule(3600)
+        self._claimable([published, moved])
+
+        with patch.object(self.dispatcher, "_enqueue") as enqueue:
+            result = self.dispatcher.dispatch_due(self.db)
+
+        assert result["dispatched"] == 0
+        enqueue.assert_not_called()
+        assert self.dispatcher.stats["stale"] == 1
+        self.mock_redis.zadd.assert_called_once_with("schedule:due", {str(moved.id): moved.scheduled_for.timestamp()})
+
+    def test_enqueue_failure_releases_claim_and_reindexes(self):
+        """Test a broker error leaves the schedule claimable on the next run"""
+        row = _schedule(5, key="k1")
+        self._claimable([row])
+        self.pipe.execute.return_value = [True]
+
+        with patch.object(self.dispatcher, "_enqueue", side_effect=ConnectionError("broker down")):
+            result = self.dispatcher.dispatch_due(self.db)
+
+        assert result["dispatched"] == 0
+        self.mock_redis.delete.assert_called_once_with("schedule:claimed:k1")
+        self.mock_redis.zadd.assert_called_once_with("schedule:due", {str(row.id): row.scheduled_for.timestamp()})
+        self.db.commit.assert_not_called()
+
+    def test_register_indexes_future_and_dispatches_imminent(self):
+        """Test far-off schedules are indexed while ones inside the lookahead go out immediately"""
+        later = _schedule(3600)
+        soon = _schedule(10)
+        self.pipe.execute.return_value = [True]
+
+        with patch.object(self.dispatcher, "_enqueue") as enqueue:
+            assert self.dispatcher.register(later, self.db) is False
+            assert self.dispatcher.register(soon, self.db) is True
+
+        self.mock_redis.zadd.assert_called_once_with("schedule:due", {str(later.id): later.scheduled_for.timestamp()})
+        enqueue.assert_called_once_with(soon)
+
+
+class TestDispatchLag:
+    """Test dispatch lag metric"""
+
+    def test_lag_recorded_in_bounded_list(self):
+        """Test lag samples are pushed in ms and trimmed to lag_samples"""
+        mock_redis = Mock(spec=redis.Redis)
+        pipe = MagicMock()
+        mock_redis.pipeline.return_value = pipe
+        dispatcher = ScheduleDispatcher(redis_client=mock_redis, lag_samples=10)
+        now = time.time()
+
+        dispatcher.record_lag(datetime.fromtimestamp(now - 0.25, tz=timezone.utc), started_at=now)
+
+        pipe.lpush.assert_called_once_with("schedule:dispatch_lag", pytest.approx(250.0, abs=0.2))
+        pipe.ltrim.assert_called_once_with("schedule:dispatch_lag", 0, 9)
+
+    def test_lag_percentiles(self):
+        """Test p50/p99 are computed over the stored samples"""
+        mock_redis = Mock(spec=redis.Redis)
+        mock_redis.lrange.return_value = [str(ms).encode() for ms in range(1, 101)]
+        dispatcher = ScheduleDispatcher(redis_client=mock_redis)
+
+        stats = dispatcher.get_lag_stats()
+
+        assert stats["samples"] == 100
+        assert stats["p50_ms"] == 50.0
+        assert stats["p99_ms"] == 99.0
+        assert stats["max_ms"] == 100.0
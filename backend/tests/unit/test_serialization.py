@@ -0,0 +1,147 @@
+"""
+Unit tests for the JSON serialization layer
+Tests parity with Pydantic/stdlib output, the stdlib fallback, direct row encoding and websocket frames
+"""
+import asyncio
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from types import SimpleNamespace
+from typing import List, Optional
+from unittest.mock import AsyncMock, patch
+from uuid import UUID
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from backend.core import serialization
+from backend.core.serialization import FastJSONResponse, RowEncoder, dumps, dumps_str, loads
+
+
+class Tier(str, Enum):
+    HIGH = "high"
+
+
+class Item(BaseModel):
+    id: str
+    published_at: Optional[datetime]
+    likes_count: int = 0
+    performance_tier: str = "unknown"
+    hashtags: List[str] = []
+
+
+PAYLOAD = {
+    "when": datetime(2026, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc),
+    "naive": datetime(2026, 5, 1, 12, 30),
+    "id": UUID("12345678-1234-5678-1234-567812345678"),
+    "tier": Tier.HIGH,
+    "price": Decimal("1.50"),
+    "count": Decimal("3"),
+    "tags": {"a"},
+    "model": Item(id="x", published_at=None),
+    "vector": np.arange(3, dtype=np.float32),
+    "text": "café 🚀",
+    1: "non-string key",
+}
+
+
+class TestDumps:
+    """Test encoder output"""
+
+    def test_matches_pydantic_json_mode(self):
+        """Test common types encode the way Pydantic response models do"""
+        item = Item(id="1", published_at=datetime(2026, 5, 1, tzinfo=timezone.utc), hashtags=["ai"])
+
+        assert loads(dumps(item)) == json.loads(item.model_dump_json())
+        assert loads(dumps(PAYLOAD)) == {
+            "when": "2026-05-01T12:30:15.250000Z",
+            "naive": "2026-05-01T12:30:00",
+            "id": "12345678-1234-5678-1234-567812345678",
+            "tier": "high",
+            "price": 1.5,
+            "count": 3,
+            "tags": ["a"],
+            "model": {"id": "x", "published_at": None, "likes_count": 0, "performance_tier": "unknown", "hashtags": []},
+            "vector": [0.0, 1.0, 2.0],
+            "text": "café 🚀",
+            "1": "non-string key",
+        }
+
+    def test_stdlib_fallback_same_result(self):
+        """Test output is identical without orjson installed"""
+        fast = loads(dumps(PAYLOAD))
+        with patch.object(serialization, "ORJSON_AVAILABLE", False):
+            fallback = dumps(PAYLOAD)
+
+        assert json.loads(fallback) == fast
+
+    def test_wide_integers_and_default(self):
+        """Test integers beyond 64 bits still encode and ``default`` handles unknown types"""
+        class Opaque:
+            def __str__(self):
+                return "opaque"
+
+        assert loads(dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+        assert loads(dumps({"x": Opaque()}, default=str)) == {"x": "opaque"}
+        assert dumps_str([1, 2], indent=True) == "[\n  1,\n  2\n]"
+
+
+class TestRowEncoder:
+    """Test ORM rows encoded without intermediate models"""
+
+    def test_row_matches_response_model(self):
+        """Test encoded rows equal the model's JSON, including falsy-to-default fields"""
+        row = SimpleNamespace(
+            id="c1", published_at=datetime(2026, 5, 1, 9, tzinfo=timezone.utc),
+            likes_count=None, performance_tier="", hashtags=None, internal="ignored"
+        )
+        expected = Item(
+            id=row.id, published_at=row.published_at,
+            likes_count=row.likes_count or 0, performance_tier=row.performance_tier or "unknown",
+            hashtags=row.hashtags or []
+        )
+
+        encoded = RowEncoder(Item).encode_rows([row])
+
+        assert loads(dumps(encoded)) == [json.loads(expected.model_dump_json())]
+
+    def test_response_skips_model_validation(self):
+        """Test a list endpoint returning encoded rows produces the response_model body"""
+        rows = [SimpleNamespace(id=str(i), published_at=None, likes_count=i, performance_tier="high", hashtags=["x"])
+                for i in range(3)]
+        app = FastAPI(default_response_class=FastJSONResponse)
+
+        @app.get("/model", response_model=List[Item])
+        def via_model():
+            return [Item(**vars(row)) for row in rows]
+
+        @app.get("/rows", response_model=List[Item])
+        def via_rows():
+            return FastJSONResponse(RowEncoder(Item).encode_rows(rows))
+
+        client = TestClient(app)
+        assert client.get("/rows").content == client.get("/model").content
+
+
+class TestWebSocketFrames:
+    """Test websocket messages are encoded once per broadcast"""
+
+    def test_broadcast_encodes_once(self):
+        """Test every connection receives the same frame from a single encode"""
+        from backend.services.websocket_manager import ConnectionManager, MessageType, WebSocketMessage
+
+        manager = ConnectionManager()
+        sockets = [AsyncMock(), AsyncMock(), AsyncMock()]
+        manager.user_connections = {1: sockets[:2], 2: sockets[2:]}
+        message = WebSocketMessage(type=list(MessageType)[0], data={"at": datetime(2026, 5, 1)}, user_id=1)
+
+        with patch.object(WebSocketMessage, "to_json", autospec=True, side_effect=WebSocketMessage.to_json) as to_json:
+            asyncio.run(manager.send_to_all_users(message))
+
+        assert to_json.call_count == 1
+        frames = {socket.send_text.await_args.args[0] for socket in sockets}
+        assert len(frames) == 1
+        assert loads(frames.pop())["data"] == {"at": "2026-05-01T00:00:00"}
@@ -0,0 +1,176 @@
+"""
+Unit tests for shared, versioned vector index snapshots
+Tests atomic publish, legacy layouts, memory-mapped loading and cross-process reloads
+"""
+import json
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from backend.core.shared_index import IndexSnapshots, load_array, save_array
+from backend.core.simple_vector_search import SimpleVectorSearch
+from backend.core.vector_store import FAISS_AVAILABLE, VectorStore
+
+
+def _unit(seed, dimension=8):
+    vector = np.random.default_rng(seed).random(dimension).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _simple_search(path, dimension=8):
+    with patch("backend.core.simple_vector_search.OpenAI"):
+        search = SimpleVectorSearch(dimension=dimension, index_path=str(path))
+    search._snapshots.check_interval_s = 0
+    return search
+
+
+class TestIndexSnapshots:
+    """Test versioned snapshot directories"""
+
+    def test_publish_swaps_current(self, tmp_path):
+        """Test a publish creates a version directory and points CURRENT at it"""
+        snapshots = IndexSnapshots(str(tmp_path), check_interval_s=0)
+        assert snapshots.current_version() is None
+
+        with snapshots.publish() as directory:
+            save_array(os.path.join(directory, "vectors.npy"), np.ones((2, 3), dtype=np.float32))
+
+        version = snapshots.current_version()
+        assert version == snapshots.last_published
+        assert (tmp_path / "CURRENT").read_text() == version
+        assert load_array(snapshots.path("vectors.npy", version)).shape == (2, 3)
+        assert snapshots.has_changed(None)
+        assert not snapshots.has_changed(version)
+
+    def test_failed_publish_keeps_previous_version(self, tmp_path):
+        """Test an exception while writing discards the staging directory"""
+        snapshots = IndexSnapshots(str(tmp_path))
+        with snapshots.publish():
+            pass
+        version = snapshots.current_version()
+
+        with pytest.raises(RuntimeError):
+            with snapshots.publish() as directory:
+                (tmp_path / "versions" / os.path.basename(directory) / "partial").write_text("x")
+                raise RuntimeError("disk full")
+
+        assert snapshots.current_version() == version
+        assert os.listdir(tmp_path / "versions") == [version]
+
+    def test_old_versions_pruned(self, tmp_path):
+        """Test only the newest keep_versions snapshots remain"""
+        snapshots = IndexSnapshots(str(tmp_path), keep_versions=2)
+        for _ in range(4):
+            with snapshots.publish():
+                pass
+
+        versions = sorted(os.listdir(tmp_path / "versions"))
+        assert len(versions) == 2
+        assert versions[-1] == snapshots.current_version()
+
+    def test_legacy_layout_read_from_root(self, tmp_path):
+        """Test directories written before snapshots resolve to the index root"""
+        snapshots = IndexSnapshots(str(tmp_path))
+        assert snapshots.path("metadata.json", snapshots.current_version()) == os.path.join(str(tmp_path), "metadata.json")
+
+    def test_arrays_are_memory_mapped(self, tmp_path):
+        """Test arrays load as read-only maps rather than private copies"""
+        path = str(tmp_path / "vectors.npy")
+        save_array(path, np.ones((4, 8), dtype=np.float32))
+
+        array = load_array(path)
+
+        assert isinstance(array, np.memmap)
+        assert not array.flags.writeable
+
+
+class TestSimpleVectorSearchSnapshots:
+    """Test SimpleVectorSearch shares and republishes its vectors"""
+
+    def test_reader_sees_writer_snapshot(self, tmp_path):
+        """Test content stored by one process is visible, mapped, in another"""
+        writer = _simple_search(tmp_path)
+        reader = _simple_search(tmp_path)
+
+        with patch.object(writer, "embed_text", return_value=_unit(1)):
+            content_id = writer.store_content("hello", {"type": "post"})
+
+        with patch.object(reader, "embed_text", return_value=_unit(1)):
+            results = reader.search_similar("hello", top_k=1, threshold=0.5)
+
+        assert [r["content_id"] for r in results] == [content_id]
+        assert isinstance(reader.vectors, np.memmap)
+
+    def test_writer_builds_on_latest_snapshot(self, tmp_path):
+        """Test a second writer appends to, rather than overwrites, the published vectors"""
+        first = _simple_search(tmp_path)
+        second = _simple_search(tmp_path)
+
+        with patch.object(first, "embed_text", return_value=_unit(1)):
+            first.store_content("one", {})
+        with patch.object(second, "embed_text", return_value=_unit(2)):
+            second.store_content("two", {})
+
+        assert second.vectors.shape == (2, 8)
+        assert [meta["content"] for meta in second.metadata.values()] == ["one", "two"]
+
+    def test_legacy_files_still_load(self, tmp_path):
+        """Test vectors.npy/metadata.json in the index root are read when no snapshot exists"""
+        np.save(tmp_path / "vectors.npy", np.stack([_unit(1)]))
+        (tmp_path / "metadata.json").write_text(json.dumps({"0": {"content_id": "legacy", "content": "old"}}))
+
+        search = _simple_search(tmp_path)
+
+        assert search.vectors.shape == (1, 8)
+        assert search.metadata["0"]["content_id"] == "legacy"
+
+
+class TestVectorStoreSnapshots:
+    """Test VectorStore snapshot loading and publishing"""
+
+    def _legacy_store(self, path):
+        metadata = {str(i): {"content_id": f"c{i}", "metadata": {}, "created_at": "2026-01-01T00:00:00"} for i in range(3)}
+        (path / "metadata.json").write_text(json.dumps(metadata))
+        (path / "id_mapping.json").write_text(json.dumps({str(i): f"c{i}" for i in range(3)}))
+        np.savez_compressed(path / "vectors.npz", **{str(i): _unit(i) for i in range(3)})
+
+    def test_rebuild_vectors_loaded_on_demand(self, tmp_path):
+        """Test readers never load the rebuild vectors and do not write on teardown"""
+        self._legacy_store(tmp_path)
+        store = VectorStore(dimension=8, index_path=str(tmp_path))
+
+        assert store._stored_vectors is None
+        store.__del__()
+
+        assert not (tmp_path / "versions").exists()
+
+    def test_removal_published_to_other_instances(self, tmp_path):
+        """Test a removal is published atomically and picked up by other instances"""
+        self._legacy_store(tmp_path)
+        writer = VectorStore(dimension=8, index_path=str(tmp_path))
+        reader = VectorStore(dimension=8, index_path=str(tmp_path))
+        reader._snapshots.check_interval_s = 0
+
+        assert writer.remove_vector("c1", rebuild_index=False)
+
+        assert writer._version is not None and not writer._dirty
+        reader._refresh()
+        assert reader._version == writer._version
+        assert "c1" not in reader._id_mapping.values()
+        assert set(reader._vectors) == {"0", "2"}
+        # The legacy files are left untouched
+        assert len(json.loads((tmp_path / "metadata.json").read_text())) == 3
+
+    @pytest.mark.skipif(not FAISS_AVAILABLE, reason="faiss not installed")
+    def test_faiss_search_after_publish(self, tmp_path):
+        """Test vectors added by one instance are searchable in another after publish"""
+        writer = VectorStore(dimension=8, index_path=str(tmp_path))
+        reader = VectorStore(dimension=8, index_path=str(tmp_path))
+        reader._snapshots.check_interval_s = 0
+
+        writer.add_vectors_batch(np.stack([_unit(1), _unit(2)]), content_ids=["a", "b"])
+        results = reader.search(_unit(1), k=1, threshold=0.5)
+
+        assert [r["content_id"] for r in results] == ["a"]
@@ -0,0 +1,106 @@
+"""
+Unit tests for Celery worker profiles
+Tests queue routing, per-queue time limits, profile settings and memory-based recycling
+"""
+import pytest
+from unittest.mock import Mock, patch
+
+from celery import Celery
+from celery.worker import state
+
+from backend.tasks import worker_profiles
+from backend.tasks.worker_profiles import (
+    WORKER_PROFILES, QueueTimeLimits, apply_worker_profile, check_memory_recycle, get_worker_profile, route_for
+)
+
+
+class TestQueueRouting:
+    """Test task routes and queue time limits"""
+
+    def test_latency_sensitive_tasks_route_to_posting(self):
+        """Test publish, dispatch and posting tasks share the posting queue"""
+        assert route_for("publish_tasks.publish_via_connection") == "posting"
+        assert route_for("backend.tasks.schedule_dispatch_tasks.dispatch_due_schedules") == "posting"
+        assert route_for("backend.tasks.posting_tasks.batch_publish_posts") == "posting"
+        assert route_for("backend.tasks.lightweight_research_tasks.lightweight_daily_research") == "research"
+        assert route_for("unrouted.task") is None
+
+    def test_tasks_get_their_queue_time_limits(self):
+        """Test task_annotations apply the routed queue's limits and leave celery builtins alone"""
+        app = Celery("profiles_test")
+        app.conf.task_routes = worker_profiles.TASK_ROUTES
+        app.conf.task_annotations = [QueueTimeLimits()]
+
+        @app.task(name="autonomous_daily_content_generation")
+        def generate():
+            pass
+
+        @app.task(name="backend.tasks.webhook_tasks.process_meta_event")
+        def webhook():
+            pass
+
+        assert generate.soft_time_limit == worker_profiles.AUTONOMOUS.soft_time_limit
+        assert webhook.time_limit == worker_profiles.WEBHOOK_PROCESSING.time_limit
+        builtin = Mock()
+        builtin.name = "celery.ping"
+        assert QueueTimeLimits().annotate(builtin) is None
+
+
+class TestWorkerProfiles:
+    """Test profile definitions and application"""
+
+    def test_every_routed_queue_is_consumed(self):
+        """Test realtime/io/cpu together consume every queue tasks are routed to"""
+        consumed = {q for name in ("realtime", "io", "cpu") for q in WORKER_PROFILES[name].queue_names}
+        routed = {route["queue"] for route in worker_profiles.TASK_ROUTES.values()}
+
+        assert routed <= consumed
+        assert set(WORKER_PROFILES["all"].queue_names) == consumed
+        assert WORKER_PROFILES["realtime"].queue_names[0] == "posting"
+
+    def test_apply_profile_sets_pool_and_queues(self):
+        """Test applying a profile configures pool, concurrency and consumed queues"""
+        app = Celery("profiles_test")
+
+        apply_worker_profile(app, get_worker_profile("cpu"))
+
+        assert app.conf.worker_pool == "prefork"
+        assert app.conf.worker_max_memory_per_child == 300 * 1024
+        assert [q.name for q in app.conf.task_queues] == ["autonomous", "research"]
+
+    def test_thread_profiles_leave_recycling_to_the_hook(self):
+        """Test non-prefork profiles do not set child recycling options Celery would ignore"""
+        options = WORKER_PROFILES["realtime"].worker_options()
+
+        assert options["worker_pool"] == "threads"
+        assert options["worker_max_memory_per_child"] is None
+
+    def test_unknown_profile(self):
+        """Test an unknown profile name is rejected"""
+        with pytest.raises(ValueError):
+            get_worker_profile("gpu")
+
+
+class TestMemoryRecycle:
+    """Test warm shutdown of thread-pool workers on memory"""
+
+    def setup_method(self):
+        self.app = Celery("profiles_test")
+        apply_worker_profile(self.app, get_worker_profile("realtime"))
+
+    def teardown_method(self):
+        state.should_stop = None
+
+    def test_recycles_when_peak_rss_exceeds_limit(self):
+        """Test the worker is asked to stop once peak RSS passes the profile limit"""
+        usage = Mock(ru_maxrss=WORKER_PROFILES["realtime"].max_memory_per_child_kb + 1)
+        with patch.object(worker_profiles.resource, "getrusage", return_value=usage):
+            assert check_memory_recycle(self.app) is True
+        assert state.should_stop == 0
+
+    def test_no_recycle_under_limit(self):
+        """Test nothing happens below the limit"""
+        usage = Mock(ru_maxrss=1024)
+        with patch.object(worker_profiles.resource, "getrusage", return_value=usage):
+            assert check_memory_recycle(self.app) is False
+        assert state.should_stop is None
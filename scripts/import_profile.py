@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Import-time profiling report for API cold starts
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and
+summarises where the time goes:
+- total import time and peak RSS of the process
+- the slowest modules by cumulative and by self time
+- cumulative time per router module of backend.api._registry (shared
+  dependencies are charged to whichever router imported them first)
+
+Usage:
+    python scripts/import_profile.py                      # import app (lazy routers)
+    LAZY_ROUTERS=false python scripts/import_profile.py   # eager registration
+    python scripts/import_profile.py --module backend.api._registry --all-routers --top 40
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_importtime(module: str, all_routers: bool = False):
+    """Import ``module`` with -X importtime; returns (entries, peak_rss_kb, returncode, stderr tail)"""
+    code = f"import {module}"
+    if all_routers:
+        code += "\nfrom backend.api._registry import ROUTERS"
+    code += "\nimport resource\nprint(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+
+    env = dict(os.environ, SCHEMA_CHECKS_ON_STARTUP="off")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+    entries = []
+    other = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+        elif not line.startswith("import time:"):
+            other.append(line)
+
+    stdout = result.stdout.strip().splitlines()
+    peak_rss_kb = int(stdout[-1]) if stdout and stdout[-1].isdigit() else None
+    return entries, peak_rss_kb, result.returncode, "\n".join(other[-15:])
+
+
+def print_report(module: str, entries, peak_rss_kb, top: int) -> None:
+    total_us = sum(self_us for _, self_us, _, _ in entries)
+    print(f"Import profile for '{module}'")
+    print("=" * 60)
+    print(f"Modules imported:  {len(entries)}")
+    print(f"Total import time: {total_us / 1e6:.3f}s")
+    if peak_rss_kb:
+        print(f"Peak RSS:          {peak_rss_kb / 1024:.1f} MiB")
+
+    print(f"\nSlowest {top} modules (cumulative, includes their imports):")
+    for name, _, cumulative_us, _ in sorted(entries, key=lambda e: -e[2])[:top]:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+
+    print(f"\nSlowest {top} modules (self time):")
+    for name, self_us, _, _ in sorted(entries, key=lambda e: -e[1])[:top]:
+        print(f"  {self_us / 1000:9.1f} ms  {name}")
+
+    routers = [(name, cumulative_us) for name, _, cumulative_us, _ in entries
+               if name.startswith("backend.api.") and name.count(".") == 2 and name != "backend.api._registry"]
+    if routers:
+        print("\nRouter modules (cumulative):")
+        for name, cumulative_us in sorted(routers, key=lambda r: -r[1]):
+            print(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--module", default="app", help="module to import (default: app)")
+    parser.add_argument("--all-routers", action="store_true", help="also import every registry router")
+    parser.add_argument("--top", type=int, default=25, help="rows per table")
+    args = parser.parse_args()
+
+    entries, peak_rss_kb, returncode, errors = run_importtime(args.module, args.all_routers)
+    if returncode != 0:
+        print(f"Import of '{args.module}' failed (exit {returncode}); partial profile follows\n{errors}\n")
+    print_report(args.module, entries, peak_rss_kb, args.top)
+    return returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -100,6 +100,11 @@ main() {
     log "🔧 Ensuring user_settings table exists..."
     python fix_user_settings_table.py || log "⚠️ User settings table fix had issues but continuing..."
     
+    # Step 3.6: Schema safety net (run here so app workers skip it at startup)
+    log "🔧 Running schema safety net..."
+    python -m backend.db.schema_checks || log "⚠️ Schema safety net had issues but continuing..."
+    export SCHEMA_CHECKS_ON_STARTUP=off
+    
     # Step 4: Verify critical tables exist
     verify_tables
     
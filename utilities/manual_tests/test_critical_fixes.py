@@ -12,6 +12,7 @@ import sys
 import os
 import asyncio
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, AsyncMock
 
 # Add project root to path
@@ -82,11 +83,13 @@ async def test_request_validation_middleware_exception_handling():
     
     try:
         from backend.core.security_middleware import RequestValidationMiddleware
-        from fastapi import Request
         
-        middleware = RequestValidationMiddleware(app=None)
+        # App that simulates a database error
+        async def database_error_app(scope, receive, send):
+            raise Exception('relation "content_logs" does not exist')
+        
+        middleware = RequestValidationMiddleware(app=database_error_app)
         
-        # Create mock request
         scope = {
             'type': 'http',
             'method': 'GET', 
@@ -95,14 +98,17 @@ async def test_request_validation_middleware_exception_handling():
             'headers': [],
             'client': ('127.0.0.1', 0)
         }
-        request = Request(scope)
+        sent = []
         
-        # Mock call_next that simulates database error
-        async def database_error_call_next(request):
-            raise Exception('relation "content_logs" does not exist')
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        
+        async def send(message):
+            sent.append(message)
         
         # Test that middleware handles the exception
-        response = await middleware.dispatch(request, database_error_call_next)
+        await middleware(scope, receive, send)
+        response = SimpleNamespace(status_code=sent[0]['status']) if sent else None
         
         if response is not None:
             print("   ✅ Middleware returned response instead of crashing")